@@ -0,0 +1,25 @@
+"""
+Run the production server: python -m app (see app.server).
+
+The workers share their metrics through prometheus_client's multiprocess
+mode, which has to be configured before prometheus_client is imported:
+PROMETHEUS_MULTIPROC_DIR defaults to a new temporary directory, and a
+configured one is emptied of the files of a previous run.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+_metrics_dir = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+if _metrics_dir:
+    Path(_metrics_dir).mkdir(parents=True, exist_ok=True)
+    for _path in Path(_metrics_dir).glob("*.db"):
+        _path.unlink()
+else:
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="calix-metrics-")
+
+from app.server import main  # noqa: E402
+
+sys.exit(main())
@@ -5,9 +5,34 @@ This module provides common dependencies that can be injected into API endpoints
 """
 
 import logging
+from functools import lru_cache
+from typing import TYPE_CHECKING
 
+import httpx
+from fastapi import Depends, Header, Request
+
+from app.api.formats import negotiate
 from app.config.settings import Settings, get_settings
+from app.core.http_client import create_openai_client
 from app.core.logging import get_logger
+from app.core.shared_cache import SharedCache, create_shared_cache
+from app.services.alert_service import AlertService
+from app.services.backtest_service import BacktestService
+from app.services.commentary_service import CommentaryService
+from app.services.fx_service import FxService
+from app.services.history_service import HistoryService
+from app.services.indicator_service import IndicatorService
+from app.services.portfolio_service import PortfolioService
+from app.services.prediction_service import PredictionService
+from app.services.prefetch import QuotePrefetcher
+from app.services.providers.base import MarketDataProvider
+from app.services.providers.factory import create_market_data_provider
+from app.services.quote_stream import QuoteStreamHub
+from app.services.retrieval_service import RetrievalService
+from app.services.stock_service import StockService
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
 
 
 def get_app_settings() -> Settings:
@@ -47,3 +72,255 @@ def get_request_logger() -> logging.Logger:
         ...     return {"status": "ok"}
     """
     return get_logger("api")
+
+
+def get_response_format(accept: str | None = Header(default=None)) -> str:
+    """
+    Dependency for choosing the response format from the `Accept` header.
+
+    Returns:
+        str: Media type to respond with (see app.api.formats)
+
+    Raises:
+        NotAcceptableError: If none of the accepted media types can be served
+    """
+    return negotiate(accept)
+
+
+def get_http_client(request: Request) -> httpx.AsyncClient:
+    """
+    Dependency for getting the shared outbound HTTP client.
+
+    The client (and its keep-alive connection pool) is created once in the
+    application lifespan; never create an httpx client per request.
+
+    Returns:
+        httpx.AsyncClient: Application-lifetime HTTP client
+
+    Example:
+        >>> @router.get("/upstream")
+        >>> async def upstream(http_client: httpx.AsyncClient = Depends(get_http_client)):
+        ...     response = await http_client.get("https://example.com/api")
+    """
+    http_client: httpx.AsyncClient = request.app.state.http_client
+    return http_client
+
+
+def get_openai_client(
+    http_client: httpx.AsyncClient = Depends(get_http_client),
+    settings: Settings = Depends(get_app_settings)
+) -> "AsyncOpenAI":
+    """
+    Dependency for getting an OpenAI client bound to the shared HTTP pool.
+
+    The OpenAI SDK is only imported when this dependency is first resolved.
+
+    Returns:
+        AsyncOpenAI: OpenAI client using the application-lifetime connection pool
+
+    Raises:
+        ExternalAPIError: If no OpenAI API key is configured
+    """
+    return create_openai_client(settings, http_client)
+
+
+@lru_cache
+def get_stock_service() -> StockService:
+    """
+    Dependency for getting the shared stock service.
+
+    The service holds process-wide state (quote cache, executor), so a single
+    instance is shared by all requests instead of creating one per request.
+
+    Returns:
+        StockService: Shared stock service instance
+
+    Example:
+        >>> from fastapi import Depends
+        >>> from app.api.dependencies import get_stock_service
+        >>>
+        >>> @router.post("/price")
+        >>> async def get_price(service: StockService = Depends(get_stock_service)):
+        ...     return await service.get_current_price("AAPL")
+    """
+    return StockService(provider=get_market_data_provider(), shared=get_shared_cache())
+
+
+@lru_cache
+def get_market_data_provider() -> MarketDataProvider:
+    """
+    Dependency for getting the shared market data provider.
+
+    Returns:
+        MarketDataProvider: Provider selected by MARKET_DATA_PROVIDER
+    """
+    return create_market_data_provider(get_settings())
+
+
+@lru_cache
+def get_shared_cache() -> SharedCache | None:
+    """
+    Dependency for getting the shared (Redis-protocol) cache tier.
+
+    Returns:
+        SharedCache | None: Cache shared by all workers, or None when SHARED_CACHE_ENABLED is false
+    """
+    return create_shared_cache(get_settings())
+
+
+@lru_cache
+def get_history_service() -> HistoryService:
+    """
+    Dependency for getting the shared history service.
+
+    Returns:
+        HistoryService: Shared history service backed by the local bar store
+    """
+    return HistoryService(provider=get_market_data_provider(), shared=get_shared_cache())
+
+
+@lru_cache
+def get_indicator_service() -> IndicatorService:
+    """
+    Dependency for getting the shared technical indicator service.
+
+    Returns:
+        IndicatorService: Indicator service reading bars through the shared history service
+    """
+    return IndicatorService(get_history_service())
+
+
+@lru_cache
+def get_portfolio_service() -> PortfolioService:
+    """
+    Dependency for getting the shared portfolio risk service.
+
+    Returns:
+        PortfolioService: Portfolio service reading prices and bars through the shared services
+    """
+    return PortfolioService(get_stock_service(), get_history_service(), get_fx_service())
+
+
+@lru_cache
+def get_backtest_service() -> BacktestService:
+    """
+    Dependency for getting the shared backtest service.
+
+    Returns:
+        BacktestService: Backtest service reading bars through the shared history service
+    """
+    return BacktestService(get_history_service())
+
+
+@lru_cache
+def get_alert_service() -> AlertService:
+    """
+    Dependency for getting the shared price alert service.
+
+    Returns:
+        AlertService: Alert service evaluating rules against the shared stock service's quotes
+    """
+    return AlertService(get_stock_service(), get_history_service())
+
+
+@lru_cache
+def get_fx_service() -> FxService:
+    """
+    Dependency for getting the shared FX rate service.
+
+    Returns:
+        FxService: FX service holding the cross-rate matrix of the configured currencies
+    """
+    settings = get_settings()
+    return FxService(
+        get_market_data_provider(),
+        currencies=settings.fx_currencies,
+        pivot=settings.fx_pivot_currency,
+        refresh_interval=settings.fx_refresh_interval
+    )
+
+
+@lru_cache
+def get_quote_prefetcher() -> QuotePrefetcher:
+    """
+    Dependency for getting the shared quote prefetcher.
+
+    Returns:
+        QuotePrefetcher: Prefetcher keeping the shared stock service's hot quotes fresh
+    """
+    settings = get_settings()
+    return QuotePrefetcher(
+        get_stock_service(),
+        watchlist=settings.prefetch_watchlist,
+        hot_set_size=settings.prefetch_hot_set_size,
+        batch_size=settings.prefetch_batch_size,
+        budget_per_minute=settings.prefetch_budget_per_minute,
+        interval=settings.prefetch_interval,
+        jitter=settings.prefetch_jitter
+    )
+
+
+@lru_cache
+def get_commentary_service() -> CommentaryService:
+    """
+    Dependency for getting the shared LLM commentary service.
+
+    Returns:
+        CommentaryService: Service holding the commentary cache and per-caller budgets
+    """
+    return CommentaryService(get_stock_service())
+
+
+def get_caller_id(request: Request, settings: Settings = Depends(get_app_settings)) -> str:
+    """
+    Dependency for getting the identity per-caller budgets are charged to.
+
+    Returns:
+        str: Value of the COMMENTARY_CALLER_HEADER header, else the client address
+    """
+    caller = request.headers.get(settings.commentary_caller_header)
+    if caller:
+        return caller
+    return request.client.host if request.client else "unknown"
+
+
+@lru_cache
+def get_prediction_service() -> PredictionService:
+    """
+    Dependency for getting the shared model inference service.
+
+    Returns:
+        PredictionService: Service serving the models in INFERENCE_MODEL_PATH
+    """
+    return PredictionService()
+
+
+@lru_cache
+def get_retrieval_service() -> RetrievalService:
+    """
+    Dependency for getting the shared news/filing retrieval service.
+
+    The index in RETRIEVAL_INDEX_PATH is memory-mapped on first use.
+
+    Returns:
+        RetrievalService: Service holding the vector index
+    """
+    return RetrievalService()
+
+
+@lru_cache
+def get_quote_stream_hub() -> QuoteStreamHub:
+    """
+    Dependency for getting the shared quote stream hub.
+
+    A single hub per worker makes every client of a ticker share one poller.
+
+    Returns:
+        QuoteStreamHub: Shared hub reading quotes through the shared stock service
+    """
+    settings = get_settings()
+    return QuoteStreamHub(
+        get_stock_service(),
+        poll_interval=settings.stream_poll_interval,
+        max_tickers=settings.stream_max_tickers
+    )
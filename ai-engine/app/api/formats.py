@@ -0,0 +1,322 @@
+"""
+Columnar wire formats of the stocks endpoints.
+
+Batch prices and history bars are sent as column arrays instead of a list of
+objects, in one of these media types (chosen from the `Accept` header):
+
+    application/json                      standard envelope, list of objects (default)
+    application/vnd.calix.columnar+json   standard envelope, column arrays
+    application/vnd.msgpack               same layout as columnar JSON, MessagePack encoded
+    application/vnd.apache.arrow.stream   Arrow IPC stream, envelope fields in the schema metadata
+
+In the columnar formats, history timestamps are epoch seconds (UTC) and bars
+are streamed in chunks of HISTORY_STREAM_CHUNK_SIZE straight from the bar
+store, so the encoded payload is never held in memory as a whole. Arrow needs
+the optional pyarrow package and is only offered when it is installed.
+"""
+
+import importlib.util
+import time
+from collections.abc import Iterable, Iterator
+from functools import cache
+from typing import TYPE_CHECKING, Any
+
+import msgpack
+import numpy as np
+from fastapi import Response
+from fastapi.responses import StreamingResponse
+from pydantic_core import to_json
+
+from app.core.errors import NotAcceptableError
+from app.core.metrics import observe_serialization
+from app.schemas.stock import StockPriceSchema, StockPricesSchema
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+JSON = "application/json"
+COLUMNAR_JSON = "application/vnd.calix.columnar+json"
+MSGPACK = "application/vnd.msgpack"
+ARROW = "application/vnd.apache.arrow.stream"
+
+# Accept header media types -> the format served for them
+_ACCEPTED = {
+    JSON: JSON,
+    "application/*": JSON,
+    "*/*": JSON,
+    COLUMNAR_JSON: COLUMNAR_JSON,
+    MSGPACK: MSGPACK,
+    "application/msgpack": MSGPACK,
+    "application/x-msgpack": MSGPACK,
+    ARROW: ARROW,
+}
+
+# OpenAPI documentation of the alternative representations (route `responses=`)
+COLUMNAR_RESPONSES: dict[int | str, dict[str, Any]] = {
+    200: {
+        "description": "Standard envelope; column arrays for the columnar media types",
+        "content": {COLUMNAR_JSON: {}, MSGPACK: {}, ARROW: {}},
+    },
+    406: {"description": "None of the accepted media types can be served"},
+}
+
+BAR_COLUMNS = ("timestamp", "open", "high", "low", "close", "volume")
+
+# MessagePack type tags of the fixed-width values written by _msgpack_column
+_MSGPACK_FLOAT64 = 0xCB
+_MSGPACK_INT64 = 0xD3
+
+
+@cache
+def arrow_available() -> bool:
+    """
+    Whether the optional pyarrow package is installed.
+
+    Returns:
+        bool: True if Arrow responses can be produced
+    """
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def negotiate(accept: str | None) -> str:
+    """
+    Pick the response format for an `Accept` header.
+
+    The highest q-value wins; ties go to the media type listed first. A
+    missing header or a wildcard selects the standard JSON envelope.
+
+    Args:
+        accept: Raw `Accept` header value
+
+    Returns:
+        str: One of JSON, COLUMNAR_JSON, MSGPACK or ARROW
+
+    Raises:
+        NotAcceptableError: If none of the accepted media types can be served
+    """
+    if not accept:
+        return JSON
+
+    best: tuple[float, str] | None = None
+    for item in accept.split(","):
+        media_type, *params = (part.strip() for part in item.split(";"))
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        served = _ACCEPTED.get(media_type.lower())
+        if served is None or quality <= 0 or (served == ARROW and not arrow_available()):
+            continue
+        if best is None or quality > best[0]:
+            best = (quality, served)
+
+    if best is None:
+        raise NotAcceptableError(
+            message="None of the accepted media types can be served",
+            details={"accept": accept, "available": [JSON, COLUMNAR_JSON, MSGPACK] + ([ARROW] if arrow_available() else [])}
+        )
+    return best[1]
+
+
+def prices_response(prices: StockPricesSchema, message: str, media_type: str) -> Response:
+    """
+    Serialize batch prices as column arrays.
+
+    Args:
+        prices: Prices and per-ticker errors from the stock service
+        message: Response message
+        media_type: COLUMNAR_JSON, MSGPACK or ARROW
+
+    Returns:
+        Response: Encoded response (errors stay a list of objects; in Arrow
+        they are JSON in the `errors` schema metadata)
+    """
+    started = time.perf_counter()
+    columns = {
+        name: [getattr(price, name) for price in prices.prices]
+        for name in StockPriceSchema.model_fields
+    }
+    errors = [error.model_dump(mode="json") for error in prices.errors]
+
+    if media_type == ARROW:
+        import pyarrow as pa
+
+        schema = pa.schema(
+            [
+                ("ticker", pa.string()),
+                ("current_price", pa.float64()),
+                ("currency", pa.string()),
+                ("market_status", pa.string()),
+                ("stale", pa.bool_()),
+                ("base_currency", pa.string()),
+                ("base_price", pa.float64()),
+            ],
+            metadata={"success": "true", "message": message, "errors": to_json(errors).decode()}
+        )
+        body = b"".join(_arrow_stream(schema, [pa.RecordBatch.from_pydict(columns, schema=schema)]))
+    else:
+        envelope = {"success": True, "message": message, "data": {"prices": columns, "errors": errors}}
+        body = msgpack.packb(envelope) if media_type == MSGPACK else to_json(envelope)
+
+    observe_serialization(time.perf_counter() - started)
+    return Response(content=body, media_type=media_type, headers={"Vary": "Accept"})
+
+
+def history_response(
+    ticker: str,
+    interval: str,
+    records: np.ndarray,
+    message: str,
+    media_type: str,
+    chunk_size: int
+) -> StreamingResponse:
+    """
+    Stream history bars as column arrays.
+
+    Args:
+        ticker: Stock ticker symbol
+        interval: Bar interval
+        records: BAR_DTYPE records sorted by ts (typically a view of the bar store's memory map)
+        message: Response message
+        media_type: COLUMNAR_JSON, MSGPACK or ARROW
+        chunk_size: Bars encoded per chunk
+
+    Returns:
+        StreamingResponse: Chunked response encoding one chunk at a time
+    """
+    if media_type == ARROW:
+        chunks = _arrow_history(ticker, interval, records, message, chunk_size)
+    elif media_type == MSGPACK:
+        chunks = _msgpack_history(ticker, interval, records, message, chunk_size)
+    else:
+        chunks = _json_history(ticker, interval, records, message, chunk_size)
+    return StreamingResponse(chunks, media_type=media_type, headers={"Vary": "Accept"})
+
+
+def _bar_column(records: np.ndarray, name: str) -> np.ndarray:
+    if name == "timestamp":
+        return np.asarray(records["ts"], dtype=np.int64)
+    if name == "volume":
+        # Providers report no volume (NaN) for some instruments, e.g. FX pairs
+        volume: np.ndarray = np.nan_to_num(records["volume"], nan=0.0)
+        return volume.astype(np.int64)
+    return np.asarray(records[name], dtype=np.float64)
+
+
+def _chunks(records: np.ndarray, chunk_size: int) -> Iterator[np.ndarray]:
+    for begin in range(0, len(records), chunk_size):
+        yield records[begin:begin + chunk_size]
+
+
+def _json_history(
+    ticker: str, interval: str, records: np.ndarray, message: str, chunk_size: int
+) -> Iterator[bytes]:
+    yield b'{"success":true,"message":%b,"data":{"ticker":%b,"interval":%b,"bars":{' % (
+        to_json(message), to_json(ticker), to_json(interval)
+    )
+    for index, name in enumerate(BAR_COLUMNS):
+        yield b'%b"%b":[' % (b"," if index else b"", name.encode())
+        for position, chunk in enumerate(_chunks(records, chunk_size)):
+            # to_json writes NaN as null, like the standard envelope
+            values = to_json(_bar_column(chunk, name).tolist())[1:-1]
+            yield b"," + values if position else values
+        yield b"]"
+    yield b"}}}"
+
+
+def _msgpack_history(
+    ticker: str, interval: str, records: np.ndarray, message: str, chunk_size: int
+) -> Iterator[bytes]:
+    packer = msgpack.Packer()
+    yield b"".join([
+        packer.pack_map_header(3),
+        packer.pack("success"), packer.pack(True),
+        packer.pack("message"), packer.pack(message),
+        packer.pack("data"), packer.pack_map_header(3),
+        packer.pack("ticker"), packer.pack(ticker),
+        packer.pack("interval"), packer.pack(interval),
+        packer.pack("bars"), packer.pack_map_header(len(BAR_COLUMNS)),
+    ])
+    for name in BAR_COLUMNS:
+        yield packer.pack(name) + packer.pack_array_header(len(records))
+        for chunk in _chunks(records, chunk_size):
+            yield _msgpack_column(_bar_column(chunk, name))
+
+
+def _msgpack_column(values: np.ndarray) -> bytes:
+    """
+    Encode array elements as fixed-width MessagePack float 64 / int 64 values.
+
+    Every element is a type tag followed by the big-endian value, so a whole
+    column is written with one NumPy copy instead of packing values one by one.
+    """
+    is_float = values.dtype.kind == "f"
+    encoded = np.empty(len(values), dtype=[("tag", "u1"), ("value", ">f8" if is_float else ">i8")])
+    encoded["tag"] = _MSGPACK_FLOAT64 if is_float else _MSGPACK_INT64
+    encoded["value"] = values
+    return encoded.tobytes()
+
+
+def _arrow_history(
+    ticker: str, interval: str, records: np.ndarray, message: str, chunk_size: int
+) -> Iterator[bytes]:
+    import pyarrow as pa
+
+    schema = pa.schema(
+        [
+            ("timestamp", pa.timestamp("s", tz="UTC")),
+            ("open", pa.float64()),
+            ("high", pa.float64()),
+            ("low", pa.float64()),
+            ("close", pa.float64()),
+            ("volume", pa.int64()),
+        ],
+        metadata={"success": "true", "message": message, "ticker": ticker, "interval": interval}
+    )
+    batches = (
+        pa.RecordBatch.from_arrays(
+            [pa.array(_bar_column(chunk, field.name), type=field.type) for field in schema],
+            schema=schema
+        )
+        for chunk in _chunks(records, chunk_size)
+    )
+    yield from _arrow_stream(schema, batches)
+
+
+class _ChunkSink:
+    """
+    Write target of an Arrow stream writer that hands out what was written so far.
+    """
+
+    closed = False
+
+    def __init__(self) -> None:
+        self._parts: list[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._parts.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def take(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts.clear()
+        return data
+
+
+def _arrow_stream(schema: "pa.Schema", batches: Iterable["pa.RecordBatch"]) -> Iterator[bytes]:
+    import pyarrow as pa
+
+    sink = _ChunkSink()
+    with pa.ipc.new_stream(sink, schema) as writer:
+        # The schema message is written with the first batch (or on close)
+        for batch in batches:
+            writer.write_batch(batch)
+            yield sink.take()
+    yield sink.take()
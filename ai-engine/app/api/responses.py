@@ -0,0 +1,64 @@
+"""
+Fast serialization of standard response envelopes.
+
+Returning a `DataResponse[...]` model from an endpoint makes FastAPI look up
+the parametrized model class, validate the model again against the route's
+response_model and only then dump it. Service output is already validated,
+so endpoints return `data_response(...)` instead: the envelope is built
+without validation and dumped to JSON bytes in one pass by pydantic-core.
+The body is byte-identical to FastAPI's own response_model serialization,
+and the route's `response_model` still documents it in OpenAPI.
+"""
+
+import time
+from functools import cache
+from typing import Any
+
+from fastapi import Response
+from pydantic import BaseModel
+
+from app.core.metrics import observe_serialization
+from app.schemas.base import DataResponse
+
+
+@cache
+def data_response_model(data_type: type[BaseModel]) -> type[DataResponse[Any]]:
+    """
+    Concrete `DataResponse` model of a payload type, created once per type.
+
+    Args:
+        data_type: Schema of the data payload
+
+    Returns:
+        type[DataResponse[Any]]: `DataResponse[data_type]`
+    """
+    return DataResponse[data_type]  # type: ignore[valid-type]
+
+
+def data_response(
+    data: BaseModel,
+    message: str = "Success",
+    success: bool = True,
+    status_code: int = 200
+) -> Response:
+    """
+    Serialize trusted service output in the standard response envelope.
+
+    The payload is not validated again; pass only schema instances built by
+    the service layer.
+
+    Args:
+        data: Response payload
+        message: Response message
+        success: Request success status
+        status_code: HTTP status code
+
+    Returns:
+        Response: JSON response with the serialized `DataResponse` body
+    """
+    started = time.perf_counter()
+    model = data_response_model(type(data))
+    envelope = model.model_construct(success=success, message=message, data=data)
+    body = model.__pydantic_serializer__.to_json(envelope, by_alias=True)
+    observe_serialization(time.perf_counter() - started)
+    return Response(content=body, status_code=status_code, media_type="application/json")
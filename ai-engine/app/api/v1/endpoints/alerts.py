@@ -0,0 +1,137 @@
+"""
+Price alert API endpoints.
+
+This module manages price alert rules for Spring Boot server. Fired alerts
+are not returned here: they are sent to ALERT_WEBHOOK_URL in batches.
+"""
+
+import logging
+
+from fastapi import APIRouter, Depends, Query, Response
+
+from app.api.dependencies import get_alert_service, get_request_logger
+from app.api.responses import data_response
+from app.schemas.alert import (
+    AlertRulesRequest,
+    AlertRulesSchema,
+    AlertRuleStateSchema,
+    AlertStatsSchema,
+)
+from app.schemas.base import DataResponse
+from app.services.alert_service import AlertService
+
+router = APIRouter(prefix="/alerts", tags=["alerts"])
+
+
+@router.put("/rules", response_model=DataResponse[AlertRulesSchema])
+async def put_alert_rules(
+    request: AlertRulesRequest,
+    service: AlertService = Depends(get_alert_service),
+    logger: logging.Logger = Depends(get_request_logger)
+) -> Response:
+    """
+    Create alert rules, or replace the rules with the same ids.
+
+    Args:
+        request: Rules to store
+        service: Alert service dependency (injected automatically)
+        logger: Logger dependency (injected automatically)
+
+    Returns:
+        DataResponse[AlertRulesSchema]: Stored rules with their armed levels wrapped in standard response format
+
+    Raises:
+        ValidationError: If there are more than ALERT_MAX_RULES_PER_REQUEST rules, or
+            the store would hold more than ALERT_MAX_RULES
+
+    Example Request (from Spring Boot):
+        PUT /api/v1/alerts/rules
+        {
+            "rules": [
+                {"id": "alert-1842", "ticker": "AAPL", "kind": "threshold", "direction": "above", "level": 200.0},
+                {"id": "alert-1843", "ticker": "005930.KS", "kind": "percent_move", "direction": "any", "percent": 0.05}
+            ]
+        }
+
+    Example Response:
+        {
+            "success": true,
+            "message": "Stored 2 alert rules",
+            "data": {
+                "rules": [
+                    {"id": "alert-1842", "ticker": "AAPL", "kind": "threshold", "direction": "above", "level": 200.0,
+                     "repeat": false, "metadata": {}, "armed_levels": {"above": 200.0}, "last_price": 182.52, ...},
+                    {"id": "alert-1843", "ticker": "005930.KS", "kind": "percent_move", "direction": "any",
+                     "percent": 0.05, "reference": 73400.0, "armed_levels": {"above": 77070.0, "below": 69730.0}, ...}
+                ]
+            }
+        }
+    """
+    logger.info("Received %d alert rules", len(request.rules))
+
+    rules = await service.put_rules(request.rules)
+
+    return data_response(data=AlertRulesSchema(rules=rules), message=f"Stored {len(rules)} alert rules")
+
+
+@router.get("/rules", response_model=DataResponse[AlertRulesSchema])
+async def list_alert_rules(
+    ticker: str | None = Query(default=None, max_length=10, description="Only rules of this ticker"),
+    service: AlertService = Depends(get_alert_service)
+) -> Response:
+    """
+    List alert rules with the levels they currently watch.
+
+    Args:
+        ticker: Optional ticker filter
+        service: Alert service dependency (injected automatically)
+
+    Returns:
+        DataResponse[AlertRulesSchema]: Rules wrapped in standard response format
+    """
+    rules = await service.list_rules(ticker)
+
+    return data_response(data=AlertRulesSchema(rules=rules), message=f"Found {len(rules)} alert rules")
+
+
+@router.delete("/rules/{rule_id}", response_model=DataResponse[AlertRuleStateSchema])
+async def delete_alert_rule(
+    rule_id: str,
+    service: AlertService = Depends(get_alert_service),
+    logger: logging.Logger = Depends(get_request_logger)
+) -> Response:
+    """
+    Delete an alert rule.
+
+    Args:
+        rule_id: Rule id
+        service: Alert service dependency (injected automatically)
+        logger: Logger dependency (injected automatically)
+
+    Returns:
+        DataResponse[AlertRuleStateSchema]: The deleted rule wrapped in standard response format
+
+    Raises:
+        ValidationError: If no rule has this id
+    """
+    logger.info("Deleting alert rule %s", rule_id)
+
+    rule = await service.delete_rule(rule_id)
+
+    return data_response(data=rule, message=f"Deleted alert rule {rule_id}")
+
+
+@router.get("/stats", response_model=DataResponse[AlertStatsSchema])
+async def get_alert_stats(service: AlertService = Depends(get_alert_service)) -> Response:
+    """
+    Rule counts and the evaluation and webhook delivery counters of the serving worker.
+
+    Args:
+        service: Alert service dependency (injected automatically)
+
+    Returns:
+        DataResponse[AlertStatsSchema]: Alert statistics wrapped in standard response format
+    """
+    stats = await service.get_stats()
+
+    return data_response(data=stats, message="Alert statistics retrieved")
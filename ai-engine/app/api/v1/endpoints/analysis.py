@@ -0,0 +1,128 @@
+"""
+LLM analysis API endpoints.
+
+This module generates market commentary on tickers or a portfolio with the
+configured OpenAI-compatible chat model. Commentary is streamed token by
+token as Server-Sent Events by default, so the first words arrive while the
+rest is still being generated.
+"""
+
+import logging
+from collections.abc import AsyncIterator
+from typing import TYPE_CHECKING
+
+from fastapi import APIRouter, Depends, Query, Response
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+
+from app.api.dependencies import (
+    get_caller_id,
+    get_commentary_service,
+    get_openai_client,
+    get_request_logger,
+)
+from app.api.responses import data_response
+from app.core.errors import AIEngineException
+from app.schemas.base import DataResponse, ErrorResponse
+from app.schemas.commentary import CommentaryRequest, CommentarySchema, CommentaryTokenMessage
+from app.services.commentary_service import CommentaryJob, CommentaryService
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+router = APIRouter(prefix="/analysis", tags=["analysis"])
+
+
+@router.post(
+    "/commentary",
+    response_model=DataResponse[CommentarySchema],
+    responses={200: {"content": {"text/event-stream": {}}}}
+)
+async def create_commentary(
+    request: CommentaryRequest,
+    stream: bool = Query(default=True, description="Stream the commentary as Server-Sent Events"),
+    service: CommentaryService = Depends(get_commentary_service),
+    llm: "AsyncOpenAI" = Depends(get_openai_client),
+    caller: str = Depends(get_caller_id),
+    logger: logging.Logger = Depends(get_request_logger)
+) -> Response:
+    """
+    Generate market commentary on tickers or a portfolio.
+
+    Validation, quote, budget and configuration errors are returned as normal
+    JSON error responses before streaming starts; an LLM failure during the
+    stream is sent as an `error` event.
+
+    Args:
+        request: Tickers or positions, optional question and language
+        stream: Stream as SSE (default) or return the whole commentary as JSON
+        service: Commentary service dependency (injected automatically)
+        llm: OpenAI client on the shared HTTP pool (injected automatically)
+        caller: Caller identity from COMMENTARY_CALLER_HEADER (injected automatically)
+        logger: Logger dependency (injected automatically)
+
+    Returns:
+        StreamingResponse | DataResponse[CommentarySchema]: SSE stream of `token`
+            events ended by a `done` event with the full CommentarySchema, or the
+            commentary wrapped in standard response format
+
+    Raises:
+        ValidationError: If too many tickers are requested
+        ExternalAPIError: If no OpenAI API key is configured, no ticker could be priced or the LLM fails
+        RateLimitError: If the caller exceeds its concurrency limit or token budget (429)
+
+    Example Request (from Spring Boot):
+        POST /api/v1/analysis/commentary?stream=false
+        X-Caller-ID: user-42
+        {
+            "positions": [{"ticker": "AAPL", "quantity": 10}, {"ticker": "005930.KS", "quantity": 50}],
+            "language": "ko"
+        }
+
+    Example Stream:
+        event: token
+        data: {"text":"Apple"}
+
+        event: token
+        data: {"text":" shares"}
+
+        event: done
+        data: {"tickers":["AAPL"],"commentary":"Apple shares ...","model":"gpt-4o-mini","cached":false,...}
+    """
+    logger.info("Received commentary request for caller %s (stream=%s)", caller, stream)
+
+    job = await service.prepare(request, caller)
+
+    if not stream:
+        try:
+            commentary = await service.generate(job, llm)
+        finally:
+            job.release()
+        return data_response(
+            data=commentary,
+            message=f"Generated commentary for {len(commentary.tickers)} tickers"
+        )
+
+    return StreamingResponse(
+        commentary_events(service, job, llm),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        # Frees the budget slot if the client disconnects before the stream starts
+        background=BackgroundTask(job.release)
+    )
+
+
+async def commentary_events(service: CommentaryService, job: CommentaryJob, llm: "AsyncOpenAI") -> AsyncIterator[str]:
+    """
+    Yield SSE frames for a commentary job: `token` events, then `done` or `error`.
+    """
+    try:
+        async for text in service.stream(job, llm):
+            yield f"event: token\ndata: {CommentaryTokenMessage(text=text).model_dump_json()}\n\n"
+        if job.result is not None:
+            yield f"event: done\ndata: {job.result.model_dump_json()}\n\n"
+    except AIEngineException as e:
+        error = ErrorResponse(success=False, message=e.message, details=e.details)
+        yield f"event: error\ndata: {error.model_dump_json()}\n\n"
+    finally:
+        job.release()
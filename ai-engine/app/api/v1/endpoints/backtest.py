@@ -0,0 +1,85 @@
+"""
+Backtest API endpoints.
+
+This module backtests trading strategies over stored bar history for
+Spring Boot server, sweeping a grid of strategy parameters in one request.
+"""
+
+import logging
+
+from fastapi import APIRouter, Depends, Response
+
+from app.api.dependencies import get_backtest_service, get_request_logger
+from app.api.responses import data_response
+from app.schemas.backtest import BacktestRequest, BacktestSchema
+from app.schemas.base import DataResponse
+from app.services.backtest_service import BacktestService
+
+router = APIRouter(prefix="/backtest", tags=["backtest"])
+
+
+@router.post("", response_model=DataResponse[BacktestSchema])
+async def run_backtest(
+    request: BacktestRequest,
+    service: BacktestService = Depends(get_backtest_service),
+    logger: logging.Logger = Depends(get_request_logger)
+) -> Response:
+    """
+    Backtest a strategy for every combination of a parameter grid.
+
+    Closes of all tickers are aligned on one timeline and every combination
+    is simulated with commission and slippage on traded value. Runs are
+    returned best Sharpe ratio first, with the equity curve of the best run.
+
+    Args:
+        request: Tickers, range, strategy, parameter grid and costs
+        service: Backtest service dependency (injected automatically)
+        logger: Logger dependency (injected automatically)
+
+    Returns:
+        DataResponse[BacktestSchema]: Runs and best equity curve wrapped in standard response format
+
+    Raises:
+        ValidationError: If there are more than BACKTEST_MAX_TICKERS tickers or
+            BACKTEST_MAX_COMBINATIONS combinations, or too little history in the range
+
+    Example Request (from Spring Boot):
+        POST /api/v1/backtest
+        {
+            "tickers": ["AAPL", "MSFT", "005930.KS"],
+            "strategy": "ma_crossover",
+            "start": "2019-01-01T00:00:00Z",
+            "fast_windows": [10, 20, 50],
+            "slow_windows": [100, 200]
+        }
+
+    Example Response:
+        {
+            "success": true,
+            "message": "Backtested 6 ma_crossover runs over 1450 bars",
+            "data": {
+                "strategy": "ma_crossover",
+                "tickers": ["AAPL", "MSFT", "005930.KS"],
+                "interval": "1d",
+                "bars": 1450,
+                "timestamps": ["2019-01-02T00:00:00Z", ...],
+                "runs": [
+                    {"parameters": {"fast": 20, "slow": 100}, "total_return": 0.42, "cagr": 0.073,
+                     "volatility": 0.14, "sharpe": 0.58, "max_drawdown": 0.19, "turnover": 3.1,
+                     "exposure": 0.64, "final_equity": 14200.0},
+                    ...
+                ],
+                "best": {"parameters": {"fast": 20, "slow": 100}, "equity": [10000.0, ...], "drawdown": [0.0, ...]}
+            }
+        }
+    """
+    logger.info(
+        "Received %s backtest request for %d tickers", request.strategy, len(request.tickers)
+    )
+
+    result = await service.run(request)
+
+    return data_response(
+        data=result,
+        message=f"Backtested {len(result.runs)} {result.strategy} runs over {result.bars} bars"
+    )
@@ -0,0 +1,104 @@
+"""
+FX rate API endpoints.
+
+This module serves the cached cross-rate matrix and bulk currency
+conversion for Spring Boot server.
+"""
+
+import logging
+
+from fastapi import APIRouter, Depends, Response
+
+from app.api.dependencies import get_fx_service, get_request_logger
+from app.api.responses import data_response
+from app.schemas.base import DataResponse
+from app.schemas.fx import FxConvertRequest, FxConvertSchema, FxRatesSchema
+from app.services.fx_service import FxService
+
+router = APIRouter(prefix="/fx", tags=["fx"])
+
+
+@router.get("/rates", response_model=DataResponse[FxRatesSchema])
+async def get_fx_rates(
+    service: FxService = Depends(get_fx_service)
+) -> Response:
+    """
+    Get the cross rates between all supported currencies.
+
+    The matrix is refreshed every FX_REFRESH_INTERVAL seconds, so this
+    endpoint never waits for an upstream call once it is loaded.
+
+    Args:
+        service: FX service dependency (injected automatically)
+
+    Returns:
+        DataResponse[FxRatesSchema]: Cross-rate matrix wrapped in standard response format
+
+    Example Response:
+        {
+            "success": true,
+            "message": "Retrieved rates for 2 currencies",
+            "data": {
+                "currencies": ["USD", "KRW"],
+                "matrix": [[1.0, 1350.0], [0.000741, 1.0]],
+                "as_of": "2024-03-01T09:00:00Z"
+            }
+        }
+    """
+    rates = await service.get_rates()
+
+    return data_response(
+        data=FxRatesSchema(currencies=list(rates.currencies), matrix=rates.matrix.tolist(), as_of=rates.as_of),
+        message=f"Retrieved rates for {len(rates.currencies)} currencies"
+    )
+
+
+@router.post("/convert", response_model=DataResponse[FxConvertSchema])
+async def convert_amounts(
+    request: FxConvertRequest,
+    service: FxService = Depends(get_fx_service),
+    logger: logging.Logger = Depends(get_request_logger)
+) -> Response:
+    """
+    Convert amounts in mixed currencies to one currency in a single call.
+
+    Args:
+        request: Amounts, the currency of each amount and the target currency
+        service: FX service dependency (injected automatically)
+        logger: Logger dependency (injected automatically)
+
+    Returns:
+        DataResponse[FxConvertSchema]: Converted amounts wrapped in standard response format
+
+    Raises:
+        ValidationError: If a currency is not supported
+
+    Example Request (from Spring Boot):
+        POST /api/v1/fx/convert
+        {
+            "amounts": [1000, 250000],
+            "currencies": ["USD", "KRW"],
+            "target": "KRW"
+        }
+
+    Example Response:
+        {
+            "success": true,
+            "message": "Converted 2 amounts to KRW",
+            "data": {"target": "KRW", "amounts": [1350000.0, 250000.0], "total": 1600000.0, "as_of": "..."}
+        }
+    """
+    logger.info("Received FX conversion request for %d amounts to %s", len(request.amounts), request.target)
+
+    rates = await service.get_rates()
+    converted = rates.convert(request.amounts, request.currencies, request.target)
+
+    return data_response(
+        data=FxConvertSchema(
+            target=request.target.upper(),
+            amounts=converted.tolist(),
+            total=float(converted.sum()),
+            as_of=rates.as_of
+        ),
+        message=f"Converted {len(request.amounts)} amounts to {request.target.upper()}"
+    )
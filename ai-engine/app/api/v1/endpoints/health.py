@@ -4,11 +4,21 @@ Health check endpoints.
 These endpoints are used to monitor the service health and readiness.
 """
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response, status
 
-from app.api.dependencies import get_app_settings
+from app.api.dependencies import (
+    get_app_settings,
+    get_market_data_provider,
+    get_prediction_service,
+    get_quote_prefetcher,
+)
+from app.api.responses import data_response
 from app.config.settings import Settings
-from app.schemas.base import BaseResponse
+from app.schemas.base import BaseResponse, DataResponse
+from app.schemas.health import CircuitStatusSchema, ReadinessSchema
+from app.services.prediction_service import PredictionService
+from app.services.prefetch import QuotePrefetcher
+from app.services.providers.base import MarketDataProvider
 
 router = APIRouter(prefix="/health", tags=["health"])
 
@@ -30,23 +40,65 @@ async def health_check(settings: Settings = Depends(get_app_settings)) -> BaseRe
     )
 
 
-@router.get("/ready", response_model=BaseResponse)
-async def readiness_check(settings: Settings = Depends(get_app_settings)) -> BaseResponse:
+@router.get("/ready", response_model=DataResponse[ReadinessSchema])
+async def readiness_check(
+    settings: Settings = Depends(get_app_settings),
+    provider: MarketDataProvider = Depends(get_market_data_provider),
+    prefetcher: QuotePrefetcher = Depends(get_quote_prefetcher),
+    predictions: PredictionService = Depends(get_prediction_service)
+) -> Response:
     """
     Readiness check endpoint.
 
-    Checks if the service is ready to accept requests.
-    Can be extended to check external dependencies (APIs, etc.) if needed.
+    Checks if the service is ready to accept requests and reports the state
+    of upstream circuit breakers. Until the startup warm-up of the
+    PREFETCH_WATCHLIST quotes has finished, the status is "warming_up" with
+    status 503, so no traffic is routed to a worker with a cold cache; the
+    same holds while the models are still loading and warming up.
+    An open circuit makes the service "degraded" but still ready (status
+    200): every worker shares the same upstream, so taking workers out of
+    rotation would not help, and cached or stale quotes can still be served.
+    A model that failed to load is reported as "degraded" too.
 
     Returns:
-        BaseResponse: Readiness status
+        DataResponse[ReadinessSchema]: Readiness, circuit breaker and model states
     """
     # In the future, add checks for:
     # - External API connectivity (OpenAI, etc.)
     # - Required environment variables
-    # - ML model loading status
 
-    return BaseResponse(
-        success=True,
-        message=f"{settings.app_name} is ready to serve requests"
+    circuits = []
+    if provider.circuit_breaker is not None:
+        snapshot = provider.circuit_breaker.snapshot()
+        circuits.append(CircuitStatusSchema(
+            name=snapshot.name,
+            state=snapshot.state,
+            failure_rate=snapshot.failure_rate,
+            calls=snapshot.calls,
+            retry_after=snapshot.retry_after
+        ))
+
+    models = predictions.statuses()
+
+    warmed_up = prefetcher.ready or not settings.prefetch_enabled
+    if not warmed_up or predictions.loading:
+        return data_response(
+            success=False,
+            data=ReadinessSchema(status="warming_up", warmed_up=warmed_up, circuits=circuits, models=models),
+            message=f"{settings.app_name} is warming up its {'quote cache' if not warmed_up else 'models'}",
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+
+    reasons = []
+    if any(circuit.state != "closed" for circuit in circuits):
+        reasons.append("upstream circuit not closed")
+    if any(model.state == "failed" for model in models):
+        reasons.append("model failed to load")
+    message = f"{settings.app_name} is ready to serve requests"
+    if reasons:
+        message = f"{settings.app_name} is ready to serve requests (degraded: {', '.join(reasons)})"
+
+    return data_response(
+        data=ReadinessSchema(status="degraded" if reasons else "ready", circuits=circuits, models=models),
+        message=message
     )
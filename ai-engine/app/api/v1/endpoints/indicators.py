@@ -0,0 +1,92 @@
+"""
+Technical indicator API endpoints.
+
+This module computes technical indicators (SMA, EMA, RSI, MACD, Bollinger
+bands, ATR, volatility) over stored bar history for Spring Boot server.
+"""
+
+import logging
+
+from fastapi import APIRouter, Depends, Response
+
+from app.api.dependencies import get_indicator_service, get_request_logger
+from app.api.responses import data_response
+from app.schemas.base import DataResponse
+from app.schemas.indicator import IndicatorRequest, IndicatorsSchema
+from app.services.indicator_service import IndicatorService
+from app.services.indicators import IndicatorParams
+
+router = APIRouter(prefix="/indicators", tags=["indicators"])
+
+
+@router.post("", response_model=DataResponse[IndicatorsSchema])
+async def get_indicators(
+    request: IndicatorRequest,
+    service: IndicatorService = Depends(get_indicator_service),
+    logger: logging.Logger = Depends(get_request_logger)
+) -> Response:
+    """
+    Compute technical indicators for one or more tickers.
+
+    All tickers are aligned on one timeline and computed together with
+    vectorized operations.
+
+    Args:
+        request: Indicator request with tickers, range, indicator names and windows
+        service: Indicator service dependency (injected automatically)
+        logger: Logger dependency (injected automatically)
+
+    Returns:
+        DataResponse[IndicatorsSchema]: Indicator series wrapped in standard response format
+
+    Example Request (from Spring Boot):
+        POST /api/v1/indicators
+        {
+            "tickers": ["AAPL", "MSFT"],
+            "interval": "1d",
+            "indicators": ["sma", "rsi"],
+            "limit": 2
+        }
+
+    Example Response:
+        {
+            "success": true,
+            "message": "Computed 2 indicators for 2 tickers",
+            "data": {
+                "interval": "1d",
+                "timestamps": ["2024-03-01T00:00:00Z", "2024-03-04T00:00:00Z"],
+                "series": [
+                    {"ticker": "AAPL", "values": {"sma": [181.2, 181.9], "rsi": [48.3, 52.1]}},
+                    {"ticker": "MSFT", "values": {"sma": [410.5, 411.0], "rsi": [61.0, 58.7]}}
+                ]
+            }
+        }
+    """
+    logger.info("Received indicator request for %d tickers: %s", len(request.tickers), request.indicators)
+
+    params = IndicatorParams(
+        sma_window=request.sma_window,
+        ema_span=request.ema_span,
+        rsi_period=request.rsi_period,
+        macd_fast=request.macd_fast,
+        macd_slow=request.macd_slow,
+        macd_signal=request.macd_signal,
+        bollinger_window=request.bollinger_window,
+        bollinger_k=request.bollinger_k,
+        atr_period=request.atr_period,
+        volatility_window=request.volatility_window
+    )
+    indicators_data = await service.get_indicators(
+        request.tickers,
+        request.interval,
+        list(dict.fromkeys(request.indicators)),
+        params,
+        start=request.start,
+        end=request.end,
+        limit=request.limit
+    )
+
+    return data_response(
+        data=indicators_data,
+        message=f"Computed {len(set(request.indicators))} indicators for {len(indicators_data.series)} tickers"
+    )
@@ -0,0 +1,87 @@
+"""
+Portfolio API endpoints.
+
+This module values portfolios and computes their risk (volatility, VaR,
+per-position risk contribution) for Spring Boot server.
+"""
+
+import logging
+
+from fastapi import APIRouter, Depends, Response
+
+from app.api.dependencies import get_portfolio_service, get_request_logger
+from app.api.responses import data_response
+from app.schemas.base import DataResponse
+from app.schemas.portfolio import PortfolioRiskRequest, PortfolioRiskSchema
+from app.services.portfolio_service import PortfolioService
+
+router = APIRouter(prefix="/portfolio", tags=["portfolio"])
+
+
+@router.post("/risk", response_model=DataResponse[PortfolioRiskSchema])
+async def get_portfolio_risk(
+    request: PortfolioRiskRequest,
+    service: PortfolioService = Depends(get_portfolio_service),
+    logger: logging.Logger = Depends(get_request_logger)
+) -> Response:
+    """
+    Value a portfolio in a base currency and compute its risk.
+
+    Positions may be quoted in different currencies; every amount in the
+    response is in `base_currency`. Positions that cannot be priced are
+    listed in `errors` instead of failing the whole request.
+
+    Args:
+        request: Holdings, base currency, lookback, VaR confidence and horizon
+        service: Portfolio service dependency (injected automatically)
+        logger: Logger dependency (injected automatically)
+
+    Returns:
+        DataResponse[PortfolioRiskSchema]: Valuation and risk wrapped in standard response format
+
+    Raises:
+        ValidationError: If the portfolio has more than PORTFOLIO_MAX_POSITIONS distinct tickers
+
+    Example Request (from Spring Boot):
+        POST /api/v1/portfolio/risk
+        {
+            "positions": [{"ticker": "AAPL", "quantity": 10}, {"ticker": "005930.KS", "quantity": 50}],
+            "base_currency": "USD",
+            "confidence": 0.95
+        }
+
+    Example Response:
+        {
+            "success": true,
+            "message": "Computed risk for 2 positions",
+            "data": {
+                "base_currency": "USD",
+                "market_value": 4473.36,
+                "daily_pnl": -12.4,
+                "volatility": 61.2,
+                "var_historical": 97.5,
+                "var_parametric": 100.67,
+                "confidence": 0.95,
+                "horizon_days": 1,
+                "observations": 250,
+                "positions": [
+                    {"ticker": "AAPL", "quantity": 10, "currency": "USD", "price": 182.52, "fx_rate": 1.0,
+                     "market_value": 1825.2, "weight": 0.408, "daily_pnl": -8.1,
+                     "risk_contribution": 25.3, "risk_contribution_pct": 0.413},
+                    ...
+                ],
+                "errors": []
+            }
+        }
+    """
+    logger.info(
+        "Received portfolio risk request for %d positions in %s",
+        len(request.positions), request.base_currency
+    )
+
+    risk_data = await service.get_risk(request)
+
+    return data_response(
+        data=risk_data,
+        message=f"Computed risk for {len(risk_data.positions)} positions"
+    )
@@ -0,0 +1,88 @@
+"""
+Model prediction API endpoints.
+
+This module serves the price-direction models loaded from
+INFERENCE_MODEL_PATH. Concurrent requests for one model are micro-batched
+into shared forward passes.
+"""
+
+import logging
+
+from fastapi import APIRouter, Depends, Response
+
+from app.api.dependencies import get_prediction_service, get_request_logger
+from app.api.responses import data_response
+from app.schemas.base import DataResponse
+from app.schemas.prediction import ModelListSchema, PredictionRequest, PredictionSchema
+from app.services.prediction_service import PredictionService
+
+router = APIRouter(prefix="/predictions", tags=["predictions"])
+
+
+@router.get("/models", response_model=DataResponse[ModelListSchema])
+async def list_models(service: PredictionService = Depends(get_prediction_service)) -> Response:
+    """
+    List the served models with their load state and input features.
+
+    Args:
+        service: Prediction service dependency (injected automatically)
+
+    Returns:
+        DataResponse[ModelListSchema]: Models wrapped in standard response format
+    """
+    models = service.statuses()
+    return data_response(
+        data=ModelListSchema(models=models),
+        message=f"{sum(model.state == 'ready' for model in models)} of {len(models)} models ready"
+    )
+
+
+@router.post("/{model}", response_model=DataResponse[PredictionSchema])
+async def predict(
+    model: str,
+    request: PredictionRequest,
+    service: PredictionService = Depends(get_prediction_service),
+    logger: logging.Logger = Depends(get_request_logger)
+) -> Response:
+    """
+    Predict the price direction for one or more feature vectors.
+
+    Args:
+        model: Model name (see GET /predictions/models)
+        request: Feature vectors in the model's feature order
+        service: Prediction service dependency (injected automatically)
+        logger: Logger dependency (injected automatically)
+
+    Returns:
+        DataResponse[PredictionSchema]: Probabilities and directions wrapped in standard response format
+
+    Raises:
+        ValidationError: If the model is unknown or the instances do not match its features
+        ModelInferenceError: If the model is not loaded or inference fails
+
+    Example Request (from Spring Boot):
+        POST /api/v1/predictions/price_direction
+        {
+            "instances": [[0.012, -0.004, 0.031, 0.22, 58.4]]
+        }
+
+    Example Response:
+        {
+            "success": true,
+            "message": "Predicted 1 instances with price_direction",
+            "data": {
+                "model": "price_direction",
+                "version": "2024-06-01",
+                "probabilities": [0.64],
+                "directions": ["up"]
+            }
+        }
+    """
+    logger.info("Received prediction request for model %s with %d instances", model, len(request.instances))
+
+    prediction = await service.predict(model, request.instances)
+
+    return data_response(
+        data=prediction,
+        message=f"Predicted {len(request.instances)} instances with {model}"
+    )
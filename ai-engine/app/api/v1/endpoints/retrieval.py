@@ -0,0 +1,162 @@
+"""
+News/filing retrieval API endpoints.
+
+This module indexes news articles and filings in the local vector index
+and searches them by similarity, optionally filtered by ticker and
+publication time.
+"""
+
+import logging
+
+from fastapi import APIRouter, Depends, Response
+
+from app.api.dependencies import get_request_logger, get_retrieval_service
+from app.api.responses import data_response
+from app.schemas.base import DataResponse
+from app.schemas.retrieval import (
+    DeletedDocumentSchema,
+    IngestRequest,
+    IngestResultSchema,
+    RetrievalStatsSchema,
+    SearchRequest,
+    SearchResultSchema,
+)
+from app.services.retrieval_service import RetrievalService
+
+router = APIRouter(prefix="/retrieval", tags=["retrieval"])
+
+
+@router.post("/documents", response_model=DataResponse[IngestResultSchema])
+async def ingest_documents(
+    request: IngestRequest,
+    service: RetrievalService = Depends(get_retrieval_service),
+    logger: logging.Logger = Depends(get_request_logger)
+) -> Response:
+    """
+    Index news articles or filings, replacing indexed documents with the same ID.
+
+    Args:
+        request: Documents to index
+        service: Retrieval service dependency (injected automatically)
+        logger: Logger dependency (injected automatically)
+
+    Returns:
+        DataResponse[IngestResultSchema]: Indexed documents and chunks wrapped in standard response format
+
+    Raises:
+        ValidationError: If more than RETRIEVAL_MAX_DOCUMENTS documents are given
+        ServiceOverloadedError: If the retrieval pool is saturated (503)
+
+    Example Request (from Spring Boot):
+        POST /api/v1/retrieval/documents
+        {
+            "documents": [{
+                "id": "news-20240601-aapl-001",
+                "ticker": "AAPL",
+                "published_at": "2024-06-01T13:30:00Z",
+                "title": "Apple unveils on-device AI features",
+                "text": "Apple announced a set of on-device AI features..."
+            }]
+        }
+    """
+    logger.info("Received ingest request for %d documents", len(request.documents))
+
+    result = await service.ingest(request.documents)
+
+    return data_response(
+        data=result,
+        message=f"Indexed {result.documents} documents as {result.chunks} chunks"
+    )
+
+
+@router.delete("/documents/{document_id}", response_model=DataResponse[DeletedDocumentSchema])
+async def delete_document(
+    document_id: str,
+    service: RetrievalService = Depends(get_retrieval_service)
+) -> Response:
+    """
+    Remove a document from the index.
+
+    Args:
+        document_id: Document ID
+        service: Retrieval service dependency (injected automatically)
+
+    Returns:
+        DataResponse[DeletedDocumentSchema]: Removed chunks wrapped in standard response format
+
+    Raises:
+        ValidationError: If the document is not indexed
+    """
+    chunks = await service.delete(document_id)
+    return data_response(
+        data=DeletedDocumentSchema(document_id=document_id, chunks=chunks),
+        message=f"Removed {document_id}"
+    )
+
+
+@router.post("/search", response_model=DataResponse[SearchResultSchema])
+async def search_documents(
+    request: SearchRequest,
+    service: RetrievalService = Depends(get_retrieval_service),
+    logger: logging.Logger = Depends(get_request_logger)
+) -> Response:
+    """
+    Find the indexed chunks most similar to a query.
+
+    Args:
+        request: Query text, result count and ticker/time filters
+        service: Retrieval service dependency (injected automatically)
+        logger: Logger dependency (injected automatically)
+
+    Returns:
+        DataResponse[SearchResultSchema]: Matching chunks wrapped in standard response format
+
+    Raises:
+        ValidationError: If more than RETRIEVAL_MAX_RESULTS results are requested
+        ServiceOverloadedError: If the retrieval pool is saturated (503)
+
+    Example Request (from Spring Boot):
+        POST /api/v1/retrieval/search
+        {
+            "query": "on-device AI announcements",
+            "top_k": 3,
+            "tickers": ["AAPL"],
+            "start": "2024-01-01T00:00:00Z"
+        }
+
+    Example Response:
+        {
+            "success": true,
+            "message": "Found 1 matching chunks",
+            "data": {
+                "query": "on-device AI announcements",
+                "hits": [{"document_id": "news-20240601-aapl-001", "chunk": 0, "ticker": "AAPL", "score": 0.71, ...}]
+            }
+        }
+    """
+    logger.info("Received retrieval search for %d results (tickers=%s)", request.top_k, request.tickers)
+
+    result = await service.search(request)
+
+    return data_response(
+        data=result,
+        message=f"Found {len(result.hits)} matching chunks"
+    )
+
+
+@router.get("/stats", response_model=DataResponse[RetrievalStatsSchema])
+async def get_stats(service: RetrievalService = Depends(get_retrieval_service)) -> Response:
+    """
+    Get the size and layout of the retrieval index.
+
+    Args:
+        service: Retrieval service dependency (injected automatically)
+
+    Returns:
+        DataResponse[RetrievalStatsSchema]: Index statistics wrapped in standard response format
+    """
+    stats = service.stats()
+    return data_response(
+        data=stats,
+        message=f"{stats.chunks} chunks indexed"
+    )
@@ -5,12 +5,33 @@ This module handles all stock-related HTTP requests from Spring Boot server.
 """
 
 import logging
+from typing import Annotated
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Response
 
-from app.api.dependencies import get_request_logger
+from app.api.dependencies import (
+    get_app_settings,
+    get_fx_service,
+    get_history_service,
+    get_request_logger,
+    get_response_format,
+    get_stock_service,
+)
+from app.api.formats import COLUMNAR_RESPONSES, JSON, history_response, prices_response
+from app.api.responses import data_response
+from app.config.settings import Settings
 from app.schemas.base import DataResponse
-from app.schemas.stock import StockPriceRequest, StockPriceSchema
+from app.schemas.stock import (
+    QuoteCacheStatsSchema,
+    StockHistoryRequest,
+    StockHistorySchema,
+    StockPriceRequest,
+    StockPriceSchema,
+    StockPricesRequest,
+    StockPricesSchema,
+)
+from app.services.fx_service import FxService
+from app.services.history_service import HistoryService
 from app.services.stock_service import StockService
 
 router = APIRouter(prefix="/stocks", tags=["stocks"])
@@ -19,16 +40,21 @@ router = APIRouter(prefix="/stocks", tags=["stocks"])
 @router.post("/price", response_model=DataResponse[StockPriceSchema])
 async def get_stock_price(
     request: StockPriceRequest,
+    service: StockService = Depends(get_stock_service),
+    fx_service: FxService = Depends(get_fx_service),
     logger: logging.Logger = Depends(get_request_logger)
-) -> DataResponse[StockPriceSchema]:
+) -> Response:
     """
     Get current stock price for a given ticker.
 
     This endpoint is called by Spring Boot server to fetch real-time stock prices.
-    The data is fetched from Yahoo Finance API.
+    The data is fetched from the configured market data provider (Yahoo Finance by default).
+    With `base_currency`, the price is also converted with the cached FX rates.
 
     Args:
-        request: Stock price request with ticker symbol
+        request: Stock price request with ticker symbol and optional base currency
+        service: Stock service dependency (injected automatically)
+        fx_service: FX service dependency (injected automatically)
         logger: Logger dependency (injected automatically)
 
     Returns:
@@ -36,6 +62,7 @@ async def get_stock_price(
 
     Raises:
         ExternalAPIError: If Yahoo Finance API call fails (automatically handled by global exception handler)
+        ValidationError: If the base currency is not supported
 
     Example Request (from Spring Boot):
         POST /api/v1/stocks/price
@@ -55,14 +82,226 @@ async def get_stock_price(
             }
         }
     """
-    logger.info(f"Received stock price request for ticker: {request.ticker}")
+    logger.info("Received stock price request for ticker: %s", request.ticker)
 
-    # Create service instance and fetch data
-    service = StockService()
+    # Fetch data (served from the quote cache when fresh)
     stock_data = await service.get_current_price(request.ticker)
+    if request.base_currency:
+        stock_data = (await fx_service.to_base([stock_data], request.base_currency))[0]
 
     # Return wrapped response
-    return DataResponse[StockPriceSchema](
+    return data_response(
         data=stock_data,
         message=f"Stock price retrieved successfully for {request.ticker}"
     )
+
+
+@router.post("/prices", response_model=DataResponse[StockPricesSchema], responses=COLUMNAR_RESPONSES)
+async def get_stock_prices(
+    request: StockPricesRequest,
+    service: StockService = Depends(get_stock_service),
+    fx_service: FxService = Depends(get_fx_service),
+    media_type: str = Depends(get_response_format),
+    logger: logging.Logger = Depends(get_request_logger)
+) -> Response:
+    """
+    Get current stock prices for several tickers in one call.
+
+    This endpoint lets Spring Boot server refresh a whole portfolio with a single
+    round trip. Tickers are de-duplicated and fetched concurrently; tickers that
+    fail are returned in `errors` instead of failing the whole request. With
+    `base_currency`, every price is also converted with the cached FX rates.
+    Prices are sent as column arrays when the `Accept` header asks for a
+    columnar format (see app.api.formats).
+
+    Args:
+        request: Batch stock price request with ticker symbols and optional base currency
+        service: Stock service dependency (injected automatically)
+        fx_service: FX service dependency (injected automatically)
+        media_type: Response format negotiated from the Accept header (injected automatically)
+        logger: Logger dependency (injected automatically)
+
+    Returns:
+        DataResponse[StockPricesSchema]: Prices and per-ticker errors wrapped in standard response format
+
+    Raises:
+        ValidationError: If too many tickers are requested (automatically handled by global exception handler)
+        NotAcceptableError: If none of the accepted media types can be served
+
+    Example Request (from Spring Boot):
+        POST /api/v1/stocks/prices
+        {
+            "tickers": ["AAPL", "MSFT", "NOPE"]
+        }
+
+    Example Response:
+        {
+            "success": true,
+            "message": "Stock prices retrieved for 2 of 3 tickers",
+            "data": {
+                "prices": [
+                    {"ticker": "AAPL", "current_price": 182.52, "currency": "USD", "market_status": "open"},
+                    {"ticker": "MSFT", "current_price": 415.1, "currency": "USD", "market_status": "open"}
+                ],
+                "errors": [
+                    {"ticker": "NOPE", "message": "Unable to fetch stock data for ticker: NOPE", "details": {...}}
+                ]
+            }
+        }
+
+    Example Response (Accept: application/vnd.calix.columnar+json):
+        {
+            "success": true,
+            "message": "Stock prices retrieved for 2 of 3 tickers",
+            "data": {
+                "prices": {
+                    "ticker": ["AAPL", "MSFT"],
+                    "current_price": [182.52, 415.1],
+                    ...
+                },
+                "errors": [...]
+            }
+        }
+    """
+    logger.info("Received stock prices request for %d tickers", len(request.tickers))
+
+    prices_data = await service.get_current_prices(request.tickers)
+    if request.base_currency:
+        prices_data.prices = await fx_service.to_base(prices_data.prices, request.base_currency)
+
+    total = len(prices_data.prices) + len(prices_data.errors)
+    message = f"Stock prices retrieved for {len(prices_data.prices)} of {total} tickers"
+    if media_type != JSON:
+        return prices_response(prices_data, message, media_type)
+    return data_response(data=prices_data, message=message)
+
+
+@router.get("/cache/stats", response_model=DataResponse[QuoteCacheStatsSchema])
+async def get_quote_cache_stats(
+    service: StockService = Depends(get_stock_service)
+) -> Response:
+    """
+    Get quote cache counters.
+
+    Use hit/miss/eviction counts to tune QUOTE_CACHE_TTL_* settings against upstream load.
+
+    Args:
+        service: Stock service dependency (injected automatically)
+
+    Returns:
+        DataResponse[QuoteCacheStatsSchema]: Cache counters wrapped in standard response format
+    """
+    stats = service.get_cache_stats()
+
+    return data_response(
+        data=QuoteCacheStatsSchema(
+            hits=stats.hits,
+            misses=stats.misses,
+            loads=stats.loads,
+            coalesced=stats.coalesced,
+            evictions=stats.evictions,
+            expirations=stats.expirations,
+            stale_hits=stats.stale_hits,
+            size=stats.size,
+            max_size=stats.max_size,
+            hit_ratio=stats.hit_ratio
+        ),
+        message="Quote cache stats retrieved successfully"
+    )
+
+
+@router.get("/history", response_model=DataResponse[StockHistorySchema], responses=COLUMNAR_RESPONSES)
+async def get_stock_history(
+    request: Annotated[StockHistoryRequest, Query()],
+    service: HistoryService = Depends(get_history_service),
+    media_type: str = Depends(get_response_format),
+    settings: Settings = Depends(get_app_settings),
+    logger: logging.Logger = Depends(get_request_logger)
+) -> Response:
+    """
+    Get historical OHLCV bars for a ticker (query parameters).
+
+    Bars are served from the local bar store; only ranges not stored yet are
+    fetched from the market data provider and appended to the store.
+    Columnar formats (see app.api.formats) are streamed straight from the
+    store in chunks of HISTORY_STREAM_CHUNK_SIZE bars.
+
+    Args:
+        request: History request (ticker, interval, start, end) from query parameters
+        service: History service dependency (injected automatically)
+        media_type: Response format negotiated from the Accept header (injected automatically)
+        settings: Application settings (injected automatically)
+        logger: Logger dependency (injected automatically)
+
+    Returns:
+        DataResponse[StockHistorySchema]: Bars wrapped in standard response format
+
+    Example Request:
+        GET /api/v1/stocks/history?ticker=AAPL&interval=1d&start=2024-01-01&end=2024-02-01
+        Accept: application/vnd.msgpack
+    """
+    return await _get_stock_history(request, service, media_type, settings, logger)
+
+
+@router.post("/history", response_model=DataResponse[StockHistorySchema], responses=COLUMNAR_RESPONSES)
+async def post_stock_history(
+    request: StockHistoryRequest,
+    service: HistoryService = Depends(get_history_service),
+    media_type: str = Depends(get_response_format),
+    settings: Settings = Depends(get_app_settings),
+    logger: logging.Logger = Depends(get_request_logger)
+) -> Response:
+    """
+    Get historical OHLCV bars for a ticker (JSON body).
+
+    Same as GET /history, for callers that prefer a request body.
+
+    Args:
+        request: History request with ticker, interval, start and end
+        service: History service dependency (injected automatically)
+        media_type: Response format negotiated from the Accept header (injected automatically)
+        settings: Application settings (injected automatically)
+        logger: Logger dependency (injected automatically)
+
+    Returns:
+        DataResponse[StockHistorySchema]: Bars wrapped in standard response format
+
+    Example Request (from Spring Boot):
+        POST /api/v1/stocks/history
+        {
+            "ticker": "AAPL",
+            "interval": "1d",
+            "start": "2024-01-01T00:00:00Z",
+            "end": "2024-02-01T00:00:00Z"
+        }
+    """
+    return await _get_stock_history(request, service, media_type, settings, logger)
+
+
+async def _get_stock_history(
+    request: StockHistoryRequest,
+    service: HistoryService,
+    media_type: str,
+    settings: Settings,
+    logger: logging.Logger
+) -> Response:
+    logger.info("Received stock history request for ticker: %s (%s)", request.ticker, request.interval)
+
+    if media_type != JSON:
+        records = await service.get_records(request.ticker, request.interval, request.start, request.end)
+        ticker = request.ticker.upper()
+        return history_response(
+            ticker,
+            request.interval,
+            records,
+            f"Retrieved {len(records)} {request.interval} bars for {ticker}",
+            media_type,
+            settings.history_stream_chunk_size
+        )
+
+    history = await service.get_history(request.ticker, request.interval, request.start, request.end)
+
+    return data_response(
+        data=history,
+        message=f"Retrieved {len(history.bars)} {request.interval} bars for {history.ticker}"
+    )
@@ -0,0 +1,153 @@
+"""
+Quote streaming endpoints.
+
+Clients (web client, mobile app, Spring Boot server) subscribe to a set of
+tickers and receive price changes as they happen instead of polling.
+Both WebSocket and Server-Sent Events (SSE) transports are offered.
+"""
+
+import asyncio
+from collections.abc import AsyncIterator
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError as PydanticValidationError
+
+from app.api.dependencies import get_app_settings, get_quote_stream_hub
+from app.config.settings import Settings
+from app.core.errors import AIEngineException, ValidationError
+from app.schemas.stream import QuoteUpdateMessage, StreamCommand, StreamStatusMessage
+from app.services.quote_stream import QuoteStreamHub, Subscription
+
+router = APIRouter(prefix="/stream", tags=["stream"])
+
+StreamStatus = Literal["subscribed", "unsubscribed", "error"]
+
+# Status message sent after a successful command
+_COMMAND_STATUS: dict[str, StreamStatus] = {
+    "subscribe": "subscribed",
+    "unsubscribe": "unsubscribed",
+}
+
+
+@router.websocket("/quotes")
+async def stream_quotes_websocket(
+    websocket: WebSocket,
+    hub: QuoteStreamHub = Depends(get_quote_stream_hub)
+) -> None:
+    """
+    Stream quote changes over a WebSocket.
+
+    The client sends StreamCommand messages to change its subscription and
+    receives QuoteUpdateMessage messages whenever a subscribed price changes.
+    A client that reads slowly receives only the latest quote per ticker.
+
+    Example Messages:
+        client -> {"action": "subscribe", "tickers": ["AAPL", "005930.KS"]}
+        server -> {"type": "subscribed", "tickers": ["005930.KS", "AAPL"], "message": null}
+        server -> {"type": "quotes", "data": [{"ticker": "AAPL", "current_price": 182.52, ...}]}
+    """
+    await websocket.accept()
+    subscription = Subscription()
+    sender = asyncio.create_task(_send_updates(websocket, subscription))
+
+    try:
+        while True:
+            raw = await websocket.receive_text()
+            try:
+                command = StreamCommand.model_validate_json(raw)
+                if command.action == "subscribe":
+                    hub.subscribe(subscription, command.tickers)
+                else:
+                    hub.unsubscribe(subscription, command.tickers)
+            except PydanticValidationError as e:
+                await _send_status(websocket, "error", subscription, message=f"Invalid command: {e.errors()[0]['msg']}")
+                continue
+            except AIEngineException as e:
+                await _send_status(websocket, "error", subscription, message=e.message)
+                continue
+
+            await _send_status(websocket, _COMMAND_STATUS[command.action], subscription)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        sender.cancel()
+        hub.unsubscribe(subscription)
+
+
+@router.get("/quotes/sse")
+async def stream_quotes_sse(
+    request: Request,
+    tickers: str = Query(..., description="Comma-separated ticker symbols (e.g., AAPL,005930.KS)"),
+    hub: QuoteStreamHub = Depends(get_quote_stream_hub),
+    settings: Settings = Depends(get_app_settings)
+) -> StreamingResponse:
+    """
+    Stream quote changes as Server-Sent Events.
+
+    Each event is named `quotes` and carries a QuoteUpdateMessage as data.
+    A comment line is sent every STREAM_HEARTBEAT_INTERVAL seconds without
+    changes to keep proxies from closing the connection.
+
+    Example Request:
+        GET /api/v1/stream/quotes/sse?tickers=AAPL,005930.KS
+
+    Example Event:
+        event: quotes
+        data: {"type":"quotes","data":[{"ticker":"AAPL","current_price":182.52,...}]}
+    """
+    symbols = [ticker.strip() for ticker in tickers.split(",") if ticker.strip()]
+    if not symbols or any(len(symbol) > 10 for symbol in symbols):
+        raise ValidationError(
+            message="tickers must be a comma-separated list of 1-10 character symbols",
+            details={"tickers": tickers}
+        )
+
+    subscription = Subscription()
+    hub.subscribe(subscription, symbols)
+
+    return StreamingResponse(
+        sse_events(request, hub, subscription, settings.stream_heartbeat_interval),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+async def sse_events(
+    request: Request,
+    hub: QuoteStreamHub,
+    subscription: Subscription,
+    heartbeat_interval: float
+) -> AsyncIterator[str]:
+    """
+    Yield SSE frames for a subscription until the client disconnects.
+    """
+    try:
+        while True:
+            try:
+                batch = await asyncio.wait_for(subscription.next_batch(), timeout=heartbeat_interval)
+            except TimeoutError:
+                if await request.is_disconnected():
+                    break
+                yield ": keep-alive\n\n"
+                continue
+            yield f"event: quotes\ndata: {QuoteUpdateMessage(data=batch).model_dump_json()}\n\n"
+    finally:
+        hub.unsubscribe(subscription)
+
+
+async def _send_updates(websocket: WebSocket, subscription: Subscription) -> None:
+    while True:
+        batch = await subscription.next_batch()
+        await websocket.send_text(QuoteUpdateMessage(data=batch).model_dump_json())
+
+
+async def _send_status(
+    websocket: WebSocket,
+    status: StreamStatus,
+    subscription: Subscription,
+    message: str | None = None
+) -> None:
+    status_message = StreamStatusMessage(type=status, tickers=sorted(subscription.tickers), message=message)
+    await websocket.send_text(status_message.model_dump_json())
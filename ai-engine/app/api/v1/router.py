@@ -7,7 +7,19 @@ When adding new endpoints, import and include the router here.
 
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import health, stocks
+from app.api.v1.endpoints import (
+    alerts,
+    analysis,
+    backtest,
+    fx,
+    health,
+    indicators,
+    portfolio,
+    predictions,
+    retrieval,
+    stocks,
+    streams,
+)
 
 # Create main API v1 router
 api_router = APIRouter()
@@ -15,7 +27,12 @@ api_router = APIRouter()
 # Include all endpoint routers
 api_router.include_router(health.router)
 api_router.include_router(stocks.router)
-
-# Future endpoints can be added here:
-# from app.api.v1.endpoints import predictions
-# api_router.include_router(predictions.router)
+api_router.include_router(indicators.router)
+api_router.include_router(portfolio.router)
+api_router.include_router(backtest.router)
+api_router.include_router(alerts.router)
+api_router.include_router(fx.router)
+api_router.include_router(streams.router)
+api_router.include_router(predictions.router)
+api_router.include_router(analysis.router)
+api_router.include_router(retrieval.router)
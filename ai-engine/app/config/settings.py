@@ -5,6 +5,7 @@ This module provides type-safe configuration management with environment variabl
 No database connection settings - this is a stateless API service.
 """
 
+from datetime import date
 from functools import lru_cache
 from typing import Literal
 
@@ -29,12 +30,194 @@ class Settings(BaseSettings):
     api_v1_prefix: str = "/api/v1"
     allowed_origins: list[str] = ["http://localhost:8080", "http://localhost:3000"]
 
+    # Server Settings (python -m app; SERVER_WORKERS=0 starts one worker per available CPU,
+    # SERVER_GRACEFUL_TIMEOUT is the seconds in-flight requests get to finish on shutdown)
+    server_host: str = "0.0.0.0"
+    server_port: int = 8000
+    server_workers: int = 0
+    server_loop: Literal["auto", "asyncio", "uvloop"] = "auto"
+    server_http: Literal["auto", "h11", "httptools"] = "auto"
+    server_graceful_timeout: int = 30
+
     # External API Keys (NO DATABASE CREDENTIALS!)
     openai_api_key: str | None = None
     langchain_api_key: str | None = None
 
     # Logging Configuration
     log_level: str = "INFO"
+    log_format: Literal["json", "text"] = "json"
+    log_queue_size: int = 10000
+    # Per-logger sampling ratio (0-1) and max records/second for INFO and below,
+    # e.g. LOG_SAMPLE_RATES='{"api": 0.1}' LOG_RATE_LIMITS='{"app.services.stock_service": 50}'
+    log_sample_rates: dict[str, float] = {}
+    log_rate_limits: dict[str, float] = {}
+    request_id_header: str = "X-Request-ID"
+
+    # Metrics Settings
+    metrics_enabled: bool = True
+
+    # Market Data Provider Settings
+    market_data_provider: Literal["yahoo", "local"] = "yahoo"
+    local_provider_data_path: str | None = None
+    local_provider_latency_ms: float = 0.0
+
+    # Stock Data Settings
+    stock_batch_max_tickers: int = 200
+    stock_batch_max_concurrency: int = 10
+
+    # Market Calendar Settings (market hours, holidays and half-days per exchange)
+    market_calendar_enabled: bool = True
+    # Closures beyond the built-in rules, e.g. MARKET_EXTRA_HOLIDAYS='{"KRX": ["2027-02-08"]}'
+    market_extra_holidays: dict[str, list[date]] = {}
+
+    # Quote Cache Settings (TTL in seconds, by market status)
+    quote_cache_max_size: int = 2048
+    quote_cache_ttl_open: float = 5.0
+    quote_cache_ttl_closed: float = 300.0
+
+    # Quote Cache Stale-While-Revalidate (seconds past the TTL an expired quote may
+    # still be served, marked stale, while it is refreshed in the background; 0 disables)
+    quote_cache_stale_ttl: float = 0.0
+
+    # Quote Prefetch Settings (keeps the watchlist and most requested tickers fresh;
+    # at most PREFETCH_BUDGET_PER_MINUTE tickers are refreshed upstream per minute)
+    prefetch_enabled: bool = True
+    prefetch_watchlist: list[str] = []
+    prefetch_hot_set_size: int = 200
+    prefetch_batch_size: int = 50
+    prefetch_budget_per_minute: int = 600
+    prefetch_interval: float = 5.0
+    prefetch_jitter: float = 0.2
+    prefetch_demand_half_life: float = 300.0
+
+    # Shared Cache Settings (optional Redis-protocol tier behind every worker's
+    # local quote cache and bar store; lock TTL/wait and timeout in seconds)
+    shared_cache_enabled: bool = False
+    shared_cache_url: str = "redis://localhost:6379/0"
+    shared_cache_namespace: str = "calix"
+    shared_cache_timeout: float = 0.5
+    shared_cache_lock_ttl: float = 10.0
+    shared_cache_lock_wait: float = 2.0
+    shared_cache_bars_ttl: float = 86400.0
+
+    # Provider Resilience Settings (circuit breaker and hedged quote requests)
+    circuit_breaker_enabled: bool = True
+    circuit_breaker_failure_rate: float = 0.5
+    circuit_breaker_min_calls: int = 20
+    circuit_breaker_window: float = 60.0
+    circuit_breaker_open_seconds: float = 30.0
+    provider_hedge_enabled: bool = False
+    provider_hedge_percentile: float = 95.0
+    provider_hedge_min_samples: int = 20
+
+    # FX Rate Settings (cross rates derived from <FX_PIVOT_CURRENCY><CCY>=X quotes)
+    fx_currencies: list[str] = ["USD", "KRW", "JPY", "EUR", "GBP", "CNY", "HKD"]
+    fx_pivot_currency: str = "USD"
+    fx_refresh_interval: float = 60.0
+    fx_refresh_enabled: bool = True
+
+    # Quote Streaming Settings
+    stream_poll_interval: float = 2.0
+    stream_max_tickers: int = 50
+    stream_heartbeat_interval: float = 15.0
+
+    # Historical Bar Store Settings (bars per chunk of streamed columnar responses)
+    bar_store_path: str = "data/bars"
+    history_default_lookback_days: int = 365
+    history_stream_chunk_size: int = 10_000
+
+    # Technical Indicator Settings
+    indicator_max_tickers: int = 50
+    indicator_max_concurrency: int = 8
+
+    # Portfolio Risk Settings
+    portfolio_max_positions: int = 5000
+    portfolio_max_concurrency: int = 16
+
+    # Backtest Settings (parameter grids are simulated in chunks of at most BACKTEST_CHUNK_ELEMENTS
+    # weights (combinations x bars x tickers) on BACKTEST_PROCESSES worker processes per server worker;
+    # 0 = the server worker's share of the CPUs, 1 = on a thread in the server process. At most
+    # BACKTEST_MAX_PENDING grids per server worker run on the processes at once, more are rejected)
+    backtest_max_tickers: int = 100
+    backtest_max_combinations: int = 1000
+    backtest_default_lookback_days: int = 1825
+    backtest_max_concurrency: int = 8
+    backtest_processes: int = 0
+    backtest_chunk_elements: int = 4_000_000
+    backtest_max_pending: int = 2
+
+    # Price Alert Settings (rules are stored in ALERT_STORE_PATH and shared by the workers of a host;
+    # one worker evaluates them every ALERT_POLL_INTERVAL seconds and sends fired events to
+    # ALERT_WEBHOOK_URL in batches of up to ALERT_WEBHOOK_BATCH_SIZE, signed with ALERT_WEBHOOK_SECRET)
+    alert_enabled: bool = False
+    alert_store_path: str = "data/alerts"
+    alert_poll_interval: float = 5.0
+    alert_indicator_refresh_interval: float = 300.0
+    alert_max_rules: int = 100_000
+    alert_max_rules_per_request: int = 1000
+    alert_max_concurrency: int = 8
+    alert_webhook_url: str | None = None
+    alert_webhook_secret: str | None = None
+    alert_webhook_batch_size: int = 100
+    alert_webhook_flush_interval: float = 1.0
+    alert_webhook_queue_size: int = 10_000
+    alert_webhook_max_retries: int = 3
+
+    # Model Inference Settings (artifacts in INFERENCE_MODEL_PATH are loaded and warmed up at
+    # startup; concurrent requests share one forward pass of up to INFERENCE_BATCH_MAX_SIZE rows,
+    # waiting at most INFERENCE_BATCH_MAX_WAIT_MS for more requests)
+    inference_model_path: str = "data/models"
+    inference_batch_max_size: int = 64
+    inference_batch_max_wait_ms: float = 2.0
+    inference_max_instances: int = 1000
+    inference_threads: int = 2
+
+    # LLM Commentary Settings (LLM_BASE_URL points the OpenAI client at any compatible server;
+    # answers are cached per inputs and quote-price bucket, near-duplicate questions included,
+    # and every caller gets a concurrency limit and a token budget per window)
+    llm_base_url: str | None = None
+    llm_model: str = "gpt-4o-mini"
+    llm_max_tokens: int = 400
+    llm_temperature: float = 0.3
+    commentary_cache_size: int = 1024
+    commentary_cache_ttl: float = 900.0
+    commentary_price_bucket_pct: float = 1.0
+    commentary_similarity_threshold: float = 0.9
+    commentary_max_tickers: int = 20
+    commentary_caller_header: str = "X-Caller-ID"
+    commentary_max_concurrency: int = 2
+    commentary_token_budget: int = 20_000
+    commentary_budget_window: float = 3600.0
+
+    # Document Retrieval Settings (chunked news/filing text embedded into a memory-mapped
+    # IVF index in RETRIEVAL_INDEX_PATH; RETRIEVAL_NPROBE of RETRIEVAL_NLIST lists are scored
+    # per query, and ticker filters matching at most RETRIEVAL_EXACT_THRESHOLD chunks are exact)
+    retrieval_index_path: str = "data/retrieval"
+    retrieval_embedder: Literal["hashing", "sentence-transformers"] = "hashing"
+    retrieval_embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2"
+    retrieval_embedding_dims: int = 256
+    retrieval_chunk_size: int = 800
+    retrieval_chunk_overlap: int = 100
+    retrieval_nlist: int = 1024
+    retrieval_nprobe: int = 16
+    retrieval_exact_threshold: int = 20_000
+    retrieval_max_documents: int = 100
+    retrieval_max_results: int = 50
+    retrieval_threads: int = 2
+
+    # Blocking Call Executor Settings
+    executor_max_workers: int = 8
+    executor_queue_depth: int = 32
+    executor_call_timeout: float = 10.0
+
+    # Outbound HTTP Client Settings (one pool shared by all upstream HTTP calls)
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_max_connections_per_host: int = 20
+    http_keepalive_expiry: float = 30.0
+    http_connect_timeout: float = 5.0
+    http_timeout: float = 30.0
+    http2_enabled: bool = True
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -0,0 +1,164 @@
+"""
+Per-caller concurrency and usage budgets.
+
+Expensive upstream work (LLM calls) is metered per caller: each caller may
+run a limited number of calls at once and spend a limited number of units
+(tokens) per sliding window. A call reserves its worst-case cost up front
+and settles the actual cost when it ends, so concurrent calls cannot jointly
+overrun the budget.
+"""
+
+import math
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from app.core.errors import RateLimitError
+
+
+@dataclass
+class _CallerUsage:
+    active: int = 0
+    reserved: int = 0
+    spent: deque[tuple[float, int]] = field(default_factory=deque)
+    spent_total: int = 0
+
+
+class BudgetLease:
+    """
+    One admitted call: holds a concurrency slot and a reservation until released.
+    """
+
+    def __init__(self, budgets: "CallerBudgets", caller: str, reserved: int):
+        self.budgets = budgets
+        self.caller = caller
+        self.reserved = reserved
+        self.spent = 0
+        self._released = False
+
+    def settle(self, spent: int) -> None:
+        """
+        Record the actual cost of the call (charged on release).
+
+        Args:
+            spent: Units actually consumed
+        """
+        self.spent = spent
+
+    def release(self) -> None:
+        """
+        Free the slot and charge the settled cost (idempotent).
+        """
+        if not self._released:
+            self._released = True
+            self.budgets._release(self)
+
+
+class CallerBudgets:
+    """
+    Concurrency limits and sliding-window usage budgets keyed by caller.
+
+    Example:
+        >>> budgets = CallerBudgets(max_concurrency=2, budget=20_000, window=3600.0)
+        >>> lease = budgets.acquire("user-42", reserve=500)
+        >>> try:
+        ...     lease.settle(tokens_used)
+        ... finally:
+        ...     lease.release()
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        budget: int,
+        window: float,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize the budgets.
+
+        Args:
+            max_concurrency: Calls a caller may run at once
+            budget: Units a caller may spend per window
+            window: Sliding window length in seconds
+            clock: Monotonic time source (injectable for tests)
+        """
+        self.max_concurrency = max_concurrency
+        self.budget = budget
+        self.window = window
+        self._clock = clock
+        self._callers: dict[str, _CallerUsage] = {}
+
+    def acquire(self, caller: str, reserve: int) -> BudgetLease:
+        """
+        Admit a call of a caller, reserving its worst-case cost.
+
+        Args:
+            caller: Caller identity
+            reserve: Units to reserve until the call settles
+
+        Returns:
+            BudgetLease: Lease to settle and release when the call ends
+
+        Raises:
+            RateLimitError: If the caller is at its concurrency limit or the reservation
+                does not fit into the remaining budget of the window
+        """
+        usage = self._callers.setdefault(caller, _CallerUsage())
+        now = self._clock()
+        self._expire(usage, now)
+
+        if usage.active >= self.max_concurrency:
+            raise RateLimitError(
+                message=f"Too many concurrent requests (max {self.max_concurrency})",
+                details={"cause": "concurrency", "max": self.max_concurrency, "retry_after": 1}
+            )
+        used = usage.spent_total + usage.reserved
+        if used + reserve > self.budget:
+            raise RateLimitError(
+                message=f"Token budget exhausted ({used} of {self.budget} per {self.window:g}s)",
+                details={
+                    "cause": "budget",
+                    "used": used,
+                    "budget": self.budget,
+                    "retry_after": self._retry_after(usage, now, used + reserve - self.budget)
+                }
+            )
+
+        usage.active += 1
+        usage.reserved += reserve
+        return BudgetLease(self, caller, reserve)
+
+    def used(self, caller: str) -> int:
+        """
+        Units spent by a caller in the current window (reservations excluded).
+        """
+        usage = self._callers.get(caller)
+        if usage is None:
+            return 0
+        self._expire(usage, self._clock())
+        return usage.spent_total
+
+    def _release(self, lease: BudgetLease) -> None:
+        usage = self._callers[lease.caller]
+        usage.active -= 1
+        usage.reserved -= lease.reserved
+        if lease.spent:
+            usage.spent.append((self._clock(), lease.spent))
+            usage.spent_total += lease.spent
+        if not usage.active and not usage.spent:
+            del self._callers[lease.caller]
+
+    def _expire(self, usage: _CallerUsage, now: float) -> None:
+        while usage.spent and usage.spent[0][0] <= now - self.window:
+            usage.spent_total -= usage.spent.popleft()[1]
+
+    def _retry_after(self, usage: _CallerUsage, now: float, excess: int) -> int:
+        # Seconds until enough spending leaves the window (a window if reservations alone block)
+        freed = 0
+        for spent_at, amount in usage.spent:
+            freed += amount
+            if freed >= excess:
+                return max(1, math.ceil(spent_at + self.window - now))
+        return max(1, math.ceil(self.window))
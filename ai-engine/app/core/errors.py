@@ -14,8 +14,12 @@ class AIEngineException(Exception):
 
     All custom exceptions should inherit from this class.
     Provides a consistent interface for error handling.
+    Subclasses can override `status_code` to change the HTTP status
+    returned by the global exception handler.
     """
 
+    status_code: int = 400
+
     def __init__(self, message: str, details: dict[str, Any] | None = None):
         """
         Initialize the exception.
@@ -46,7 +50,7 @@ class ModelInferenceError(AIEngineException):
     Examples: Model loading failures, prediction errors
     """
 
-    pass
+    status_code = 503
 
 
 class ValidationError(AIEngineException):
@@ -58,3 +62,53 @@ class ValidationError(AIEngineException):
     """
 
     pass
+
+
+class ServiceOverloadedError(AIEngineException):
+    """
+    Exception raised when the service rejects work because it is overloaded.
+
+    Examples: Blocking-call executor queue is full
+    """
+
+    status_code = 503
+
+
+class WorkerCrashedError(AIEngineException):
+    """
+    Exception raised when a worker process dies while running a computation.
+
+    Examples: Backtest worker process killed by the OOM killer
+    """
+
+    status_code = 503
+
+
+class RateLimitError(AIEngineException):
+    """
+    Exception raised when a caller exceeds its concurrency or usage budget.
+
+    Examples: Too many concurrent LLM requests, token budget of the window spent
+    """
+
+    status_code = 429
+
+
+class CircuitOpenError(ExternalAPIError):
+    """
+    Exception raised when a call is rejected because its circuit breaker is open.
+
+    Examples: Market data provider failing too often, calls fail fast until it recovers
+    """
+
+    status_code = 503
+
+
+class NotAcceptableError(AIEngineException):
+    """
+    Exception raised when no representation matches the request's Accept header.
+
+    Examples: Only text/csv accepted, Arrow requested without pyarrow installed
+    """
+
+    status_code = 406
@@ -0,0 +1,160 @@
+"""
+Bounded execution layer for blocking calls.
+
+Synchronous libraries such as yfinance must never run directly on the event loop,
+otherwise one slow upstream response stalls every request served by the worker.
+This module runs such calls on a dedicated thread pool with a per-call timeout
+and a queue-depth limit that rejects new work while the pool is overloaded.
+"""
+
+import asyncio
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import Any, TypeVar
+
+from app.config.settings import get_settings
+from app.core.errors import ExternalAPIError, ServiceOverloadedError
+from app.core.logging import get_logger
+from app.core.metrics import EXECUTOR_PENDING, EXECUTOR_WAIT
+
+logger = get_logger(__name__)
+
+R = TypeVar("R")
+
+
+class BlockingExecutor:
+    """
+    Thread pool wrapper for blocking calls with timeout and admission control.
+
+    At most `max_workers` calls run at once and at most `queue_depth` more wait
+    for a free thread. Calls beyond that are rejected immediately with
+    ServiceOverloadedError instead of piling up behind a slow upstream.
+
+    Note that a call that times out keeps its thread until the blocking function
+    returns, so it keeps counting against the queue-depth limit until then.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        queue_depth: int,
+        timeout: float | None = None,
+        name: str = "blocking"
+    ):
+        """
+        Initialize the executor.
+
+        Args:
+            max_workers: Number of worker threads
+            queue_depth: Number of calls allowed to wait for a free thread
+            timeout: Default per-call timeout in seconds (None disables it)
+            name: Name used for worker threads and log messages
+        """
+        self.name = name
+        self.max_workers = max_workers
+        self.queue_depth = queue_depth
+        self.timeout = timeout
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._wait_metric = EXECUTOR_WAIT.labels(executor=name)
+        self._pending_metric = EXECUTOR_PENDING.labels(executor=name)
+
+    @property
+    def pending(self) -> int:
+        """
+        Number of submitted calls that have not finished yet (running or queued).
+        """
+        return self._pending
+
+    async def run(
+        self,
+        func: Callable[..., R],
+        *args: Any,
+        timeout: float | None = None,
+        **kwargs: Any
+    ) -> R:
+        """
+        Run a blocking function on the pool without blocking the event loop.
+
+        Args:
+            func: Blocking callable
+            *args: Positional arguments for func
+            timeout: Per-call timeout in seconds (defaults to the executor timeout)
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            The return value of func
+
+        Raises:
+            ServiceOverloadedError: If running and queued calls already fill the pool
+            ExternalAPIError: If the call does not finish within the timeout
+        """
+        with self._lock:
+            if self._pending >= self.max_workers + self.queue_depth:
+                logger.warning("Executor '%s' overloaded, rejecting call to %s", self.name, _name_of(func))
+                raise ServiceOverloadedError(
+                    message="Service is overloaded, please retry later",
+                    details={"executor": self.name, "pending": self._pending}
+                )
+            self._pending += 1
+            self._pending_metric.set(self._pending)
+
+        try:
+            future = self._pool.submit(self._timed, partial(func, *args, **kwargs), time.perf_counter())
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(self._on_done)
+
+        call_timeout = self.timeout if timeout is None else timeout
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout=call_timeout)
+        except TimeoutError:
+            logger.error("Call to %s timed out after %ss", _name_of(func), call_timeout)
+            raise ExternalAPIError(
+                message="External API call timed out",
+                details={"error": "timeout", "cause": "timeout", "timeout": call_timeout, "call": _name_of(func)}
+            ) from None
+
+    def shutdown(self) -> None:
+        """
+        Stop accepting work and release worker threads without waiting for running calls.
+        """
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _timed(self, call: Callable[[], R], submitted: float) -> R:
+        self._wait_metric.observe(time.perf_counter() - submitted)
+        return call()
+
+    def _on_done(self, future: Future[Any]) -> None:
+        self._release()
+
+    def _release(self) -> None:
+        with self._lock:
+            self._pending -= 1
+            self._pending_metric.set(self._pending)
+
+
+def _name_of(func: Callable[..., Any]) -> str:
+    return getattr(func, "__qualname__", repr(func))
+
+
+@lru_cache
+def get_blocking_executor() -> BlockingExecutor:
+    """
+    Get the application-wide executor for blocking upstream calls.
+
+    Returns:
+        BlockingExecutor: Executor configured from Settings
+    """
+    settings = get_settings()
+    return BlockingExecutor(
+        max_workers=settings.executor_max_workers,
+        queue_depth=settings.executor_queue_depth,
+        timeout=settings.executor_call_timeout,
+        name="provider"
+    )
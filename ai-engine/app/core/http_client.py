@@ -0,0 +1,218 @@
+"""
+Shared outbound HTTP client for AI Engine.
+
+One httpx.AsyncClient is created per process in the application lifespan
+and shared by every upstream HTTP caller (OpenAI/LangChain, HTTP market data
+providers), so connections stay alive across requests and the TLS handshake
+is paid once per connection rather than once per request.
+
+Note: yfinance does not use httpx; it already shares one process-wide
+curl_cffi session across all yf.Ticker objects.
+"""
+
+import asyncio
+import importlib.util
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from typing import TYPE_CHECKING, Any, cast
+
+import httpx
+
+from app.config.settings import Settings
+from app.core.errors import ExternalAPIError
+from app.core.metrics import (
+    HTTP_CLIENT_HOST_WAIT,
+    HTTP_CLIENT_IN_FLIGHT,
+    HTTP_CLIENT_POOL_CONNECTIONS,
+    multiprocess_enabled,
+)
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+
+class HostLimitedTransport(httpx.AsyncBaseTransport):
+    """
+    Transport wrapper that caps concurrent requests per host.
+
+    httpx only limits connections for the whole pool, so one slow upstream
+    could take every connection. Each host gets its own semaphore; a slot is
+    held until the response body is closed, because the connection stays
+    busy until then.
+
+    Args:
+        transport: Underlying transport (owns the connection pool)
+        max_per_host: Maximum concurrent requests per host
+
+    Example:
+        >>> transport = HostLimitedTransport(httpx.AsyncHTTPTransport(http2=True), max_per_host=20)
+        >>> client = httpx.AsyncClient(transport=transport)
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, max_per_host: int):
+        self.transport = transport
+        self.max_per_host = max_per_host
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        semaphore = self._semaphores.get(host)
+        if semaphore is None:
+            semaphore = self._semaphores.setdefault(host, asyncio.Semaphore(self.max_per_host))
+
+        started = time.perf_counter()
+        await semaphore.acquire()
+        HTTP_CLIENT_HOST_WAIT.labels(host=host).observe(time.perf_counter() - started)
+        HTTP_CLIENT_IN_FLIGHT.labels(host=host).inc()
+
+        released = False
+
+        def release() -> None:
+            nonlocal released
+            if not released:
+                released = True
+                HTTP_CLIENT_IN_FLIGHT.labels(host=host).dec()
+                semaphore.release()
+
+        try:
+            response = await self.transport.handle_async_request(request)
+        except BaseException:
+            release()
+            raise
+
+        if isinstance(response.stream, httpx.AsyncByteStream) and not isinstance(response.stream, httpx.ByteStream):
+            response.stream = _ReleasingStream(response.stream, release)
+        else:
+            # Body already in memory (nothing left to read from the connection)
+            release()
+        return response
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """
+    Response body stream that frees the per-host slot when closed.
+    """
+
+    def __init__(self, stream: httpx.AsyncByteStream, on_close: Callable[[], None]):
+        self._stream = stream
+        self._on_close = on_close
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            self._on_close()
+
+
+def http2_available() -> bool:
+    """
+    Whether HTTP/2 support (the optional h2 package) is installed.
+    """
+    return importlib.util.find_spec("h2") is not None
+
+
+def create_http_client(settings: Settings) -> httpx.AsyncClient:
+    """
+    Create the shared outbound HTTP client.
+
+    HTTP/2 is negotiated via ALPN when enabled in settings and the h2 package
+    is installed; servers without HTTP/2 transparently get HTTP/1.1 over the
+    same keep-alive pool. Pool usage is exported as Prometheus gauges.
+
+    Args:
+        settings: Application settings
+
+    Returns:
+        httpx.AsyncClient: Client to be closed with `await client.aclose()`
+
+    Example:
+        >>> client = create_http_client(get_settings())
+        >>> response = await client.get("https://api.openai.com/v1/models")
+    """
+    pool = httpx.AsyncHTTPTransport(
+        http2=settings.http2_enabled and http2_available(),
+        limits=httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+            keepalive_expiry=settings.http_keepalive_expiry,
+        ),
+    )
+    return httpx.AsyncClient(
+        transport=HostLimitedTransport(pool, settings.http_max_connections_per_host),
+        event_hooks={"response": _export_pool_usage(pool)},
+        timeout=httpx.Timeout(settings.http_timeout, connect=settings.http_connect_timeout),
+        headers={"User-Agent": f"{settings.app_name.replace(' ', '-')}/{settings.app_version}"},
+    )
+
+
+def create_openai_client(settings: Settings, http_client: httpx.AsyncClient) -> "AsyncOpenAI":
+    """
+    Create an OpenAI client that sends requests over the shared HTTP pool.
+
+    The OpenAI SDK is imported here rather than at module level so app
+    startup does not pay for it unless an OpenAI client is actually used.
+    LangChain chat models accept the same client via `http_async_client=`.
+
+    Args:
+        settings: Application settings (provide the API key and optional LLM_BASE_URL)
+        http_client: Shared outbound HTTP client
+
+    Returns:
+        AsyncOpenAI: OpenAI client (closing it is not required; the pool is closed in the lifespan)
+
+    Raises:
+        ExternalAPIError: If no OpenAI API key is configured
+    """
+    if not settings.openai_api_key:
+        raise ExternalAPIError(
+            message="OpenAI API key is not configured",
+            details={"cause": "not_configured"}
+        )
+    from openai import AsyncOpenAI
+
+    # The SDK annotates http_client with its own vendored httpx fork; an
+    # httpx.AsyncClient is accepted at runtime (duck-typed transport calls)
+    return AsyncOpenAI(
+        api_key=settings.openai_api_key,
+        base_url=settings.llm_base_url,
+        http_client=cast(Any, http_client)
+    )
+
+
+def _export_pool_usage(transport: httpx.AsyncHTTPTransport) -> list[Callable[[httpx.Response], Awaitable[None]]]:
+    """
+    Publish active/idle connection counts of the transport's pool on scrape.
+
+    httpx does not expose pool statistics publicly, so this reads the
+    underlying httpcore pool and reports zero if its layout changes.
+    Scrape-time callbacks only see the scraped process, so in multiprocess
+    metrics mode the counts are published whenever a response arrives instead.
+
+    Returns:
+        list: Response event hooks for the client
+    """
+
+    def count(idle: bool) -> float:
+        connections = getattr(getattr(transport, "_pool", None), "connections", [])
+        return float(sum(1 for c in connections if c.is_idle() == idle))
+
+    active, idle = HTTP_CLIENT_POOL_CONNECTIONS.labels(state="active"), HTTP_CLIENT_POOL_CONNECTIONS.labels(state="idle")
+    if not multiprocess_enabled():
+        active.set_function(lambda: count(idle=False))
+        idle.set_function(lambda: count(idle=True))
+        return []
+
+    async def publish(response: httpx.Response) -> None:
+        active.set(count(idle=False))
+        idle.set(count(idle=True))
+
+    active.set(0.0)
+    idle.set(0.0)
+    return [publish]
@@ -2,12 +2,194 @@
 Logging configuration for AI Engine.
 
 This module provides structured logging setup and logger factory functions.
+
+Log records are handed to a bounded queue on the calling thread and written
+as JSON lines by a background listener thread, so request handlers never
+block on stdout. Each record carries the request correlation ID of the
+request that emitted it.
 """
 
+import atexit
+import json
 import logging
+import os
+import queue
+import random
 import sys
+import threading
+import time
+from collections.abc import Callable, Mapping
+from contextvars import ContextVar
+from datetime import UTC, datetime
+from logging.handlers import QueueHandler, QueueListener
 
 from app.config.settings import get_settings
+from app.core.metrics import LOG_RECORDS_DROPPED
+
+# Correlation ID of the request being served (set by RequestIdMiddleware)
+request_id_var: ContextVar[str | None] = ContextVar("request_id", default=None)
+
+_listener: QueueListener | None = None
+# Whether the pipeline was running when the process forked (see _before_fork)
+_restart_after_fork = False
+
+
+def get_request_id() -> str | None:
+    """
+    Correlation ID of the current request, or None outside a request.
+    """
+    return request_id_var.get()
+
+
+class RequestIdFilter(logging.Filter):
+    """
+    Attach the current request ID to every record.
+
+    Must run on the emitting thread (i.e., on the QueueHandler), because the
+    listener thread does not see the request's context variables.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Per-logger sampling and rate limiting for INFO and lower records.
+
+    WARNING and above always pass. For a logger listed in sample_rates only
+    that fraction of records is kept; for a logger listed in rate_limits at
+    most that many records per second are kept (token bucket with a burst of
+    one second but at least one record, so rates below 1/s still let records
+    through). Logger names match by prefix, so "app.services" covers all
+    service modules; the longest matching prefix wins.
+
+    Args:
+        sample_rates: Logger name prefix -> fraction of records to keep (0-1)
+        rate_limits: Logger name prefix -> max records per second
+        clock: Monotonic time source (injectable for tests)
+        rng: Random source returning floats in [0, 1) (injectable for tests)
+
+    Example:
+        >>> sampler = SamplingFilter(sample_rates={"api": 0.1}, rate_limits={"app.services": 100})
+        >>> handler.addFilter(sampler)
+    """
+
+    def __init__(
+        self,
+        sample_rates: Mapping[str, float] | None = None,
+        rate_limits: Mapping[str, float] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        rng: Callable[[], float] = random.random,
+    ):
+        super().__init__()
+        self.sample_rates = dict(sample_rates or {})
+        self.rate_limits = dict(rate_limits or {})
+        self._clock = clock
+        self._rng = rng
+        self._lock = threading.Lock()
+        # Rate-limited logger prefix -> (tokens, last refill time)
+        self._buckets: dict[str, tuple[float, float]] = {}
+        # Logger name -> (sampling prefix, rate limit prefix), resolved once per logger
+        self._rules: dict[str, tuple[str | None, str | None]] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+
+        rules = self._rules.get(record.name)
+        if rules is None:
+            rules = (
+                _longest_prefix(record.name, self.sample_rates),
+                _longest_prefix(record.name, self.rate_limits),
+            )
+            self._rules[record.name] = rules
+        sample_key, limit_key = rules
+
+        if sample_key is not None and self._rng() >= self.sample_rates[sample_key]:
+            LOG_RECORDS_DROPPED.labels(logger=sample_key, reason="sampled").inc()
+            return False
+
+        if limit_key is not None and not self._take_token(limit_key):
+            LOG_RECORDS_DROPPED.labels(logger=limit_key, reason="rate_limited").inc()
+            return False
+
+        return True
+
+    def _take_token(self, key: str) -> bool:
+        rate = self.rate_limits[key]
+        capacity = max(rate, 1.0)
+        now = self._clock()
+        with self._lock:
+            tokens, last = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - last) * rate)
+            if tokens < 1.0:
+                self._buckets[key] = (tokens, now)
+                return False
+            self._buckets[key] = (tokens - 1.0, now)
+            return True
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Format records as single-line JSON objects.
+
+    Example output:
+        {"timestamp": "2024-01-15T10:30:00.123Z", "level": "INFO", "logger": "api",
+         "message": "Received stock price request for ticker: AAPL", "request_id": "3f2c..."}
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: dict[str, object] = {
+            "timestamp": datetime.fromtimestamp(record.created, tz=UTC)
+            .isoformat(timespec="milliseconds")
+            .replace("+00:00", "Z"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id is not None:
+            entry["request_id"] = request_id
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    QueueHandler that never blocks the caller and defers formatting.
+
+    The caller only merges the message arguments (they may be mutable objects
+    that change later) and renders any traceback; timestamps and JSON encoding
+    happen on the listener thread. When the queue is full the record is
+    dropped and counted instead of stalling the request.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_RECORDS_DROPPED.labels(logger=record.name, reason="queue_full").inc()
+
+
+def _longest_prefix(name: str, rules: Mapping[str, float]) -> str | None:
+    best: str | None = None
+    for prefix in rules:
+        if (name == prefix or name.startswith(prefix + ".")) and (best is None or len(prefix) > len(best)):
+            best = prefix
+    return best
 
 
 def setup_logging() -> None:
@@ -17,15 +199,38 @@ def setup_logging() -> None:
     This function should be called once at application startup.
     It configures the root logger and sets appropriate log levels
     for external libraries.
+
+    The root logger gets a single non-blocking queue handler; a listener
+    thread drains the queue to stdout and is stopped (flushing pending
+    records) at interpreter exit. Calling it again replaces the pipeline.
     """
+    global _listener
+
     settings = get_settings()
 
+    shutdown_logging()
+
+    if settings.log_format == "json":
+        formatter: logging.Formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s")
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(formatter)
+
+    queue_handler = NonBlockingQueueHandler(queue.Queue(maxsize=settings.log_queue_size))
+    queue_handler.addFilter(SamplingFilter(settings.log_sample_rates, settings.log_rate_limits))
+    queue_handler.addFilter(RequestIdFilter())
+
     # Configure root logger
-    logging.basicConfig(
-        level=getattr(logging, settings.log_level.upper()),
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        handlers=[logging.StreamHandler(sys.stdout)],
-    )
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(getattr(logging, settings.log_level.upper()))
+
+    _listener = QueueListener(queue_handler.queue, stream_handler, respect_handler_level=True)
+    _listener.start()
 
     # Set external library log levels to reduce noise
     logging.getLogger("uvicorn").setLevel(logging.INFO)
@@ -34,6 +239,39 @@ def setup_logging() -> None:
     logging.getLogger("httpcore").setLevel(logging.WARNING)
 
 
+def shutdown_logging() -> None:
+    """
+    Stop the listener thread after writing all queued records.
+
+    Safe to call multiple times; registered to run at interpreter exit.
+    """
+    global _listener
+
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
+
+
+def _before_fork() -> None:
+    global _restart_after_fork
+
+    _restart_after_fork = _listener is not None
+    shutdown_logging()
+
+
+def _after_fork() -> None:
+    if _restart_after_fork:
+        setup_logging()
+
+
+# The listener thread does not survive a fork (e.g. the pre-fork server in
+# app.server): flush it before forking and start a new one in both processes
+os.register_at_fork(before=_before_fork, after_in_parent=_after_fork, after_in_child=_after_fork)
+
+
 def get_logger(name: str) -> logging.Logger:
     """
     Get a logger instance for a specific module.
@@ -47,6 +285,6 @@ def get_logger(name: str) -> logging.Logger:
     Example:
         >>> from app.core.logging import get_logger
         >>> logger = get_logger(__name__)
-        >>> logger.info("Processing request")
+        >>> logger.info("Processing request for %s", ticker)
     """
     return logging.getLogger(name)
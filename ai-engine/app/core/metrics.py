@@ -0,0 +1,348 @@
+"""
+Prometheus metrics for AI Engine.
+
+This module defines all application metrics in a dedicated registry and
+small helpers to record them. Metrics are exposed at GET /metrics.
+
+Under the pre-fork server (python -m app) every worker records into files in
+PROMETHEUS_MULTIPROC_DIR (prometheus_client multiprocess mode), and a scrape
+answered by any worker reports the metrics of all of them: counters and
+histograms are summed, gauges are summed over live workers (circuit states
+take the worst one).
+
+Recorded stages:
+    - HTTP request latency per route template
+    - Upstream provider latency per provider, operation and ticker market
+    - Time blocking calls wait in the executor queue before they start
+    - Response serialization (Pydantic validation + dump, or the fast envelope path) time per route
+    - ExternalAPIError occurrences by cause
+    - In-flight HTTP requests
+    - Log records dropped by sampling, rate limits or a full log queue
+    - Outbound HTTP connection pool usage and per-host slot waits
+    - Circuit breaker state and hedged upstream requests
+    - Model inference batch sizes and forward pass latency per model
+    - LLM commentary cache lookups, token usage and time to first token
+    - Price alert events by outcome (fired, delivered, failed, dropped)
+"""
+
+import os
+import time
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+from app.core.errors import AIEngineException, ExternalAPIError
+
+REGISTRY = CollectorRegistry(auto_describe=True)
+
+# Buckets from 1 ms to 30 s (upstream calls) and 10 µs to 1 s (in-process stages)
+_LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+_FAST_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.05, 0.1, 1.0)
+
+REQUEST_LATENCY = Histogram(
+    "calix_http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+    buckets=_LATENCY_BUCKETS,
+    registry=REGISTRY,
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "calix_http_requests_in_flight",
+    "HTTP requests currently being served",
+    multiprocess_mode="livesum",
+    registry=REGISTRY,
+)
+UPSTREAM_LATENCY = Histogram(
+    "calix_upstream_request_duration_seconds",
+    "Market data provider call latency",
+    ["provider", "operation", "market", "outcome"],
+    buckets=_LATENCY_BUCKETS,
+    registry=REGISTRY,
+)
+EXECUTOR_WAIT = Histogram(
+    "calix_executor_queue_wait_seconds",
+    "Time blocking calls wait for a free executor thread",
+    ["executor"],
+    buckets=_FAST_BUCKETS + (2.5, 5.0, 10.0),
+    registry=REGISTRY,
+)
+EXECUTOR_PENDING = Gauge(
+    "calix_executor_pending_calls",
+    "Blocking calls running or waiting in the executor",
+    ["executor"],
+    multiprocess_mode="livesum",
+    registry=REGISTRY,
+)
+SERIALIZATION_LATENCY = Histogram(
+    "calix_response_serialization_seconds",
+    "Response model validation and serialization time by route template",
+    ["route"],
+    buckets=_FAST_BUCKETS,
+    registry=REGISTRY,
+)
+EXTERNAL_API_ERRORS = Counter(
+    "calix_external_api_errors_total",
+    "ExternalAPIError occurrences by cause",
+    ["provider", "cause"],
+    registry=REGISTRY,
+)
+LOG_RECORDS_DROPPED = Counter(
+    "calix_log_records_dropped_total",
+    "Log records dropped before being written",
+    ["logger", "reason"],
+    registry=REGISTRY,
+)
+HTTP_CLIENT_IN_FLIGHT = Gauge(
+    "calix_http_client_requests_in_flight",
+    "Outbound HTTP requests holding a per-host slot",
+    ["host"],
+    multiprocess_mode="livesum",
+    registry=REGISTRY,
+)
+HTTP_CLIENT_HOST_WAIT = Histogram(
+    "calix_http_client_host_wait_seconds",
+    "Time outbound HTTP requests wait for a free per-host slot",
+    ["host"],
+    buckets=_FAST_BUCKETS + (2.5, 5.0, 10.0),
+    registry=REGISTRY,
+)
+HTTP_CLIENT_POOL_CONNECTIONS = Gauge(
+    "calix_http_client_pool_connections",
+    "Connections in the shared outbound HTTP pool by state",
+    ["state"],
+    multiprocess_mode="livesum",
+    registry=REGISTRY,
+)
+CIRCUIT_STATE = Gauge(
+    "calix_circuit_breaker_state",
+    "Circuit breaker state (0 closed, 1 half-open, 2 open)",
+    ["circuit"],
+    multiprocess_mode="livemax",
+    registry=REGISTRY,
+)
+HEDGED_REQUESTS = Counter(
+    "calix_hedged_requests_total",
+    "Hedged upstream requests by the attempt that answered first",
+    ["provider", "winner"],
+    registry=REGISTRY,
+)
+PREFETCHED_QUOTES = Counter(
+    "calix_prefetched_quotes_total",
+    "Quotes refreshed by the background prefetcher by outcome",
+    ["outcome"],
+    registry=REGISTRY,
+)
+MODEL_BATCH_SIZE = Histogram(
+    "calix_model_batch_size",
+    "Rows per micro-batched model forward pass",
+    ["model"],
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024),
+    registry=REGISTRY,
+)
+MODEL_INFERENCE_LATENCY = Histogram(
+    "calix_model_inference_seconds",
+    "Model forward pass latency per batch",
+    ["model"],
+    buckets=_FAST_BUCKETS + (2.5, 5.0),
+    registry=REGISTRY,
+)
+COMMENTARY_CACHE_LOOKUPS = Counter(
+    "calix_commentary_cache_lookups_total",
+    "LLM commentary cache lookups by result (hit, near_hit, miss)",
+    ["result"],
+    registry=REGISTRY,
+)
+LLM_TOKENS = Counter(
+    "calix_llm_tokens_total",
+    "Tokens consumed by LLM calls by kind (prompt, completion)",
+    ["model", "kind"],
+    registry=REGISTRY,
+)
+LLM_FIRST_TOKEN_LATENCY = Histogram(
+    "calix_llm_first_token_seconds",
+    "Time from sending an LLM request to its first streamed token",
+    ["model"],
+    buckets=_LATENCY_BUCKETS,
+    registry=REGISTRY,
+)
+
+ALERT_EVENTS = Counter(
+    "calix_alert_events_total",
+    "Price alert events by outcome",
+    ["outcome"],
+    registry=REGISTRY,
+)
+
+# ASGI scope of the HTTP request being served, used to label serialization time
+_current_scope: ContextVar[Mapping[str, Any] | None] = ContextVar("current_scope", default=None)
+
+
+# Yahoo Finance suffixes of exchanges reported under their own market label
+_EXCHANGE_SUFFIXES = frozenset({"T", "HK", "SS", "SZ", "TW", "L", "DE", "PA", "AS", "SW", "TO", "AX", "NS", "BO"})
+
+
+def market_of(ticker: str) -> str:
+    """
+    Market label of a ticker, derived from its exchange suffix.
+
+    Args:
+        ticker: Stock ticker symbol (e.g., "AAPL", "005930.KS", "KRW=X")
+
+    Returns:
+        str: "US" for suffix-less tickers, "KRX" for .KS/.KQ, "FX" for =X, the suffix
+            of other known exchanges (e.g., "T", "HK"), else "other"
+    """
+    symbol = ticker.upper()
+    if symbol.endswith("=X"):
+        return "FX"
+    if "." not in symbol:
+        return "US"
+    suffix = symbol.rsplit(".", 1)[1]
+    if suffix in ("KS", "KQ"):
+        return "KRX"
+    # Tickers come from clients, so unknown suffixes must not become new label values
+    return suffix if suffix in _EXCHANGE_SUFFIXES else "other"
+
+
+def error_cause(exc: AIEngineException) -> str:
+    """
+    Cause label of an error (details["cause"], or "unknown").
+    """
+    return str(exc.details.get("cause", "unknown"))
+
+
+@contextmanager
+def observe_upstream(provider: str, operation: str, market: str) -> Iterator[None]:
+    """
+    Record latency and errors of one upstream provider call.
+
+    Args:
+        provider: Provider name (e.g., "yahoo")
+        operation: Provider operation (quote, quotes, history)
+        market: Market label (see market_of)
+    """
+    started = time.perf_counter()
+    outcome = "ok"
+    try:
+        yield
+    except ExternalAPIError as e:
+        outcome = "error"
+        EXTERNAL_API_ERRORS.labels(provider=provider, cause=error_cause(e)).inc()
+        raise
+    except BaseException:
+        outcome = "error"
+        raise
+    finally:
+        UPSTREAM_LATENCY.labels(
+            provider=provider, operation=operation, market=market, outcome=outcome
+        ).observe(time.perf_counter() - started)
+
+
+def set_current_scope(scope: Mapping[str, Any] | None) -> Any:
+    """
+    Remember the ASGI scope of the request served by the current task.
+
+    Returns:
+        A token for reset_current_scope
+    """
+    return _current_scope.set(scope)
+
+
+def reset_current_scope(token: Any) -> None:
+    """
+    Restore the previously served ASGI scope.
+    """
+    _current_scope.reset(token)
+
+
+def route_of(scope: Mapping[str, Any] | None) -> str:
+    """
+    Route template of a request (e.g., "/api/v1/alerts/rules/{rule_id}"), or "unmatched".
+
+    The template is the matched route's own path. FastAPI versions that keep
+    included routers nested store only the path below the include prefix
+    there (e.g., "/health"), so the prefix is taken from the leading
+    segments of the request path that the route template does not cover.
+    Only literal prefix segments are reused; path parameter values never
+    end up in the label.
+    """
+    route = scope.get("route") if scope else None
+    template = getattr(route, "path", None)
+    if scope is None or not isinstance(template, str):
+        return "unmatched"
+
+    depth = template.count("/")
+    segments = str(scope.get("path", "")).split("/")
+    if ":path}" in template or len(segments) <= depth:
+        return template
+    prefix = "/".join(segments[:len(segments) - depth])
+    return prefix + template
+
+
+def observe_serialization(seconds: float) -> None:
+    """
+    Record the serialization time of the response to the request being served.
+
+    Args:
+        seconds: Time spent building and dumping the response body
+    """
+    SERIALIZATION_LATENCY.labels(route=route_of(_current_scope.get())).observe(seconds)
+
+
+def instrument_serialization() -> None:
+    """
+    Time FastAPI's response serialization step per route.
+
+    FastAPI validates and dumps the returned response model in
+    fastapi.routing.serialize_response; this wraps that function once. If a
+    future FastAPI version removes it, serialization is simply not recorded.
+    """
+    import fastapi.routing
+
+    original = getattr(fastapi.routing, "serialize_response", None)
+    if original is None or getattr(original, "_calix_instrumented", False):
+        return
+
+    async def timed_serialize_response(**kwargs: Any) -> Any:
+        started = time.perf_counter()
+        try:
+            return await original(**kwargs)
+        finally:
+            observe_serialization(time.perf_counter() - started)
+
+    timed_serialize_response._calix_instrumented = True  # type: ignore[attr-defined]
+    fastapi.routing.serialize_response = timed_serialize_response
+
+
+def multiprocess_enabled() -> bool:
+    """
+    Whether metrics are shared between processes (PROMETHEUS_MULTIPROC_DIR is set).
+    """
+    return bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """
+    Render all metrics in the Prometheus text format.
+
+    In multiprocess mode the metrics of every worker are aggregated.
+
+    Returns:
+        tuple[bytes, str]: Payload and its content type
+    """
+    if multiprocess_enabled():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
@@ -0,0 +1,113 @@
+"""
+ASGI middleware for AI Engine.
+
+Middleware here is written as plain ASGI callables (not BaseHTTPMiddleware)
+so it adds no extra task or response buffering on the request path.
+"""
+
+import re
+import time
+import uuid
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.logging import request_id_var
+from app.core.metrics import (
+    REQUEST_LATENCY,
+    REQUESTS_IN_FLIGHT,
+    reset_current_scope,
+    route_of,
+    set_current_scope,
+)
+
+
+class MetricsMiddleware:
+    """
+    Record request latency per route template and the number of in-flight requests.
+
+    The route label is the matched path template (e.g., "/api/v1/stocks/price"),
+    never the raw path, to keep metric cardinality bounded.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        token = set_current_scope(scope)
+        REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            REQUESTS_IN_FLIGHT.dec()
+            reset_current_scope(token)
+            REQUEST_LATENCY.labels(
+                method=scope["method"], route=route_of(scope), status=str(status)
+            ).observe(time.perf_counter() - started)
+
+
+# Accepted caller-supplied IDs: UUIDs, trace IDs and similar tokens only,
+# so arbitrary header content never reaches the logs
+_REQUEST_ID_PATTERN = re.compile(r"^[A-Za-z0-9._:\-]{1,128}$")
+
+
+class RequestIdMiddleware:
+    """
+    Propagate a correlation ID for every HTTP and WebSocket request.
+
+    The ID is taken from the caller's header (the Spring Boot server sends its
+    own ID so both services' logs can be joined) or generated when missing or
+    malformed. It is bound to the logging context for the whole request,
+    stored in scope["state"]["request_id"] and echoed in the response header.
+
+    Args:
+        app: ASGI application to wrap
+        header_name: Header carrying the correlation ID (e.g., "X-Request-ID")
+    """
+
+    def __init__(self, app: ASGIApp, header_name: str = "X-Request-ID"):
+        self.app = app
+        self.header_name = header_name
+        self._header_key = header_name.lower().encode("latin-1")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for key, value in scope["headers"]:
+            if key == self._header_key:
+                candidate = value.decode("latin-1")
+                if _REQUEST_ID_PATTERN.match(candidate):
+                    request_id = candidate
+                break
+        if request_id is None:
+            request_id = uuid.uuid4().hex
+
+        scope.setdefault("state", {})["request_id"] = request_id
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", [])
+                MutableHeaders(scope=message)[self.header_name] = request_id
+            await send(message)
+
+        token = request_id_var.set(request_id)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_id_var.reset(token)
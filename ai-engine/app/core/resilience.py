@@ -0,0 +1,302 @@
+"""
+Resilience primitives for upstream calls.
+
+When an upstream degrades, waiting the full failure time on every request
+piles requests up in the workers. This module provides:
+
+    - CircuitBreaker: fails calls fast once the recent failure rate of an
+      upstream passes a threshold, and probes it again after a cool-down.
+    - LatencyTracker + hedged: send a duplicate request when the first one is
+      slower than a latency percentile, and use whichever answers first.
+"""
+
+import asyncio
+import math
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Literal, TypeVar
+
+from app.core.errors import AIEngineException, CircuitOpenError, ExternalAPIError
+from app.core.logging import get_logger
+from app.core.metrics import CIRCUIT_STATE, error_cause
+
+logger = get_logger(__name__)
+
+R = TypeVar("R")
+
+CircuitState = Literal["closed", "open", "half_open"]
+
+_STATE_VALUES: dict[CircuitState, int] = {"closed": 0, "half_open": 1, "open": 2}
+
+# ExternalAPIError causes that mean the upstream itself is unhealthy; other
+# errors (e.g., an invalid ticker) prove that it answered
+UPSTREAM_FAILURE_CAUSES = frozenset({"upstream_error", "timeout"})
+
+
+@dataclass(frozen=True)
+class CircuitSnapshot:
+    """
+    Point-in-time view of a circuit breaker.
+    """
+
+    name: str
+    state: CircuitState
+    failure_rate: float
+    calls: int
+    retry_after: float | None
+
+
+class CircuitBreaker:
+    """
+    Failure-rate circuit breaker with a sliding time window.
+
+    - closed: calls pass; their outcomes are kept for `window` seconds. Once
+      at least `min_calls` outcomes are known and the failure rate reaches
+      `failure_rate`, the circuit opens.
+    - open: calls are rejected with CircuitOpenError for `open_seconds`.
+    - half_open: up to `half_open_calls` probe calls pass; a successful probe
+      closes the circuit, a failed one opens it again.
+
+    Only upstream failures count (errors with cause upstream_error or timeout,
+    and unexpected exceptions). Other application errors such as an invalid
+    ticker count as successes, and cancelled calls or rejections by our own
+    admission control (ServiceOverloadedError) are not recorded at all.
+
+    The breaker is meant to be used from a single event loop and is not thread-safe.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate: float = 0.5,
+        min_calls: int = 20,
+        window: float = 60.0,
+        open_seconds: float = 30.0,
+        half_open_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize the breaker.
+
+        Args:
+            name: Circuit name used in errors, logs and metrics (e.g., the provider name)
+            failure_rate: Failure ratio (0-1) within the window that opens the circuit
+            min_calls: Minimum outcomes within the window before the rate is evaluated
+            window: Length of the sliding outcome window in seconds
+            open_seconds: Time calls are rejected before probing the upstream again
+            half_open_calls: Concurrent probe calls allowed while half-open
+            clock: Monotonic clock function (injectable for tests)
+        """
+        self.name = name
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.window = window
+        self.open_seconds = open_seconds
+        self.half_open_calls = half_open_calls
+        self._clock = clock
+        self._state: CircuitState = "closed"
+        self._opened_at = 0.0
+        self._probes = 0
+        # (time, failed) of recent calls, oldest first
+        self._outcomes: deque[tuple[float, bool]] = deque()
+        self._failures = 0
+        self._metric = CIRCUIT_STATE.labels(circuit=name)
+        self._metric.set(0)
+
+    @property
+    def state(self) -> CircuitState:
+        """
+        Current state; an open circuit whose cool-down has elapsed reports half_open.
+        """
+        if self._state == "open" and self._clock() - self._opened_at >= self.open_seconds:
+            self._set_state("half_open")
+        return self._state
+
+    def snapshot(self) -> CircuitSnapshot:
+        """
+        Get the current state and failure statistics.
+
+        Returns:
+            CircuitSnapshot: State, failure rate within the window and remaining open time
+        """
+        state = self.state
+        self._prune(self._clock())
+        calls = len(self._outcomes)
+        retry_after = None
+        if state == "open":
+            retry_after = round(max(self.open_seconds - (self._clock() - self._opened_at), 0.0), 3)
+        return CircuitSnapshot(
+            name=self.name,
+            state=state,
+            failure_rate=round(self._failures / calls, 4) if calls else 0.0,
+            calls=calls,
+            retry_after=retry_after
+        )
+
+    async def call(self, func: Callable[[], Awaitable[R]]) -> R:
+        """
+        Run an upstream call through the breaker.
+
+        Args:
+            func: Coroutine function doing the upstream call
+
+        Returns:
+            The return value of func
+
+        Raises:
+            CircuitOpenError: If the circuit is open (or all probe slots are taken)
+        """
+        probe = self._admit()
+        try:
+            result = await func()
+        except AIEngineException as e:
+            if isinstance(e, ExternalAPIError):
+                self._record(failed=error_cause(e) in UPSTREAM_FAILURE_CAUSES, probe=probe)
+            elif probe:
+                # Our own rejection says nothing about the upstream; free the probe slot
+                self._probes -= 1
+            raise
+        except Exception:
+            self._record(failed=True, probe=probe)
+            raise
+        except BaseException:
+            if probe:
+                self._probes -= 1
+            raise
+        self._record(failed=False, probe=probe)
+        return result
+
+    def _admit(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return False
+        if state == "half_open" and self._probes < self.half_open_calls:
+            self._probes += 1
+            return True
+
+        snapshot = self.snapshot()
+        raise CircuitOpenError(
+            message=f"Upstream '{self.name}' is unavailable, please retry later",
+            details={"circuit": self.name, "state": state, "retry_after": snapshot.retry_after, "cause": "circuit_open"}
+        )
+
+    def _record(self, failed: bool, probe: bool) -> None:
+        now = self._clock()
+        if probe:
+            self._probes -= 1
+            if failed:
+                self._open(now)
+            else:
+                logger.info("Circuit '%s' closed after a successful probe", self.name)
+                self._outcomes.clear()
+                self._failures = 0
+                self._set_state("closed")
+            return
+
+        self._outcomes.append((now, failed))
+        self._failures += failed
+        self._prune(now)
+        if self._state != "closed" or len(self._outcomes) < self.min_calls:
+            return
+        if self._failures / len(self._outcomes) >= self.failure_rate:
+            self._open(now)
+
+    def _open(self, now: float) -> None:
+        calls = len(self._outcomes)
+        logger.warning(
+            "Circuit '%s' opened for %ss (%d of %d recent calls failed)",
+            self.name, self.open_seconds, self._failures, calls
+        )
+        self._opened_at = now
+        self._set_state("open")
+
+    def _prune(self, now: float) -> None:
+        horizon = now - self.window
+        while self._outcomes and self._outcomes[0][0] < horizon:
+            _, failed = self._outcomes.popleft()
+            self._failures -= failed
+
+    def _set_state(self, state: CircuitState) -> None:
+        self._state = state
+        self._metric.set(_STATE_VALUES[state])
+
+
+class LatencyTracker:
+    """
+    Rolling sample of recent call latencies.
+
+    Args:
+        sample_size: Number of most recent latencies kept
+        min_samples: Samples needed before a percentile is reported
+    """
+
+    def __init__(self, sample_size: int = 200, min_samples: int = 20):
+        self.min_samples = min_samples
+        self._samples: deque[float] = deque(maxlen=sample_size)
+
+    def record(self, seconds: float) -> None:
+        """
+        Add one latency sample in seconds.
+        """
+        self._samples.append(seconds)
+
+    def percentile(self, percent: float) -> float | None:
+        """
+        Latency at a percentile of the recent samples (nearest rank).
+
+        Args:
+            percent: Percentile (0-100)
+
+        Returns:
+            float | None: Latency in seconds, or None with fewer than min_samples samples
+        """
+        if len(self._samples) < self.min_samples:
+            return None
+        ordered = sorted(self._samples)
+        rank = max(math.ceil(percent / 100.0 * len(ordered)), 1)
+        return ordered[rank - 1]
+
+
+async def hedged(
+    attempt: Callable[[], Awaitable[R]],
+    delay: float | None
+) -> tuple[R, Literal["primary", "hedge"] | None]:
+    """
+    Run an idempotent call, sending a duplicate if the first one is slow.
+
+    If the first attempt has not finished after `delay` seconds a second one
+    is started, and the first successful result wins; the other attempt is
+    cancelled. If every attempt fails, the first attempt's error is raised.
+
+    Args:
+        attempt: Coroutine function doing one attempt (must be safe to call twice)
+        delay: Seconds to wait before hedging (None never hedges)
+
+    Returns:
+        tuple: The result, and which attempt produced it ("primary" or "hedge"),
+            or None when no hedge was sent
+    """
+    first = asyncio.ensure_future(attempt())
+    tasks = [first]
+    try:
+        if delay is not None:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done:
+                tasks.append(asyncio.ensure_future(attempt()))
+
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in tasks:
+                if task in done and not task.cancelled() and task.exception() is None:
+                    winner: Literal["primary", "hedge"] | None = None
+                    if len(tasks) > 1:
+                        winner = "primary" if task is first else "hedge"
+                    return task.result(), winner
+        return first.result(), None
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
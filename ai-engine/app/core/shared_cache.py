@@ -0,0 +1,368 @@
+"""
+Shared (L2) cache tier for multi-worker deployments.
+
+Every uvicorn worker and replica has its own in-process quote cache (L1), so
+without a shared tier each of them fetches the same tickers upstream. This
+module puts a Redis-protocol store behind those local caches:
+
+    - values are opaque bytes (callers encode them compactly, see
+      app.services.cache_codec) with a per-key TTL;
+    - a distributed lock (SET NX PX + compare-and-delete) lets only one worker
+      refresh a key at a time while the others wait for its result;
+    - writes are announced on a pub/sub channel so other workers drop their
+      local copies of the written keys.
+
+The redis client is only imported when SHARED_CACHE_ENABLED is true.
+"""
+
+import asyncio
+import secrets
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, TypeVar
+
+import msgpack
+
+from app.config.settings import Settings
+from app.core.logging import get_logger
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+
+logger = get_logger(__name__)
+
+V = TypeVar("V")
+
+# Deletes the lock only if it still holds our token (never another worker's lock)
+_RELEASE_SCRIPT = "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) else return 0 end"
+
+
+class SharedCache:
+    """
+    Redis-protocol cache shared by all workers.
+
+    Keys are given without the namespace (e.g., "quote:AAPL"). Any Redis
+    error is logged and treated as a miss, so an unavailable store only costs
+    the upstream calls it would have saved.
+    """
+
+    def __init__(
+        self,
+        client: "Redis",
+        namespace: str = "calix",
+        lock_ttl: float = 10.0,
+        lock_wait: float = 2.0,
+        lock_poll: float = 0.05,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            client: Async Redis-protocol client (redis.asyncio.Redis or a compatible fake)
+            namespace: Prefix of every key and of the invalidation channel
+            lock_ttl: Seconds after which a lock of a crashed holder expires
+            lock_wait: Seconds a worker waits for another worker's refresh before loading itself
+            lock_poll: Seconds between two checks while waiting for another worker's refresh
+            clock: Monotonic clock function (injectable for tests)
+        """
+        self.client = client
+        self.namespace = namespace
+        self.lock_ttl = lock_ttl
+        self.lock_wait = lock_wait
+        self.lock_poll = lock_poll
+        self.channel = f"{namespace}:invalidate"
+        # Identifies this worker's own invalidation messages
+        self.origin = secrets.token_hex(8)
+        self._clock = clock
+        self._handlers: list[Callable[[list[str]], None]] = []
+        self._listener: asyncio.Task[None] | None = None
+
+    async def get_many(self, keys: list[str]) -> dict[str, bytes]:
+        """
+        Read several keys in one round trip.
+
+        Args:
+            keys: Keys without namespace
+
+        Returns:
+            dict[str, bytes]: Values of the keys that exist
+        """
+        if not keys:
+            return {}
+        try:
+            values = await self.client.mget([self._key(key) for key in keys])
+        except Exception as e:
+            logger.warning("Shared cache read failed: %s", e)
+            return {}
+        return {key: value for key, value in zip(keys, values, strict=True) if isinstance(value, bytes)}
+
+    async def set_many(self, items: dict[str, tuple[bytes, float]], publish: bool = True) -> None:
+        """
+        Write several keys with their own TTL in one round trip and announce them.
+
+        Args:
+            items: Key -> (value, TTL in seconds); entries with TTL <= 0 are skipped
+            publish: Whether to tell other workers to drop their local copies
+        """
+        items = {key: item for key, item in items.items() if item[1] > 0}
+        if not items:
+            return
+        try:
+            async with self.client.pipeline(transaction=False) as pipe:
+                for key, (value, ttl) in items.items():
+                    pipe.set(self._key(key), value, px=max(int(ttl * 1000), 1))
+                if publish:
+                    pipe.publish(self.channel, msgpack.packb([self.origin, list(items)]))
+                await pipe.execute()
+        except Exception as e:
+            logger.warning("Shared cache write failed: %s", e)
+
+    async def invalidate(self, keys: list[str]) -> None:
+        """
+        Delete keys and tell every worker to drop its local copies.
+
+        Args:
+            keys: Keys without namespace
+        """
+        if not keys:
+            return
+        try:
+            async with self.client.pipeline(transaction=False) as pipe:
+                pipe.delete(*(self._key(key) for key in keys))
+                pipe.publish(self.channel, msgpack.packb([self.origin, keys]))
+                await pipe.execute()
+        except Exception as e:
+            logger.warning("Shared cache invalidation failed: %s", e)
+
+    async def acquire(self, keys: list[str]) -> dict[str, str]:
+        """
+        Try to take the refresh locks of several keys without waiting.
+
+        Args:
+            keys: Keys without namespace
+
+        Returns:
+            dict[str, str]: Lock token per key this worker now holds
+        """
+        if not keys:
+            return {}
+        tokens = {key: secrets.token_hex(8) for key in keys}
+        try:
+            async with self.client.pipeline(transaction=False) as pipe:
+                for key, token in tokens.items():
+                    pipe.set(self._lock_key(key), token, nx=True, px=int(self.lock_ttl * 1000))
+                results = await pipe.execute()
+        except Exception as e:
+            logger.warning("Shared cache lock failed: %s", e)
+            # Without the store nobody can coordinate: behave as the only worker
+            return tokens
+        return {key: token for (key, token), taken in zip(tokens.items(), results, strict=True) if taken}
+
+    async def release(self, tokens: dict[str, str]) -> None:
+        """
+        Release locks taken with acquire(); locks taken over by others are left alone.
+
+        Args:
+            tokens: Lock token per key, as returned by acquire()
+        """
+        if not tokens:
+            return
+        try:
+            async with self.client.pipeline(transaction=False) as pipe:
+                for key, token in tokens.items():
+                    pipe.eval(_RELEASE_SCRIPT, 1, self._lock_key(key), token)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning("Shared cache unlock failed: %s", e)
+
+    @asynccontextmanager
+    async def lock(self, key: str) -> AsyncIterator[bool]:
+        """
+        Hold the refresh lock of one key, waiting up to `lock_wait` for another holder.
+
+        Args:
+            key: Key without namespace
+
+        Yields:
+            bool: Whether the lock is held; false once `lock_wait` elapsed, in which
+                case the caller proceeds without it
+        """
+        deadline = self._clock() + self.lock_wait
+        tokens = await self.acquire([key])
+        while not tokens and self._clock() < deadline:
+            await asyncio.sleep(self.lock_poll)
+            tokens = await self.acquire([key])
+        try:
+            yield bool(tokens)
+        finally:
+            await self.release(tokens)
+
+    async def get_or_load_many(
+        self,
+        keys: list[str],
+        load: Callable[[list[str]], Awaitable[dict[str, V]]],
+        encode: Callable[[V], bytes],
+        decode: Callable[[bytes], V],
+        ttl_for: Callable[[V], float]
+    ) -> dict[str, V]:
+        """
+        Read keys from the store; load the missing ones with one refresher per key across workers.
+
+        Keys whose lock this worker takes are loaded, stored and announced.
+        Keys locked by another worker are polled until that worker has stored
+        them, or `lock_wait` elapses and they are loaded here as well.
+
+        Args:
+            keys: Keys without namespace
+            load: Coroutine function loading missing keys (e.g., from the upstream provider);
+                keys it leaves out (failed loads) are neither stored nor returned
+            encode: Binary encoding of a value
+            decode: Inverse of encode
+            ttl_for: TTL in seconds of a loaded value (values with TTL <= 0 are not stored)
+
+        Returns:
+            dict[str, V]: Value per key, as returned by the store or `load`
+        """
+        results: dict[str, V] = {}
+        self._decode_into(results, await self.get_many(keys), decode)
+        missing = [key for key in keys if key not in results]
+        if not missing:
+            return results
+
+        tokens = await self.acquire(missing)
+        try:
+            owned = [key for key in missing if key in tokens]
+            if owned:
+                results.update(await self._load_and_store(owned, load, encode, ttl_for))
+        finally:
+            await self.release(tokens)
+
+        waiting = [key for key in missing if key not in tokens]
+        deadline = self._clock() + self.lock_wait
+        while waiting and self._clock() < deadline:
+            await asyncio.sleep(self.lock_poll)
+            self._decode_into(results, await self.get_many(waiting), decode)
+            waiting = [key for key in waiting if key not in results]
+
+        if waiting:
+            logger.info("Loading %d keys locked by another worker after waiting %ss", len(waiting), self.lock_wait)
+            results.update(await self._load_and_store(waiting, load, encode, ttl_for))
+        return results
+
+    def subscribe(self, handler: Callable[[list[str]], None]) -> None:
+        """
+        Register a handler for keys written or invalidated by other workers.
+
+        Handlers run once start() has been called.
+
+        Args:
+            handler: Called with the keys (without namespace) of each message
+        """
+        self._handlers.append(handler)
+
+    def start(self) -> None:
+        """
+        Start listening for invalidation messages in the background.
+        """
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.ensure_future(self._listen())
+
+    async def close(self) -> None:
+        """
+        Stop listening and close the client connections.
+        """
+        if self._listener is not None and not self._listener.done():
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+        self._listener = None
+        await self.client.aclose()
+
+    async def _load_and_store(
+        self,
+        keys: list[str],
+        load: Callable[[list[str]], Awaitable[dict[str, V]]],
+        encode: Callable[[V], bytes],
+        ttl_for: Callable[[V], float]
+    ) -> dict[str, V]:
+        loaded = await load(keys)
+        await self.set_many({key: (encode(value), ttl_for(value)) for key, value in loaded.items()})
+        return loaded
+
+    def _decode_into(self, results: dict[str, V], raw: dict[str, bytes], decode: Callable[[bytes], V]) -> None:
+        for key, value in raw.items():
+            try:
+                results[key] = decode(value)
+            except Exception:
+                # An unreadable entry (e.g., written by another version) is a miss
+                logger.warning("Ignoring undecodable shared cache entry %s", key)
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                async with self.client.pubsub() as pubsub:
+                    await pubsub.subscribe(self.channel)
+                    while True:
+                        message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                        if message is not None:
+                            self._dispatch(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Shared cache invalidation listener failed, reconnecting: %s", e)
+                await asyncio.sleep(1.0)
+
+    def _dispatch(self, payload: bytes) -> None:
+        try:
+            origin, keys = msgpack.unpackb(payload)
+        except Exception:
+            logger.warning("Ignoring malformed shared cache invalidation message")
+            return
+        if origin == self.origin:
+            return
+        for handler in self._handlers:
+            try:
+                handler(list(keys))
+            except Exception:
+                logger.exception("Shared cache invalidation handler failed")
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    def _lock_key(self, key: str) -> str:
+        return f"{self.namespace}:lock:{key}"
+
+
+def create_shared_cache(settings: Settings) -> SharedCache | None:
+    """
+    Create the shared cache tier configured in settings.
+
+    Args:
+        settings: Application settings
+
+    Returns:
+        SharedCache | None: Shared cache, or None when SHARED_CACHE_ENABLED is false
+    """
+    if not settings.shared_cache_enabled:
+        return None
+    from redis.asyncio import Redis
+    from redis.asyncio.retry import Retry
+    from redis.backoff import NoBackoff
+
+    client = Redis.from_url(
+        settings.shared_cache_url,
+        socket_timeout=settings.shared_cache_timeout,
+        socket_connect_timeout=settings.shared_cache_timeout,
+        # A cache must fail fast: one immediate retry instead of the client's backoff schedule
+        retry=Retry(NoBackoff(), 1)
+    )
+    return SharedCache(
+        client,
+        namespace=settings.shared_cache_namespace,
+        lock_ttl=settings.shared_cache_lock_ttl,
+        lock_wait=settings.shared_cache_lock_wait
+    )
@@ -4,21 +4,44 @@ AI Engine Main Application.
 FastAPI application entry point with middleware, routers, and exception handlers.
 
 Running the application:
-    $ uvicorn app.main:app --reload --port 8000
+    $ uvicorn app.main:app --reload --port 8000   # development
+    $ python -m app                               # production (see app.server)
 
 API Documentation:
     - Swagger UI: http://localhost:8000/docs
     - ReDoc: http://localhost:8000/redoc
 """
 
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-
+from fastapi.responses import JSONResponse, Response
+
+from app.api.dependencies import (
+    get_alert_service,
+    get_backtest_service,
+    get_commentary_service,
+    get_fx_service,
+    get_history_service,
+    get_indicator_service,
+    get_portfolio_service,
+    get_prediction_service,
+    get_quote_prefetcher,
+    get_quote_stream_hub,
+    get_retrieval_service,
+    get_shared_cache,
+    get_stock_service,
+)
 from app.api.v1.router import api_router
 from app.config.settings import get_settings
 from app.core.errors import AIEngineException
+from app.core.executor import get_blocking_executor
+from app.core.http_client import create_http_client
 from app.core.logging import setup_logging
+from app.core.metrics import instrument_serialization, render_metrics
+from app.core.middleware import MetricsMiddleware, RequestIdMiddleware
 from app.schemas.base import ErrorResponse
 
 # Setup logging
@@ -27,12 +50,85 @@ setup_logging()
 # Get settings
 settings = get_settings()
 
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    Application lifespan handler.
+
+    Creates the shared outbound HTTP client, starts listening for shared
+    cache invalidations, starts the scheduled FX rate refresh, quote
+    prefetching and price alert evaluation and starts loading the models on
+    startup, and releases process-wide resources (alert webhooks, background
+    refreshes, model batchers, quote pollers, retrieval threads, backtest
+    worker processes, shared cache and HTTP connections, executor threads)
+    on shutdown.
+    """
+    app.state.http_client = create_http_client(settings)
+    shared_cache = get_shared_cache()
+    if shared_cache is not None:
+        # Subscribes the stock service to invalidations before listening
+        get_stock_service()
+        shared_cache.start()
+    if settings.fx_refresh_enabled:
+        get_fx_service().start()
+    if settings.prefetch_enabled:
+        get_quote_prefetcher().start()
+    get_prediction_service().start()
+    if settings.alert_enabled:
+        get_alert_service().start(app.state.http_client)
+
+    yield
+
+    if get_alert_service.cache_info().currsize:
+        await get_alert_service().close()
+        get_alert_service.cache_clear()
+
+    await get_prediction_service().close()
+    get_prediction_service.cache_clear()
+    if get_quote_prefetcher.cache_info().currsize:
+        await get_quote_prefetcher().close()
+        get_quote_prefetcher.cache_clear()
+    if get_fx_service.cache_info().currsize:
+        await get_fx_service().close()
+        get_fx_service.cache_clear()
+        # Holds the closed FX service
+        get_portfolio_service.cache_clear()
+    if get_quote_stream_hub.cache_info().currsize:
+        await get_quote_stream_hub().close()
+        get_quote_stream_hub.cache_clear()
+    if get_retrieval_service.cache_info().currsize:
+        get_retrieval_service().close()
+        get_retrieval_service.cache_clear()
+    if get_backtest_service.cache_info().currsize:
+        get_backtest_service().close()
+        get_backtest_service.cache_clear()
+
+    if shared_cache is not None:
+        await shared_cache.close()
+    get_shared_cache.cache_clear()
+    # Built on the closed shared cache, directly or through the stock and history services
+    for dependency in (
+        get_stock_service,
+        get_history_service,
+        get_indicator_service,
+        get_portfolio_service,
+        get_commentary_service
+    ):
+        dependency.cache_clear()
+    await app.state.http_client.aclose()
+    get_blocking_executor().shutdown()
+    get_blocking_executor.cache_clear()
+
+
 # Create FastAPI application
 app = FastAPI(
     title=settings.app_name,
     version=settings.app_version,
     debug=settings.debug,
-    description="AI Engine for financial data analysis and prediction models"
+    description="AI Engine for financial data analysis and prediction models",
+    lifespan=lifespan
 )
 
 # Add CORS middleware for Spring Boot server integration
@@ -42,8 +138,17 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[settings.request_id_header],
 )
 
+# Add request correlation ID middleware (binds the ID for all later log records)
+app.add_middleware(RequestIdMiddleware, header_name=settings.request_id_header)
+
+# Add Prometheus metrics middleware (outermost, so it times the whole request)
+if settings.metrics_enabled:
+    instrument_serialization()
+    app.add_middleware(MetricsMiddleware)
+
 
 # Global exception handler for custom exceptions
 @app.exception_handler(AIEngineException)
@@ -51,10 +156,11 @@ async def ai_engine_exception_handler(request: Request, exc: AIEngineException)
     """
     Handle all AIEngineException and its subclasses.
 
-    Returns a standardized error response with 400 status code.
+    Returns a standardized error response with the exception's status code
+    (400 unless the exception class overrides it).
     """
     return JSONResponse(
-        status_code=400,
+        status_code=exc.status_code,
         content=ErrorResponse(
             success=False,
             message=exc.message,
@@ -67,6 +173,17 @@ async def ai_engine_exception_handler(request: Request, exc: AIEngineException)
 app.include_router(api_router, prefix=settings.api_v1_prefix)
 
 
+# Prometheus scrape endpoint
+if settings.metrics_enabled:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics() -> Response:
+        """
+        Expose application metrics in the Prometheus text format.
+        """
+        payload, content_type = render_metrics()
+        return Response(content=payload, media_type=content_type)
+
+
 # Root endpoint (for backward compatibility)
 @app.get("/")
 async def root() -> dict[str, str]:
@@ -79,4 +196,4 @@ async def root() -> dict[str, str]:
         "status": "running",
         "service": settings.app_name,
         "version": settings.app_version
-    }
\ No newline at end of file
+    }
@@ -0,0 +1,194 @@
+"""
+Asyncio micro-batching of model inference.
+
+Concurrent prediction requests for one model are queued and served by a
+single forward pass over all of their rows. A batch is sent once it holds
+`max_batch_size` rows or `max_wait` seconds after its first request
+arrived, whichever comes first. Requests arriving while a pass runs form
+the next batch, which is sent as soon as that pass ends. Inference cost
+therefore grows with the number of batches, not with the number of requests.
+"""
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import numpy as np
+
+from app.core.errors import AIEngineException, ModelInferenceError
+from app.core.executor import BlockingExecutor
+from app.core.logging import get_logger
+from app.core.metrics import MODEL_BATCH_SIZE, MODEL_INFERENCE_LATENCY
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class _Request:
+    rows: np.ndarray
+    future: asyncio.Future[np.ndarray]
+
+
+class MicroBatcher:
+    """
+    Batches concurrent calls of one model's predict function.
+
+    The batching task starts with the first request (and starts again if the
+    event loop changes, e.g. between test clients); close() stops it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        predict: Callable[[np.ndarray], np.ndarray],
+        executor: BlockingExecutor,
+        max_batch_size: int,
+        max_wait: float
+    ):
+        """
+        Initialize the batcher.
+
+        Args:
+            name: Model name (metric label and log context)
+            predict: Vectorized forward pass, (n, features) -> (n,)
+            executor: Executor running the forward passes off the event loop
+            max_batch_size: Rows that trigger a pass without waiting further
+            max_wait: Seconds a batch waits for more requests after its first one
+        """
+        self.name = name
+        self.predict = predict
+        self.executor = executor
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.batches = 0
+        self.rows = 0
+        self._queue: deque[_Request] = deque()
+        self._queued_rows = 0
+        self._arrived: asyncio.Event | None = None
+        self._task: asyncio.Task[None] | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._batch_size_metric = MODEL_BATCH_SIZE.labels(model=name)
+        self._latency_metric = MODEL_INFERENCE_LATENCY.labels(model=name)
+
+    async def submit(self, rows: np.ndarray) -> np.ndarray:
+        """
+        Predict rows as part of the next batch.
+
+        Args:
+            rows: Input matrix of shape (n, features)
+
+        Returns:
+            np.ndarray: One output per row
+
+        Raises:
+            ModelInferenceError: If the forward pass fails
+            ServiceOverloadedError: If the inference executor is saturated
+        """
+        arrived = self._ensure_running()
+        request = _Request(rows=rows, future=asyncio.get_running_loop().create_future())
+        self._queue.append(request)
+        self._queued_rows += len(rows)
+        arrived.set()
+        return await request.future
+
+    async def close(self) -> None:
+        """
+        Stop the batching task and fail the requests still queued.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._fail(list(self._queue), ModelInferenceError(message=f"Model {self.name} is shutting down"))
+        self._queue.clear()
+        self._queued_rows = 0
+
+    def _ensure_running(self) -> asyncio.Event:
+        loop = asyncio.get_running_loop()
+        if self._arrived is None or self._task is None or self._task.done() or self._loop is not loop:
+            # Requests queued on another (closed) loop can never be answered
+            self._queue.clear()
+            self._queued_rows = 0
+            self._loop = loop
+            self._arrived = asyncio.Event()
+            self._task = loop.create_task(self._run(self._arrived))
+        return self._arrived
+
+    async def _run(self, arrived: asyncio.Event) -> None:
+        while True:
+            idle = not self._queue
+            if idle:
+                arrived.clear()
+                await arrived.wait()
+
+            # Gather until the batch is full or max_wait has passed since it started.
+            # Requests that queued up during the previous pass have waited already.
+            deadline = time.monotonic() + self.max_wait
+            while idle and self._queued_rows < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                arrived.clear()
+                try:
+                    await asyncio.wait_for(arrived.wait(), timeout=remaining)
+                except TimeoutError:
+                    break
+
+            batch = self._take()
+            if batch:
+                await self._execute(batch)
+
+    def _take(self) -> list[_Request]:
+        batch: list[_Request] = []
+        size = 0
+        while self._queue:
+            request = self._queue[0]
+            # An oversized request still goes alone rather than waiting forever
+            if batch and size + len(request.rows) > self.max_batch_size:
+                break
+            self._queue.popleft()
+            self._queued_rows -= len(request.rows)
+            if request.future.done():
+                continue  # cancelled while queued, e.g. the client disconnected
+            batch.append(request)
+            size += len(request.rows)
+        return batch
+
+    async def _execute(self, batch: list[_Request]) -> None:
+        rows = batch[0].rows if len(batch) == 1 else np.concatenate([request.rows for request in batch])
+        started = time.perf_counter()
+        try:
+            outputs = await self.executor.run(self.predict, rows)
+        except AIEngineException as e:
+            self._fail(batch, e)
+            return
+        except Exception as e:
+            logger.exception("Forward pass of model %s failed for %d rows", self.name, len(rows))
+            self._fail(batch, ModelInferenceError(
+                message=f"Inference failed for model {self.name}",
+                details={"model": self.name, "error": str(e)}
+            ))
+            return
+
+        self._latency_metric.observe(time.perf_counter() - started)
+        self._batch_size_metric.observe(len(rows))
+        self.batches += 1
+        self.rows += len(rows)
+
+        offset = 0
+        for request in batch:
+            end = offset + len(request.rows)
+            if not request.future.done():
+                request.future.set_result(outputs[offset:end])
+            offset = end
+
+    @staticmethod
+    def _fail(batch: list[_Request], error: Exception) -> None:
+        for request in batch:
+            if not request.future.done():
+                request.future.set_exception(error)
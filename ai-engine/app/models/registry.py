@@ -0,0 +1,137 @@
+"""
+Registry of the models served by this worker.
+
+Artifacts are discovered in the model directory when the registry is
+created and loaded (then warmed up) once by load(), typically in the
+background at startup. Until then the models report status "loading".
+One broken artifact never prevents the others from being served.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Literal
+
+import numpy as np
+
+from app.core.errors import ModelInferenceError, ValidationError
+from app.core.logging import get_logger
+from app.models.runtime import MODEL_LOADERS, Model, load_model
+
+logger = get_logger(__name__)
+
+ModelState = Literal["loading", "ready", "failed"]
+
+
+@dataclass(frozen=True)
+class ModelStatus:
+    """
+    Load status of one model artifact.
+    """
+
+    name: str
+    state: ModelState
+    kind: str | None = None
+    version: str | None = None
+    features: tuple[str, ...] = ()
+    load_seconds: float | None = None
+    error: str | None = None
+
+
+class ModelRegistry:
+    """
+    Models loaded from one directory, looked up by name.
+    """
+
+    def __init__(self, path: str | Path, warmup_rows: int = 1):
+        """
+        Initialize the registry and discover the artifacts in `path`.
+
+        Args:
+            path: Directory holding the model artifacts (may not exist)
+            warmup_rows: Rows of the warm-up forward pass run after loading each model
+        """
+        self.path = Path(path)
+        self.warmup_rows = warmup_rows
+        self._models: dict[str, Model] = {}
+        self._lock = threading.Lock()
+        artifacts = sorted(self.path.iterdir()) if self.path.is_dir() else []
+        self._artifacts = {
+            artifact.stem: artifact for artifact in artifacts if artifact.suffix in MODEL_LOADERS
+        }
+        self._statuses = {name: ModelStatus(name=name, state="loading") for name in self._artifacts}
+
+    @property
+    def loading(self) -> bool:
+        """
+        Whether some artifact has not been loaded (or failed to load) yet.
+        """
+        return any(status.state == "loading" for status in self._statuses.values())
+
+    def load(self) -> None:
+        """
+        Load and warm up every artifact still loading (blocking; run it off the event loop).
+        """
+        with self._lock:
+            for name, artifact in self._artifacts.items():
+                if self._statuses[name].state == "loading":
+                    self._statuses[name] = self._load(name, artifact)
+
+    def get(self, name: str) -> Model:
+        """
+        Get a loaded model.
+
+        Args:
+            name: Model name
+
+        Returns:
+            Model: The loaded model
+
+        Raises:
+            ValidationError: If no such model is registered
+            ModelInferenceError: If the model is still loading or failed to load
+        """
+        status = self._statuses.get(name)
+        if status is None:
+            raise ValidationError(
+                message=f"Unknown model: {name}",
+                details={"model": name, "available": sorted(self._statuses)}
+            )
+        model = self._models.get(name)
+        if model is None:
+            raise ModelInferenceError(
+                message=f"Model {name} is not available ({status.state})",
+                details={"model": name, "state": status.state, "error": status.error}
+            )
+        return model
+
+    def statuses(self) -> list[ModelStatus]:
+        """
+        Get the load status of every discovered artifact, sorted by name.
+        """
+        return [self._statuses[name] for name in sorted(self._statuses)]
+
+    def _load(self, name: str, artifact: Path) -> ModelStatus:
+        started = time.perf_counter()
+        try:
+            model = load_model(artifact)
+            # The first pass allocates buffers and initializes kernels; keep it off the request path
+            output = model.predict(np.zeros((self.warmup_rows, len(model.features))))
+            if output.shape != (self.warmup_rows,):
+                raise ValueError(f"Model returned shape {output.shape} for {self.warmup_rows} rows")
+        except Exception as e:
+            logger.exception("Failed to load model %s from %s", name, artifact)
+            return ModelStatus(name=name, state="failed", error=str(e))
+
+        self._models[name] = model
+        status = ModelStatus(
+            name=name,
+            state="ready",
+            kind=model.kind,
+            version=model.version,
+            features=model.features,
+            load_seconds=time.perf_counter() - started
+        )
+        logger.info("Loaded model %s v%s (%s) in %.3fs", name, model.version, model.kind, status.load_seconds)
+        return status
@@ -0,0 +1,216 @@
+"""
+CPU model runtimes for price-direction models.
+
+Every model maps a (rows, features) float64 matrix to one probability per row
+that the price moves up. Artifacts are single files named <model>.<suffix>:
+
+    .npz     logistic regression exported with save_linear_model (NumPy only)
+    .onnx    ONNX graph, run with onnxruntime (optional dependency)
+    .joblib  scikit-learn classifier with predict_proba (optional dependency)
+
+The optional runtimes are only imported when an artifact needs them.
+"""
+
+import hashlib
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Sequence
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+
+class Model(ABC):
+    """
+    A loaded model ready for vectorized inference.
+    """
+
+    kind: str = "model"
+
+    def __init__(self, name: str, version: str, features: Sequence[str]):
+        """
+        Initialize the model.
+
+        Args:
+            name: Model name (artifact file stem)
+            version: Artifact version
+            features: Names of the input columns, in order
+        """
+        self.name = name
+        self.version = version
+        self.features = tuple(features)
+
+    @abstractmethod
+    def predict(self, rows: np.ndarray) -> np.ndarray:
+        """
+        Run one forward pass.
+
+        Args:
+            rows: Input matrix of shape (n, len(features))
+
+        Returns:
+            np.ndarray: Probability of an up move per row, shape (n,)
+        """
+
+
+class LinearModel(Model):
+    """
+    Logistic regression: sigmoid(rows @ weights + bias).
+    """
+
+    kind = "logistic"
+
+    def __init__(self, name: str, version: str, features: Sequence[str], weights: np.ndarray, bias: float):
+        super().__init__(name, version, features)
+        self.weights = np.ascontiguousarray(weights, dtype=np.float64)
+        self.bias = float(bias)
+
+    @classmethod
+    def load(cls, path: Path) -> "LinearModel":
+        with np.load(path, allow_pickle=False) as artifact:
+            return cls(
+                name=path.stem,
+                version=str(artifact["version"]) if "version" in artifact else _file_version(path),
+                features=[str(feature) for feature in artifact["features"]],
+                weights=artifact["weights"],
+                bias=float(artifact["bias"])
+            )
+
+    def predict(self, rows: np.ndarray) -> np.ndarray:
+        logits = rows @ self.weights + self.bias
+        # exp() of a large negative logit overflows to inf, which still gives 0.0
+        with np.errstate(over="ignore"):
+            probabilities: np.ndarray = 1.0 / (1.0 + np.exp(-logits))
+        return probabilities
+
+
+class OnnxModel(Model):
+    """
+    ONNX graph run by onnxruntime on the CPU.
+
+    The graph takes one float input of shape (n, features) and its last output
+    holds P(up) per row, either as (n,) or as class probabilities (n, 2).
+    Feature names come from the `features` metadata entry (comma-separated).
+    """
+
+    kind = "onnx"
+
+    def __init__(self, name: str, version: str, features: Sequence[str], session: Any):
+        super().__init__(name, version, features)
+        self.session = session
+        self.input_name = session.get_inputs()[0].name
+
+    @classmethod
+    def load(cls, path: Path) -> "OnnxModel":
+        import onnxruntime
+
+        options = onnxruntime.SessionOptions()
+        # Parallelism comes from batching; one thread per session keeps workers from oversubscribing CPUs
+        options.intra_op_num_threads = 1
+        session = onnxruntime.InferenceSession(str(path), options, providers=["CPUExecutionProvider"])
+        metadata = session.get_modelmeta()
+        features = metadata.custom_metadata_map.get("features", "")
+        width = session.get_inputs()[0].shape[1]
+        return cls(
+            name=path.stem,
+            version=str(metadata.version or _file_version(path)),
+            features=features.split(",") if features else [f"f{i}" for i in range(int(width))],
+            session=session
+        )
+
+    def predict(self, rows: np.ndarray) -> np.ndarray:
+        outputs = self.session.run(None, {self.input_name: rows.astype(np.float32)})
+        return _up_probability(np.asarray(outputs[-1], dtype=np.float64))
+
+
+class SklearnModel(Model):
+    """
+    scikit-learn classifier saved with joblib; classes must be (down, up).
+    """
+
+    kind = "sklearn"
+
+    def __init__(self, name: str, version: str, features: Sequence[str], estimator: Any):
+        super().__init__(name, version, features)
+        self.estimator = estimator
+
+    @classmethod
+    def load(cls, path: Path) -> "SklearnModel":
+        import joblib
+
+        estimator = joblib.load(path)
+        features = getattr(estimator, "feature_names_in_", None)
+        if features is None:
+            features = [f"f{i}" for i in range(int(estimator.n_features_in_))]
+        return cls(
+            name=path.stem,
+            version=str(getattr(estimator, "version", None) or _file_version(path)),
+            features=[str(feature) for feature in features],
+            estimator=estimator
+        )
+
+    def predict(self, rows: np.ndarray) -> np.ndarray:
+        return _up_probability(np.asarray(self.estimator.predict_proba(rows), dtype=np.float64))
+
+
+# Artifact suffix -> loader
+MODEL_LOADERS: dict[str, Callable[[Path], Model]] = {
+    ".npz": LinearModel.load,
+    ".onnx": OnnxModel.load,
+    ".joblib": SklearnModel.load,
+}
+
+
+def load_model(path: Path) -> Model:
+    """
+    Load a model artifact with the runtime matching its suffix.
+
+    Args:
+        path: Artifact path
+
+    Returns:
+        Model: Loaded model
+
+    Raises:
+        ValueError: If the suffix has no runtime
+        ImportError: If the runtime's optional package is not installed
+    """
+    loader = MODEL_LOADERS.get(path.suffix)
+    if loader is None:
+        raise ValueError(f"No model runtime for {path.suffix} artifacts")
+    return loader(path)
+
+
+def save_linear_model(
+    path: str | Path,
+    features: Sequence[str],
+    weights: Sequence[float] | np.ndarray,
+    bias: float,
+    version: str
+) -> None:
+    """
+    Export a logistic regression as a .npz artifact readable by LinearModel.
+
+    Args:
+        path: Artifact path (the file stem becomes the model name)
+        features: Input column names, in order
+        weights: One coefficient per feature
+        bias: Intercept
+        version: Artifact version
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    if weights.shape != (len(features),):
+        raise ValueError("weights must hold one coefficient per feature")
+    with open(path, "wb") as f:
+        np.savez(f, features=np.asarray(features, dtype=str), weights=weights, bias=np.float64(bias), version=np.str_(version))
+
+
+def _up_probability(outputs: np.ndarray) -> np.ndarray:
+    # Class probabilities (n, 2) -> P(up); a single column is already P(up)
+    if outputs.ndim == 2:
+        return np.ascontiguousarray(outputs[:, -1])
+    return outputs
+
+
+def _file_version(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()[:12]
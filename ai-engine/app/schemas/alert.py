@@ -0,0 +1,169 @@
+"""
+Price alert Pydantic schemas.
+
+This module defines request and response models for alert rules, fired
+alert events and the webhook payload sent to Spring Boot server.
+"""
+
+from datetime import datetime
+from typing import Literal
+
+from pydantic import BaseModel, Field, model_validator
+
+from app.schemas.stock import TickerSymbol
+
+
+class AlertRuleSchema(BaseModel):
+    """
+    Price alert rule.
+
+    - `threshold`: fires when the price crosses `level` in `direction`
+      ("above" or "below").
+    - `percent_move`: fires when the price moves `percent` (0.05 = 5%) up
+      ("above"), down ("below") or either way ("any") from `reference`
+      (defaults to the price when the rule is armed).
+    - `indicator_cross`: fires when the price crosses the `indicator` moving
+      average of `period` daily closes in `direction`.
+
+    One-shot rules are removed when they fire; rules with `repeat` stay armed
+    (repeating percent moves are measured again from the price that fired them).
+    """
+
+    id: str = Field(..., min_length=1, max_length=128, description="Rule id, unique across tickers (e.g., the backend alert id)")
+    ticker: TickerSymbol = Field(..., description="Stock ticker symbol")
+    kind: Literal["threshold", "percent_move", "indicator_cross"] = Field(..., description="Rule type")
+    direction: Literal["above", "below", "any"] = Field(default="above", description="Crossing direction")
+    level: float | None = Field(default=None, gt=0, description="Price level of threshold rules")
+    percent: float | None = Field(default=None, gt=0, le=10, description="Move of percent_move rules (fraction)")
+    reference: float | None = Field(default=None, gt=0, description="Reference price of percent_move rules")
+    indicator: Literal["sma", "ema"] | None = Field(default=None, description="Moving average of indicator_cross rules")
+    period: int | None = Field(default=None, ge=2, le=400, description="Moving average window (daily bars)")
+    repeat: bool = Field(default=False, description="Stay armed after firing")
+    metadata: dict[str, str] = Field(default_factory=dict, description="Opaque values echoed in fired events (e.g., user id)")
+
+    @model_validator(mode="after")
+    def _kind_parameters(self) -> "AlertRuleSchema":
+        if self.kind == "threshold" and self.level is None:
+            raise ValueError("threshold rules need a level")
+        if self.kind == "percent_move" and self.percent is None:
+            raise ValueError("percent_move rules need a percent")
+        if self.kind == "indicator_cross" and (self.indicator is None or self.period is None):
+            raise ValueError("indicator_cross rules need an indicator and a period")
+        if self.kind != "percent_move" and self.direction == "any":
+            raise ValueError("direction 'any' is only supported by percent_move rules")
+        return self
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "id": "alert-1842",
+                "ticker": "AAPL",
+                "kind": "threshold",
+                "direction": "above",
+                "level": 200.0,
+                "metadata": {"user_id": "42"}
+            }
+        }
+
+
+class AlertRulesRequest(BaseModel):
+    """
+    Request model for creating or replacing alert rules by id.
+    """
+
+    rules: list[AlertRuleSchema] = Field(..., min_length=1, description="Rules to create or replace")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "rules": [
+                    {"id": "alert-1842", "ticker": "AAPL", "kind": "threshold", "direction": "above", "level": 200.0},
+                    {"id": "alert-1843", "ticker": "005930.KS", "kind": "percent_move", "direction": "any", "percent": 0.05},
+                    {"id": "alert-1844", "ticker": "MSFT", "kind": "indicator_cross", "direction": "below",
+                     "indicator": "sma", "period": 50, "repeat": True}
+                ]
+            }
+        }
+
+
+class AlertRuleStateSchema(AlertRuleSchema):
+    """
+    Alert rule with the levels it currently watches.
+    """
+
+    armed_levels: dict[str, float] = Field(
+        default_factory=dict,
+        description="Levels to be crossed upwards ('above') or downwards ('below'); empty until the reference price "
+                    "or moving average is known"
+    )
+    last_price: float | None = Field(default=None, description="Last price evaluated for the ticker")
+
+
+class AlertRulesSchema(BaseModel):
+    """
+    Response model for a list of alert rules.
+    """
+
+    rules: list[AlertRuleStateSchema] = Field(..., description="Alert rules")
+
+
+class AlertEventSchema(BaseModel):
+    """
+    A fired alert rule.
+    """
+
+    id: str = Field(..., description="Event id (unique; repeated if a webhook batch is retried)")
+    rule_id: str = Field(..., description="Id of the fired rule")
+    ticker: str = Field(..., description="Stock ticker symbol")
+    kind: str = Field(..., description="Rule type")
+    direction: str = Field(..., description="Crossing direction: above or below")
+    level: float = Field(..., description="Crossed price level")
+    price: float = Field(..., description="Price that crossed the level")
+    previous_price: float = Field(..., description="Price before the crossing")
+    triggered_at: datetime = Field(..., description="Time of the crossing (UTC)")
+    metadata: dict[str, str] = Field(default_factory=dict, description="Metadata of the rule")
+
+
+class AlertWebhookPayload(BaseModel):
+    """
+    Body of one alert webhook call: a batch of fired events.
+    """
+
+    events: list[AlertEventSchema] = Field(..., description="Fired events, oldest first")
+    sent_at: datetime = Field(..., description="Time the batch was sent (UTC)")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "events": [{
+                    "id": "5f0c8e2a9b6d4f1e8a3c7b2d1e0f9a8b",
+                    "rule_id": "alert-1842",
+                    "ticker": "AAPL",
+                    "kind": "threshold",
+                    "direction": "above",
+                    "level": 200.0,
+                    "price": 200.35,
+                    "previous_price": 199.8,
+                    "triggered_at": "2024-06-05T15:00:05Z",
+                    "metadata": {"user_id": "42"}
+                }],
+                "sent_at": "2024-06-05T15:00:06Z"
+            }
+        }
+
+
+class AlertStatsSchema(BaseModel):
+    """
+    Response model for alert engine statistics of the worker that served the request.
+    """
+
+    rules: int = Field(..., description="Stored rules")
+    tickers: int = Field(..., description="Tickers with at least one rule")
+    evaluator: bool = Field(..., description="Whether this worker evaluates rules and sends webhooks")
+    evaluations: int = Field(..., description="Price updates evaluated by this worker")
+    fired: int = Field(..., description="Rules fired by this worker")
+    queued: int = Field(..., description="Events waiting for a webhook call")
+    delivered: int = Field(..., description="Events delivered to the webhook")
+    failed: int = Field(..., description="Events dropped after the webhook kept failing")
+    dropped: int = Field(..., description="Events dropped because the queue was full or no webhook is configured")
+    webhook_calls: int = Field(..., description="Successful webhook calls")
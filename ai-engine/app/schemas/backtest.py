@@ -0,0 +1,128 @@
+"""
+Backtest Pydantic schemas.
+
+This module defines request and response models for strategy backtests over stored bar history.
+"""
+
+from datetime import datetime
+from typing import Literal
+
+from pydantic import BaseModel, Field, model_validator
+
+from app.schemas.stock import TickerSymbol
+
+
+class BacktestRequest(BaseModel):
+    """
+    Request model for backtesting a strategy over a parameter grid.
+
+    `ma_crossover` tries every (fast, slow) pair of `fast_windows` x
+    `slow_windows` with fast < slow; `rebalance` tries every period of
+    `rebalance_periods`. Naive datetimes are interpreted as UTC.
+    """
+
+    tickers: list[TickerSymbol] = Field(..., min_length=1, description="Stock ticker symbols")
+    strategy: Literal["ma_crossover", "rebalance"] = Field(..., description="Strategy to simulate")
+    interval: Literal["1d", "1wk"] = Field(default="1d", description="Bar interval")
+    start: datetime | None = Field(default=None, description="Inclusive range start (defaults to BACKTEST_DEFAULT_LOOKBACK_DAYS ago)")
+    end: datetime | None = Field(default=None, description="Exclusive range end (defaults to now)")
+
+    fast_windows: list[int] = Field(default=[10, 20, 50], min_length=1, description="Fast moving-average windows (bars)")
+    slow_windows: list[int] = Field(default=[50, 100, 200], min_length=1, description="Slow moving-average windows (bars)")
+    allow_short: bool = Field(default=False, description="Short a ticker while its fast average is below the slow one")
+    rebalance_periods: list[int] = Field(default=[21], min_length=1, description="Bars between rebalances")
+    weights: dict[str, float] | None = Field(
+        default=None, description="Rebalance target weights per ticker (default equal; renormalized to 1)"
+    )
+
+    commission_bps: float = Field(default=1.0, ge=0, le=1000, description="Commission per traded value (basis points)")
+    slippage_bps: float = Field(default=5.0, ge=0, le=1000, description="Slippage per traded value (basis points)")
+    initial_capital: float = Field(default=10_000.0, gt=0, description="Equity at the first bar")
+
+    @model_validator(mode="after")
+    def _positive_parameters(self) -> "BacktestRequest":
+        if min(self.fast_windows + self.slow_windows + self.rebalance_periods) < 1:
+            raise ValueError("windows and rebalance periods must be at least 1 bar")
+        if self.weights is not None and (not self.weights or min(self.weights.values()) < 0):
+            raise ValueError("weights must be non-negative and not empty")
+        return self
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "tickers": ["AAPL", "MSFT", "005930.KS"],
+                "strategy": "ma_crossover",
+                "start": "2019-01-01T00:00:00Z",
+                "fast_windows": [10, 20, 50],
+                "slow_windows": [100, 200],
+                "commission_bps": 1.0,
+                "slippage_bps": 5.0
+            }
+        }
+
+
+class BacktestRunSchema(BaseModel):
+    """
+    Summary statistics of one parameter combination.
+
+    Returns and drawdowns are fractions (0.12 = 12%). Volatility, Sharpe
+    ratio (zero risk-free rate) and turnover are annualized; turnover is
+    the traded value per year as a multiple of equity.
+    """
+
+    parameters: dict[str, int] = Field(..., description="Strategy parameters of the run")
+    total_return: float = Field(..., description="Total return after costs")
+    cagr: float = Field(..., description="Compound annual growth rate")
+    volatility: float = Field(..., description="Annualized volatility of period returns")
+    sharpe: float = Field(..., description="Annualized Sharpe ratio")
+    max_drawdown: float = Field(..., description="Deepest fall from an equity high (positive fraction)")
+    turnover: float = Field(..., description="Annualized traded value / equity")
+    exposure: float = Field(..., description="Average gross invested fraction of equity")
+    final_equity: float = Field(..., description="Equity at the last bar")
+
+
+class BacktestCurveSchema(BaseModel):
+    """
+    Equity curve of one parameter combination, aligned with the response timestamps.
+    """
+
+    parameters: dict[str, int] = Field(..., description="Strategy parameters of the run")
+    equity: list[float] = Field(..., description="Equity at each bar")
+    drawdown: list[float] = Field(..., description="Fall from the running equity high at each bar")
+
+
+class BacktestSchema(BaseModel):
+    """
+    Response model for a backtest: every run of the grid, best first, and the best run's equity curve.
+    """
+
+    strategy: str = Field(..., description="Simulated strategy")
+    tickers: list[str] = Field(..., description="Tickers with price history in the range")
+    interval: str = Field(..., description="Bar interval")
+    bars: int = Field(..., description="Bars simulated")
+    timestamps: list[datetime] = Field(..., description="Bar timestamps (UTC)")
+    runs: list[BacktestRunSchema] = Field(..., description="Runs by descending Sharpe ratio")
+    best: BacktestCurveSchema = Field(..., description="Equity curve of the run with the highest Sharpe ratio")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "strategy": "ma_crossover",
+                "tickers": ["AAPL", "MSFT"],
+                "interval": "1d",
+                "bars": 3,
+                "timestamps": ["2024-01-02T00:00:00Z", "2024-01-03T00:00:00Z", "2024-01-04T00:00:00Z"],
+                "runs": [{
+                    "parameters": {"fast": 20, "slow": 100},
+                    "total_return": 0.42,
+                    "cagr": 0.073,
+                    "volatility": 0.14,
+                    "sharpe": 0.58,
+                    "max_drawdown": 0.19,
+                    "turnover": 3.1,
+                    "exposure": 0.64,
+                    "final_equity": 14200.0
+                }],
+                "best": {"parameters": {"fast": 20, "slow": 100}, "equity": [10000.0, 10012.5, 9987.1], "drawdown": [0.0, 0.0, 0.0025]}
+            }
+        }
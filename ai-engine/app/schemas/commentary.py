@@ -0,0 +1,82 @@
+"""
+LLM commentary Pydantic schemas.
+
+This module defines request and response models for the market commentary endpoint.
+"""
+
+from typing import Literal
+
+from pydantic import BaseModel, Field, model_validator
+
+from app.schemas.portfolio import PositionSchema
+from app.schemas.stock import TickerSymbol
+
+
+class CommentaryRequest(BaseModel):
+    """
+    Request model for market commentary on tickers or a portfolio.
+
+    Exactly one of `tickers` and `positions` must be given.
+    """
+
+    tickers: list[TickerSymbol] = Field(default_factory=list, description="Tickers to comment on")
+    positions: list[PositionSchema] = Field(default_factory=list, description="Portfolio holdings to comment on")
+    question: str | None = Field(default=None, max_length=500, description="Optional focus question")
+    language: Literal["ko", "en"] = Field(default="ko", description="Language of the commentary")
+
+    @model_validator(mode="after")
+    def _one_subject(self) -> "CommentaryRequest":
+        if bool(self.tickers) == bool(self.positions):
+            raise ValueError("exactly one of tickers and positions must be given")
+        return self
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "tickers": ["AAPL", "MSFT"],
+                "question": "What is driving these stocks today?",
+                "language": "en"
+            }
+        }
+
+
+class CommentaryUsageSchema(BaseModel):
+    """
+    Tokens an answer cost when it was generated.
+    """
+
+    prompt_tokens: int = Field(..., description="Prompt tokens")
+    completion_tokens: int = Field(..., description="Completion tokens")
+
+
+class CommentarySchema(BaseModel):
+    """
+    Response model for generated market commentary.
+
+    `cached` answers cost no tokens; `usage` reports what they cost when generated.
+    """
+
+    tickers: list[str] = Field(..., description="Tickers the commentary is based on")
+    commentary: str = Field(..., description="Generated commentary")
+    model: str = Field(..., description="LLM that generated the commentary")
+    cached: bool = Field(default=False, description="True if served from the commentary cache")
+    usage: CommentaryUsageSchema = Field(..., description="Token usage of the generation")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "tickers": ["AAPL", "MSFT"],
+                "commentary": "Both names trade near their highs as large-cap tech leads the market...",
+                "model": "gpt-4o-mini",
+                "cached": False,
+                "usage": {"prompt_tokens": 182, "completion_tokens": 143}
+            }
+        }
+
+
+class CommentaryTokenMessage(BaseModel):
+    """
+    Streamed piece of commentary text (SSE event "token").
+    """
+
+    text: str = Field(..., description="Next piece of the commentary")
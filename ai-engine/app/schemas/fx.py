@@ -0,0 +1,66 @@
+"""
+FX rate Pydantic schemas.
+
+This module defines request and response models for exchange rate endpoints.
+"""
+
+from datetime import datetime
+
+from pydantic import BaseModel, Field, model_validator
+
+
+class FxRatesSchema(BaseModel):
+    """
+    Response model for the cross-rate matrix.
+
+    `matrix[i][j]` is the number of units of `currencies[j]` per unit of `currencies[i]`.
+    """
+
+    currencies: list[str] = Field(..., description="Currency codes, in matrix order")
+    matrix: list[list[float]] = Field(..., description="Cross rates: matrix[i][j] = currencies[j] per currencies[i]")
+    as_of: datetime = Field(..., description="Time the rates were taken (UTC)")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "currencies": ["USD", "KRW"],
+                "matrix": [[1.0, 1350.0], [0.000741, 1.0]],
+                "as_of": "2024-03-01T09:00:00Z"
+            }
+        }
+
+
+class FxConvertRequest(BaseModel):
+    """
+    Request model for converting amounts in mixed currencies to one currency.
+    """
+
+    amounts: list[float] = Field(..., min_length=1, max_length=100_000, description="Amounts to convert")
+    currencies: list[str] = Field(..., min_length=1, description="Currency of each amount (same length as amounts)")
+    target: str = Field(..., min_length=3, max_length=3, description="Currency to convert to")
+
+    @model_validator(mode="after")
+    def check_lengths(self) -> "FxConvertRequest":
+        if len(self.amounts) != len(self.currencies):
+            raise ValueError("amounts and currencies must have the same length")
+        return self
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "amounts": [1000, 250000, 12.5],
+                "currencies": ["USD", "KRW", "EUR"],
+                "target": "KRW"
+            }
+        }
+
+
+class FxConvertSchema(BaseModel):
+    """
+    Response model for converted amounts.
+    """
+
+    target: str = Field(..., description="Currency of the converted amounts")
+    amounts: list[float] = Field(..., description="Converted amounts, in request order")
+    total: float = Field(..., description="Sum of the converted amounts")
+    as_of: datetime = Field(..., description="Time the rates were taken (UTC)")
@@ -0,0 +1,54 @@
+"""
+Health check Pydantic schemas.
+
+This module defines the response models of the readiness endpoint.
+"""
+
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+from app.schemas.prediction import ModelStatusSchema
+
+
+class CircuitStatusSchema(BaseModel):
+    """
+    State of one upstream circuit breaker.
+    """
+
+    name: str = Field(..., description="Circuit name (market data provider name)")
+    state: Literal["closed", "open", "half_open"] = Field(..., description="Circuit breaker state")
+    failure_rate: float = Field(..., description="Failed fraction of recent upstream calls")
+    calls: int = Field(..., description="Upstream calls within the failure-rate window")
+    retry_after: float | None = Field(default=None, description="Seconds until an open circuit is probed again")
+
+
+class ReadinessSchema(BaseModel):
+    """
+    Response model for the readiness check.
+
+    `degraded` means the service still serves requests, but some upstream
+    circuit is not closed (its calls fail fast or serve stale quotes).
+    `degraded` is also reported when a model failed to load.
+    `warming_up` means the startup warm-up of the watchlist quotes or the
+    loading of the models has not finished yet.
+    """
+
+    status: Literal["ready", "degraded", "warming_up"] = Field(..., description="Overall readiness")
+    warmed_up: bool = Field(default=True, description="Whether the watchlist quote warm-up has finished")
+    circuits: list[CircuitStatusSchema] = Field(default_factory=list, description="Upstream circuit breakers")
+    models: list[ModelStatusSchema] = Field(default_factory=list, description="Served models and their load state")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "status": "ready",
+                "warmed_up": True,
+                "circuits": [
+                    {"name": "yahoo", "state": "closed", "failure_rate": 0.0, "calls": 42, "retry_after": None}
+                ],
+                "models": [
+                    {"name": "price_direction", "state": "ready", "kind": "logistic", "version": "2024-06-01"}
+                ]
+            }
+        }
@@ -0,0 +1,94 @@
+"""
+Technical indicator Pydantic schemas.
+
+This module defines request and response models for indicator endpoints.
+"""
+
+from datetime import datetime
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+from app.schemas.stock import TickerSymbol
+
+IndicatorName = Literal["sma", "ema", "rsi", "macd", "bollinger", "atr", "volatility"]
+
+
+class IndicatorRequest(BaseModel):
+    """
+    Request model for computing technical indicators over bar history.
+
+    All tickers are aligned on one timeline and computed together.
+    """
+
+    tickers: list[TickerSymbol] = Field(..., min_length=1, description="Stock ticker symbols")
+    interval: Literal["1m", "5m", "15m", "30m", "1h", "1d", "1wk"] = Field(default="1d", description="Bar interval")
+    start: datetime | None = Field(default=None, description="Inclusive range start (ISO 8601)")
+    end: datetime | None = Field(default=None, description="Exclusive range end (ISO 8601)")
+    indicators: list[IndicatorName] = Field(
+        default=["sma", "ema", "rsi", "macd", "bollinger", "atr", "volatility"],
+        min_length=1,
+        description="Indicators to compute"
+    )
+    limit: int | None = Field(default=None, ge=1, description="Return only the last N points of each series")
+
+    sma_window: int = Field(default=20, ge=1, description="SMA window (bars)")
+    ema_span: int = Field(default=20, ge=1, description="EMA span (bars)")
+    rsi_period: int = Field(default=14, ge=1, description="RSI period (bars)")
+    macd_fast: int = Field(default=12, ge=1, description="MACD fast EMA span")
+    macd_slow: int = Field(default=26, ge=1, description="MACD slow EMA span")
+    macd_signal: int = Field(default=9, ge=1, description="MACD signal EMA span")
+    bollinger_window: int = Field(default=20, ge=2, description="Bollinger band window (bars)")
+    bollinger_k: float = Field(default=2.0, gt=0, description="Bollinger band width in standard deviations")
+    atr_period: int = Field(default=14, ge=1, description="ATR period (bars)")
+    volatility_window: int = Field(default=20, ge=2, description="Rolling volatility window (bars)")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "tickers": ["AAPL", "MSFT"],
+                "interval": "1d",
+                "start": "2024-01-01T00:00:00Z",
+                "indicators": ["sma", "rsi", "macd"],
+                "limit": 5
+            }
+        }
+
+
+class IndicatorSeriesSchema(BaseModel):
+    """
+    Indicator values of one ticker, aligned with the response timestamps.
+
+    Values are null during an indicator's warm-up period and before the
+    ticker's first bar.
+    """
+
+    ticker: str = Field(..., description="Stock ticker symbol")
+    values: dict[str, list[float | None]] = Field(
+        ...,
+        description="Series name (e.g., sma, macd_signal, bb_upper) -> values"
+    )
+
+
+class IndicatorsSchema(BaseModel):
+    """
+    Response model for technical indicators.
+    """
+
+    interval: str = Field(..., description="Bar interval")
+    timestamps: list[datetime] = Field(..., description="Bar timestamps shared by all series (UTC)")
+    series: list[IndicatorSeriesSchema] = Field(..., description="Indicator values per ticker")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "interval": "1d",
+                "timestamps": ["2024-03-01T00:00:00Z", "2024-03-04T00:00:00Z"],
+                "series": [
+                    {
+                        "ticker": "AAPL",
+                        "values": {"sma": [181.2, 181.9], "rsi": [48.3, 52.1]}
+                    }
+                ]
+            }
+        }
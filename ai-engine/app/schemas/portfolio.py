@@ -0,0 +1,88 @@
+"""
+Portfolio Pydantic schemas.
+
+This module defines request and response models for portfolio valuation and risk.
+"""
+
+from pydantic import BaseModel, Field
+
+from app.schemas.stock import StockPriceErrorSchema, TickerSymbol
+
+
+class PositionSchema(BaseModel):
+    """
+    One holding of a portfolio.
+    """
+
+    ticker: TickerSymbol = Field(..., description="Stock ticker symbol (e.g., AAPL, 005930.KS)")
+    quantity: float = Field(..., description="Number of shares held (negative for short positions)")
+
+
+class PortfolioRiskRequest(BaseModel):
+    """
+    Request model for portfolio valuation and risk.
+
+    Positions of the same ticker are summed. Each position is priced in its
+    quote currency and converted to `base_currency`.
+    """
+
+    positions: list[PositionSchema] = Field(..., min_length=1, description="Portfolio holdings")
+    base_currency: str = Field(
+        default="USD", min_length=3, max_length=3, description="Currency of all reported amounts"
+    )
+    lookback_days: int = Field(
+        default=365, ge=30, le=3650, description="Calendar days of daily return history used for risk"
+    )
+    confidence: float = Field(default=0.95, gt=0.5, lt=1.0, description="VaR confidence level")
+    horizon_days: int = Field(default=1, ge=1, le=250, description="VaR and volatility horizon in trading days")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "positions": [
+                    {"ticker": "AAPL", "quantity": 10},
+                    {"ticker": "005930.KS", "quantity": 50}
+                ],
+                "base_currency": "KRW",
+                "confidence": 0.99
+            }
+        }
+
+
+class PositionRiskSchema(BaseModel):
+    """
+    Valuation and risk of one position.
+    """
+
+    ticker: str = Field(..., description="Stock ticker symbol")
+    quantity: float = Field(..., description="Number of shares held")
+    currency: str = Field(..., description="Quote currency of the ticker")
+    price: float = Field(..., description="Current price in the quote currency")
+    fx_rate: float = Field(..., description="Base currency units per unit of the quote currency")
+    market_value: float = Field(..., description="Position value in the base currency")
+    weight: float = Field(..., description="Share of the portfolio market value")
+    daily_pnl: float = Field(..., description="Value change since the last completed daily close, in the base currency")
+    risk_contribution: float = Field(..., description="Share of the portfolio volatility, in the base currency")
+    risk_contribution_pct: float = Field(..., description="risk_contribution / portfolio volatility")
+
+
+class PortfolioRiskSchema(BaseModel):
+    """
+    Response model for portfolio valuation and risk.
+
+    Risk figures are positive amounts in the base currency over `horizon_days`.
+    Positions that could not be priced are listed in `errors` and excluded;
+    positions without return history are valued but carry no risk.
+    """
+
+    base_currency: str = Field(..., description="Currency of all amounts")
+    market_value: float = Field(..., description="Total market value")
+    daily_pnl: float = Field(..., description="Value change since the last completed daily closes")
+    volatility: float = Field(..., description="Standard deviation of portfolio P&L (covariance based)")
+    var_historical: float = Field(..., description="Historical-simulation value at risk")
+    var_parametric: float = Field(..., description="Parametric (normal) value at risk")
+    confidence: float = Field(..., description="VaR confidence level")
+    horizon_days: int = Field(..., description="Risk horizon in trading days")
+    observations: int = Field(..., description="Daily returns used for risk")
+    positions: list[PositionRiskSchema] = Field(default_factory=list, description="Per-position valuation and risk")
+    errors: list[StockPriceErrorSchema] = Field(default_factory=list, description="Positions that could not be priced")
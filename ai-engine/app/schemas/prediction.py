@@ -0,0 +1,73 @@
+"""
+Prediction Pydantic schemas.
+
+This module defines request and response models for model inference endpoints.
+"""
+
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+
+class PredictionRequest(BaseModel):
+    """
+    Request model for a price-direction prediction.
+
+    Each instance is one feature vector in the order listed by
+    GET /predictions/models for the model.
+    """
+
+    instances: list[list[float]] = Field(..., min_length=1, description="Feature vectors, one per prediction")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "instances": [
+                    [0.012, -0.004, 0.031, 0.22, 58.4],
+                    [-0.020, -0.011, -0.045, 0.35, 31.9]
+                ]
+            }
+        }
+
+
+class PredictionSchema(BaseModel):
+    """
+    Response model for a prediction, one entry per instance.
+    """
+
+    model: str = Field(..., description="Model name")
+    version: str = Field(..., description="Model artifact version")
+    probabilities: list[float] = Field(..., description="Probability that the price moves up, per instance")
+    directions: list[Literal["up", "down"]] = Field(..., description="Predicted direction (probability >= 0.5 is up)")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "model": "price_direction",
+                "version": "2024-06-01",
+                "probabilities": [0.64, 0.31],
+                "directions": ["up", "down"]
+            }
+        }
+
+
+class ModelStatusSchema(BaseModel):
+    """
+    Load status of a served model.
+    """
+
+    name: str = Field(..., description="Model name")
+    state: Literal["loading", "ready", "failed"] = Field(..., description="Load state")
+    kind: str | None = Field(default=None, description="Runtime (logistic, onnx, sklearn)")
+    version: str | None = Field(default=None, description="Artifact version")
+    features: list[str] = Field(default_factory=list, description="Input feature names, in order")
+    load_seconds: float | None = Field(default=None, description="Load and warm-up time in seconds")
+    error: str | None = Field(default=None, description="Load error, if the model failed to load")
+
+
+class ModelListSchema(BaseModel):
+    """
+    Response model for the served models.
+    """
+
+    models: list[ModelStatusSchema] = Field(default_factory=list, description="Models found in INFERENCE_MODEL_PATH")
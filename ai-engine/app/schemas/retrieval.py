@@ -0,0 +1,151 @@
+"""
+Document retrieval Pydantic schemas.
+
+This module defines request and response models for the news/filing retrieval endpoints.
+"""
+
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+from app.schemas.stock import TickerSymbol
+
+
+class DocumentSchema(BaseModel):
+    """
+    A news article or filing to index.
+
+    Re-ingesting a document with the same `id` replaces it. Naive datetimes
+    are interpreted as UTC.
+    """
+
+    id: str = Field(..., min_length=1, max_length=200, description="Document ID (e.g., URL or filing accession number)")
+    ticker: TickerSymbol = Field(..., description="Ticker the document is about")
+    published_at: datetime = Field(..., description="Publication time (ISO 8601)")
+    title: str = Field(default="", max_length=500, description="Title")
+    text: str = Field(..., min_length=1, description="Full text")
+    source: str | None = Field(default=None, max_length=100, description="Publisher or filing type")
+    url: str | None = Field(default=None, max_length=2000, description="Link to the original")
+
+
+class IngestRequest(BaseModel):
+    """
+    Request model for indexing documents.
+    """
+
+    documents: list[DocumentSchema] = Field(..., min_length=1, description="Documents to index")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "documents": [{
+                    "id": "news-20240601-aapl-001",
+                    "ticker": "AAPL",
+                    "published_at": "2024-06-01T13:30:00Z",
+                    "title": "Apple unveils on-device AI features",
+                    "text": "Apple announced a set of on-device AI features at its developer conference...",
+                    "source": "Reuters",
+                    "url": "https://example.com/aapl-ai"
+                }]
+            }
+        }
+
+
+class IngestResultSchema(BaseModel):
+    """
+    Response model for indexed documents.
+    """
+
+    documents: int = Field(..., description="Documents indexed")
+    chunks: int = Field(..., description="Chunks embedded and indexed")
+    replaced: int = Field(..., description="Documents that replaced an indexed version")
+
+
+class DeletedDocumentSchema(BaseModel):
+    """
+    Response model for a removed document.
+    """
+
+    document_id: str = Field(..., description="Document ID")
+    chunks: int = Field(..., description="Chunks removed")
+
+
+class SearchRequest(BaseModel):
+    """
+    Request model for a similarity search over indexed chunks.
+
+    Naive datetimes are interpreted as UTC.
+    """
+
+    query: str = Field(..., min_length=1, max_length=2000, description="Search text")
+    top_k: int = Field(default=5, ge=1, description="Maximum results")
+    tickers: list[TickerSymbol] = Field(default_factory=list, description="Only documents about these tickers")
+    start: datetime | None = Field(default=None, description="Only documents published at or after this time")
+    end: datetime | None = Field(default=None, description="Only documents published before this time")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "query": "on-device AI announcements",
+                "top_k": 3,
+                "tickers": ["AAPL"],
+                "start": "2024-01-01T00:00:00Z"
+            }
+        }
+
+
+class SearchHitSchema(BaseModel):
+    """
+    A matching chunk of an indexed document.
+    """
+
+    document_id: str = Field(..., description="Document ID")
+    chunk: int = Field(..., description="Chunk number within the document")
+    ticker: str = Field(..., description="Ticker the document is about")
+    published_at: datetime = Field(..., description="Publication time (UTC)")
+    title: str = Field(..., description="Document title")
+    source: str | None = Field(default=None, description="Publisher or filing type")
+    url: str | None = Field(default=None, description="Link to the original")
+    text: str = Field(..., description="Chunk text")
+    score: float = Field(..., description="Cosine similarity to the query")
+
+
+class SearchResultSchema(BaseModel):
+    """
+    Response model for a similarity search.
+    """
+
+    query: str = Field(..., description="Search text")
+    hits: list[SearchHitSchema] = Field(..., description="Matching chunks by descending score")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "query": "on-device AI announcements",
+                "hits": [{
+                    "document_id": "news-20240601-aapl-001",
+                    "chunk": 0,
+                    "ticker": "AAPL",
+                    "published_at": "2024-06-01T13:30:00Z",
+                    "title": "Apple unveils on-device AI features",
+                    "source": "Reuters",
+                    "url": "https://example.com/aapl-ai",
+                    "text": "Apple announced a set of on-device AI features at its developer conference...",
+                    "score": 0.71
+                }]
+            }
+        }
+
+
+class RetrievalStatsSchema(BaseModel):
+    """
+    Response model for the size and layout of the retrieval index.
+    """
+
+    embedder: str = Field(..., description="Embedding model of the index")
+    dims: int = Field(..., description="Vector dimensions")
+    chunks: int = Field(..., description="Indexed chunks (excluding deleted ones)")
+    deleted_chunks: int = Field(..., description="Deleted chunks not compacted away yet")
+    unsorted_chunks: int = Field(..., description="Chunks added since the last compaction (scanned exactly)")
+    lists: int = Field(..., description="Inverted lists (1 until enough chunks exist to train the index)")
+    trained: bool = Field(..., description="Whether the list centroids are trained")
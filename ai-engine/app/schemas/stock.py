@@ -4,8 +4,13 @@ Stock-related Pydantic schemas.
 This module defines request and response models for stock-related endpoints.
 """
 
+from datetime import datetime
+from typing import Annotated, Any, Literal
+
 from pydantic import BaseModel, Field
 
+TickerSymbol = Annotated[str, Field(min_length=1, max_length=10)]
+
 
 class StockPriceRequest(BaseModel):
     """
@@ -15,11 +20,36 @@ class StockPriceRequest(BaseModel):
     """
 
     ticker: str = Field(..., min_length=1, max_length=10, description="Stock ticker symbol (e.g., AAPL, GOOGL)")
+    base_currency: str | None = Field(
+        default=None, min_length=3, max_length=3, description="Also report the price in this currency (e.g., KRW)"
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "ticker": "AAPL",
+                "base_currency": "KRW"
+            }
+        }
+
+
+class StockPricesRequest(BaseModel):
+    """
+    Request model for getting stock prices of several tickers at once.
+
+    Duplicate tickers (case-insensitive) are fetched only once.
+    """
+
+    tickers: list[TickerSymbol] = Field(..., min_length=1, description="Stock ticker symbols (e.g., AAPL, 005930.KS)")
+    base_currency: str | None = Field(
+        default=None, min_length=3, max_length=3, description="Also report every price in this currency (e.g., USD)"
+    )
 
     class Config:
         json_schema_extra = {
             "example": {
-                "ticker": "AAPL"
+                "tickers": ["AAPL", "MSFT", "005930.KS"],
+                "base_currency": "USD"
             }
         }
 
@@ -34,7 +64,18 @@ class StockPriceSchema(BaseModel):
     ticker: str = Field(..., description="Stock ticker symbol")
     current_price: float = Field(..., description="Current stock price")
     currency: str = Field(..., description="Currency code (e.g., USD, KRW)")
-    market_status: str = Field(..., description="Market status (e.g., open, closed)")
+    market_status: str = Field(
+        ...,
+        description="Market status from the exchange calendar: open or closed (open for exchanges without a calendar)"
+    )
+    stale: bool = Field(
+        default=False,
+        description="True if this is the last known good quote served while a fresh one is fetched"
+    )
+    base_currency: str | None = Field(default=None, description="Requested base currency, if any")
+    base_price: float | None = Field(
+        default=None, description="current_price converted to base_currency (None if the currency has no rate)"
+    )
 
     class Config:
         json_schema_extra = {
@@ -42,6 +83,134 @@ class StockPriceSchema(BaseModel):
                 "ticker": "AAPL",
                 "current_price": 182.52,
                 "currency": "USD",
-                "market_status": "open"
+                "market_status": "open",
+                "stale": False
+            }
+        }
+
+
+class StockPriceErrorSchema(BaseModel):
+    """
+    Per-ticker error entry of a batch price response.
+    """
+
+    ticker: str = Field(..., description="Stock ticker symbol that failed")
+    message: str = Field(..., description="Error message")
+    details: dict[str, Any] | None = Field(default=None, description="Additional error details")
+
+
+class StockPricesSchema(BaseModel):
+    """
+    Response model for batch stock price data.
+
+    Successful and failed tickers are reported separately so that one bad
+    symbol does not fail the whole batch. Both lists keep the request order.
+    """
+
+    prices: list[StockPriceSchema] = Field(default_factory=list, description="Prices of tickers fetched successfully")
+    errors: list[StockPriceErrorSchema] = Field(default_factory=list, description="Tickers that could not be fetched")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "prices": [
+                    {
+                        "ticker": "AAPL",
+                        "current_price": 182.52,
+                        "currency": "USD",
+                        "market_status": "open"
+                    }
+                ],
+                "errors": [
+                    {
+                        "ticker": "NOPE",
+                        "message": "Unable to fetch stock data for ticker: NOPE",
+                        "details": {"ticker": "NOPE", "error": "Invalid ticker or data not available"}
+                    }
+                ]
+            }
+        }
+
+
+class QuoteCacheStatsSchema(BaseModel):
+    """
+    Response model for quote cache counters.
+
+    Used to tune cache TTLs against upstream load.
+    """
+
+    hits: int = Field(..., description="Lookups served from the cache")
+    misses: int = Field(..., description="Lookups not served from the cache")
+    loads: int = Field(..., description="Upstream loads started on a miss")
+    coalesced: int = Field(..., description="Misses that joined an in-flight load instead of starting one")
+    evictions: int = Field(..., description="Entries evicted because the cache was full")
+    expirations: int = Field(..., description="Entries dropped because their TTL elapsed")
+    stale_hits: int = Field(..., description="Expired quotes served as stale while being refreshed")
+    size: int = Field(..., description="Current number of entries")
+    max_size: int = Field(..., description="Maximum number of entries")
+    hit_ratio: float = Field(..., description="hits / (hits + misses)")
+
+
+class StockHistoryRequest(BaseModel):
+    """
+    Request model for getting historical OHLCV bars.
+
+    Naive datetimes are interpreted as UTC. `end` defaults to now and `start`
+    to HISTORY_DEFAULT_LOOKBACK_DAYS before `end`.
+    """
+
+    ticker: TickerSymbol = Field(..., description="Stock ticker symbol (e.g., AAPL, GOOGL)")
+    interval: Literal["1m", "5m", "15m", "30m", "1h", "1d", "1wk"] = Field(default="1d", description="Bar interval")
+    start: datetime | None = Field(default=None, description="Inclusive range start (ISO 8601)")
+    end: datetime | None = Field(default=None, description="Exclusive range end (ISO 8601)")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "ticker": "AAPL",
+                "interval": "1d",
+                "start": "2024-01-01T00:00:00Z",
+                "end": "2024-02-01T00:00:00Z"
+            }
+        }
+
+
+class BarSchema(BaseModel):
+    """
+    One OHLCV bar.
+    """
+
+    timestamp: datetime = Field(..., description="Bar start time (UTC)")
+    open: float = Field(..., description="Open price")
+    high: float = Field(..., description="High price")
+    low: float = Field(..., description="Low price")
+    close: float = Field(..., description="Close price")
+    volume: int = Field(..., description="Traded volume")
+
+
+class StockHistorySchema(BaseModel):
+    """
+    Response model for historical OHLCV bars.
+    """
+
+    ticker: str = Field(..., description="Stock ticker symbol")
+    interval: str = Field(..., description="Bar interval")
+    bars: list[BarSchema] = Field(default_factory=list, description="Bars sorted by timestamp")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "ticker": "AAPL",
+                "interval": "1d",
+                "bars": [
+                    {
+                        "timestamp": "2024-01-02T00:00:00Z",
+                        "open": 187.15,
+                        "high": 188.44,
+                        "low": 183.89,
+                        "close": 185.64,
+                        "volume": 82488700
+                    }
+                ]
             }
         }
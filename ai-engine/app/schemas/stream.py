@@ -0,0 +1,47 @@
+"""
+Quote streaming Pydantic schemas.
+
+This module defines the messages exchanged over the quote streaming endpoints.
+"""
+
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+from app.schemas.stock import StockPriceSchema, TickerSymbol
+
+
+class StreamCommand(BaseModel):
+    """
+    Client -> server WebSocket message.
+    """
+
+    action: Literal["subscribe", "unsubscribe"] = Field(..., description="Subscription change")
+    tickers: list[TickerSymbol] = Field(..., min_length=1, description="Stock ticker symbols")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "action": "subscribe",
+                "tickers": ["AAPL", "005930.KS"]
+            }
+        }
+
+
+class QuoteUpdateMessage(BaseModel):
+    """
+    Server -> client message with the latest quotes of changed tickers.
+    """
+
+    type: Literal["quotes"] = Field(default="quotes", description="Message type")
+    data: list[StockPriceSchema] = Field(..., description="Latest quote of every ticker updated since the last message")
+
+
+class StreamStatusMessage(BaseModel):
+    """
+    Server -> client message acknowledging a command or reporting an error.
+    """
+
+    type: Literal["subscribed", "unsubscribed", "error"] = Field(..., description="Message type")
+    tickers: list[str] = Field(default_factory=list, description="Tickers currently subscribed")
+    message: str | None = Field(default=None, description="Error message")
@@ -0,0 +1,339 @@
+"""
+Production server entry point.
+
+    $ python -m app [--host HOST] [--port PORT] [--workers N]
+
+Pre-fork model: the master process imports the application once, freezes
+the objects created so far (so the garbage collector never writes to their
+pages) and forks the workers, which share those pages copy-on-write instead
+of each importing the app. Every worker runs a uvicorn server (uvloop and
+httptools when installed) on the listening socket bound by the master; the
+master only supervises them and replaces workers that die.
+
+Signals (sent to the master):
+    SIGTERM, SIGINT  Graceful drain: workers stop accepting connections,
+                     finish in-flight requests (up to SERVER_GRACEFUL_TIMEOUT
+                     seconds) and run the shutdown lifespan; stragglers are killed.
+    SIGHUP           Graceful reload: a new generation of workers is started,
+                     then the old one is drained, so no connection is refused.
+                     Code and settings are preloaded, so changes to them need
+                     a restart.
+
+With PROMETHEUS_MULTIPROC_DIR set (python -m app sets it), the master marks
+exited workers dead so their gauges leave the aggregated metrics.
+"""
+
+import argparse
+import gc
+import importlib.util
+import math
+import os
+import signal
+import socket
+import sys
+import time
+from pathlib import Path
+from types import FrameType
+
+import uvicorn
+from prometheus_client import multiprocess
+
+from app.config.settings import Settings, get_settings
+from app.core.logging import get_logger, shutdown_logging
+from app.core.metrics import multiprocess_enabled
+
+logger = get_logger(__name__)
+
+# Exit code of a worker whose application failed to start (same as uvicorn)
+STARTUP_FAILURE = 3
+
+# Seconds on top of SERVER_GRACEFUL_TIMEOUT a draining worker gets for its shutdown lifespan
+_KILL_GRACE = 5.0
+
+_POLL_INTERVAL = 0.1
+
+
+def available_cpus() -> int:
+    """
+    Count the CPUs this process may use.
+
+    Honours the CPU affinity mask and, in a container, the cgroup v2 CPU quota.
+
+    Returns:
+        int: Usable CPUs (at least 1)
+    """
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+    try:
+        quota, period = Path("/sys/fs/cgroup/cpu.max").read_text().split()
+        if quota != "max":
+            cpus = min(cpus, math.ceil(int(quota) / int(period)))
+    except (OSError, ValueError):
+        pass
+    return max(1, cpus)
+
+
+def worker_count(settings: Settings) -> int:
+    """
+    Number of workers to run.
+
+    Args:
+        settings: Application settings
+
+    Returns:
+        int: SERVER_WORKERS if set, otherwise one worker per available CPU
+    """
+    return settings.server_workers if settings.server_workers > 0 else available_cpus()
+
+
+def resolve_loop(loop: str) -> str:
+    """
+    Resolve the event loop choice ("auto" picks uvloop when installed).
+    """
+    if loop != "auto":
+        return loop
+    return "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+
+
+def resolve_http(http: str) -> str:
+    """
+    Resolve the HTTP parser choice ("auto" picks httptools when installed).
+    """
+    if http != "auto":
+        return http
+    return "httptools" if importlib.util.find_spec("httptools") else "h11"
+
+
+class _WorkerServer(uvicorn.Server):
+    """
+    uvicorn server of one worker, logging how long it took to become ready.
+    """
+
+    def __init__(self, config: uvicorn.Config, launched: float):
+        super().__init__(config)
+        self.launched = launched
+        self.forked = time.monotonic()
+
+    async def startup(self, sockets: list[socket.socket] | None = None) -> None:
+        await super().startup(sockets=sockets)
+        if self.started:
+            now = time.monotonic()
+            logger.info(
+                "Worker %d ready %.3fs after fork (%.3fs after launch)",
+                os.getpid(), now - self.forked, now - self.launched
+            )
+
+
+class PreforkServer:
+    """
+    Master process forking and supervising uvicorn workers on one socket.
+    """
+
+    def __init__(
+        self,
+        config: uvicorn.Config,
+        workers: int,
+        graceful_timeout: float,
+        launched: float | None = None
+    ):
+        """
+        Initialize the server.
+
+        Args:
+            config: uvicorn config holding the (preloaded) application
+            workers: Number of workers to keep running
+            graceful_timeout: Seconds in-flight requests get to finish on shutdown
+            launched: time.monotonic() at process launch, for worker startup logs (defaults to now)
+        """
+        self.config = config
+        self.workers = workers
+        self.graceful_timeout = graceful_timeout
+        self.launched = launched if launched is not None else time.monotonic()
+        self._pids: dict[int, int] = {}  # worker pid -> generation
+        self._generation = 0
+        self._signals: list[int] = []
+
+    def run(self) -> int:
+        """
+        Bind the socket, fork the workers and supervise them until told to stop.
+
+        Returns:
+            int: Process exit code (STARTUP_FAILURE if a worker failed to boot)
+        """
+        if not self.config.loaded:
+            self.config.load()
+        sock = self.config.bind_socket()
+
+        # Objects created so far are never collected; keeping the collector off
+        # their pages lets the workers keep sharing them
+        gc.collect()
+        gc.freeze()
+
+        for sig in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP):
+            signal.signal(sig, self._on_signal)
+
+        exit_code = 0
+        while True:
+            exit_code = self._reap()
+            if exit_code or any(sig != signal.SIGHUP for sig in self._signals):
+                break
+            if self._signals:
+                self._signals.clear()
+                self._reload(sock)
+            self._spawn_missing(sock)
+            time.sleep(_POLL_INTERVAL)
+
+        logger.info("Draining %d workers", len(self._pids))
+        self._drain(list(self._pids))
+        sock.close()
+        return exit_code
+
+    def _on_signal(self, sig: int, frame: FrameType | None) -> None:
+        self._signals.append(sig)
+
+    def _spawn_missing(self, sock: socket.socket) -> None:
+        current = sum(1 for generation in self._pids.values() if generation == self._generation)
+        for _ in range(self.workers - current):
+            self._spawn(sock)
+
+    def _spawn(self, sock: socket.socket) -> None:
+        pid = os.fork()
+        if pid:
+            self._pids[pid] = self._generation
+            return
+
+        # Worker: uvicorn installs its own SIGTERM/SIGINT handlers while serving
+        exit_code = STARTUP_FAILURE
+        try:
+            for sig in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP):
+                signal.signal(sig, signal.SIG_IGN)
+            server = _WorkerServer(self.config, self.launched)
+            server.run(sockets=[sock])
+            if server.started:
+                exit_code = 0
+        except BaseException:
+            logger.exception("Worker %d crashed", os.getpid())
+            exit_code = 1
+        finally:
+            shutdown_logging()
+            os._exit(exit_code)
+
+    def _reap(self) -> int:
+        """
+        Collect exited workers.
+
+        Returns:
+            int: STARTUP_FAILURE if a current worker failed to boot, otherwise 0
+        """
+        while self._pids:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                self._pids.clear()
+                break
+            if pid == 0:
+                break
+            _mark_dead(pid)
+            generation = self._pids.pop(pid, None)
+            if generation != self._generation:
+                continue
+            code = os.waitstatus_to_exitcode(status)
+            if code == STARTUP_FAILURE:
+                logger.error("Worker %d failed to boot, shutting down", pid)
+                return STARTUP_FAILURE
+            logger.warning("Worker %d exited with code %d, replacing it", pid, code)
+        return 0
+
+    def _reload(self, sock: socket.socket) -> None:
+        old = list(self._pids)
+        self._generation += 1
+        logger.info("Reloading: starting %d workers, draining %d", self.workers, len(old))
+        self._spawn_missing(sock)
+        for pid in old:
+            self._signal(pid, signal.SIGTERM)
+
+    def _drain(self, pids: list[int]) -> None:
+        for pid in pids:
+            self._signal(pid, signal.SIGTERM)
+        deadline = time.monotonic() + self.graceful_timeout + _KILL_GRACE
+        # Workers of no current generation are never replaced
+        self._generation = -1
+        while self._pids and time.monotonic() < deadline:
+            self._reap()
+            time.sleep(_POLL_INTERVAL / 2)
+        for pid in list(self._pids):
+            logger.warning("Worker %d did not drain in time, killing it", pid)
+            self._signal(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+            _mark_dead(pid)
+            self._pids.pop(pid)
+
+    @staticmethod
+    def _signal(pid: int, sig: int) -> None:
+        try:
+            os.kill(pid, sig)
+        except ProcessLookupError:
+            pass
+
+
+def _mark_dead(pid: int) -> None:
+    """
+    Drop the live gauges of an exited worker from the shared metrics.
+    """
+    if multiprocess_enabled():
+        multiprocess.mark_process_dead(pid)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Run the production server.
+
+    Args:
+        argv: Command line arguments (defaults to sys.argv[1:])
+
+    Returns:
+        int: Process exit code
+    """
+    settings = get_settings()
+    parser = argparse.ArgumentParser(prog="python -m app", description="Run the AI Engine API server.")
+    parser.add_argument("--host", default=settings.server_host, help="Bind address (SERVER_HOST)")
+    parser.add_argument("--port", type=int, default=settings.server_port, help="Bind port (SERVER_PORT)")
+    parser.add_argument(
+        "--workers", type=int, default=worker_count(settings),
+        help="Worker processes (SERVER_WORKERS, default: one per available CPU)"
+    )
+    args = parser.parse_args(argv)
+
+    launched = time.monotonic()
+    # Preload: workers inherit the imported application instead of importing it again
+    from app.main import app
+
+    loop, http = resolve_loop(settings.server_loop), resolve_http(settings.server_http)
+    config = uvicorn.Config(
+        app,
+        host=args.host,
+        port=args.port,
+        loop=loop,
+        http=http,
+        lifespan="on",
+        # Records propagate to the application's log pipeline; requests are timed by MetricsMiddleware
+        log_config=None,
+        access_log=False,
+        timeout_graceful_shutdown=settings.server_graceful_timeout
+    )
+    config.load()
+    logger.info(
+        "Preloaded application in %.3fs; starting %d workers on %s:%d (loop=%s, http=%s)",
+        time.monotonic() - launched, args.workers, args.host, args.port, loop, http
+    )
+
+    server = PreforkServer(
+        config,
+        workers=args.workers,
+        graceful_timeout=settings.server_graceful_timeout,
+        launched=launched
+    )
+    return server.run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
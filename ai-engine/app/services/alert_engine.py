@@ -0,0 +1,418 @@
+"""
+Price alert rule engine.
+
+Every rule is reduced to one or two price levels it watches, and each
+ticker keeps the armed levels of its rules in two sorted arrays: levels to
+be crossed upwards and levels to be crossed downwards. A price update from
+`previous` to `price` can only fire the rules whose level lies between the
+two, which bisection finds in O(log rules + fired), so thousands of rules
+on one ticker cost about as much per tick as one.
+
+    - threshold: fires when the price crosses a fixed level.
+    - percent_move: fires when the price moves `percent` from a reference
+      price (by default the first price seen), i.e. leaves the band
+      [reference * (1 - percent), reference * (1 + percent)]. Repeating rules
+      are re-armed around the price that fired them.
+    - indicator_cross: fires when the price crosses a moving average of daily
+      closes. The average is supplied with set_indicator() as it is
+      refreshed, and also fires the rule if the line moves across the price.
+
+Rules fire on crossings only: a rule whose level is already behind the
+price when it is armed waits until the price comes back and crosses it.
+One-shot rules are removed when they fire. Repeating threshold and
+indicator rules stay armed and fire again only after the price has crossed
+back. No I/O happens here; see app.services.alert_service.
+
+Not thread-safe; meant to be used from a single event loop.
+"""
+
+import bisect
+import dataclasses
+import uuid
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import Literal
+
+RuleKind = Literal["threshold", "percent_move", "indicator_cross"]
+Direction = Literal["above", "below", "any"]
+Indicator = Literal["sma", "ema"]
+Side = Literal["above", "below"]
+
+
+@dataclass(frozen=True)
+class AlertRule:
+    """
+    A price alert rule.
+
+    `level` is the threshold of threshold rules, `percent` (0.05 = 5%) and
+    `reference` define percent_move rules, and `indicator` and `period`
+    (in daily bars) the moving average of indicator_cross rules. `direction`
+    is "above" (crossed upwards), "below" (crossed downwards) or "any"
+    (percent_move only).
+    """
+
+    id: str
+    ticker: str
+    kind: RuleKind
+    direction: Direction
+    level: float | None = None
+    percent: float | None = None
+    reference: float | None = None
+    indicator: Indicator | None = None
+    period: int | None = None
+    repeat: bool = False
+    metadata: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class AlertEvent:
+    """
+    A fired rule.
+
+    `level` is the crossed level and `previous_price` the price before the
+    crossing (for indicator moves, the price the line moved across).
+    """
+
+    id: str
+    rule_id: str
+    ticker: str
+    kind: RuleKind
+    direction: Side
+    level: float
+    price: float
+    previous_price: float
+    timestamp: float
+    metadata: dict[str, str]
+
+
+class SortedLevels:
+    """
+    Price levels with their rule ids, kept sorted for range queries.
+    """
+
+    def __init__(self) -> None:
+        self.levels: list[float] = []
+        self.rule_ids: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self.levels)
+
+    def add(self, level: float, rule_id: str) -> None:
+        """
+        Insert a level, after any equal levels.
+        """
+        index = bisect.bisect_right(self.levels, level)
+        self.levels.insert(index, level)
+        self.rule_ids.insert(index, rule_id)
+
+    def remove(self, level: float, rule_id: str) -> None:
+        """
+        Remove a level added with add().
+        """
+        index = bisect.bisect_left(self.levels, level)
+        while self.rule_ids[index] != rule_id:
+            index += 1
+        del self.levels[index]
+        del self.rule_ids[index]
+
+    def rising(self, previous: float, price: float) -> list[tuple[float, str]]:
+        """
+        Levels crossed upwards by a move from previous to price: previous < level <= price.
+        """
+        lo = bisect.bisect_right(self.levels, previous)
+        hi = bisect.bisect_right(self.levels, price)
+        return list(zip(self.levels[lo:hi], self.rule_ids[lo:hi], strict=True))
+
+    def falling(self, previous: float, price: float) -> list[tuple[float, str]]:
+        """
+        Levels crossed downwards by a move from previous to price: price <= level < previous.
+        """
+        lo = bisect.bisect_left(self.levels, price)
+        hi = bisect.bisect_left(self.levels, previous)
+        return list(zip(self.levels[lo:hi], self.rule_ids[lo:hi], strict=True))[::-1]
+
+
+class TickerBook:
+    """
+    Rules of one ticker and their armed levels.
+    """
+
+    def __init__(self) -> None:
+        self.rules: dict[str, AlertRule] = {}
+        self.armed: dict[tuple[str, Side], float] = {}
+        self.above = SortedLevels()
+        self.below = SortedLevels()
+
+    def arm(self, rule_id: str, side: Side, level: float) -> None:
+        """
+        Watch a level of a rule, replacing the rule's previous level on that side.
+        """
+        self.disarm(rule_id, side)
+        self.armed[(rule_id, side)] = level
+        (self.above if side == "above" else self.below).add(level, rule_id)
+
+    def disarm(self, rule_id: str, side: Side | None = None) -> None:
+        """
+        Stop watching the level of a rule on one side (both by default).
+        """
+        for current in ("above", "below") if side is None else (side,):
+            level = self.armed.pop((rule_id, current), None)
+            if level is not None:
+                (self.above if current == "above" else self.below).remove(level, rule_id)
+
+
+class AlertEngine:
+    """
+    Rules of all tickers, the last price of each ticker and crossing detection.
+    """
+
+    def __init__(self) -> None:
+        self._books: dict[str, TickerBook] = {}
+        self._ticker_of: dict[str, str] = {}
+        self._prices: dict[str, float] = {}
+        self._indicators: dict[tuple[str, Indicator, int], float] = {}
+        # Rules changed by firing since the last take_changes(): removed one-shot rules and rebased references
+        self._fired_once: dict[str, AlertRule] = {}
+        self._rebased: dict[str, AlertRule] = {}
+        self.evaluations = 0
+        self.fired = 0
+
+    @property
+    def tickers(self) -> list[str]:
+        """
+        Tickers with at least one rule.
+        """
+        return list(self._books)
+
+    def __len__(self) -> int:
+        return len(self._ticker_of)
+
+    def rules(self, ticker: str | None = None) -> list[AlertRule]:
+        """
+        Current rules (percent_move references as rebased by firing), of one ticker or all.
+        """
+        if ticker is None:
+            books = list(self._books.values())
+        else:
+            books = [self._books[ticker]] if ticker in self._books else []
+        return [rule for book in books for rule in book.rules.values()]
+
+    def get(self, rule_id: str) -> AlertRule | None:
+        """
+        The current version of a rule, if it exists.
+        """
+        ticker = self._ticker_of.get(rule_id)
+        return None if ticker is None else self._books[ticker].rules[rule_id]
+
+    def last_price(self, ticker: str) -> float | None:
+        """
+        Last price evaluated for a ticker.
+        """
+        return self._prices.get(ticker)
+
+    def armed_levels(self, rule_id: str) -> dict[str, float]:
+        """
+        Levels a rule currently watches (empty until its reference or indicator is known).
+        """
+        rule = self.get(rule_id)
+        if rule is None:
+            return {}
+        armed = self._books[rule.ticker].armed
+        return {side: armed[(rule_id, side)] for side in ("above", "below") if (rule_id, side) in armed}
+
+    def indicator_keys(self) -> set[tuple[str, Indicator, int]]:
+        """
+        (ticker, indicator, period) of every indicator_cross rule.
+        """
+        return {
+            (rule.ticker, rule.indicator, rule.period)
+            for book in self._books.values()
+            for rule in book.rules.values()
+            if rule.kind == "indicator_cross" and rule.indicator is not None and rule.period is not None
+        }
+
+    def upsert(self, rules: Iterable[AlertRule]) -> None:
+        """
+        Add rules, or replace rules with the same id (unchanged rules keep their armed state).
+        """
+        for rule in rules:
+            current = self.get(rule.id)
+            if current == rule:
+                continue
+            if current is not None:
+                self._discard(current)
+            book = self._books.setdefault(rule.ticker, TickerBook())
+            book.rules[rule.id] = rule
+            self._ticker_of[rule.id] = rule.ticker
+            self._fired_once.pop(rule.id, None)
+            self._arm(book, rule)
+
+    def remove(self, rule_ids: Iterable[str]) -> list[str]:
+        """
+        Remove rules by id.
+
+        Returns:
+            list[str]: Ids of the rules that existed
+        """
+        removed = []
+        for rule_id in rule_ids:
+            rule = self.get(rule_id)
+            if rule is not None:
+                self._discard(rule)
+                removed.append(rule_id)
+        return removed
+
+    def replace(self, rules: Iterable[AlertRule]) -> None:
+        """
+        Make the rule set exactly `rules`, keeping the armed state of unchanged rules.
+        """
+        rules = list(rules)
+        keep = {rule.id for rule in rules}
+        self.remove([rule.id for rule in self.rules() if rule.id not in keep])
+        self.upsert(rules)
+
+    def on_price(self, ticker: str, price: float, timestamp: float) -> list[AlertEvent]:
+        """
+        Evaluate a price update of a ticker.
+
+        Args:
+            ticker: Normalized ticker symbol
+            price: New price
+            timestamp: Time of the price (seconds since epoch)
+
+        Returns:
+            list[AlertEvent]: Rules fired by the move from the last price, in crossing order
+        """
+        previous = self._prices.get(ticker)
+        self._prices[ticker] = price
+        book = self._books.get(ticker)
+        if book is None:
+            return []
+        self.evaluations += 1
+
+        if previous is None:
+            # Percent moves without a reference are measured from the first price
+            for rule in list(book.rules.values()):
+                if rule.kind == "percent_move" and rule.reference is None:
+                    self._rebase(book, rule, price)
+            return []
+        side: Side
+        if price > previous:
+            side, crossed = "above", book.above.rising(previous, price)
+        elif price < previous:
+            side, crossed = "below", book.below.falling(previous, price)
+        else:
+            return []
+        return [self._fire(book, rule_id, side, level, price, previous, timestamp) for level, rule_id in crossed]
+
+    def set_indicator(
+        self, ticker: str, indicator: Indicator, period: int, value: float, timestamp: float
+    ) -> list[AlertEvent]:
+        """
+        Move the level of the indicator_cross rules on a moving average.
+
+        A rule fires if the line moved across the last price in its direction
+        (e.g. an "above" rule fires when the line falls below the price).
+
+        Args:
+            ticker: Normalized ticker symbol
+            indicator: Moving average type
+            period: Moving average window (daily bars)
+            value: Latest value of the moving average
+            timestamp: Time of the update (seconds since epoch)
+
+        Returns:
+            list[AlertEvent]: Rules fired by the move of the line
+        """
+        old = self._indicators.get((ticker, indicator, period))
+        self._indicators[(ticker, indicator, period)] = value
+        book = self._books.get(ticker)
+        if book is None:
+            return []
+        price = self._prices.get(ticker)
+        events = []
+        for rule in list(book.rules.values()):
+            if rule.kind != "indicator_cross" or (rule.indicator, rule.period) != (indicator, period):
+                continue
+            side: Side = "above" if rule.direction == "above" else "below"
+            book.arm(rule.id, side, value)
+            if old is None or price is None:
+                continue
+            if (side == "above" and old > price >= value) or (side == "below" and old < price <= value):
+                events.append(self._fire(book, rule.id, side, value, price, price, timestamp))
+        return events
+
+    def take_changes(self) -> tuple[list[AlertRule], list[AlertRule]]:
+        """
+        Rules changed by firing since the last call, to be persisted.
+
+        Returns:
+            tuple: Fired one-shot rules (now removed) and percent_move rules with a new reference
+        """
+        fired_once, rebased = list(self._fired_once.values()), list(self._rebased.values())
+        self._fired_once.clear()
+        self._rebased.clear()
+        return fired_once, rebased
+
+    def _fire(
+        self,
+        book: TickerBook,
+        rule_id: str,
+        side: Side,
+        level: float,
+        price: float,
+        previous: float,
+        timestamp: float
+    ) -> AlertEvent:
+        rule = book.rules[rule_id]
+        self.fired += 1
+        event = AlertEvent(
+            id=uuid.uuid4().hex,
+            rule_id=rule.id,
+            ticker=rule.ticker,
+            kind=rule.kind,
+            direction=side,
+            level=level,
+            price=price,
+            previous_price=previous,
+            timestamp=timestamp,
+            metadata=rule.metadata
+        )
+        if not rule.repeat:
+            self._discard(rule)
+            self._fired_once[rule.id] = rule
+        elif rule.kind == "percent_move":
+            self._rebase(book, rule, price)
+        return event
+
+    def _arm(self, book: TickerBook, rule: AlertRule) -> None:
+        if rule.kind == "threshold" and rule.level is not None:
+            book.arm(rule.id, "below" if rule.direction == "below" else "above", rule.level)
+        elif rule.kind == "percent_move":
+            reference = rule.reference if rule.reference is not None else self._prices.get(rule.ticker)
+            if reference is not None:
+                self._rebase(book, rule, reference)
+        elif rule.kind == "indicator_cross" and rule.indicator is not None and rule.period is not None:
+            value = self._indicators.get((rule.ticker, rule.indicator, rule.period))
+            if value is not None:
+                book.arm(rule.id, "below" if rule.direction == "below" else "above", value)
+
+    def _rebase(self, book: TickerBook, rule: AlertRule, reference: float) -> None:
+        percent = rule.percent or 0.0
+        if rule.direction in ("above", "any"):
+            book.arm(rule.id, "above", reference * (1 + percent))
+        if rule.direction in ("below", "any"):
+            book.arm(rule.id, "below", reference * (1 - percent))
+        if rule.reference != reference:
+            rebased = dataclasses.replace(rule, reference=reference)
+            book.rules[rule.id] = rebased
+            self._rebased[rule.id] = rebased
+
+    def _discard(self, rule: AlertRule) -> None:
+        book = self._books[rule.ticker]
+        book.disarm(rule.id)
+        del book.rules[rule.id]
+        del self._ticker_of[rule.id]
+        self._rebased.pop(rule.id, None)
+        if not book.rules:
+            del self._books[rule.ticker]
@@ -0,0 +1,310 @@
+"""
+Price alert service.
+
+Stores alert rules for Spring Boot server and evaluates them against live
+quotes. One worker per host (elected with EvaluatorLock) runs the
+evaluation loop: every ALERT_POLL_INTERVAL seconds it reads the quotes of
+all tickers with rules through StockService in batches (sharing its cache,
+single-flight loading and batch upstream calls), feeds each price to the
+AlertEngine, whose sorted per-ticker level arrays find the crossed rules,
+and queues fired events on the AlertWebhook. Moving averages of
+indicator_cross rules are recomputed from daily bars every
+ALERT_INDICATOR_REFRESH_INTERVAL seconds.
+
+Any worker can change rules: changes go to the shared AlertRuleStore, and
+each worker reloads it when the file changes. One-shot rules removed and
+percent_move references moved by firing are written back after each cycle.
+"""
+
+import asyncio
+import dataclasses
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from datetime import UTC, datetime, timedelta
+
+import httpx
+import pandas as pd
+
+from app.config.settings import Settings, get_settings
+from app.core.errors import AIEngineException, ValidationError
+from app.core.executor import BlockingExecutor, get_blocking_executor
+from app.core.logging import get_logger
+from app.core.metrics import ALERT_EVENTS
+from app.schemas.alert import AlertRuleSchema, AlertRuleStateSchema, AlertStatsSchema
+from app.services.alert_engine import AlertEngine, AlertEvent, AlertRule
+from app.services.alert_store import AlertRuleStore, EvaluatorLock
+from app.services.alert_webhook import AlertWebhook
+from app.services.history_service import HistoryService
+from app.services.indicators import ema, sma
+from app.services.stock_service import StockService
+
+logger = get_logger(__name__)
+
+
+class AlertService:
+    """
+    Service for price alert rules and their evaluation.
+    """
+
+    def __init__(
+        self,
+        stock_service: StockService,
+        history_service: HistoryService,
+        settings: Settings | None = None,
+        store: AlertRuleStore | None = None,
+        lock: EvaluatorLock | None = None,
+        webhook: AlertWebhook | None = None,
+        executor: BlockingExecutor | None = None,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep
+    ):
+        """
+        Initialize the service.
+
+        Args:
+            stock_service: Source of live quotes
+            history_service: Source of daily bars for moving averages
+            settings: Application settings (defaults to the cached settings singleton)
+            store: Rule store (defaults to a store in ALERT_STORE_PATH)
+            lock: Evaluator election lock (defaults to a lock in ALERT_STORE_PATH)
+            webhook: Event delivery (defaults to a webhook configured from settings)
+            executor: Executor for rule store file I/O (defaults to the shared blocking executor)
+            clock: Wall clock (seconds since epoch)
+            sleep: Async sleep function (injectable for tests)
+        """
+        self.stock_service = stock_service
+        self.history_service = history_service
+        self.settings = settings or get_settings()
+        self.store = store or AlertRuleStore(self.settings.alert_store_path)
+        self.lock = lock or EvaluatorLock(self.settings.alert_store_path)
+        self.webhook = webhook or AlertWebhook(
+            self.settings.alert_webhook_url,
+            batch_size=self.settings.alert_webhook_batch_size,
+            flush_interval=self.settings.alert_webhook_flush_interval,
+            queue_size=self.settings.alert_webhook_queue_size,
+            max_retries=self.settings.alert_webhook_max_retries,
+            secret=self.settings.alert_webhook_secret
+        )
+        self.executor = executor or get_blocking_executor()
+        self.engine = AlertEngine()
+        self._clock = clock
+        self._sleep = sleep
+        self._sync_lock = asyncio.Lock()
+        self._indicators_refreshed: float | None = None
+        self._task: asyncio.Task[None] | None = None
+
+    async def put_rules(self, rules: list[AlertRuleSchema]) -> list[AlertRuleStateSchema]:
+        """
+        Create rules, or replace the rules with the same ids.
+
+        A replaced rule is armed again from scratch; an identical rule keeps its state.
+
+        Args:
+            rules: Rules to store
+
+        Returns:
+            list[AlertRuleStateSchema]: Stored rules with their armed levels
+
+        Raises:
+            ValidationError: If the request or the store would exceed the rule limits
+        """
+        if len(rules) > self.settings.alert_max_rules_per_request:
+            raise ValidationError(
+                message=f"Too many rules in one request (max {self.settings.alert_max_rules_per_request})",
+                details={"requested": len(rules), "max": self.settings.alert_max_rules_per_request}
+            )
+        converted = list({rule.id: _to_rule(rule) for rule in rules}.values())
+
+        await self._sync()
+        total = len(self.engine) + sum(self.engine.get(rule.id) is None for rule in converted)
+        if total > self.settings.alert_max_rules:
+            raise ValidationError(
+                message=f"Too many alert rules (max {self.settings.alert_max_rules})",
+                details={"requested": total, "max": self.settings.alert_max_rules}
+            )
+        await self._sync(upsert=converted)
+        stored = (self.engine.get(rule.id) for rule in converted)
+        return [self._state(rule) for rule in stored if rule is not None]
+
+    async def delete_rule(self, rule_id: str) -> AlertRuleStateSchema:
+        """
+        Delete a rule.
+
+        Args:
+            rule_id: Rule id
+
+        Returns:
+            AlertRuleStateSchema: The deleted rule
+
+        Raises:
+            ValidationError: If no rule has this id
+        """
+        await self._sync()
+        rule = self.engine.get(rule_id)
+        if rule is None:
+            raise ValidationError(message=f"Alert rule not found: {rule_id}", details={"id": rule_id})
+        deleted = self._state(rule)
+        await self._sync(remove=[rule_id])
+        return deleted
+
+    async def list_rules(self, ticker: str | None = None) -> list[AlertRuleStateSchema]:
+        """
+        List rules, of one ticker or all.
+
+        Args:
+            ticker: Ticker symbol (None lists every rule)
+
+        Returns:
+            list[AlertRuleStateSchema]: Rules with their armed levels
+        """
+        await self._sync()
+        symbol = ticker.strip().upper() if ticker else None
+        return [self._state(rule) for rule in self.engine.rules(symbol)]
+
+    async def get_stats(self) -> AlertStatsSchema:
+        """
+        Rule counts and the evaluation and delivery counters of this worker.
+
+        Returns:
+            AlertStatsSchema: Alert engine statistics
+        """
+        await self._sync()
+        return AlertStatsSchema(
+            rules=len(self.engine),
+            tickers=len(self.engine.tickers),
+            evaluator=self.lock.held,
+            evaluations=self.engine.evaluations,
+            fired=self.engine.fired,
+            queued=self.webhook.queued,
+            delivered=self.webhook.delivered,
+            failed=self.webhook.failed,
+            dropped=self.webhook.dropped,
+            webhook_calls=self.webhook.calls
+        )
+
+    async def evaluate_once(self) -> list[AlertEvent]:
+        """
+        Evaluate every rule against the current quotes and queue fired events.
+
+        Returns:
+            list[AlertEvent]: Fired events
+        """
+        await self._sync()
+        now = self._clock()
+        events = []
+        interval = self.settings.alert_indicator_refresh_interval
+        if self._indicators_refreshed is None or now - self._indicators_refreshed >= interval:
+            self._indicators_refreshed = now
+            events += await self._refresh_indicators()
+
+        tickers = self.engine.tickers
+        size = self.settings.stock_batch_max_tickers
+        for offset in range(0, len(tickers), size):
+            quotes = await self.stock_service.get_current_prices(tickers[offset:offset + size])
+            now = self._clock()
+            for quote in quotes.prices:
+                events += self.engine.on_price(quote.ticker, quote.current_price, now)
+
+        if events:
+            ALERT_EVENTS.labels(outcome="fired").inc(len(events))
+            self.webhook.offer(events)
+            # Persist removed one-shot rules and moved references right away
+            await self._sync()
+        return events
+
+    def start(self, http_client: httpx.AsyncClient) -> None:
+        """
+        Start the evaluation loop and webhook deliveries in the background.
+
+        Every worker runs the loop, but only the one holding the evaluator lock evaluates.
+
+        Args:
+            http_client: Shared outbound HTTP client
+        """
+        self.webhook.start(http_client)
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+
+    async def close(self) -> None:
+        """
+        Stop the evaluation loop, send queued events and give up the evaluator role.
+        """
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        await self.webhook.close()
+        self.lock.release()
+
+    async def _run(self) -> None:
+        while True:
+            started = self._clock()
+            if self.lock.held or self.lock.try_acquire():
+                try:
+                    await self.evaluate_once()
+                except Exception:
+                    # Never let one failed cycle stop the evaluation
+                    logger.exception("Alert evaluation cycle failed")
+            elapsed = self._clock() - started
+            await self._sleep(max(self.settings.alert_poll_interval - elapsed, 0.0))
+
+    async def _sync(self, upsert: Iterable[AlertRule] = (), remove: Iterable[str] = ()) -> None:
+        """
+        Write rule changes and changes made by firing, and reload the store if it changed.
+        """
+        upsert, remove = list(upsert), list(remove)
+        async with self._sync_lock:
+            fired, rebased = self.engine.take_changes()
+            if not (upsert or remove or fired or rebased or self.store.changed()):
+                return
+            rules = await self.executor.run(self.store.update, upsert, remove, fired, rebased)
+            self.engine.replace(rules)
+
+    async def _refresh_indicators(self) -> list[AlertEvent]:
+        """
+        Recompute the moving averages of indicator_cross rules from daily bars.
+        """
+        keys = sorted(self.engine.indicator_keys())
+        periods: dict[str, int] = {}
+        for ticker, _, period in keys:
+            periods[ticker] = max(periods.get(ticker, 0), period)
+        end = datetime.fromtimestamp(self._clock(), tz=UTC)
+        semaphore = asyncio.Semaphore(self.settings.alert_max_concurrency)
+
+        async def load(ticker: str, period: int) -> pd.DataFrame | None:
+            async with semaphore:
+                try:
+                    # About twice the window in trading days, so EMAs have converged
+                    frame = await self.history_service.get_bars(ticker, "1d", end - timedelta(days=period * 3 + 30), end)
+                except AIEngineException as e:
+                    logger.warning("No daily history for alert indicators of %s: %s", ticker, e.message)
+                    return None
+            close: pd.DataFrame = frame[["close"]]
+            return close
+
+        loaded = await asyncio.gather(*(load(ticker, period) for ticker, period in periods.items()))
+        closes = dict(zip(periods, loaded, strict=True))
+        now = self._clock()
+        events = []
+        for ticker, indicator, period in keys:
+            close = closes[ticker]
+            if close is None or close.empty:
+                continue
+            line = (sma if indicator == "sma" else ema)(close, period).iloc[-1, 0]
+            if pd.notna(line):
+                events += self.engine.set_indicator(ticker, indicator, period, float(line), now)
+        return events
+
+    def _state(self, rule: AlertRule) -> AlertRuleStateSchema:
+        return AlertRuleStateSchema(
+            **dataclasses.asdict(rule),
+            armed_levels=self.engine.armed_levels(rule.id),
+            last_price=self.engine.last_price(rule.ticker)
+        )
+
+
+def _to_rule(schema: AlertRuleSchema) -> AlertRule:
+    return AlertRule(**{**schema.model_dump(), "ticker": schema.ticker.strip().upper()})
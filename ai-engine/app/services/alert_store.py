@@ -0,0 +1,196 @@
+"""
+File-backed store of price alert rules.
+
+The server runs several worker processes, and a rule created through one
+of them must be seen by all. Rules are kept in one JSON file that every
+worker reads again when its modification time changes. Writes are
+read-modify-write cycles under an exclusive file lock and replace the file
+atomically, so concurrent writers never lose each other's changes and
+readers never see a partial file.
+
+EvaluatorLock elects the one worker per host that evaluates rules and
+sends webhooks. It is a non-blocking exclusive file lock that the kernel
+releases when its process exits, so another worker takes over after a crash.
+"""
+
+import dataclasses
+import fcntl
+import json
+import os
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO
+
+from app.services.alert_engine import AlertRule
+
+STORE_VERSION = 1
+
+
+class AlertRuleStore:
+    """
+    Alert rules in `<root>/rules.json`, shared by the workers of one host.
+    """
+
+    def __init__(self, root: str | Path):
+        """
+        Initialize the store.
+
+        Args:
+            root: Directory of the rules file (created if missing)
+        """
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.path = self.root / "rules.json"
+        self._lock_path = self.root / "rules.lock"
+        # (inode, mtime) of the file when this process last read or wrote it; every write makes a new inode
+        self._seen: tuple[int, int] | None = None
+
+    def changed(self) -> bool:
+        """
+        Whether the file changed since this process last read or wrote it.
+        """
+        return self._version() != self._seen
+
+    def load(self) -> list[AlertRule]:
+        """
+        Read every rule.
+
+        Returns:
+            list[AlertRule]: Stored rules
+        """
+        with _locked(self._lock_path, fcntl.LOCK_SH):
+            return list(self._read().values())
+
+    def update(
+        self,
+        upsert: Iterable[AlertRule] = (),
+        remove: Iterable[str] = (),
+        fired: Iterable[AlertRule] = (),
+        rebased: Iterable[AlertRule] = ()
+    ) -> list[AlertRule]:
+        """
+        Apply changes to the stored rules in one atomic read-modify-write.
+
+        `fired` and `rebased` come from rule evaluation and are compare-and-set:
+        a fired one-shot rule is only removed, and a new percent_move reference
+        only stored, if the stored rule was not changed meanwhile.
+
+        Args:
+            upsert: Rules to add or replace
+            remove: Ids of rules to remove
+            fired: Fired one-shot rules to remove
+            rebased: Percent_move rules whose reference moved
+
+        Returns:
+            list[AlertRule]: Stored rules after the update
+        """
+        upsert, remove, fired, rebased = list(upsert), list(remove), list(fired), list(rebased)
+        if not (upsert or remove or fired or rebased):
+            return self.load()
+
+        with _locked(self._lock_path, fcntl.LOCK_EX):
+            rules = self._read()
+            for rule in fired:
+                if _same_rule(rules.get(rule.id), rule):
+                    del rules[rule.id]
+            for rule in rebased:
+                if _same_rule(rules.get(rule.id), rule):
+                    rules[rule.id] = rule
+            for rule_id in remove:
+                rules.pop(rule_id, None)
+            for rule in upsert:
+                rules[rule.id] = rule
+            self._write(rules)
+            return list(rules.values())
+
+    def _read(self) -> dict[str, AlertRule]:
+        self._seen = self._version()
+        try:
+            payload = json.loads(self.path.read_bytes())
+        except FileNotFoundError:
+            return {}
+        if payload.get("version") != STORE_VERSION:
+            raise ValueError(f"Unsupported alert rule store version at {self.path}: {payload.get('version')}")
+        return {item["id"]: AlertRule(**item) for item in payload["rules"]}
+
+    def _write(self, rules: dict[str, AlertRule]) -> None:
+        payload = {"version": STORE_VERSION, "rules": [dataclasses.asdict(rule) for rule in rules.values()]}
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        tmp_path.write_text(json.dumps(payload, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+        self._seen = self._version()
+
+    def _version(self) -> tuple[int, int] | None:
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns
+
+
+class EvaluatorLock:
+    """
+    Host-wide election of the worker that evaluates alert rules.
+    """
+
+    def __init__(self, root: str | Path):
+        """
+        Initialize the lock.
+
+        Args:
+            root: Directory of the lock file (created if missing)
+        """
+        Path(root).mkdir(parents=True, exist_ok=True)
+        self.path = Path(root) / "evaluator.lock"
+        self._file: IO[bytes] | None = None
+
+    @property
+    def held(self) -> bool:
+        """
+        Whether this process is the evaluator.
+        """
+        return self._file is not None
+
+    def try_acquire(self) -> bool:
+        """
+        Become the evaluator unless another process is.
+
+        Returns:
+            bool: True if this process holds the lock
+        """
+        if self._file is not None:
+            return True
+        # Held open for as long as the lock is
+        file = open(self.path, "ab")
+        try:
+            fcntl.flock(file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            file.close()
+            return False
+        self._file = file
+        return True
+
+    def release(self) -> None:
+        """
+        Give up the evaluator role.
+        """
+        if self._file is not None:
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+
+
+@contextmanager
+def _locked(path: Path, operation: int) -> Iterator[None]:
+    with open(path, "ab") as file:
+        fcntl.flock(file, operation)
+        try:
+            yield
+        finally:
+            fcntl.flock(file, fcntl.LOCK_UN)
+
+
+def _same_rule(stored: AlertRule | None, rule: AlertRule) -> bool:
+    # Evaluation only ever changes percent_move references
+    return stored is not None and dataclasses.replace(stored, reference=None) == dataclasses.replace(rule, reference=None)
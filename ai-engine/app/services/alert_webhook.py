@@ -0,0 +1,212 @@
+"""
+Batched delivery of fired alert events to the backend.
+
+Events are queued as rules fire and sent in batches of up to `batch_size`
+events per webhook call: a batch leaves as soon as it is full, or
+`flush_interval` seconds after its first event, so a burst of alerts costs a
+few requests instead of one per event. Calls go through the shared outbound
+HTTP client and are retried with exponential backoff on network errors,
+429 and 5xx responses. Each body is signed with HMAC-SHA256 when a secret
+is configured. Delivery is at least once: the backend should ignore events
+whose id it has seen.
+"""
+
+import asyncio
+import hashlib
+import hmac
+from collections import deque
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime
+
+import httpx
+
+from app.core.logging import get_logger
+from app.core.metrics import ALERT_EVENTS
+from app.schemas.alert import AlertEventSchema, AlertWebhookPayload
+from app.services.alert_engine import AlertEvent
+
+logger = get_logger(__name__)
+
+SIGNATURE_HEADER = "X-Calix-Signature"
+
+
+class AlertWebhook:
+    """
+    Queue of fired events and the background task that sends them.
+    """
+
+    def __init__(
+        self,
+        url: str | None,
+        batch_size: int = 100,
+        flush_interval: float = 1.0,
+        queue_size: int = 10_000,
+        max_retries: int = 3,
+        retry_backoff: float = 0.5,
+        secret: str | None = None,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep
+    ):
+        """
+        Initialize the webhook.
+
+        Args:
+            url: Webhook URL (None drops events after logging them)
+            batch_size: Maximum events per call
+            flush_interval: Seconds a partial batch waits for more events
+            queue_size: Maximum queued events (the oldest are dropped beyond it)
+            max_retries: Retries of a failed call before its events are dropped
+            retry_backoff: Seconds before the first retry (doubled for each next one)
+            secret: Key of the HMAC-SHA256 body signature (None sends unsigned calls)
+            sleep: Async sleep function (injectable for tests)
+        """
+        self.url = url
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue_size = queue_size
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.secret = secret
+        self._sleep = sleep
+        self._queue: deque[AlertEvent] = deque()
+        self._ready = asyncio.Event()
+        self._client: httpx.AsyncClient | None = None
+        self._task: asyncio.Task[None] | None = None
+        self.delivered = 0
+        self.failed = 0
+        self.dropped = 0
+        self.calls = 0
+
+    @property
+    def queued(self) -> int:
+        """
+        Events waiting to be sent.
+        """
+        return len(self._queue)
+
+    def offer(self, events: list[AlertEvent]) -> None:
+        """
+        Queue fired events for delivery.
+
+        Args:
+            events: Fired events, oldest first
+        """
+        if self.url is None:
+            for event in events:
+                logger.info("Alert %s fired for %s at %s (no webhook configured)", event.rule_id, event.ticker, event.price)
+            self._count_dropped(len(events))
+            return
+
+        self._queue.extend(events)
+        overflow = len(self._queue) - self.queue_size
+        if overflow > 0:
+            for _ in range(overflow):
+                self._queue.popleft()
+            logger.warning("Alert webhook queue is full, dropped the %d oldest events", overflow)
+            self._count_dropped(overflow)
+        self._ready.set()
+
+    def start(self, client: httpx.AsyncClient) -> None:
+        """
+        Start sending batches in the background.
+
+        Args:
+            client: Shared outbound HTTP client
+        """
+        self._client = client
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+
+    async def flush(self, max_retries: int | None = None) -> None:
+        """
+        Send every queued event now, in batches.
+
+        Args:
+            max_retries: Retries per failed call (defaults to the configured retries)
+        """
+        if self._client is None or self.url is None:
+            return
+        while self._queue:
+            batch = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+            try:
+                await self._deliver(self._client, self.url, batch, self.max_retries if max_retries is None else max_retries)
+            except asyncio.CancelledError:
+                # Stopped mid-call (close()): put the batch back for the last flush; the backend
+                # may already have it, which at-least-once delivery allows
+                self._queue.extendleft(reversed(batch))
+                raise
+
+    async def close(self) -> None:
+        """
+        Stop the background task and make a last attempt to send queued events.
+        """
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        await self.flush(max_retries=0)
+
+    async def _run(self) -> None:
+        while True:
+            await self._ready.wait()
+            if len(self._queue) < self.batch_size:
+                await self._sleep(self.flush_interval)
+            self._ready.clear()
+            try:
+                await self.flush()
+            except Exception:
+                # Never let one failed batch stop the deliveries
+                logger.exception("Alert webhook delivery failed")
+
+    async def _deliver(self, client: httpx.AsyncClient, url: str, batch: list[AlertEvent], max_retries: int) -> None:
+        payload = AlertWebhookPayload(
+            events=[_event_schema(event) for event in batch],
+            sent_at=datetime.now(UTC)
+        )
+        body = payload.model_dump_json().encode()
+        headers = {"Content-Type": "application/json"}
+        if self.secret:
+            digest = hmac.new(self.secret.encode(), body, hashlib.sha256).hexdigest()
+            headers[SIGNATURE_HEADER] = f"sha256={digest}"
+
+        for attempt in range(max_retries + 1):
+            if attempt:
+                await self._sleep(self.retry_backoff * 2 ** (attempt - 1))
+            try:
+                response = await client.post(url, content=body, headers=headers)
+            except httpx.HTTPError as e:
+                logger.warning("Alert webhook call failed (attempt %d): %s", attempt + 1, e)
+                continue
+            if response.is_success:
+                self.calls += 1
+                self.delivered += len(batch)
+                ALERT_EVENTS.labels(outcome="delivered").inc(len(batch))
+                return
+            logger.warning("Alert webhook returned %d (attempt %d)", response.status_code, attempt + 1)
+            if response.status_code != 429 and response.status_code < 500:
+                break
+
+        logger.error("Dropped %d alert events after failed webhook calls", len(batch))
+        self.failed += len(batch)
+        ALERT_EVENTS.labels(outcome="failed").inc(len(batch))
+
+    def _count_dropped(self, count: int) -> None:
+        self.dropped += count
+        ALERT_EVENTS.labels(outcome="dropped").inc(count)
+
+
+def _event_schema(event: AlertEvent) -> AlertEventSchema:
+    return AlertEventSchema(
+        id=event.id,
+        rule_id=event.rule_id,
+        ticker=event.ticker,
+        kind=event.kind,
+        direction=event.direction,
+        level=event.level,
+        price=event.price,
+        previous_price=event.previous_price,
+        triggered_at=datetime.fromtimestamp(event.timestamp, tz=UTC),
+        metadata=event.metadata
+    )
@@ -0,0 +1,264 @@
+"""
+Vectorized backtest kernels.
+
+A strategy run is a (T x N) matrix of target weights (rows = bars, columns =
+tickers, fractions of portfolio equity, the rest in cash) decided at each
+bar's close and held over the next bar. A parameter grid is a stack of such
+matrices, (C x T x N) for C parameter combinations, and the whole grid is
+simulated at once: returns, drifted pre-trade weights, turnover, costs and
+equity curves are whole-array operations, with no loop over bars or combinations.
+
+This module only depends on NumPy, so run_grid() can run in worker
+processes without importing the application.
+"""
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+import numpy as np
+
+STRATEGIES = ("ma_crossover", "rebalance")
+
+# Stats reported per parameter combination, in this order
+STAT_NAMES = (
+    "total_return", "cagr", "volatility", "sharpe", "max_drawdown", "turnover", "exposure", "final_equity"
+)
+
+
+@dataclass(frozen=True)
+class Simulation:
+    """
+    Simulated runs of C parameter combinations over T bars.
+
+    `returns`, `turnover` and `costs` are per holding period (T-1 entries);
+    `equity` starts at the initial capital (T entries).
+    """
+
+    returns: np.ndarray
+    turnover: np.ndarray
+    costs: np.ndarray
+    equity: np.ndarray
+    exposure: np.ndarray
+
+
+def rolling_means(prices: np.ndarray, windows: Sequence[int]) -> dict[int, np.ndarray]:
+    """
+    Simple moving averages of price columns for several windows, from one cumulative sum.
+
+    Args:
+        prices: (T x N) prices, NaN before a ticker's first bar
+        windows: Window lengths in bars
+
+    Returns:
+        dict[int, np.ndarray]: Window -> (T x N) means, NaN until the window is full of prices
+    """
+    valid = np.isfinite(prices)
+    sums = np.vstack([np.zeros((1, prices.shape[1])), np.cumsum(np.where(valid, prices, 0.0), axis=0)])
+    counts = np.vstack([np.zeros((1, prices.shape[1])), np.cumsum(valid, axis=0)])
+    means = {}
+    for window in set(windows):
+        mean = np.full(prices.shape, np.nan)
+        if window <= prices.shape[0]:
+            total = sums[window:] - sums[:-window]
+            full = (counts[window:] - counts[:-window]) == window
+            mean[window - 1:] = np.where(full, total / window, np.nan)
+        means[window] = mean
+    return means
+
+
+def ma_crossover_weights(
+    prices: np.ndarray,
+    windows: Sequence[tuple[int, int]],
+    allow_short: bool = False
+) -> np.ndarray:
+    """
+    Target weights of moving-average crossover strategies.
+
+    Every ticker gets an equal 1/N sleeve of equity, invested while its fast
+    average is above its slow one and in cash (or short, if allowed) otherwise.
+
+    Args:
+        prices: (T x N) prices
+        windows: (fast, slow) window pairs, one per combination
+        allow_short: Short the sleeve while the fast average is below the slow one
+
+    Returns:
+        np.ndarray: (C x T x N) target weights
+    """
+    means = rolling_means(prices, [window for pair in windows for window in pair])
+    sleeve = 1.0 / prices.shape[1]
+    weights = np.empty((len(windows), *prices.shape))
+    for i, (fast, slow) in enumerate(windows):
+        above = means[fast] > means[slow]
+        if allow_short:
+            below = means[fast] < means[slow]
+            weights[i] = sleeve * (above.astype(np.float64) - below)
+        else:
+            weights[i] = sleeve * above
+    return weights
+
+
+def rebalance_weights(prices: np.ndarray, periods: Sequence[int], targets: np.ndarray) -> np.ndarray:
+    """
+    Target weights of fully invested portfolios rebalanced every few bars.
+
+    At each rebalance the portfolio is reset to the target weights of the
+    tickers that have a price (renormalized to 1); between rebalances the
+    weights drift with prices, so only rebalances trade.
+
+    Args:
+        prices: (T x N) prices
+        periods: Bars between rebalances, one per combination
+        targets: (N) target weights (any positive scale)
+
+    Returns:
+        np.ndarray: (C x T x N) weights
+    """
+    bars = np.arange(prices.shape[0])
+    priced = np.isfinite(prices)
+    safe = np.where(priced, prices, 1.0)
+    reset = np.where(priced, targets, 0.0)
+    totals = reset.sum(axis=1, keepdims=True)
+    reset = np.divide(reset, totals, out=np.zeros_like(reset), where=totals > 0)
+
+    weights = np.empty((len(periods), *prices.shape))
+    for i, period in enumerate(periods):
+        start = (bars // period) * period
+        drifted = reset[start] * safe / safe[start]
+        totals = drifted.sum(axis=1, keepdims=True)
+        weights[i] = np.divide(drifted, totals, out=np.zeros_like(drifted), where=totals > 0)
+    return weights
+
+
+def simulate(prices: np.ndarray, weights: np.ndarray, cost_rate: float, initial_capital: float = 1.0) -> Simulation:
+    """
+    Simulate target-weight strategies with proportional trading costs.
+
+    Weights set at bar t's close earn the returns from t to t+1. Before each
+    trade the held weights have drifted with the last returns, so turnover is
+    the sum of |target - drifted| over tickers; each unit of turnover costs
+    `cost_rate` (commission plus slippage) of equity. Runs start in cash.
+
+    Args:
+        prices: (T x N) prices, NaN before a ticker's first bar
+        weights: (C x T x N) target weights
+        cost_rate: Cost per unit of traded equity (e.g., 0.0006 for 6 bps)
+        initial_capital: Equity at the first bar
+
+    Returns:
+        Simulation: Per-period returns, turnover, costs and equity curves
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        asset_returns = np.nan_to_num(prices[1:] / prices[:-1] - 1.0, nan=0.0, posinf=0.0, neginf=0.0)
+    held = weights[:, :-1]
+    gross = np.einsum("ctn,tn->ct", held, asset_returns)
+
+    # Weights just before each trade: last period's weights after its returns
+    before = np.zeros_like(held)
+    growth = 1.0 + gross[:, :-1, None]
+    before[:, 1:] = held[:, :-1] * (1.0 + asset_returns[:-1]) / np.where(growth > 0, growth, 1.0)
+    turnover = np.abs(held - before).sum(axis=2)
+    costs = turnover * cost_rate
+
+    returns = gross - costs
+    equity = np.empty((weights.shape[0], weights.shape[1]))
+    equity[:, 0] = initial_capital
+    equity[:, 1:] = initial_capital * np.cumprod(1.0 + returns, axis=1)
+    return Simulation(
+        returns=returns,
+        turnover=turnover,
+        costs=costs,
+        equity=equity,
+        exposure=np.abs(held).sum(axis=2)
+    )
+
+
+def summarize(simulation: Simulation, periods_per_year: float) -> np.ndarray:
+    """
+    Summary statistics of simulated runs.
+
+    Sharpe ratio and volatility are annualized from per-period returns (zero
+    risk-free rate); turnover is the annualized sum of traded weight; maximum
+    drawdown is the deepest fall from a running equity high, as a positive fraction.
+
+    Args:
+        simulation: Simulated runs
+        periods_per_year: Bars per year (e.g., 252 for daily bars)
+
+    Returns:
+        np.ndarray: (C x len(STAT_NAMES)) statistics in STAT_NAMES order
+    """
+    returns = simulation.returns
+    equity = simulation.equity
+    periods = returns.shape[1]
+    growth = equity[:, -1] / equity[:, 0]
+    years = periods / periods_per_year
+
+    std = returns.std(axis=1, ddof=1) if periods > 1 else np.zeros(len(returns))
+    mean = returns.mean(axis=1) if periods else np.zeros(len(returns))
+    sharpe = np.divide(mean, std, out=np.zeros_like(mean), where=std > 1e-12) * np.sqrt(periods_per_year)
+    with np.errstate(invalid="ignore"):
+        cagr = np.where(growth > 0, growth ** (1.0 / years) - 1.0, -1.0) if years > 0 else np.zeros_like(growth)
+    drawdown = 1.0 - (equity / np.maximum.accumulate(equity, axis=1)).min(axis=1)
+
+    return np.column_stack([
+        growth - 1.0,
+        cagr,
+        std * np.sqrt(periods_per_year),
+        sharpe,
+        drawdown,
+        simulation.turnover.sum(axis=1) / years if years > 0 else np.zeros_like(growth),
+        simulation.exposure.mean(axis=1) if periods else np.zeros_like(growth),
+        equity[:, -1],
+    ])
+
+
+def strategy_weights(
+    prices: np.ndarray,
+    strategy: str,
+    grid: Sequence[tuple[int, ...]],
+    targets: np.ndarray | None = None,
+    allow_short: bool = False
+) -> np.ndarray:
+    """
+    Target weights of a strategy for each parameter combination.
+
+    Args:
+        prices: (T x N) prices
+        strategy: "ma_crossover" ((fast, slow) combinations) or "rebalance" ((period,) combinations)
+        grid: Parameter combinations
+        targets: (N) target weights of "rebalance" (default equal)
+        allow_short: Short "ma_crossover" sleeves below the slow average
+
+    Returns:
+        np.ndarray: (C x T x N) target weights
+    """
+    if strategy == "ma_crossover":
+        return ma_crossover_weights(prices, [(fast, slow) for fast, slow in grid], allow_short)
+    if strategy == "rebalance":
+        return rebalance_weights(
+            prices, [period for (period,) in grid], targets if targets is not None else np.ones(prices.shape[1])
+        )
+    raise ValueError(f"Unknown strategy: {strategy}")
+
+
+def run_grid(
+    prices: np.ndarray,
+    strategy: str,
+    grid: Sequence[tuple[int, ...]],
+    cost_rate: float,
+    periods_per_year: float,
+    initial_capital: float = 1.0,
+    targets: np.ndarray | None = None,
+    allow_short: bool = False
+) -> np.ndarray:
+    """
+    Simulate a strategy for a chunk of a parameter grid and summarize every run.
+
+    Top-level and NumPy-only, so chunks can be sent to worker processes.
+
+    Returns:
+        np.ndarray: (C x len(STAT_NAMES)) statistics in STAT_NAMES order
+    """
+    weights = strategy_weights(prices, strategy, grid, targets, allow_short)
+    return summarize(simulate(prices, weights, cost_rate, initial_capital), periods_per_year)
@@ -0,0 +1,297 @@
+"""
+Strategy backtest service.
+
+Loads stored bar history of many tickers into one aligned price matrix and
+simulates a strategy for every combination of a parameter grid with the
+vectorized kernels of app.services.backtest. Large grids are split into
+chunks that run in parallel on a pool of worker processes, so the
+simulation neither blocks the event loop nor competes for this process's GIL.
+"""
+
+import asyncio
+import itertools
+import math
+import multiprocessing
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import UTC, datetime, timedelta
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from app.config.settings import Settings, get_settings
+from app.core.errors import (
+    AIEngineException,
+    ServiceOverloadedError,
+    ValidationError,
+    WorkerCrashedError,
+)
+from app.core.executor import BlockingExecutor
+from app.core.logging import get_logger
+from app.schemas.backtest import (
+    BacktestCurveSchema,
+    BacktestRequest,
+    BacktestRunSchema,
+    BacktestSchema,
+)
+from app.server import available_cpus, worker_count
+from app.services.backtest import STAT_NAMES, run_grid, simulate, strategy_weights
+from app.services.history_service import HistoryService
+from app.services.indicators import align_prices
+
+logger = get_logger(__name__)
+
+_PERIODS_PER_YEAR = {"1d": 252.0, "1wk": 52.0}
+
+
+class BacktestService:
+    """
+    Service for vectorized strategy backtests over stored bar history.
+
+    Grids run on BACKTEST_PROCESSES worker processes (0 = this server
+    worker's share of the CPUs), started on first use with the "spawn" method
+    so they never inherit the server's threads or sockets. With a single
+    process, chunks run on a backtest thread in this process instead.
+    """
+
+    def __init__(
+        self,
+        history_service: HistoryService,
+        settings: Settings | None = None,
+        executor: BlockingExecutor | None = None,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Initialize the service.
+
+        Args:
+            history_service: Source of OHLCV bars
+            settings: Application settings (defaults to the cached settings singleton)
+            executor: Executor for in-process simulation (defaults to a dedicated backtest thread)
+            clock: Wall clock used for the default range end (seconds since epoch)
+        """
+        self.history_service = history_service
+        self.settings = settings or get_settings()
+        # Every server worker has its own pool, so together they use each CPU once
+        self.processes = self.settings.backtest_processes or max(1, available_cpus() // worker_count(self.settings))
+        self.executor = executor or BlockingExecutor(max_workers=1, queue_depth=16, name="backtest")
+        self._clock = clock
+        self._pool: ProcessPoolExecutor | None = None
+        self._pooled_grids = 0
+
+    async def run(self, request: BacktestRequest) -> BacktestSchema:
+        """
+        Backtest a strategy for every combination of its parameter grid.
+
+        Args:
+            request: Tickers, range, strategy grid and costs
+
+        Returns:
+            BacktestSchema: Runs by descending Sharpe ratio and the best run's equity curve
+
+        Raises:
+            ValidationError: If there are too many tickers or combinations, no valid
+                combination, or not enough history in the range
+            ServiceOverloadedError: If the backtest thread or worker processes are saturated
+            WorkerCrashedError: If a worker process died (the pool is restarted on the next run)
+        """
+        symbols = list(dict.fromkeys(ticker.strip().upper() for ticker in request.tickers))
+        if len(symbols) > self.settings.backtest_max_tickers:
+            raise ValidationError(
+                message=f"Too many tickers in one backtest (max {self.settings.backtest_max_tickers})",
+                details={"requested": len(symbols), "max": self.settings.backtest_max_tickers}
+            )
+        grid, names = self._grid(request)
+
+        closes = await self._load_closes(symbols, request)
+        if closes.shape[0] < 2 or closes.shape[1] == 0:
+            raise ValidationError(
+                message="Not enough price history in the backtest range",
+                details={"bars": int(closes.shape[0]), "tickers": list(closes.columns)}
+            )
+        prices = closes.to_numpy(dtype=np.float64)
+        targets = self._targets(request, list(closes.columns))
+        cost_rate = (request.commission_bps + request.slippage_bps) / 10_000
+        periods_per_year = _PERIODS_PER_YEAR[request.interval]
+        simulate_chunk = partial(
+            run_grid,
+            prices,
+            request.strategy,
+            cost_rate=cost_rate,
+            periods_per_year=periods_per_year,
+            initial_capital=request.initial_capital,
+            targets=targets,
+            allow_short=request.allow_short
+        )
+
+        started = time.perf_counter()
+        stats = await self._run_chunks(simulate_chunk, grid, prices.size)
+        logger.info(
+            "Backtested %s over %d bars x %d tickers for %d combinations in %.3fs",
+            request.strategy, prices.shape[0], prices.shape[1], len(grid), time.perf_counter() - started
+        )
+
+        stats = np.nan_to_num(stats, nan=0.0, posinf=0.0, neginf=0.0)
+        order = np.argsort(-stats[:, STAT_NAMES.index("sharpe")], kind="stable")
+        runs = [
+            BacktestRunSchema(
+                parameters=dict(zip(names, grid[i], strict=True)),
+                **{name: float(value) for name, value in zip(STAT_NAMES, stats[i], strict=True)}
+            )
+            for i in order
+        ]
+
+        best = grid[int(order[0])]
+        equity = await self.executor.run(
+            self._equity_curve, prices, request, best, targets, cost_rate
+        )
+        drawdown = 1.0 - equity / np.maximum.accumulate(equity)
+        return BacktestSchema(
+            strategy=request.strategy,
+            tickers=list(closes.columns),
+            interval=request.interval,
+            bars=prices.shape[0],
+            timestamps=list(closes.index.to_pydatetime()),
+            runs=runs,
+            best=BacktestCurveSchema(
+                parameters=dict(zip(names, best, strict=True)),
+                equity=equity.tolist(),
+                drawdown=drawdown.tolist()
+            )
+        )
+
+    def close(self) -> None:
+        """
+        Stop the worker processes and the backtest thread.
+        """
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+        self.executor.shutdown()
+
+    async def _run_chunks(
+        self,
+        simulate_chunk: Callable[[list[tuple[int, ...]]], np.ndarray],
+        grid: list[tuple[int, ...]],
+        matrix_size: int
+    ) -> np.ndarray:
+        # Chunks hold at most BACKTEST_CHUNK_ELEMENTS weights, and at least one chunk goes to every process
+        size = max(1, self.settings.backtest_chunk_elements // max(matrix_size, 1))
+        size = min(size, math.ceil(len(grid) / self.processes))
+        chunks = [grid[i:i + size] for i in range(0, len(grid), size)]
+
+        if self.processes <= 1 or len(chunks) == 1:
+            results = [await self.executor.run(simulate_chunk, chunk) for chunk in chunks]
+        else:
+            if self._pooled_grids >= self.settings.backtest_max_pending:
+                logger.warning("Backtest worker processes saturated, rejecting a grid of %d combinations", len(grid))
+                raise ServiceOverloadedError(
+                    message="Service is overloaded, please retry later",
+                    details={"executor": "backtest-processes", "pending": self._pooled_grids}
+                )
+            self._pooled_grids += 1
+            loop = asyncio.get_running_loop()
+            pool = self._process_pool()
+            try:
+                results = await asyncio.gather(*(
+                    loop.run_in_executor(pool, simulate_chunk, chunk) for chunk in chunks
+                ))
+            except BrokenProcessPool as e:
+                # A broken pool rejects all further work; start a new one on the next run
+                if self._pool is pool:
+                    self._pool = None
+                pool.shutdown(wait=False, cancel_futures=True)
+                logger.error("Backtest worker process died: %s", e)
+                raise WorkerCrashedError(
+                    message="Backtest worker process died, please retry",
+                    details={"processes": self.processes, "chunks": len(chunks)}
+                ) from e
+            finally:
+                self._pooled_grids -= 1
+        return np.vstack(results)
+
+    def _process_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.processes, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._pool
+
+    def _grid(self, request: BacktestRequest) -> tuple[list[tuple[int, ...]], tuple[str, ...]]:
+        grid: list[tuple[int, ...]]
+        if request.strategy == "ma_crossover":
+            names: tuple[str, ...] = ("fast", "slow")
+            grid = [
+                (fast, slow)
+                for fast, slow in itertools.product(sorted(set(request.fast_windows)), sorted(set(request.slow_windows)))
+                if fast < slow
+            ]
+        else:
+            names = ("period",)
+            grid = [(period,) for period in sorted(set(request.rebalance_periods))]
+
+        if not grid:
+            raise ValidationError(
+                message="No parameter combination with a fast window shorter than the slow window",
+                details={"fast_windows": request.fast_windows, "slow_windows": request.slow_windows}
+            )
+        if len(grid) > self.settings.backtest_max_combinations:
+            raise ValidationError(
+                message=f"Too many parameter combinations (max {self.settings.backtest_max_combinations})",
+                details={"requested": len(grid), "max": self.settings.backtest_max_combinations}
+            )
+        return grid, names
+
+    def _targets(self, request: BacktestRequest, tickers: list[str]) -> np.ndarray | None:
+        if request.weights is None:
+            return None
+        weights = {ticker.strip().upper(): weight for ticker, weight in request.weights.items()}
+        targets = np.array([weights.get(ticker, 0.0) for ticker in tickers])
+        if not targets.any():
+            raise ValidationError(
+                message="No positive target weight for a ticker with price history",
+                details={"tickers": tickers, "weights": request.weights}
+            )
+        return targets
+
+    def _equity_curve(
+        self,
+        prices: np.ndarray,
+        request: BacktestRequest,
+        parameters: tuple[int, ...],
+        targets: np.ndarray | None,
+        cost_rate: float
+    ) -> np.ndarray:
+        weights = strategy_weights(prices, request.strategy, [parameters], targets, request.allow_short)
+        equity: np.ndarray = simulate(prices, weights, cost_rate, request.initial_capital).equity[0]
+        return equity
+
+    async def _load_closes(self, symbols: list[str], request: BacktestRequest) -> pd.DataFrame:
+        """
+        Closes of several symbols in the request range, aligned on one timeline.
+
+        At most `backtest_max_concurrency` symbols load at the same time. Symbols
+        whose history cannot be loaded or is empty are left out.
+        """
+        end = request.end or datetime.fromtimestamp(self._clock(), tz=UTC)
+        start = request.start or end - timedelta(days=self.settings.backtest_default_lookback_days)
+        semaphore = asyncio.Semaphore(self.settings.backtest_max_concurrency)
+
+        async def load(symbol: str) -> pd.Series | None:
+            async with semaphore:
+                try:
+                    frame = await self.history_service.get_bars(symbol, request.interval, start, end)
+                except AIEngineException as e:
+                    logger.warning("No %s history for %s: %s", request.interval, symbol, e.message)
+                    return None
+            close: pd.Series = frame["close"]
+            return close
+
+        loaded = await asyncio.gather(*(load(symbol) for symbol in symbols))
+        series = {symbol: close for symbol, close in zip(symbols, loaded, strict=True) if close is not None and not close.empty}
+        if not series:
+            return pd.DataFrame(dtype=np.float64)
+        return align_prices(series)[list(series)]
@@ -0,0 +1,226 @@
+"""
+Local on-disk OHLCV bar store.
+
+Bars are kept in one partition per (interval, ticker): a flat binary file of
+fixed-size records that is appended to in place and read back through a
+read-only NumPy memory map, so serving a range never copies or parses the
+whole history. A small JSON sidecar records which time range the partition
+fully covers, so callers know which ranges still have to be fetched upstream.
+
+Layout:
+    <root>/<interval>/<TICKER>.bars   # BAR_DTYPE records sorted by ts
+    <root>/<interval>/<TICKER>.json   # {"start": <epoch s>, "end": <epoch s>}
+"""
+
+import json
+import os
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from app.services.providers.base import BAR_COLUMNS, empty_bars
+
+# One bar per record; ts is the bar start time in epoch seconds (UTC)
+BAR_DTYPE = np.dtype([
+    ("ts", "<i8"),
+    ("open", "<f8"),
+    ("high", "<f8"),
+    ("low", "<f8"),
+    ("close", "<f8"),
+    ("volume", "<f8"),
+])
+
+_UNSAFE_CHARS = re.compile(r"[^A-Z0-9.\-]")
+
+
+@dataclass(frozen=True)
+class Coverage:
+    """
+    Time range [start, end) in epoch seconds for which a partition holds every bar.
+    """
+
+    start: int
+    end: int
+
+
+class BarStore:
+    """
+    Append-only columnar bar storage on the local filesystem.
+
+    Writes to one partition are serialized with a per-partition lock; reads are
+    lock-free because records are only ever appended (or the whole file is
+    atomically replaced).
+    """
+
+    def __init__(self, root: str | Path):
+        """
+        Initialize the store.
+
+        Args:
+            root: Directory holding all partitions (created on first write)
+        """
+        self.root = Path(root)
+        self._locks: dict[tuple[str, str], threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def coverage(self, ticker: str, interval: str) -> Coverage | None:
+        """
+        Get the fully covered time range of a partition.
+
+        Args:
+            ticker: Stock ticker symbol
+            interval: Bar interval
+
+        Returns:
+            Coverage | None: Covered range, or None if nothing is stored yet
+        """
+        meta_path = self._meta_path(ticker, interval)
+        if not meta_path.exists():
+            return None
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        return Coverage(start=int(meta["start"]), end=int(meta["end"]))
+
+    def read(self, ticker: str, interval: str, start: int, end: int) -> np.ndarray:
+        """
+        Read stored bars with start <= ts < end.
+
+        Args:
+            ticker: Stock ticker symbol
+            interval: Bar interval
+            start: Inclusive start in epoch seconds
+            end: Exclusive end in epoch seconds
+
+        Returns:
+            np.ndarray: BAR_DTYPE records (a read-only view of the memory map)
+        """
+        records = self._map(ticker, interval)
+        ts = records["ts"]
+        lo, hi = np.searchsorted(ts, [start, end], side="left")
+        return records[lo:hi]
+
+    def write(self, ticker: str, interval: str, records: np.ndarray, start: int, end: int) -> None:
+        """
+        Store bars fetched for the range [start, end) and extend the coverage.
+
+        Bars after the last stored bar are appended in place. Bars before the
+        first stored bar (a backfill) cause the partition to be rewritten once.
+        Bars already stored are ignored.
+
+        Args:
+            ticker: Stock ticker symbol
+            interval: Bar interval
+            records: BAR_DTYPE records, sorted by ts
+            start: Inclusive start of the fetched range in epoch seconds
+            end: Exclusive end of the fetched range in epoch seconds
+        """
+        with self._lock(ticker, interval):
+            data_path = self._data_path(ticker, interval)
+            data_path.parent.mkdir(parents=True, exist_ok=True)
+
+            existing = self._map(ticker, interval)
+            if existing.size == 0:
+                new_records = records
+                append = True
+            else:
+                first, last = existing["ts"][0], existing["ts"][-1]
+                head = records[records["ts"] < first]
+                tail = records[records["ts"] > last]
+                if head.size:
+                    new_records = np.concatenate([head, np.asarray(existing), tail])
+                    append = False
+                else:
+                    new_records = tail
+                    append = True
+
+            if append:
+                with open(data_path, "ab") as f:
+                    f.write(np.ascontiguousarray(new_records, dtype=BAR_DTYPE).tobytes())
+            else:
+                self._replace(data_path, np.ascontiguousarray(new_records, dtype=BAR_DTYPE).tobytes())
+
+            coverage = self.coverage(ticker, interval)
+            if coverage is not None:
+                start, end = min(start, coverage.start), max(end, coverage.end)
+            self._replace(
+                self._meta_path(ticker, interval),
+                json.dumps({"start": start, "end": end}).encode("utf-8")
+            )
+
+    def _map(self, ticker: str, interval: str) -> np.ndarray:
+        path = self._data_path(ticker, interval)
+        try:
+            size = path.stat().st_size
+        except FileNotFoundError:
+            return np.empty(0, dtype=BAR_DTYPE)
+
+        # Ignore a trailing partial record left by an interrupted append
+        count = size // BAR_DTYPE.itemsize
+        if count == 0:
+            return np.empty(0, dtype=BAR_DTYPE)
+        return np.memmap(path, dtype=BAR_DTYPE, mode="r", shape=(count,))
+
+    def _lock(self, ticker: str, interval: str) -> threading.Lock:
+        key = (interval, ticker.upper())
+        with self._locks_guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def _partition(self, ticker: str, interval: str) -> Path:
+        name = _UNSAFE_CHARS.sub(lambda m: f"_{ord(m.group()):02X}", ticker.upper())
+        return self.root / interval / name
+
+    def _data_path(self, ticker: str, interval: str) -> Path:
+        return self._partition(ticker, interval).with_suffix(".bars")
+
+    def _meta_path(self, ticker: str, interval: str) -> Path:
+        return self._partition(ticker, interval).with_suffix(".json")
+
+    @staticmethod
+    def _replace(path: Path, payload: bytes) -> None:
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_bytes(payload)
+        os.replace(tmp_path, path)
+
+
+# Columns that must all be present for a bar to be kept (volume may be missing)
+PRICE_COLUMNS = ["open", "high", "low", "close"]
+
+
+def frame_to_records(frame: pd.DataFrame) -> np.ndarray:
+    """
+    Convert a provider history DataFrame into BAR_DTYPE records.
+
+    Rows with a missing (NaN) price are dropped: providers emit them for
+    gaps (yfinance does), and they must never be persisted as bars.
+
+    Args:
+        frame: Bars indexed by UTC timestamps with BAR_COLUMNS columns
+
+    Returns:
+        np.ndarray: BAR_DTYPE records sorted by ts
+    """
+    frame = frame.dropna(subset=PRICE_COLUMNS)
+    records = np.empty(len(frame), dtype=BAR_DTYPE)
+    records["ts"] = frame.index.as_unit("s").asi8
+    for column in BAR_COLUMNS:
+        records[column] = frame[column].to_numpy(dtype="float64")
+    return np.sort(records, order="ts")
+
+
+def records_to_frame(records: np.ndarray) -> pd.DataFrame:
+    """
+    Convert BAR_DTYPE records into a history DataFrame.
+
+    Args:
+        records: BAR_DTYPE records
+
+    Returns:
+        pd.DataFrame: Bars indexed by UTC timestamps with BAR_COLUMNS columns
+    """
+    if records.size == 0:
+        return empty_bars()
+    index = pd.DatetimeIndex(pd.to_datetime(records["ts"], unit="s", utc=True), name="timestamp")
+    return pd.DataFrame({column: np.asarray(records[column]) for column in BAR_COLUMNS}, index=index)
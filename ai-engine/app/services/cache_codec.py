@@ -0,0 +1,106 @@
+"""
+Binary encodings of values in the shared cache.
+
+Quotes are msgpack arrays (a few dozen bytes instead of a JSON document).
+Bar partitions are a fixed struct header with their coverage followed by
+the raw BAR_DTYPE records, so decoding is a zero-parse NumPy view.
+"""
+
+import struct
+
+import msgpack
+import numpy as np
+
+from app.schemas.stock import StockPriceSchema
+from app.services.bar_store import BAR_DTYPE, Coverage
+
+# Bumped whenever a layout changes; entries of another version are ignored
+_QUOTE_VERSION = 1
+_BARS_HEADER = struct.Struct("<Bqq")
+_BARS_VERSION = 1
+
+
+def encode_quote(price: StockPriceSchema, expires_at: float) -> bytes:
+    """
+    Encode a quote and the wall-clock time its cache lifetime ends.
+
+    Args:
+        price: Quote to encode
+        expires_at: Expiry in epoch seconds
+
+    Returns:
+        bytes: msgpack array
+    """
+    packed: bytes = msgpack.packb([
+        _QUOTE_VERSION,
+        price.ticker,
+        price.current_price,
+        price.currency,
+        price.market_status,
+        expires_at
+    ])
+    return packed
+
+
+def decode_quote(payload: bytes) -> tuple[StockPriceSchema, float]:
+    """
+    Decode a quote written by encode_quote.
+
+    Args:
+        payload: Encoded quote
+
+    Returns:
+        tuple[StockPriceSchema, float]: The quote and its expiry in epoch seconds
+
+    Raises:
+        ValueError: If the payload is not a quote of the current layout
+    """
+    fields = msgpack.unpackb(payload)
+    if not isinstance(fields, list) or len(fields) != 6 or fields[0] != _QUOTE_VERSION:
+        raise ValueError("Unsupported quote encoding")
+    _, ticker, current_price, currency, market_status, expires_at = fields
+    price = StockPriceSchema(
+        ticker=ticker,
+        current_price=current_price,
+        currency=currency,
+        market_status=market_status
+    )
+    return price, float(expires_at)
+
+
+def encode_bars(records: np.ndarray, coverage: Coverage) -> bytes:
+    """
+    Encode the bars of a partition with the range they fully cover.
+
+    Args:
+        records: BAR_DTYPE records sorted by ts
+        coverage: Range the records fully cover
+
+    Returns:
+        bytes: Header followed by the raw records
+    """
+    header = _BARS_HEADER.pack(_BARS_VERSION, coverage.start, coverage.end)
+    return header + np.ascontiguousarray(records, dtype=BAR_DTYPE).tobytes()
+
+
+def decode_bars(payload: bytes) -> tuple[np.ndarray, Coverage]:
+    """
+    Decode bars written by encode_bars.
+
+    Args:
+        payload: Encoded bars
+
+    Returns:
+        tuple[np.ndarray, Coverage]: Read-only BAR_DTYPE records and their coverage
+
+    Raises:
+        ValueError: If the payload is not a bar partition of the current layout
+    """
+    if len(payload) < _BARS_HEADER.size:
+        raise ValueError("Truncated bar encoding")
+    version, start, end = _BARS_HEADER.unpack_from(payload)
+    body = len(payload) - _BARS_HEADER.size
+    if version != _BARS_VERSION or body % BAR_DTYPE.itemsize:
+        raise ValueError("Unsupported bar encoding")
+    records = np.frombuffer(payload, dtype=BAR_DTYPE, offset=_BARS_HEADER.size)
+    return records, Coverage(start=start, end=end)
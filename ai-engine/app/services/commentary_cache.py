@@ -0,0 +1,224 @@
+"""
+Prompt/response cache for LLM commentary.
+
+Answers are grouped by an exact context key (normalized inputs plus the
+quote-snapshot buckets they were generated from). Within one context, a
+question also hits the answer of a rephrasing of it: a cached question with
+the same set of content words (stopwords and word order ignored) whose
+embedding is close enough, so "What's driving AAPL today?" and "what is
+driving aapl today" share one LLM call.
+
+The embedding is a hashed character-trigram vector (NumPy only, stable across
+processes). Character trigrams alone rate "increase my position" and
+"decrease my position" as near-duplicates, which is why the content words
+must match exactly: a single different word ("month" or "year") can change
+the question.
+"""
+
+import re
+import time
+import zlib
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from typing import Literal
+
+import numpy as np
+
+from app.core.metrics import COMMENTARY_CACHE_LOOKUPS
+
+# Dimensions of the hashed trigram embedding
+EMBEDDING_DIMS = 1024
+
+# Cached answers per context (the most recent ones are kept)
+_ANSWERS_PER_CONTEXT = 8
+
+_WORDS = re.compile(r"\w+")
+
+# Words that do not change what a question asks (negations and directions are not among them)
+_STOPWORDS = frozenset({
+    "a", "an", "the", "is", "are", "was", "were", "be", "been", "being", "am", "do", "does", "did",
+    "what", "whats", "s", "which", "who", "how", "i", "me", "my", "we", "our", "you", "your", "it", "its",
+    "this", "that", "these", "those", "of", "to", "in", "on", "for", "at", "by", "with", "about",
+    "and", "or", "please", "tell", "can", "could", "would", "will", "there", "here", "so", "just",
+})
+
+CacheResult = Literal["hit", "near_hit", "miss"]
+
+
+def normalize_question(question: str | None) -> str:
+    """
+    Lower-case a question and collapse it to its words.
+
+    Args:
+        question: Free-text question (None for none)
+
+    Returns:
+        str: Words separated by single spaces ("" for no question)
+    """
+    return " ".join(_WORDS.findall(question.lower())) if question else ""
+
+
+def content_words(text: str) -> frozenset[str]:
+    """
+    Words of a normalized question that are not stopwords.
+
+    Args:
+        text: Normalized text (see normalize_question)
+
+    Returns:
+        frozenset[str]: Content words, without order or repetitions
+    """
+    return frozenset(word for word in text.split() if word not in _STOPWORDS)
+
+
+def embed(text: str) -> np.ndarray:
+    """
+    Embed normalized text as an L2-normalized hashed character-trigram vector.
+
+    Args:
+        text: Normalized text (see normalize_question)
+
+    Returns:
+        np.ndarray: float64 vector of EMBEDDING_DIMS (all zeros for "")
+    """
+    vector = np.zeros(EMBEDDING_DIMS)
+    if not text:
+        return vector
+    padded = f" {text} "
+    # crc32 rather than hash(): str hashes are randomized per process
+    buckets = [zlib.crc32(padded[i:i + 3].encode()) % EMBEDDING_DIMS for i in range(len(padded) - 2)]
+    np.add.at(vector, buckets, 1.0)
+    normalized: np.ndarray = vector / np.linalg.norm(vector)
+    return normalized
+
+
+@dataclass
+class CachedCommentary:
+    """
+    One cached answer.
+    """
+
+    question: str
+    content: frozenset[str]
+    embedding: np.ndarray
+    text: str
+    prompt_tokens: int
+    completion_tokens: int
+    expires_at: float
+
+
+class CommentaryCache:
+    """
+    TTL cache of commentary answers with LRU eviction of contexts.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl: float,
+        similarity_threshold: float,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_size: Maximum cached answers over all contexts
+            ttl: Seconds an answer stays valid
+            similarity_threshold: Minimum cosine similarity of two questions with the same
+                content words to share an answer
+            clock: Monotonic time source (injectable for tests)
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.similarity_threshold = similarity_threshold
+        self._clock = clock
+        self._contexts: OrderedDict[Hashable, list[CachedCommentary]] = OrderedDict()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def get(self, context: Hashable, question: str) -> CachedCommentary | None:
+        """
+        Find the answer to a question, or to a rephrasing of it, in a context.
+
+        Args:
+            context: Exact context key
+            question: Normalized question ("" for none; only matches "")
+
+        Returns:
+            CachedCommentary | None: Best matching live answer
+        """
+        entry, result = self._lookup(context, question)
+        COMMENTARY_CACHE_LOOKUPS.labels(result=result).inc()
+        return entry
+
+    def set(self, context: Hashable, question: str, text: str, prompt_tokens: int, completion_tokens: int) -> None:
+        """
+        Cache an answer.
+
+        Args:
+            context: Exact context key
+            question: Normalized question
+            text: Generated commentary
+            prompt_tokens: Prompt tokens the answer cost
+            completion_tokens: Completion tokens the answer cost
+        """
+        entries = self._contexts.pop(context, [])
+        kept = [entry for entry in entries if entry.question != question]
+        kept.append(CachedCommentary(
+            question=question,
+            content=content_words(question),
+            embedding=embed(question),
+            text=text,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            expires_at=self._clock() + self.ttl
+        ))
+        kept = kept[-_ANSWERS_PER_CONTEXT:]
+        self._contexts[context] = kept
+        self._size += len(kept) - len(entries)
+
+        while self._size > self.max_size and self._contexts:
+            _, evicted = self._contexts.popitem(last=False)
+            self._size -= len(evicted)
+
+    def clear(self) -> None:
+        """
+        Drop every cached answer.
+        """
+        self._contexts.clear()
+        self._size = 0
+
+    def _lookup(self, context: Hashable, question: str) -> tuple[CachedCommentary | None, CacheResult]:
+        entries = self._contexts.get(context)
+        if not entries:
+            return None, "miss"
+
+        now = self._clock()
+        live = [entry for entry in entries if entry.expires_at > now]
+        if len(live) != len(entries):
+            self._size -= len(entries) - len(live)
+            if not live:
+                del self._contexts[context]
+                return None, "miss"
+            self._contexts[context] = live
+        self._contexts.move_to_end(context)
+
+        for entry in live:
+            if entry.question == question:
+                return entry, "hit"
+        if not question:
+            return None, "miss"
+
+        content = content_words(question)
+        candidates = [entry for entry in live if entry.question and entry.content == content]
+        if not content or not candidates:
+            return None, "miss"
+        similarities = np.stack([entry.embedding for entry in candidates]) @ embed(question)
+        best = int(np.argmax(similarities))
+        if similarities[best] >= self.similarity_threshold:
+            return candidates[best], "near_hit"
+        return None, "miss"
@@ -0,0 +1,312 @@
+"""
+LLM market commentary service.
+
+Generates short commentary on tickers or a portfolio from a current quote
+snapshot with an OpenAI-compatible chat model, streaming the text as it is
+generated. Answers are cached per normalized inputs and quote-price bucket
+(near-duplicate questions included, see app.services.commentary_cache), and
+every caller is held to a concurrency limit and a token budget.
+"""
+
+import math
+import time
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, cast
+
+from app.config.settings import Settings, get_settings
+from app.core.budget import BudgetLease, CallerBudgets
+from app.core.errors import AIEngineException, ExternalAPIError, ValidationError
+from app.core.logging import get_logger
+from app.core.metrics import LLM_FIRST_TOKEN_LATENCY, LLM_TOKENS
+from app.schemas.commentary import CommentaryRequest, CommentarySchema, CommentaryUsageSchema
+from app.schemas.stock import StockPriceSchema
+from app.services.commentary_cache import CachedCommentary, CommentaryCache, normalize_question
+from app.services.stock_service import StockService
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+    from openai.types.chat import ChatCompletionMessageParam
+
+logger = get_logger(__name__)
+
+_LANGUAGES = {"ko": "Korean", "en": "English"}
+
+_SYSTEM_PROMPT = (
+    "You are a market commentator in a stock portfolio app. Write a short, factual commentary "
+    "(at most one paragraph) on the instruments below, based on the quote snapshot. "
+    "Do not give personalized investment advice. Answer in {language}."
+)
+
+# Context key of an answer: subject kind, language and per-ticker (ticker, quantity, price bucket, market status)
+ContextKey = tuple[str, str, tuple[tuple[str, float | None, int, str], ...]]
+
+
+@dataclass
+class CommentaryJob:
+    """
+    A prepared commentary request: either a cache hit or an admitted LLM call.
+
+    `result` is set once the commentary has been fully streamed.
+    """
+
+    tickers: list[str]
+    messages: list[dict[str, str]]
+    context: ContextKey
+    question: str
+    cached: CachedCommentary | None = None
+    lease: BudgetLease | None = None
+    result: CommentarySchema | None = None
+
+    def release(self) -> None:
+        """
+        Release the budget slot of a job that is not streamed to the end (idempotent).
+        """
+        if self.lease is not None:
+            self.lease.release()
+
+
+class CommentaryService:
+    """
+    Service for LLM market commentary.
+
+    Requests are handled in two steps so that every error that can be
+    reported as a normal JSON response happens before streaming starts:
+    prepare() validates, fetches quotes, looks up the cache and admits the
+    call against the caller's budget; stream() then yields the text.
+    """
+
+    def __init__(
+        self,
+        stock_service: StockService,
+        settings: Settings | None = None,
+        cache: CommentaryCache | None = None,
+        budgets: CallerBudgets | None = None
+    ):
+        """
+        Initialize the service.
+
+        Args:
+            stock_service: Source of current prices
+            settings: Application settings (defaults to the cached settings singleton)
+            cache: Answer cache (defaults to one sized by the COMMENTARY_CACHE_* settings)
+            budgets: Per-caller budgets (defaults to the COMMENTARY_* concurrency and token budget)
+        """
+        self.stock_service = stock_service
+        self.settings = settings or get_settings()
+        self.cache = cache or CommentaryCache(
+            max_size=self.settings.commentary_cache_size,
+            ttl=self.settings.commentary_cache_ttl,
+            similarity_threshold=self.settings.commentary_similarity_threshold
+        )
+        self.budgets = budgets or CallerBudgets(
+            max_concurrency=self.settings.commentary_max_concurrency,
+            budget=self.settings.commentary_token_budget,
+            window=self.settings.commentary_budget_window
+        )
+
+    async def prepare(self, request: CommentaryRequest, caller: str) -> CommentaryJob:
+        """
+        Validate a request, snapshot its quotes and serve it from the cache or admit it.
+
+        Args:
+            request: Tickers or positions, optional question and language
+            caller: Caller identity the budget is charged to
+
+        Returns:
+            CommentaryJob: Job to pass to stream() or generate()
+
+        Raises:
+            ValidationError: If too many tickers are requested
+            ExternalAPIError: If none of the tickers could be priced
+            RateLimitError: If the caller is over its concurrency limit or token budget
+        """
+        quantities: dict[str, float | None] = {}
+        if request.positions:
+            for position in request.positions:
+                ticker = position.ticker.strip().upper()
+                quantities[ticker] = (quantities.get(ticker) or 0.0) + position.quantity
+        else:
+            quantities = dict.fromkeys(ticker.strip().upper() for ticker in request.tickers)
+
+        if len(quantities) > self.settings.commentary_max_tickers:
+            raise ValidationError(
+                message=f"Too many tickers for commentary (max {self.settings.commentary_max_tickers})",
+                details={"requested": len(quantities), "max": self.settings.commentary_max_tickers}
+            )
+
+        quotes = await self.stock_service.get_current_prices(list(quantities))
+        if not quotes.prices:
+            raise ExternalAPIError(
+                message="No quotes available for commentary",
+                details={"cause": "no_quotes", "errors": [error.model_dump() for error in quotes.errors]}
+            )
+
+        question = normalize_question(request.question)
+        context: ContextKey = (
+            "portfolio" if request.positions else "tickers",
+            request.language,
+            tuple(
+                (quote.ticker, quantities[quote.ticker], self._price_bucket(quote.current_price), quote.market_status)
+                for quote in sorted(quotes.prices, key=lambda quote: quote.ticker)
+            )
+        )
+        messages = self._messages(request, quotes.prices, quantities, [error.ticker for error in quotes.errors])
+        job = CommentaryJob(
+            tickers=[quote.ticker for quote in quotes.prices],
+            messages=messages,
+            context=context,
+            question=question
+        )
+
+        job.cached = self.cache.get(context, question)
+        if job.cached is None:
+            prompt_tokens = _estimate_tokens(" ".join(message["content"] for message in messages))
+            job.lease = self.budgets.acquire(caller, reserve=prompt_tokens + self.settings.llm_max_tokens)
+        return job
+
+    async def stream(self, job: CommentaryJob, llm: "AsyncOpenAI") -> AsyncIterator[str]:
+        """
+        Yield the commentary text as it is generated (a cached answer in one piece).
+
+        The caller's budget is charged with the tokens reported by the server
+        (estimated if it reports none) and released when the stream ends,
+        also when the consumer stops early.
+
+        Args:
+            job: Prepared job
+            llm: OpenAI-compatible client
+
+        Yields:
+            str: Pieces of the commentary
+
+        Raises:
+            ExternalAPIError: If the LLM request fails
+        """
+        if job.cached is not None:
+            job.result = self._result(job, job.cached.text, job.cached.prompt_tokens,
+                                      job.cached.completion_tokens, cached=True)
+            yield job.cached.text
+            return
+
+        from openai import APIError
+
+        model = self.settings.llm_model
+        parts: list[str] = []
+        prompt_tokens = _estimate_tokens(" ".join(message["content"] for message in job.messages))
+        completion_tokens: int | None = None
+        started = time.perf_counter()
+        try:
+            response = await llm.chat.completions.create(
+                model=model,
+                messages=cast("list[ChatCompletionMessageParam]", job.messages),
+                max_tokens=self.settings.llm_max_tokens,
+                temperature=self.settings.llm_temperature,
+                stream=True,
+                stream_options={"include_usage": True}
+            )
+            async for chunk in response:
+                if chunk.usage is not None:
+                    prompt_tokens = chunk.usage.prompt_tokens
+                    completion_tokens = chunk.usage.completion_tokens
+                for choice in chunk.choices:
+                    text = choice.delta.content
+                    if text:
+                        if not parts:
+                            LLM_FIRST_TOKEN_LATENCY.labels(model=model).observe(time.perf_counter() - started)
+                        parts.append(text)
+                        yield text
+        except AIEngineException:
+            raise
+        except APIError as e:
+            logger.warning("LLM request for %s failed: %s", job.tickers, e)
+            raise ExternalAPIError(
+                message="LLM request failed",
+                details={"cause": "llm", "status": getattr(e, "status_code", None), "error": str(e)}
+            ) from e
+        finally:
+            text = "".join(parts)
+            if completion_tokens is None:
+                completion_tokens = _estimate_tokens(text) if text else 0
+            LLM_TOKENS.labels(model=model, kind="prompt").inc(prompt_tokens)
+            LLM_TOKENS.labels(model=model, kind="completion").inc(completion_tokens)
+            if job.lease is not None:
+                job.lease.settle(prompt_tokens + completion_tokens)
+                job.lease.release()
+
+        self.cache.set(job.context, job.question, text, prompt_tokens, completion_tokens)
+        job.result = self._result(job, text, prompt_tokens, completion_tokens, cached=False)
+
+    async def generate(self, job: CommentaryJob, llm: "AsyncOpenAI") -> CommentarySchema:
+        """
+        Generate the whole commentary (non-streaming).
+
+        Args:
+            job: Prepared job
+            llm: OpenAI-compatible client
+
+        Returns:
+            CommentarySchema: Commentary, cache flag and token usage
+
+        Raises:
+            ExternalAPIError: If the LLM request fails
+        """
+        async for _ in self.stream(job, llm):
+            pass
+        if job.result is None:
+            raise ExternalAPIError(message="LLM returned no commentary", details={"cause": "llm"})
+        return job.result
+
+    def _price_bucket(self, price: float) -> int:
+        # Log-scale buckets: prices within COMMENTARY_PRICE_BUCKET_PCT of each other share answers
+        if price <= 0:
+            return 0
+        return math.floor(math.log(price) / math.log1p(self.settings.commentary_price_bucket_pct / 100))
+
+    def _messages(
+        self,
+        request: CommentaryRequest,
+        prices: list[StockPriceSchema],
+        quantities: dict[str, float | None],
+        unpriced: list[str]
+    ) -> list[dict[str, str]]:
+        lines = ["Quote snapshot:"]
+        for quote in prices:
+            quantity = quantities[quote.ticker]
+            if quantity is None:
+                lines.append(f"- {quote.ticker}: {quote.current_price:.2f} {quote.currency}, market {quote.market_status}")
+            else:
+                lines.append(
+                    f"- {quote.ticker}: {quantity:g} shares at {quote.current_price:.2f} {quote.currency} "
+                    f"(value {quantity * quote.current_price:,.2f} {quote.currency}), market {quote.market_status}"
+                )
+        if unpriced:
+            lines.append(f"No quote available for: {', '.join(unpriced)}")
+        if request.question:
+            lines.append(f"Question: {request.question.strip()}")
+
+        return [
+            {"role": "system", "content": _SYSTEM_PROMPT.format(language=_LANGUAGES[request.language])},
+            {"role": "user", "content": "\n".join(lines)},
+        ]
+
+    def _result(
+        self,
+        job: CommentaryJob,
+        text: str,
+        prompt_tokens: int,
+        completion_tokens: int,
+        cached: bool
+    ) -> CommentarySchema:
+        return CommentarySchema(
+            tickers=job.tickers,
+            commentary=text,
+            model=self.settings.llm_model,
+            cached=cached,
+            usage=CommentaryUsageSchema(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+        )
+
+
+def _estimate_tokens(text: str) -> int:
+    # About four characters per token for English text; only used when the server reports no usage
+    return max(1, len(text) // 4)
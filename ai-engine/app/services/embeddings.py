@@ -0,0 +1,127 @@
+"""
+Text embedding models for document retrieval.
+
+Embedders turn texts into L2-normalized float32 vectors, so the inner
+product of two vectors is their cosine similarity. The default hashing
+embedder needs no model download or network access; a sentence-transformers
+model can be plugged in with RETRIEVAL_EMBEDDER=sentence-transformers
+(requires the optional sentence-transformers package).
+"""
+
+import re
+import zlib
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from typing import Any
+
+import numpy as np
+
+from app.config.settings import Settings
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+class Embedder(ABC):
+    """
+    Text embedding model.
+
+    `name` identifies the model and its dimensions; an index refuses
+    vectors from another embedder than the one it was built with.
+    """
+
+    name: str
+    dims: int
+
+    @abstractmethod
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Embed texts (blocking).
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            np.ndarray: (len(texts), dims) float32 L2-normalized vectors
+        """
+
+
+class HashingEmbedder(Embedder):
+    """
+    Offline embedder hashing word unigrams and bigrams into a fixed number of dimensions.
+
+    Each feature adds a log-scaled term frequency to a crc32-chosen dimension
+    with a hash-chosen sign, so unrelated features cancel out on average.
+    Texts sharing vocabulary get similar vectors; synonyms do not, which is
+    the price of needing no model.
+    """
+
+    def __init__(self, dims: int = 256):
+        """
+        Initialize the embedder.
+
+        Args:
+            dims: Vector dimensions
+        """
+        self.dims = dims
+        self.name = f"hashing-{dims}"
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dims), dtype=np.float32)
+        for i, text in enumerate(texts):
+            tokens = _TOKEN.findall(text.lower())
+            features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:], strict=False)]
+            counts: dict[int, float] = {}
+            for feature in features:
+                digest = zlib.crc32(feature.encode("utf-8"))
+                # The low bit picks the sign, the rest the dimension
+                key = (digest >> 1) % self.dims
+                counts[key] = counts.get(key, 0.0) + (1.0 if digest & 1 else -1.0)
+            for key, count in counts.items():
+                vectors[i, key] = np.sign(count) * np.log1p(abs(count))
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors /= np.maximum(norms, 1e-12)
+        return vectors
+
+
+class SentenceTransformerEmbedder(Embedder):
+    """
+    Embedder backed by a local sentence-transformers model.
+
+    The model is loaded on first use from the local Hugging Face cache (or
+    a local directory), so it can run offline once downloaded.
+    """
+
+    def __init__(self, model_name: str):
+        """
+        Initialize the embedder.
+
+        Args:
+            model_name: Model name or local model directory
+
+        Raises:
+            ImportError: If sentence-transformers is not installed
+        """
+        from sentence_transformers import SentenceTransformer
+
+        self._model: Any = SentenceTransformer(model_name)
+        self.dims = int(self._model.get_sentence_embedding_dimension() or 0)
+        self.name = f"st:{model_name}"
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = self._model.encode(list(texts), normalize_embeddings=True, convert_to_numpy=True)
+        return np.asarray(vectors, dtype=np.float32).reshape(len(texts), self.dims)
+
+
+def create_embedder(settings: Settings) -> Embedder:
+    """
+    Create the embedder selected by RETRIEVAL_EMBEDDER.
+
+    Args:
+        settings: Application settings
+
+    Returns:
+        Embedder: Hashing or sentence-transformers embedder
+    """
+    if settings.retrieval_embedder == "sentence-transformers":
+        return SentenceTransformerEmbedder(settings.retrieval_embedding_model)
+    return HashingEmbedder(settings.retrieval_embedding_dims)
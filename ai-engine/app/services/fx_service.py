@@ -0,0 +1,289 @@
+"""
+Foreign exchange rate service.
+
+Keeps one quote per configured currency against a pivot currency (e.g.,
+USDKRW=X, USDJPY=X) and derives the full cross-rate matrix from them as one
+NumPy array. The matrix is rebuilt on a schedule, so conversions never cost
+an upstream lookup per request and whole arrays of amounts convert at once.
+"""
+
+import asyncio
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from datetime import UTC, datetime
+
+import numpy as np
+
+from app.core.errors import AIEngineException, ExternalAPIError, ValidationError
+from app.core.logging import get_logger
+from app.schemas.stock import StockPriceSchema
+from app.services.providers.base import MarketDataProvider
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class FxRates:
+    """
+    Immutable cross-rate matrix.
+
+    `matrix[i, j]` is the number of units of `currencies[j]` per unit of
+    `currencies[i]`, so an amount converts from i to j as amount * matrix[i, j].
+    """
+
+    currencies: tuple[str, ...]
+    matrix: np.ndarray
+    as_of: datetime
+
+    @classmethod
+    def from_pivot_rates(cls, pivot_rates: dict[str, float], as_of: datetime) -> "FxRates":
+        """
+        Build the cross-rate matrix from rates against one pivot currency.
+
+        Args:
+            pivot_rates: Units of each currency per unit of the pivot currency (pivot itself = 1)
+            as_of: Time the rates were taken
+
+        Returns:
+            FxRates: Rates between every pair of the given currencies
+        """
+        currencies = tuple(pivot_rates)
+        per_pivot = np.array([pivot_rates[currency] for currency in currencies], dtype=np.float64)
+        # (pivot per unit of i) * (units of j per pivot)
+        matrix = np.outer(1.0 / per_pivot, per_pivot)
+        np.fill_diagonal(matrix, 1.0)
+        matrix.setflags(write=False)
+        return cls(currencies=currencies, matrix=matrix, as_of=as_of)
+
+    def __contains__(self, currency: object) -> bool:
+        return currency in self.currencies
+
+    def index_of(self, currency: str) -> int:
+        """
+        Row/column of a currency in the matrix.
+
+        Raises:
+            ValidationError: If the currency is not supported
+        """
+        try:
+            return self.currencies.index(currency.upper())
+        except ValueError:
+            raise ValidationError(
+                message=f"Unsupported currency: {currency}",
+                details={"currency": currency, "supported": list(self.currencies), "cause": "unsupported_currency"}
+            ) from None
+
+    def rate(self, source: str, target: str) -> float:
+        """
+        Units of `target` per unit of `source`.
+
+        Raises:
+            ValidationError: If either currency is not supported
+        """
+        return float(self.matrix[self.index_of(source), self.index_of(target)])
+
+    def convert(self, amounts: np.ndarray | Sequence[float], currencies: Sequence[str], target: str) -> np.ndarray:
+        """
+        Convert amounts in mixed currencies to one target currency in a single pass.
+
+        Args:
+            amounts: Amounts to convert
+            currencies: Currency of each amount (same length as amounts)
+            target: Currency to convert to
+
+        Returns:
+            np.ndarray: Converted amounts
+
+        Raises:
+            ValidationError: If the lengths differ or a currency is not supported
+        """
+        values = np.asarray(amounts, dtype=np.float64)
+        if values.shape != (len(currencies),):
+            raise ValidationError(
+                message="Every amount needs exactly one currency",
+                details={"amounts": values.size, "currencies": len(currencies)}
+            )
+        if not len(currencies):
+            return values
+
+        # Look every distinct currency up once, then gather with an index array
+        codes, inverse = np.unique(np.char.upper(np.asarray(currencies, dtype=str)), return_inverse=True)
+        rows = np.array([self.index_of(str(code)) for code in codes], dtype=np.intp)[inverse]
+        converted: np.ndarray = values * self.matrix[rows, self.index_of(target)]
+        return converted
+
+
+class FxService:
+    """
+    Service for exchange rates between the configured currencies.
+
+    `start()` refreshes the matrix every `refresh_interval` seconds in the
+    background. Without the scheduler (or before its first run) the matrix is
+    loaded on first use and reloaded once it is older than the interval.
+    When some pair quotes fail, their last known rates are kept.
+    """
+
+    def __init__(
+        self,
+        provider: MarketDataProvider,
+        currencies: Sequence[str],
+        pivot: str = "USD",
+        refresh_interval: float = 60.0,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Initialize the service.
+
+        Args:
+            provider: Source of pair quotes
+            currencies: Supported currency codes (the pivot is always included)
+            pivot: Currency every pair is quoted against (e.g., USD for USDKRW=X)
+            refresh_interval: Seconds between two refreshes of the matrix
+            clock: Wall-clock function in epoch seconds (injectable for tests)
+        """
+        self.provider = provider
+        self.pivot = pivot.upper()
+        self.currencies = list(dict.fromkeys([self.pivot, *(currency.upper() for currency in currencies)]))
+        self.refresh_interval = refresh_interval
+        self._clock = clock
+        self._pivot_rates: dict[str, float] = {self.pivot: 1.0}
+        self._rates: FxRates | None = None
+        self._loaded_at = 0.0
+        self._loading: asyncio.Task[FxRates] | None = None
+        self._scheduler: asyncio.Task[None] | None = None
+
+    def pair_symbol(self, currency: str) -> str | None:
+        """
+        Provider symbol of a currency's pair against the pivot.
+
+        Returns:
+            str | None: e.g. "USDKRW=X", or None for the pivot itself
+        """
+        currency = currency.upper()
+        return None if currency == self.pivot else f"{self.pivot}{currency}=X"
+
+    async def get_rates(self) -> FxRates:
+        """
+        Get the current cross-rate matrix, loading it if missing or out of date.
+
+        Concurrent callers share one refresh.
+
+        Returns:
+            FxRates: Current rates
+
+        Raises:
+            ExternalAPIError: If no rate could ever be loaded
+        """
+        if self._rates is not None and self._clock() - self._loaded_at < self.refresh_interval:
+            return self._rates
+        return await self._shared_refresh()
+
+    async def refresh(self) -> FxRates:
+        """
+        Fetch all pair quotes in one batch and rebuild the matrix.
+
+        Returns:
+            FxRates: The new rates
+
+        Raises:
+            ExternalAPIError: If no rate could ever be loaded
+        """
+        symbols = {currency: f"{self.pivot}{currency}=X" for currency in self.currencies if currency != self.pivot}
+        try:
+            quotes = await self.provider.get_quotes(list(symbols.values()))
+        except AIEngineException as e:
+            logger.warning("FX rate refresh failed: %s", e.message)
+            quotes = {}
+
+        for currency, symbol in symbols.items():
+            quote = quotes.get(symbol)
+            if quote is None or isinstance(quote, Exception) or not quote.price > 0:
+                logger.warning("No FX rate for %s, keeping the last known one", symbol)
+                continue
+            self._pivot_rates[currency] = quote.price
+
+        if len(self._pivot_rates) == 1 and len(self.currencies) > 1:
+            raise ExternalAPIError(
+                message="Exchange rates are not available",
+                details={"pairs": list(symbols.values()), "cause": "upstream_error"}
+            )
+
+        now = self._clock()
+        rates = FxRates.from_pivot_rates(
+            {currency: self._pivot_rates[currency] for currency in self.currencies if currency in self._pivot_rates},
+            as_of=datetime.fromtimestamp(now, tz=UTC)
+        )
+        self._rates = rates
+        self._loaded_at = now
+        return rates
+
+    async def to_base(self, prices: list[StockPriceSchema], base_currency: str) -> list[StockPriceSchema]:
+        """
+        Copy quotes with their price converted to a base currency.
+
+        Quotes in a currency without a rate keep `base_price=None`.
+
+        Args:
+            prices: Quotes to convert
+            base_currency: Currency to convert to
+
+        Returns:
+            list[StockPriceSchema]: Copies with base_currency and base_price set
+
+        Raises:
+            ValidationError: If the base currency is not supported
+        """
+        rates = await self.get_rates()
+        base = base_currency.upper()
+        rates.index_of(base)
+
+        convertible = [price for price in prices if price.currency in rates]
+        converted = rates.convert(
+            [price.current_price for price in convertible],
+            [price.currency for price in convertible],
+            base
+        )
+        base_prices = {id(price): round(float(value), 4) for price, value in zip(convertible, converted, strict=True)}
+        return [
+            price.model_copy(update={"base_currency": base, "base_price": base_prices.get(id(price))})
+            for price in prices
+        ]
+
+    def start(self) -> None:
+        """
+        Start refreshing the matrix every `refresh_interval` seconds in the background.
+        """
+        if self._scheduler is None or self._scheduler.done():
+            self._scheduler = asyncio.ensure_future(self._run())
+
+    async def close(self) -> None:
+        """
+        Stop the background refresh.
+        """
+        for task in (self._scheduler, self._loading):
+            if task is not None and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._scheduler = None
+        self._loading = None
+
+    async def _shared_refresh(self) -> FxRates:
+        """
+        Join the running refresh, or start one (scheduled and on-demand loads never overlap).
+        """
+        if self._loading is None or self._loading.done():
+            self._loading = asyncio.ensure_future(self.refresh())
+        return await asyncio.shield(self._loading)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self._shared_refresh()
+            except Exception:
+                # Never let one failed refresh stop the schedule
+                logger.exception("Scheduled FX rate refresh failed")
+            await asyncio.sleep(self.refresh_interval)
@@ -0,0 +1,296 @@
+"""
+Historical bar data service.
+
+Serves OHLCV history from the local bar store and only asks the upstream
+provider for the ranges the store does not cover yet.
+"""
+
+import asyncio
+import math
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime
+
+import numpy as np
+import pandas as pd
+
+from app.config.settings import Settings, get_settings
+from app.core.errors import ValidationError
+from app.core.logging import get_logger
+from app.core.shared_cache import SharedCache
+from app.schemas.stock import BarSchema, StockHistorySchema
+from app.services.bar_store import BarStore, Coverage, frame_to_records, records_to_frame
+from app.services.cache_codec import decode_bars, encode_bars
+from app.services.providers.base import INTERVAL_DELTAS, Interval, MarketDataProvider
+from app.services.providers.factory import create_market_data_provider
+
+logger = get_logger(__name__)
+
+_SECONDS_PER_DAY = 86_400
+
+
+class HistoryService:
+    """
+    Service for historical OHLCV bars.
+
+    Only completed bars are persisted. The bar that is still forming (its
+    interval has not ended yet) is fetched on demand and served, but never
+    stored, so the store never holds values that can still change.
+
+    With a shared cache, a worker missing a range first imports the
+    partition another worker has published there, and only one worker at a
+    time fetches the rest of a partition upstream.
+    """
+
+    def __init__(
+        self,
+        settings: Settings | None = None,
+        provider: MarketDataProvider | None = None,
+        store: BarStore | None = None,
+        clock: Callable[[], float] = time.time,
+        shared: SharedCache | None = None
+    ):
+        """
+        Initialize the service.
+
+        Args:
+            settings: Application settings (defaults to the cached settings singleton)
+            provider: Market data provider (defaults to the provider selected in settings)
+            store: Bar store (defaults to a store at settings.bar_store_path)
+            clock: Wall-clock function in epoch seconds (injectable for tests)
+            shared: Shared cache tier in front of the upstream provider (None keeps bars per host)
+        """
+        self.settings = settings or get_settings()
+        self.provider = provider or create_market_data_provider(self.settings)
+        self.store = store or BarStore(self.settings.bar_store_path)
+        self.shared = shared
+        self._clock = clock
+
+    async def get_history(
+        self,
+        ticker: str,
+        interval: Interval,
+        start: datetime | None = None,
+        end: datetime | None = None
+    ) -> StockHistorySchema:
+        """
+        Get OHLCV bars of a ticker as a response schema.
+
+        Args:
+            ticker: Stock ticker symbol
+            interval: Bar interval
+            start: Inclusive range start (defaults to the configured lookback before end)
+            end: Exclusive range end (defaults to now)
+
+        Returns:
+            StockHistorySchema: Bars sorted by timestamp
+
+        Raises:
+            ValidationError: If start is not before end
+            ExternalAPIError: If a missing range cannot be fetched upstream
+        """
+        frame = await self.get_bars(ticker, interval, start, end)
+
+        bars = [
+            BarSchema(
+                timestamp=timestamp,
+                open=row.open,
+                high=row.high,
+                low=row.low,
+                close=row.close,
+                # Providers report no volume (NaN) for some instruments, e.g. FX pairs
+                volume=0 if math.isnan(row.volume) else int(row.volume)
+            )
+            for timestamp, row in zip(frame.index, frame.itertuples(index=False), strict=True)
+        ]
+        return StockHistorySchema(ticker=ticker.upper(), interval=interval, bars=bars)
+
+    async def get_bars(
+        self,
+        ticker: str,
+        interval: Interval,
+        start: datetime | None = None,
+        end: datetime | None = None
+    ) -> pd.DataFrame:
+        """
+        Get OHLCV bars of a ticker as a DataFrame.
+
+        Args:
+            ticker: Stock ticker symbol
+            interval: Bar interval
+            start: Inclusive range start (defaults to the configured lookback before end)
+            end: Exclusive range end (defaults to now)
+
+        Returns:
+            pd.DataFrame: Bars indexed by UTC timestamps with open/high/low/close/volume columns
+
+        Raises:
+            ValidationError: If start is not before end
+            ExternalAPIError: If a missing range cannot be fetched upstream
+        """
+        return records_to_frame(await self.get_records(ticker, interval, start, end))
+
+    async def get_records(
+        self,
+        ticker: str,
+        interval: Interval,
+        start: datetime | None = None,
+        end: datetime | None = None
+    ) -> np.ndarray:
+        """
+        Get OHLCV bars of a ticker as BAR_DTYPE records.
+
+        Ranges already covered by the bar store are read from disk; only the
+        uncovered head and/or tail ranges are fetched (from the shared cache
+        if enabled, otherwise upstream) and appended.
+
+        Args:
+            ticker: Stock ticker symbol
+            interval: Bar interval
+            start: Inclusive range start (defaults to the configured lookback before end)
+            end: Exclusive range end (defaults to now)
+
+        Returns:
+            np.ndarray: BAR_DTYPE records sorted by ts (a read-only view of the bar
+            store's memory map when no forming bar is appended)
+
+        Raises:
+            ValidationError: If start is not before end
+            ExternalAPIError: If a missing range cannot be fetched upstream
+        """
+        symbol = ticker.strip().upper()
+        now = int(self._clock())
+        step = int(INTERVAL_DELTAS[interval].total_seconds())
+
+        end_s = min(_to_epoch(end), now) if end else now
+        start_s = _to_epoch(start) if start else end_s - self.settings.history_default_lookback_days * _SECONDS_PER_DAY
+        if start_s >= end_s:
+            raise ValidationError(
+                message="History start must be before end",
+                details={"ticker": symbol, "start": start_s, "end": end_s}
+            )
+
+        # A bar is complete (and may be stored) once its whole interval has passed
+        complete_end = now - step + 1
+
+        missing = self._missing(symbol, interval, start_s, end_s)
+        # A range shorter than one interval past the stored bars holds at most the
+        # forming bar, which is never shared; only longer ones go through the shared cache
+        if self.shared is not None and any(min(end, complete_end) - begin >= step for begin, end in missing):
+            key = f"bars:{interval}:{symbol}"
+            async with self.shared.lock(key):
+                if await self._import_shared(self.shared, key, symbol, interval):
+                    missing = self._missing(symbol, interval, start_s, end_s)
+                imported = self.store.coverage(symbol, interval)
+                forming = await self._fetch_missing(symbol, interval, missing, complete_end)
+                if self.store.coverage(symbol, interval) != imported:
+                    await self._export_shared(self.shared, key, symbol, interval)
+        else:
+            forming = await self._fetch_missing(symbol, interval, missing, complete_end)
+
+        stored = self.store.read(symbol, interval, start_s, end_s)
+        if forming:
+            live = np.concatenate(forming)
+            live = live[(live["ts"] >= start_s) & (live["ts"] < end_s)]
+            if stored.size:
+                live = live[live["ts"] > stored["ts"][-1]]
+            stored = np.concatenate([stored, live])
+
+        return stored
+
+    def _missing(self, symbol: str, interval: Interval, start_s: int, end_s: int) -> list[tuple[int, int]]:
+        """
+        Head and/or tail ranges of [start_s, end_s) the bar store does not cover.
+        """
+        coverage = self.store.coverage(symbol, interval)
+        if coverage is None:
+            return [(start_s, end_s)]
+        missing = []
+        if start_s < coverage.start:
+            missing.append((start_s, coverage.start))
+        if end_s > coverage.end:
+            missing.append((coverage.end, end_s))
+        return missing
+
+    async def _fetch_missing(
+        self,
+        symbol: str,
+        interval: Interval,
+        missing: list[tuple[int, int]],
+        complete_end: int
+    ) -> list[np.ndarray]:
+        """
+        Fetch missing ranges upstream, persist their completed bars and return the forming ones.
+        """
+        forming: list[np.ndarray] = []
+        for fetch_start, fetch_end in missing:
+            logger.info("Fetching %s bars for %s from %s to %s upstream", interval, symbol, fetch_start, fetch_end)
+            fetched = await self.provider.get_history(
+                symbol,
+                interval,
+                datetime.fromtimestamp(fetch_start, tz=UTC),
+                datetime.fromtimestamp(fetch_end, tz=UTC)
+            )
+            records = frame_to_records(fetched)
+            complete = records[records["ts"] < complete_end]
+            forming.append(records[records["ts"] >= complete_end])
+
+            persist_end = min(fetch_end, complete_end)
+            if persist_end > fetch_start:
+                await asyncio.to_thread(self.store.write, symbol, interval, complete, fetch_start, persist_end)
+        return forming
+
+    async def _import_shared(self, shared: SharedCache, key: str, symbol: str, interval: Interval) -> bool:
+        """
+        Merge the partition published in the shared cache into the bar store.
+
+        Only a partition that overlaps or touches the local coverage is
+        merged, so the coverage never spans a gap.
+
+        Returns:
+            bool: Whether the local coverage grew
+        """
+        payload = (await shared.get_many([key])).get(key)
+        if payload is None:
+            return False
+        try:
+            records, shared_coverage = decode_bars(payload)
+        except ValueError:
+            logger.warning("Ignoring undecodable shared bars of %s %s", symbol, interval)
+            return False
+
+        local = self.store.coverage(symbol, interval)
+        if local is not None and not _extends(local, shared_coverage):
+            return False
+        await asyncio.to_thread(
+            self.store.write, symbol, interval, records, shared_coverage.start, shared_coverage.end
+        )
+        return True
+
+    async def _export_shared(self, shared: SharedCache, key: str, symbol: str, interval: Interval) -> None:
+        """
+        Publish the whole local partition to the shared cache.
+        """
+        coverage = self.store.coverage(symbol, interval)
+        if coverage is None:
+            return
+        records = self.store.read(symbol, interval, coverage.start, coverage.end)
+        await shared.set_many(
+            {key: (encode_bars(records, coverage), self.settings.shared_cache_bars_ttl)},
+            # Bars have no per-worker copy to invalidate
+            publish=False
+        )
+
+
+def _extends(local: Coverage, other: Coverage) -> bool:
+    """
+    Whether `other` overlaps or touches `local` and covers something `local` does not.
+    """
+    touches = other.start <= local.end and other.end >= local.start
+    return touches and (other.start < local.start or other.end > local.end)
+
+
+def _to_epoch(value: datetime) -> int:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return int(value.timestamp())
@@ -0,0 +1,141 @@
+"""
+Technical indicator service.
+
+Loads bar history for many tickers, aligns it into 2-D price frames and
+computes indicators for all tickers at once with vectorized kernels.
+"""
+
+import asyncio
+import math
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from app.config.settings import Settings, get_settings
+from app.core.errors import ValidationError
+from app.core.logging import get_logger
+from app.schemas.indicator import IndicatorSeriesSchema, IndicatorsSchema
+from app.services.history_service import HistoryService
+from app.services.indicators import IndicatorParams, align_prices, compute_indicators
+from app.services.providers.base import Interval
+
+logger = get_logger(__name__)
+
+
+class IndicatorService:
+    """
+    Service for technical indicators over stored bar history.
+    """
+
+    def __init__(self, history_service: HistoryService, settings: Settings | None = None):
+        """
+        Initialize the service.
+
+        Args:
+            history_service: Source of OHLCV bars
+            settings: Application settings (defaults to the cached settings singleton)
+        """
+        self.history_service = history_service
+        self.settings = settings or get_settings()
+
+    async def load_prices(
+        self,
+        tickers: list[str],
+        interval: Interval,
+        start: datetime | None = None,
+        end: datetime | None = None
+    ) -> dict[str, pd.DataFrame]:
+        """
+        Load bars of several tickers and align them on one timeline.
+
+        At most `indicator_max_concurrency` tickers are loaded at the same
+        time, so a cold request cannot overrun the blocking-call executor.
+
+        Args:
+            tickers: Stock ticker symbols
+            interval: Bar interval
+            start: Inclusive range start
+            end: Exclusive range end
+
+        Returns:
+            dict[str, pd.DataFrame]: "high"/"low"/"close" -> aligned frame (rows = timestamps, columns = tickers)
+
+        Raises:
+            ValidationError: If more than `indicator_max_tickers` distinct tickers are requested
+            ExternalAPIError: If bars of a ticker cannot be fetched
+        """
+        symbols = list(dict.fromkeys(ticker.strip().upper() for ticker in tickers))
+
+        if len(symbols) > self.settings.indicator_max_tickers:
+            raise ValidationError(
+                message=f"Too many tickers in one indicator request (max {self.settings.indicator_max_tickers})",
+                details={"requested": len(symbols), "max": self.settings.indicator_max_tickers}
+            )
+
+        semaphore = asyncio.Semaphore(self.settings.indicator_max_concurrency)
+
+        async def load(symbol: str) -> pd.DataFrame:
+            async with semaphore:
+                return await self.history_service.get_bars(symbol, interval, start, end)
+
+        frames = await asyncio.gather(*(load(symbol) for symbol in symbols))
+        bars = dict(zip(symbols, frames, strict=True))
+
+        return {
+            field: align_prices({symbol: frame[field] for symbol, frame in bars.items()}).reindex(columns=symbols)
+            for field in ("high", "low", "close")
+        }
+
+    async def get_indicators(
+        self,
+        tickers: list[str],
+        interval: Interval,
+        indicators: list[str],
+        params: IndicatorParams,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        limit: int | None = None
+    ) -> IndicatorsSchema:
+        """
+        Compute technical indicators for several tickers.
+
+        Args:
+            tickers: Stock ticker symbols
+            interval: Bar interval
+            indicators: Indicator names (sma, ema, rsi, macd, bollinger, atr, volatility)
+            params: Indicator window parameters
+            start: Inclusive range start
+            end: Exclusive range end
+            limit: Return only the last N points of each series
+
+        Returns:
+            IndicatorsSchema: Indicator series per ticker on a shared timeline
+
+        Raises:
+            ValidationError: If more than `indicator_max_tickers` distinct tickers are requested
+            ExternalAPIError: If bars of a ticker cannot be fetched
+        """
+        prices = await self.load_prices(tickers, interval, start, end)
+        close = prices["close"]
+        logger.info("Computing %s over %d bars x %d tickers", indicators, close.shape[0], close.shape[1])
+
+        results = compute_indicators(prices["high"], prices["low"], close, indicators, params)
+
+        rows = slice(-limit, None) if limit else slice(None)
+        timestamps = close.index[rows]
+        series = [
+            IndicatorSeriesSchema(
+                ticker=ticker,
+                values={name: _to_json_list(frame[ticker].to_numpy()[rows]) for name, frame in results.items()}
+            )
+            for ticker in close.columns
+        ]
+        return IndicatorsSchema(interval=interval, timestamps=list(timestamps.to_pydatetime()), series=series)
+
+
+def _to_json_list(values: np.ndarray) -> list[float | None]:
+    """
+    Convert a float array into a JSON-safe list (NaN -> None).
+    """
+    return [None if math.isnan(value) else value for value in values.tolist()]
@@ -0,0 +1,386 @@
+"""
+Vectorized technical indicators.
+
+All batch functions take aligned 2-D price frames (rows = bar timestamps,
+columns = tickers) and compute every ticker at once with pandas/NumPy kernels,
+never with per-row Python loops. Leading NaNs mark the warm-up period of each
+indicator; inputs must not contain gaps after a ticker's first bar (use
+align_prices, which forward-fills them).
+
+IncrementalIndicators keeps the rolling state of the same indicators so that
+appending one new bar updates every series in O(1) instead of recomputing the
+whole window. Its output matches the batch functions exactly.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+INDICATOR_NAMES = ("sma", "ema", "rsi", "macd", "bollinger", "atr", "volatility")
+
+
+@dataclass(frozen=True)
+class IndicatorParams:
+    """
+    Window parameters of all indicators.
+    """
+
+    sma_window: int = 20
+    ema_span: int = 20
+    rsi_period: int = 14
+    macd_fast: int = 12
+    macd_slow: int = 26
+    macd_signal: int = 9
+    bollinger_window: int = 20
+    bollinger_k: float = 2.0
+    atr_period: int = 14
+    volatility_window: int = 20
+    annualization: int = 252
+
+
+def align_prices(series: dict[str, pd.Series]) -> pd.DataFrame:
+    """
+    Align per-ticker price series on the union of their timestamps.
+
+    Gaps after a ticker's first bar are forward-filled (the last price stays
+    valid while that market is closed); rows before it stay NaN.
+
+    Args:
+        series: Price series per ticker, indexed by timestamp
+
+    Returns:
+        pd.DataFrame: Aligned prices, one column per ticker
+    """
+    frame = pd.concat(series, axis=1).sort_index()
+    return frame.ffill()
+
+
+def sma(close: pd.DataFrame, window: int) -> pd.DataFrame:
+    """
+    Simple moving average.
+    """
+    return close.rolling(window, min_periods=window).mean()
+
+
+def ema(close: pd.DataFrame, span: int) -> pd.DataFrame:
+    """
+    Exponential moving average (recursive form, seeded with the first value).
+    """
+    return close.ewm(span=span, adjust=False, min_periods=span).mean()
+
+
+def rsi(close: pd.DataFrame, period: int) -> pd.DataFrame:
+    """
+    Relative strength index with Wilder smoothing.
+    """
+    delta = close.diff()
+    avg_gain = delta.clip(lower=0).ewm(alpha=1 / period, adjust=False, min_periods=period).mean()
+    avg_loss = (-delta.clip(upper=0)).ewm(alpha=1 / period, adjust=False, min_periods=period).mean()
+    values = _rsi_values(avg_gain.to_numpy(dtype="float64"), avg_loss.to_numpy(dtype="float64"))
+    return pd.DataFrame(values, index=close.index, columns=close.columns)
+
+
+def macd(close: pd.DataFrame, fast: int, slow: int, signal: int) -> dict[str, pd.DataFrame]:
+    """
+    MACD line, signal line and histogram.
+    """
+    line = ema(close, fast) - ema(close, slow)
+    signal_line = line.ewm(span=signal, adjust=False, min_periods=signal).mean()
+    return {"macd": line, "macd_signal": signal_line, "macd_hist": line - signal_line}
+
+
+def bollinger(close: pd.DataFrame, window: int, k: float) -> dict[str, pd.DataFrame]:
+    """
+    Bollinger bands (population standard deviation).
+    """
+    rolling = close.rolling(window, min_periods=window)
+    middle = rolling.mean()
+    width = k * rolling.std(ddof=0)
+    return {"bb_upper": middle + width, "bb_middle": middle, "bb_lower": middle - width}
+
+
+def true_range(high: pd.DataFrame, low: pd.DataFrame, close: pd.DataFrame) -> pd.DataFrame:
+    """
+    True range; the first bar of each ticker uses high - low.
+    """
+    prev_close = close.shift(1)
+    ranges = np.fmax(high - low, np.fmax((high - prev_close).abs(), (low - prev_close).abs()))
+    return pd.DataFrame(ranges, index=close.index, columns=close.columns)
+
+
+def atr(high: pd.DataFrame, low: pd.DataFrame, close: pd.DataFrame, period: int) -> pd.DataFrame:
+    """
+    Average true range with Wilder smoothing.
+    """
+    return true_range(high, low, close).ewm(alpha=1 / period, adjust=False, min_periods=period).mean()
+
+
+def rolling_volatility(close: pd.DataFrame, window: int, annualization: int) -> pd.DataFrame:
+    """
+    Annualized rolling standard deviation of log returns.
+    """
+    returns = np.log(close).diff()
+    return returns.rolling(window, min_periods=window).std(ddof=1) * np.sqrt(annualization)
+
+
+def compute_indicators(
+    high: pd.DataFrame,
+    low: pd.DataFrame,
+    close: pd.DataFrame,
+    names: list[str],
+    params: IndicatorParams
+) -> dict[str, pd.DataFrame]:
+    """
+    Compute the requested indicators for all tickers at once.
+
+    Args:
+        high: Aligned high prices (rows = timestamps, columns = tickers)
+        low: Aligned low prices
+        close: Aligned close prices
+        names: Indicator names from INDICATOR_NAMES
+        params: Indicator window parameters
+
+    Returns:
+        dict[str, pd.DataFrame]: Output series name -> frame shaped like close
+    """
+    result: dict[str, pd.DataFrame] = {}
+    if "sma" in names:
+        result["sma"] = sma(close, params.sma_window)
+    if "ema" in names:
+        result["ema"] = ema(close, params.ema_span)
+    if "rsi" in names:
+        result["rsi"] = rsi(close, params.rsi_period)
+    if "macd" in names:
+        result.update(macd(close, params.macd_fast, params.macd_slow, params.macd_signal))
+    if "bollinger" in names:
+        result.update(bollinger(close, params.bollinger_window, params.bollinger_k))
+    if "atr" in names:
+        result["atr"] = atr(high, low, close, params.atr_period)
+    if "volatility" in names:
+        result["volatility"] = rolling_volatility(close, params.volatility_window, params.annualization)
+    return result
+
+
+class _RollingWindow:
+    """
+    Fixed-size ring buffer per series with running sum and sum of squares.
+    """
+
+    def __init__(self, history: np.ndarray, window: int):
+        # history: (rows, n) most recent values, oldest first
+        self.window = window
+        n = history.shape[1]
+        self.buffer = np.full((window, n), np.nan)
+        tail = history[-window:]
+        self.buffer[window - len(tail):] = tail
+        self.position = 0
+        self.count: np.ndarray = np.zeros(n, dtype=np.int64)
+        self.sum: np.ndarray = np.zeros(n)
+        self.sum_sq: np.ndarray = np.zeros(n)
+        self._resync()
+
+    def push(self, values: np.ndarray) -> None:
+        oldest = self.buffer[self.position]
+        valid_old = ~np.isnan(oldest)
+        self.sum -= np.where(valid_old, oldest, 0.0)
+        self.sum_sq -= np.where(valid_old, oldest ** 2, 0.0)
+
+        valid_new = ~np.isnan(values)
+        self.sum += np.where(valid_new, values, 0.0)
+        self.sum_sq += np.where(valid_new, values ** 2, 0.0)
+        self.count = self.count - valid_old + valid_new
+
+        self.buffer[self.position] = values
+        self.position = (self.position + 1) % self.window
+
+        # Recompute the running sums once per full turn to stop floating-point
+        # drift; amortized this is still O(1) per push
+        if self.position == 0:
+            self._resync()
+
+    def _resync(self) -> None:
+        self.count = np.sum(~np.isnan(self.buffer), axis=0)
+        self.sum = np.nansum(self.buffer, axis=0)
+        self.sum_sq = np.nansum(self.buffer ** 2, axis=0)
+
+    def mean(self) -> np.ndarray:
+        return np.where(self.count >= self.window, self.sum / self.window, np.nan)
+
+    def std(self, ddof: int) -> np.ndarray:
+        n = self.window
+        variance = (self.sum_sq - self.sum ** 2 / n) / (n - ddof)
+        return np.where(self.count >= n, np.sqrt(np.maximum(variance, 0.0)), np.nan)
+
+
+class _Ewm:
+    """
+    Recursive exponential average per series, matching pandas ewm(adjust=False).
+    """
+
+    def __init__(self, raw: pd.DataFrame, alpha: float, min_periods: int):
+        # raw: unmasked ewm values and the number of valid observations seen
+        self.alpha = alpha
+        self.min_periods = min_periods
+        self.value = raw.iloc[-1].to_numpy(dtype="float64") if len(raw) else np.full(raw.shape[1], np.nan)
+        self.count = np.zeros(raw.shape[1], dtype=np.int64)
+
+    def push(self, values: np.ndarray) -> np.ndarray:
+        valid = ~np.isnan(values)
+        seeded = ~np.isnan(self.value)
+        updated = np.where(seeded, self.alpha * values + (1 - self.alpha) * self.value, values)
+        self.value = np.where(valid, updated, self.value)
+        self.count = self.count + valid
+        return self.output()
+
+    def output(self) -> np.ndarray:
+        return np.where(self.count >= self.min_periods, self.value, np.nan)
+
+
+class IncrementalIndicators:
+    """
+    O(1)-per-bar indicator state for a fixed set of tickers.
+
+    Seed it once from history, then call update() with each new bar row; every
+    indicator of every ticker is updated with a constant number of vectorized
+    operations, independent of the window lengths.
+    """
+
+    def __init__(
+        self,
+        high: pd.DataFrame,
+        low: pd.DataFrame,
+        close: pd.DataFrame,
+        params: IndicatorParams | None = None
+    ):
+        """
+        Seed the state from aligned history.
+
+        Args:
+            high: Aligned high prices (rows = timestamps, columns = tickers)
+            low: Aligned low prices
+            close: Aligned close prices
+            params: Indicator window parameters
+        """
+        self.params = params or IndicatorParams()
+        self.tickers = list(close.columns)
+        p = self.params
+        closes = close.to_numpy(dtype="float64")
+        counts = np.sum(~np.isnan(closes), axis=0)
+
+        self._sma = _RollingWindow(closes, p.sma_window)
+        self._bollinger = _RollingWindow(closes, p.bollinger_window)
+
+        log_returns = np.log(close).diff().to_numpy(dtype="float64")
+        self._volatility = _RollingWindow(log_returns, p.volatility_window)
+
+        def seeded(raw: pd.DataFrame, alpha: float, min_periods: int, valid: np.ndarray) -> _Ewm:
+            state = _Ewm(raw, alpha, min_periods)
+            state.count = valid
+            return state
+
+        self._ema = seeded(close.ewm(span=p.ema_span, adjust=False).mean(), 2 / (p.ema_span + 1), p.ema_span, counts)
+        self._fast = seeded(close.ewm(span=p.macd_fast, adjust=False).mean(), 2 / (p.macd_fast + 1), p.macd_slow, counts)
+        self._slow = seeded(close.ewm(span=p.macd_slow, adjust=False).mean(), 2 / (p.macd_slow + 1), p.macd_slow, counts)
+        macd_line = macd(close, p.macd_fast, p.macd_slow, p.macd_signal)["macd"]
+        self._signal = seeded(
+            macd_line.ewm(span=p.macd_signal, adjust=False).mean(),
+            2 / (p.macd_signal + 1),
+            p.macd_signal,
+            np.sum(~np.isnan(macd_line.to_numpy()), axis=0)
+        )
+
+        delta = close.diff()
+        delta_counts = np.sum(~np.isnan(delta.to_numpy()), axis=0)
+        alpha = 1 / p.rsi_period
+        self._gain = seeded(delta.clip(lower=0).ewm(alpha=alpha, adjust=False).mean(), alpha, p.rsi_period, delta_counts)
+        self._loss = seeded((-delta.clip(upper=0)).ewm(alpha=alpha, adjust=False).mean(), alpha, p.rsi_period, delta_counts)
+
+        ranges = true_range(high, low, close)
+        self._atr = seeded(
+            ranges.ewm(alpha=1 / p.atr_period, adjust=False).mean(),
+            1 / p.atr_period,
+            p.atr_period,
+            np.sum(~np.isnan(ranges.to_numpy()), axis=0)
+        )
+
+        self._last_close = _last_valid(close)
+        self._last_high = _last_valid(high)
+        self._last_low = _last_valid(low)
+
+    def update(self, high: np.ndarray, low: np.ndarray, close: np.ndarray) -> dict[str, np.ndarray]:
+        """
+        Append one bar per ticker and return the latest indicator values.
+
+        A ticker without a new bar (NaN inputs) repeats its previous bar, the
+        same forward-fill align_prices applies to the batch path, so its
+        window indicators keep their values instead of turning NaN.
+
+        Args:
+            high: High price per ticker (NaN if the ticker has no new bar)
+            low: Low price per ticker
+            close: Close price per ticker
+
+        Returns:
+            dict[str, np.ndarray]: Output series name -> latest value per ticker
+        """
+        p = self.params
+        prev_close = self._last_close
+        missing = np.isnan(close)
+        close = np.where(missing, prev_close, close)
+        high = np.where(missing, self._last_high, high)
+        low = np.where(missing, self._last_low, low)
+        delta = close - prev_close
+
+        self._sma.push(close)
+        self._bollinger.push(close)
+        self._volatility.push(np.log(close) - np.log(prev_close))
+
+        ema_value = self._ema.push(close)
+        self._fast.push(close)
+        slow = self._slow.push(close)
+        macd_line = np.where(np.isnan(slow), np.nan, self._fast.value - self._slow.value)
+        signal = self._signal.push(macd_line)
+
+        avg_gain = self._gain.push(np.where(np.isnan(delta), np.nan, np.maximum(delta, 0.0)))
+        avg_loss = self._loss.push(np.where(np.isnan(delta), np.nan, np.maximum(-delta, 0.0)))
+
+        ranges = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+        atr_value = self._atr.push(ranges)
+
+        self._last_close = np.where(np.isnan(close), prev_close, close)
+        self._last_high = np.where(np.isnan(high), self._last_high, high)
+        self._last_low = np.where(np.isnan(low), self._last_low, low)
+
+        middle = self._bollinger.mean()
+        width = p.bollinger_k * self._bollinger.std(ddof=0)
+        return {
+            "sma": self._sma.mean(),
+            "ema": ema_value,
+            "rsi": _rsi_values(avg_gain, avg_loss),
+            "macd": macd_line,
+            "macd_signal": signal,
+            "macd_hist": macd_line - signal,
+            "bb_upper": middle + width,
+            "bb_middle": middle,
+            "bb_lower": middle - width,
+            "atr": atr_value,
+            "volatility": self._volatility.std(ddof=1) * np.sqrt(p.annualization),
+        }
+
+
+def _last_valid(frame: pd.DataFrame) -> np.ndarray:
+    """
+    Last non-NaN value of each column (NaN for columns without any value).
+    """
+    if not len(frame):
+        return np.full(frame.shape[1], np.nan)
+    values: np.ndarray = frame.ffill().iloc[-1].to_numpy(dtype="float64")
+    return values
+
+
+def _rsi_values(avg_gain: np.ndarray, avg_loss: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        value = 100 - 100 / (1 + avg_gain / avg_loss)
+    # No losses in the window means maximum strength (also covers 0 / 0)
+    return np.where((avg_loss == 0) & ~np.isnan(avg_gain), 100.0, value)
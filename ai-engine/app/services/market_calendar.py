@@ -0,0 +1,356 @@
+"""
+Exchange trading calendar.
+
+Resolves the exchange of a ticker from its suffix and answers "is the market
+open now, and when does it next open?" in O(1): trading sessions (regular
+hours, holidays, half-days and late opens) are precomputed per exchange and
+year into a date-keyed index, so a lookup is one dict access plus a
+comparison.
+
+Supported exchanges:
+    - US: NYSE/NASDAQ (suffix-less tickers), 09:30-16:00 America/New_York,
+      NYSE holiday rules and 13:00 early closes
+    - KRX: KOSPI/KOSDAQ (.KS/.KQ), 09:00-15:30 Asia/Seoul, opening at 10:00 on
+      the first trading day of the year
+    - FX: currency pairs (=X), Sunday 17:00 to Friday 17:00 America/New_York
+
+Korean holidays that follow the lunar calendar, substitute holidays and
+election days are listed per year in _KRX_HOLIDAYS; later years can be added
+through the MARKET_EXTRA_HOLIDAYS setting until the table is extended.
+Tickers of other exchanges have no calendar and are treated as always open.
+"""
+
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, time, timedelta
+from typing import Literal
+from zoneinfo import ZoneInfo
+
+MarketStatus = Literal["open", "closed"]
+
+_NEW_YORK = ZoneInfo("America/New_York")
+_SEOUL = ZoneInfo("Asia/Seoul")
+
+# KRX closures that do not follow a fixed solar date
+_KRX_HOLIDAYS: dict[int, tuple[str, ...]] = {
+    2024: ("02-09", "02-12", "04-10", "05-06", "05-15", "09-16", "09-17", "09-18", "10-01"),
+    2025: ("01-27", "01-28", "01-29", "01-30", "03-03", "05-06", "06-03", "10-06", "10-07", "10-08"),
+    2026: ("02-16", "02-17", "02-18", "03-02", "05-25", "06-03", "08-17", "09-24", "09-25", "10-05"),
+}
+
+# KRX closures on fixed solar dates (New Year, Independence Movement Day, Labor Day,
+# Children's Day, Memorial Day, Liberation Day, National Foundation Day, Hangul Day, Christmas)
+_KRX_SOLAR_HOLIDAYS = ((1, 1), (3, 1), (5, 1), (5, 5), (6, 6), (8, 15), (10, 3), (10, 9), (12, 25))
+
+
+@dataclass(frozen=True)
+class Session:
+    """
+    One continuous trading session (UTC bounds).
+    """
+
+    open: datetime
+    close: datetime
+    early_close: bool = False
+
+
+@dataclass(frozen=True)
+class MarketState:
+    """
+    Trading state of an exchange at one instant.
+
+    `exchange` is None for tickers without a calendar; those are always open
+    and have no session bounds.
+    """
+
+    exchange: str | None
+    is_open: bool
+    next_open: datetime | None = None
+    next_close: datetime | None = None
+    last_close: datetime | None = None
+
+    @property
+    def status(self) -> MarketStatus:
+        """
+        "open" or "closed".
+        """
+        return "open" if self.is_open else "closed"
+
+
+def exchange_of(ticker: str) -> str | None:
+    """
+    Calendar exchange of a ticker, derived from its suffix.
+
+    Args:
+        ticker: Stock ticker symbol (e.g., "AAPL", "005930.KS", "KRW=X")
+
+    Returns:
+        str | None: "US", "KRX", "FX", or None if the exchange has no calendar
+    """
+    symbol = ticker.strip().upper()
+    if symbol.endswith("=X"):
+        return "FX"
+    if "." not in symbol:
+        return "US"
+    if symbol.rsplit(".", 1)[1] in ("KS", "KQ"):
+        return "KRX"
+    return None
+
+
+class MarketCalendar:
+    """
+    Precomputed session index of the supported exchanges.
+
+    Sessions are built for the year before and the two years after the
+    current one; a lookup outside that range extends the index once.
+    Contiguous sessions (FX trades around the clock on weekdays) are merged,
+    so a session's close is always followed by a real closure.
+    """
+
+    def __init__(
+        self,
+        extra_holidays: Mapping[str, Iterable[date]] | None = None,
+        clock: Callable[[], datetime] = lambda: datetime.now(UTC)
+    ):
+        """
+        Initialize the calendar.
+
+        Args:
+            extra_holidays: Exchange code -> additional full-day closures
+            clock: Function returning the current aware datetime (injectable for tests)
+        """
+        self.extra_holidays = {code.upper(): set(days) for code, days in (extra_holidays or {}).items()}
+        self._clock = clock
+        self._builders: dict[str, tuple[ZoneInfo, Callable[[int], dict[date, Session]]]] = {
+            "US": (_NEW_YORK, self._us_sessions),
+            "KRX": (_SEOUL, self._krx_sessions),
+            "FX": (_NEW_YORK, self._fx_sessions),
+        }
+        self._years: dict[str, tuple[int, int]] = {}
+        self._sessions: dict[str, list[Session]] = {}
+        # Exchange -> local date -> index of the first session that has not closed before that date
+        self._index: dict[str, dict[date, int]] = {}
+
+        current = clock().year
+        for code in self._builders:
+            self._build(code, current - 1, current + 2)
+
+    def now(self) -> datetime:
+        """
+        Current time of the calendar's clock.
+        """
+        return self._clock()
+
+    def state(self, ticker: str, now: datetime | None = None) -> MarketState:
+        """
+        Trading state of a ticker's exchange.
+
+        Args:
+            ticker: Stock ticker symbol
+            now: Instant to evaluate (defaults to the clock)
+
+        Returns:
+            MarketState: Whether the market is open, and the surrounding session bounds
+        """
+        exchange = exchange_of(ticker)
+        if exchange is None:
+            return MarketState(exchange=None, is_open=True)
+        return self.exchange_state(exchange, now)
+
+    def exchange_state(self, exchange: str, now: datetime | None = None) -> MarketState:
+        """
+        Trading state of an exchange.
+
+        Args:
+            exchange: Exchange code ("US", "KRX" or "FX")
+            now: Instant to evaluate (defaults to the clock)
+
+        Returns:
+            MarketState: Whether the market is open, and the surrounding session bounds
+        """
+        now = now or self._clock()
+        tz, _ = self._builders[exchange]
+        local_date = now.astimezone(tz).date()
+        first, last = self._years[exchange]
+        if not first <= local_date.year < last:
+            self._build(exchange, min(first, local_date.year), max(last, local_date.year + 1))
+
+        sessions = self._sessions[exchange]
+        i = self._index[exchange][local_date]
+        if sessions[i].close <= now:
+            # Today's session has already ended
+            i += 1
+        session = sessions[i]
+        last_close = sessions[i - 1].close if i > 0 else None
+
+        if session.open <= now:
+            return MarketState(exchange=exchange, is_open=True, next_close=session.close, last_close=last_close)
+        return MarketState(
+            exchange=exchange, is_open=False, next_open=session.open, next_close=session.close, last_close=last_close
+        )
+
+    def status(self, ticker: str, now: datetime | None = None) -> MarketStatus:
+        """
+        "open" or "closed" for a ticker's exchange (always "open" without a calendar).
+        """
+        return self.state(ticker, now).status
+
+    def seconds_until_open(self, ticker: str, now: datetime | None = None) -> float:
+        """
+        Seconds until the ticker's market opens (0.0 while open or without a calendar).
+        """
+        now = now or self._clock()
+        state = self.state(ticker, now)
+        if state.next_open is None:
+            return 0.0
+        return max((state.next_open - now).total_seconds(), 0.0)
+
+    def _build(self, exchange: str, first_year: int, last_year: int) -> None:
+        tz, build_year = self._builders[exchange]
+        by_date: dict[date, Session] = {}
+        for year in range(first_year, last_year + 1):
+            by_date.update(build_year(year))
+
+        merged: list[Session] = []
+        for day in sorted(by_date):
+            session = by_date[day]
+            if merged and merged[-1].close == session.open:
+                merged[-1] = Session(merged[-1].open, session.close, session.early_close)
+            else:
+                merged.append(session)
+
+        index: dict[date, int] = {}
+        i = 0
+        day = date(first_year, 1, 1)
+        while day.year <= last_year and i < len(merged):
+            start_of_day = datetime.combine(day, time(), tz)
+            while i < len(merged) and merged[i].close <= start_of_day:
+                i += 1
+            index[day] = i
+            day += timedelta(days=1)
+
+        # The last indexed year only provides the "next session" of the year before it
+        self._years[exchange] = (first_year, last_year)
+        self._sessions[exchange] = merged
+        self._index[exchange] = index
+
+    def _us_sessions(self, year: int) -> dict[date, Session]:
+        holidays = _us_holidays(year) | self.extra_holidays.get("US", set())
+        thanksgiving = _nth_weekday(year, 11, 3, 4)
+        early_closes = {date(year, 7, 3), thanksgiving + timedelta(days=1), date(year, 12, 24)}
+
+        sessions: dict[date, Session] = {}
+        for day in _weekdays(year):
+            if day in holidays:
+                continue
+            early = day in early_closes
+            sessions[day] = Session(
+                open=_at(day, time(9, 30), _NEW_YORK),
+                close=_at(day, time(13, 0) if early else time(16, 0), _NEW_YORK),
+                early_close=early
+            )
+        return sessions
+
+    def _krx_sessions(self, year: int) -> dict[date, Session]:
+        holidays = _krx_holidays(year) | self.extra_holidays.get("KRX", set())
+
+        sessions: dict[date, Session] = {}
+        for day in _weekdays(year):
+            if day in holidays:
+                continue
+            # The first trading day of the year opens an hour late
+            opens = time(10, 0) if not sessions else time(9, 0)
+            sessions[day] = Session(open=_at(day, opens, _SEOUL), close=_at(day, time(15, 30), _SEOUL))
+        return sessions
+
+    def _fx_sessions(self, year: int) -> dict[date, Session]:
+        holidays = self.extra_holidays.get("FX", set())
+
+        sessions: dict[date, Session] = {}
+        day = date(year, 1, 1)
+        while day.year == year:
+            weekday = day.weekday()
+            if day not in holidays and weekday != 5:
+                opens = time(17, 0) if weekday == 6 else time()
+                closes = _at(day, time(17, 0), _NEW_YORK) if weekday == 4 else _at(day + timedelta(days=1), time(), _NEW_YORK)
+                sessions[day] = Session(open=_at(day, opens, _NEW_YORK), close=closes)
+            day += timedelta(days=1)
+        return sessions
+
+
+def _at(day: date, at: time, tz: ZoneInfo) -> datetime:
+    return datetime.combine(day, at, tz).astimezone(UTC)
+
+
+def _weekdays(year: int) -> list[date]:
+    day = date(year, 1, 1)
+    days = []
+    while day.year == year:
+        if day.weekday() < 5:
+            days.append(day)
+        day += timedelta(days=1)
+    return days
+
+
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    first = date(year, month, 1)
+    return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+
+
+def _last_weekday(year: int, month: int, weekday: int) -> date:
+    last = date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _easter(year: int) -> date:
+    # Anonymous Gregorian algorithm
+    a, b, c = year % 19, year // 100, year % 100
+    d, e = b // 4, b % 4
+    g = (8 * b + 13) // 25
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = c // 4, c % 4
+    j = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 19 * j) // 433
+    month = (h + j - 7 * m + 90) // 25
+    return date(year, month, (h + j - 7 * m + 33 * month + 19) % 32)
+
+
+def _observed(day: date) -> date:
+    # Saturday holidays are observed on Friday, Sunday holidays on Monday
+    if day.weekday() == 5:
+        return day - timedelta(days=1)
+    if day.weekday() == 6:
+        return day + timedelta(days=1)
+    return day
+
+
+def _us_holidays(year: int) -> set[date]:
+    holidays = {
+        _nth_weekday(year, 1, 0, 3),        # Martin Luther King Jr. Day
+        _nth_weekday(year, 2, 0, 3),        # Washington's Birthday
+        _easter(year) - timedelta(days=2),  # Good Friday
+        _last_weekday(year, 5, 0),          # Memorial Day
+        _observed(date(year, 7, 4)),        # Independence Day
+        _nth_weekday(year, 9, 0, 1),        # Labor Day
+        _nth_weekday(year, 11, 3, 4),       # Thanksgiving Day
+        _observed(date(year, 12, 25)),      # Christmas Day
+    }
+    new_year = date(year, 1, 1)
+    if new_year.weekday() != 5:
+        # NYSE does not close on the Friday before a Saturday New Year's Day
+        holidays.add(_observed(new_year))
+    if year >= 2022:
+        holidays.add(_observed(date(year, 6, 19)))  # Juneteenth
+    return holidays
+
+
+def _krx_holidays(year: int) -> set[date]:
+    holidays = {date(year, month, day) for month, day in _KRX_SOLAR_HOLIDAYS}
+    holidays |= {date.fromisoformat(f"{year}-{day}") for day in _KRX_HOLIDAYS.get(year, ())}
+
+    # Year-end closing day: the last weekday of the year that is not already a holiday
+    year_end = date(year, 12, 31)
+    while year_end.weekday() >= 5 or year_end in holidays:
+        year_end -= timedelta(days=1)
+    holidays.add(year_end)
+    return holidays
@@ -0,0 +1,236 @@
+"""
+Portfolio valuation and risk service.
+
+Prices every holding, converts it to a base currency and computes portfolio
+risk over aligned daily return histories with the vectorized kernels in
+app.services.risk.
+"""
+
+import asyncio
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from app.config.settings import Settings, get_settings
+from app.core.errors import AIEngineException, ValidationError
+from app.core.logging import get_logger
+from app.schemas.portfolio import PortfolioRiskRequest, PortfolioRiskSchema, PositionRiskSchema
+from app.schemas.stock import StockPriceErrorSchema, StockPriceSchema
+from app.services.fx_service import FxRates, FxService
+from app.services.history_service import HistoryService
+from app.services.indicators import align_prices
+from app.services.risk import portfolio_risk, returns_from_prices
+from app.services.stock_service import StockService
+
+logger = get_logger(__name__)
+
+_DAY = timedelta(days=1)
+
+
+class PortfolioService:
+    """
+    Service for portfolio valuation and risk.
+
+    Current prices come from the stock service (quote cache included),
+    current exchange rates from the FX service's cached matrix and daily
+    closes from the history service (bar store included). The daily closes
+    of the FX pivot pairs turn local returns into base-currency returns.
+    """
+
+    def __init__(
+        self,
+        stock_service: StockService,
+        history_service: HistoryService,
+        fx_service: FxService,
+        settings: Settings | None = None,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Initialize the service.
+
+        Args:
+            stock_service: Source of current prices
+            history_service: Source of daily bars
+            fx_service: Source of exchange rates
+            settings: Application settings (defaults to the cached settings singleton)
+            clock: Wall-clock function in epoch seconds (injectable for tests)
+        """
+        self.stock_service = stock_service
+        self.history_service = history_service
+        self.fx_service = fx_service
+        self.settings = settings or get_settings()
+        self._clock = clock
+
+    async def get_risk(self, request: PortfolioRiskRequest) -> PortfolioRiskSchema:
+        """
+        Value a portfolio in its base currency and compute its risk.
+
+        Positions of the same ticker are summed. Positions that cannot be
+        priced (or whose currency has no exchange rate) are reported in
+        `errors` and left out; positions without daily history are valued but
+        contribute no risk.
+
+        Args:
+            request: Holdings, base currency, lookback, VaR confidence and horizon
+
+        Returns:
+            PortfolioRiskSchema: Portfolio totals, risk figures and per-position breakdown
+
+        Raises:
+            ValidationError: If the portfolio has more than `portfolio_max_positions` distinct tickers
+                or the base currency is not supported
+            ExternalAPIError: If no exchange rates are available
+        """
+        rates = await self.fx_service.get_rates()
+        base = request.base_currency.upper()
+        rates.index_of(base)
+
+        holdings: dict[str, float] = {}
+        for position in request.positions:
+            ticker = position.ticker.strip().upper()
+            holdings[ticker] = holdings.get(ticker, 0.0) + position.quantity
+
+        if len(holdings) > self.settings.portfolio_max_positions:
+            raise ValidationError(
+                message=f"Too many positions in one portfolio (max {self.settings.portfolio_max_positions})",
+                details={"requested": len(holdings), "max": self.settings.portfolio_max_positions}
+            )
+
+        prices, errors = await self._load_prices(list(holdings))
+        for ticker in list(prices):
+            currency = prices[ticker].currency
+            if currency not in rates:
+                del prices[ticker]
+                errors.append(StockPriceErrorSchema(
+                    ticker=ticker,
+                    message=f"No {currency}/{base} exchange rate available for ticker: {ticker}",
+                    details={"ticker": ticker, "currency": currency, "cause": "unsupported_currency"}
+                ))
+
+        tickers = list(prices)
+        currencies = [prices[ticker].currency for ticker in tickers]
+        quantity = np.array([holdings[ticker] for ticker in tickers], dtype=np.float64)
+        price = np.array([prices[ticker].current_price for ticker in tickers], dtype=np.float64)
+        rate = rates.convert(np.ones(len(tickers)), currencies, base)
+        value = quantity * price * rate
+
+        pairs = {
+            currency: pair
+            for currency in dict.fromkeys([base, *currencies])
+            if (pair := self.fx_service.pair_symbol(currency)) is not None
+        }
+        closes = await self._load_closes(tickers + list(pairs.values()), lookback_days=request.lookback_days)
+        local = closes.reindex(columns=tickers).to_numpy(dtype=np.float64)
+        per_pivot = {currency: self._per_pivot_history(closes, currency, pairs, rates) for currency in pairs}
+        fx = np.ones_like(local)
+        for column, currency in enumerate(currencies):
+            if currency != base:
+                # Base units per unit of the position currency, day by day
+                fx[:, column] = per_pivot.get(base, 1.0) / per_pivot.get(currency, 1.0)
+
+        # Base-currency price paths: their returns are (1 + r_local) * (1 + r_fx) - 1
+        risk = portfolio_risk(
+            returns_from_prices(local * fx),
+            value,
+            confidence=request.confidence,
+            horizon_days=request.horizon_days
+        )
+
+        last_close = local[-1] if local.shape[0] else np.full(len(tickers), np.nan)
+        daily_pnl = np.nan_to_num(quantity * (price - last_close) * rate)
+        market_value = float(value.sum())
+        weight = value / market_value if market_value else np.zeros_like(value)
+        contribution_pct = risk.contributions / risk.volatility if risk.volatility else np.zeros_like(value)
+
+        positions = [
+            PositionRiskSchema(
+                ticker=ticker,
+                quantity=float(quantity[i]),
+                currency=prices[ticker].currency,
+                price=float(price[i]),
+                fx_rate=float(rate[i]),
+                market_value=float(value[i]),
+                weight=float(weight[i]),
+                daily_pnl=float(daily_pnl[i]),
+                risk_contribution=float(risk.contributions[i]),
+                risk_contribution_pct=float(contribution_pct[i])
+            )
+            for i, ticker in enumerate(tickers)
+        ]
+
+        return PortfolioRiskSchema(
+            base_currency=base,
+            market_value=market_value,
+            daily_pnl=float(daily_pnl.sum()),
+            volatility=risk.volatility,
+            var_historical=risk.var_historical,
+            var_parametric=risk.var_parametric,
+            confidence=request.confidence,
+            horizon_days=request.horizon_days,
+            observations=risk.observations,
+            positions=positions,
+            errors=errors
+        )
+
+    async def _load_prices(
+        self,
+        tickers: list[str]
+    ) -> tuple[dict[str, StockPriceSchema], list[StockPriceErrorSchema]]:
+        """
+        Current prices in batches of at most `stock_batch_max_tickers` tickers.
+        """
+        prices: dict[str, StockPriceSchema] = {}
+        errors: list[StockPriceErrorSchema] = []
+        size = self.settings.stock_batch_max_tickers
+        for offset in range(0, len(tickers), size):
+            batch = await self.stock_service.get_current_prices(tickers[offset:offset + size])
+            prices.update((price.ticker, price) for price in batch.prices)
+            errors.extend(batch.errors)
+        return prices, errors
+
+    async def _load_closes(self, symbols: list[str], lookback_days: int) -> pd.DataFrame:
+        """
+        Completed daily closes of several symbols, aligned on one timeline.
+
+        At most `portfolio_max_concurrency` symbols load at the same time. A
+        symbol whose history cannot be loaded gets an all-NaN column.
+        """
+        now = datetime.fromtimestamp(self._clock(), tz=UTC)
+        start = now - timedelta(days=lookback_days)
+        semaphore = asyncio.Semaphore(self.settings.portfolio_max_concurrency)
+
+        async def load(symbol: str) -> pd.Series | None:
+            async with semaphore:
+                try:
+                    frame = await self.history_service.get_bars(symbol, "1d", start, now)
+                except AIEngineException as e:
+                    logger.warning("No daily history for %s: %s", symbol, e.message)
+                    return None
+            # Only bars whose day has ended; the forming bar is still moving
+            close = frame["close"]
+            return close[close.index + _DAY <= now]
+
+        loaded = await asyncio.gather(*(load(symbol) for symbol in symbols))
+        series = {symbol: close for symbol, close in zip(symbols, loaded, strict=True) if close is not None and not close.empty}
+        if not series:
+            return pd.DataFrame(columns=symbols, dtype=np.float64)
+        return align_prices(series).reindex(columns=symbols)
+
+    def _per_pivot_history(
+        self,
+        closes: pd.DataFrame,
+        currency: str,
+        pairs: dict[str, str],
+        rates: FxRates
+    ) -> np.ndarray | float:
+        """
+        Daily units of a currency per pivot unit; the current rate if its pair has no history.
+        """
+        pair = closes.get(pairs[currency])
+        if pair is None or pair.isna().all():
+            return rates.rate(self.fx_service.pivot, currency)
+        history: np.ndarray = pair.to_numpy(dtype=np.float64)
+        return history
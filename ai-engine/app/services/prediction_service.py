@@ -0,0 +1,175 @@
+"""
+Model inference service.
+
+Serves the price-direction models of the model registry. Each model gets a
+micro-batcher, so concurrent requests share vectorized forward passes run
+on a dedicated inference thread pool, never on the event loop and never
+behind slow upstream calls on the provider executor.
+"""
+
+import asyncio
+
+import numpy as np
+
+from app.config.settings import Settings, get_settings
+from app.core.errors import ValidationError
+from app.core.executor import BlockingExecutor
+from app.core.logging import get_logger
+from app.models.batcher import MicroBatcher
+from app.models.registry import ModelRegistry, ModelStatus
+from app.schemas.prediction import ModelStatusSchema, PredictionSchema
+
+logger = get_logger(__name__)
+
+
+class PredictionService:
+    """
+    Service for model predictions.
+
+    start() loads and warms up the registry's models in the background;
+    until that has finished, the models report state "loading" (see
+    GET /health/ready) and predictions for them are rejected.
+    """
+
+    def __init__(
+        self,
+        settings: Settings | None = None,
+        registry: ModelRegistry | None = None,
+        executor: BlockingExecutor | None = None
+    ):
+        """
+        Initialize the service.
+
+        Args:
+            settings: Application settings (defaults to the cached settings singleton)
+            registry: Model registry (defaults to the artifacts in settings.inference_model_path)
+            executor: Executor for forward passes (defaults to a dedicated inference pool)
+        """
+        self.settings = settings or get_settings()
+        self.registry = registry or ModelRegistry(
+            self.settings.inference_model_path,
+            warmup_rows=self.settings.inference_batch_max_size
+        )
+        self.executor = executor or BlockingExecutor(
+            max_workers=self.settings.inference_threads,
+            # Each model runs one pass at a time, so the queue never holds more than one per model
+            queue_depth=max(len(self.registry.statuses()), 1),
+            name="inference"
+        )
+        self._batchers: dict[str, MicroBatcher] = {}
+        self._loading: asyncio.Task[None] | None = None
+
+    @property
+    def loading(self) -> bool:
+        """
+        Whether some model has not finished loading yet.
+        """
+        return self.registry.loading
+
+    def start(self) -> None:
+        """
+        Start loading the models in the background (no-op once started).
+        """
+        if self._loading is None and self.registry.loading:
+            self._loading = asyncio.ensure_future(self.load())
+
+    async def load(self) -> None:
+        """
+        Load and warm up every model not loaded yet, off the event loop.
+        """
+        await self.executor.run(self.registry.load)
+
+    async def close(self) -> None:
+        """
+        Stop loading, stop the batchers and release the inference threads.
+        """
+        if self._loading is not None:
+            self._loading.cancel()
+            try:
+                await self._loading
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._loading = None
+        for batcher in self._batchers.values():
+            await batcher.close()
+        self._batchers.clear()
+        self.executor.shutdown()
+
+    def statuses(self) -> list[ModelStatusSchema]:
+        """
+        Get the load status of every model.
+
+        Returns:
+            list[ModelStatusSchema]: Models sorted by name
+        """
+        return [_status_schema(status) for status in self.registry.statuses()]
+
+    async def predict(self, model_name: str, instances: list[list[float]]) -> PredictionSchema:
+        """
+        Predict the price direction for a list of feature vectors.
+
+        Args:
+            model_name: Registered model name
+            instances: Feature vectors in the model's feature order
+
+        Returns:
+            PredictionSchema: Up-move probability and direction per instance
+
+        Raises:
+            ValidationError: If the model is unknown or the instances do not fit its features
+            ModelInferenceError: If the model is not loaded or the forward pass fails
+            ServiceOverloadedError: If the inference pool is saturated
+        """
+        model = self.registry.get(model_name)
+
+        if len(instances) > self.settings.inference_max_instances:
+            raise ValidationError(
+                message=f"Too many instances: {len(instances)} (max {self.settings.inference_max_instances})",
+                details={"count": len(instances), "max": self.settings.inference_max_instances}
+            )
+        widths = {len(instance) for instance in instances}
+        if widths != {len(model.features)}:
+            raise ValidationError(
+                message=f"Model {model_name} expects {len(model.features)} features per instance",
+                details={"model": model_name, "features": list(model.features), "received": sorted(widths)}
+            )
+        rows = np.asarray(instances, dtype=np.float64)
+        if not np.isfinite(rows).all():
+            raise ValidationError(
+                message="Instances must contain finite numbers only",
+                details={"model": model_name}
+            )
+
+        probabilities = await self._batcher(model_name).submit(rows)
+
+        return PredictionSchema(
+            model=model_name,
+            version=model.version,
+            probabilities=probabilities.tolist(),
+            directions=np.where(probabilities >= 0.5, "up", "down").tolist()
+        )
+
+    def _batcher(self, model_name: str) -> MicroBatcher:
+        batcher = self._batchers.get(model_name)
+        if batcher is None:
+            batcher = MicroBatcher(
+                name=model_name,
+                predict=self.registry.get(model_name).predict,
+                executor=self.executor,
+                max_batch_size=self.settings.inference_batch_max_size,
+                max_wait=self.settings.inference_batch_max_wait_ms / 1000
+            )
+            self._batchers[model_name] = batcher
+        return batcher
+
+
+def _status_schema(status: ModelStatus) -> ModelStatusSchema:
+    return ModelStatusSchema(
+        name=status.name,
+        state=status.state,
+        kind=status.kind,
+        version=status.version,
+        features=list(status.features),
+        load_seconds=status.load_seconds,
+        error=status.error
+    )
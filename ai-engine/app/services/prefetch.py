@@ -0,0 +1,327 @@
+"""
+Background quote prefetching.
+
+The first request for a ticker after startup, or after its cache entry
+expired, pays the full upstream latency. The prefetcher keeps a hot set of
+tickers fresh in the quote cache instead:
+
+    - TickerDemand ranks tickers by recent request frequency (exponentially
+      decayed counts, so the hot set follows what is requested now).
+    - QuotePrefetcher warms the configured watchlist at startup, then
+      periodically refreshes hot tickers whose quotes expire before the next
+      cycle, in batches spread over the cycle with jitter and within an
+      upstream budget per minute. Tickers whose refresh fails are skipped
+      for exponentially growing pauses, so they do not use up the budget.
+"""
+
+import asyncio
+import heapq
+import math
+import random
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Iterable, Sequence
+from typing import TYPE_CHECKING
+
+from app.core.logging import get_logger
+from app.core.metrics import PREFETCHED_QUOTES
+
+if TYPE_CHECKING:
+    from app.services.stock_service import StockService
+
+logger = get_logger(__name__)
+
+# Scores are rebased before the forward-decay weights get this large (2^50)
+_MAX_EXPONENT = 50.0
+
+
+class TickerDemand:
+    """
+    Exponentially decayed request counts per ticker.
+
+    Every request adds 1 to a ticker's score, and scores halve every
+    `half_life` seconds. Forward decay keeps `record` O(1): instead of
+    decaying every score, new requests get a weight that grows over time.
+    Tickers whose score falls below `min_score` are no longer reported.
+
+    Not thread-safe; meant to be used from a single event loop.
+    """
+
+    def __init__(
+        self,
+        half_life: float = 300.0,
+        min_score: float = 0.5,
+        max_tickers: int = 10_000,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize the tracker.
+
+        Args:
+            half_life: Seconds after which a request counts half
+            min_score: Decayed score below which a ticker is not hot any more
+            max_tickers: Maximum number of tracked tickers (the coldest are dropped)
+            clock: Monotonic clock function (injectable for tests)
+        """
+        self.half_life = half_life
+        self.min_score = min_score
+        self.max_tickers = max_tickers
+        self._clock = clock
+        self._origin = clock()
+        self._scores: dict[str, float] = {}
+
+    def record(self, tickers: Iterable[str]) -> None:
+        """
+        Count one request for each of the given tickers.
+
+        Args:
+            tickers: Normalized ticker symbols
+        """
+        exponent = (self._clock() - self._origin) / self.half_life
+        if exponent > _MAX_EXPONENT:
+            self._rebase(exponent)
+            exponent = 0.0
+        weight = math.exp2(exponent)
+
+        scores = self._scores
+        for ticker in tickers:
+            scores[ticker] = scores.get(ticker, 0.0) + weight
+
+        if len(scores) > self.max_tickers * 1.25:
+            keep = heapq.nlargest(self.max_tickers, scores.items(), key=lambda item: item[1])
+            self._scores = dict(keep)
+
+    def top(self, n: int) -> list[str]:
+        """
+        Most requested tickers, hottest first.
+
+        Args:
+            n: Maximum number of tickers
+
+        Returns:
+            list[str]: Up to n tickers whose decayed score is at least min_score
+        """
+        if n <= 0:
+            return []
+        threshold = self.min_score * math.exp2((self._clock() - self._origin) / self.half_life)
+        ranked = heapq.nlargest(n, self._scores.items(), key=lambda item: item[1])
+        return [ticker for ticker, score in ranked if score >= threshold]
+
+    def _rebase(self, exponent: float) -> None:
+        scale = math.exp2(-exponent)
+        self._scores = {ticker: score * scale for ticker, score in self._scores.items() if score * scale > 1e-9}
+        self._origin = self._clock()
+
+
+class QuotePrefetcher:
+    """
+    Scheduler keeping the quotes of hot tickers fresh in the quote cache.
+
+    The hot set is the configured watchlist followed by the most requested
+    other tickers, up to `hot_set_size`. Each cycle (every `interval` seconds)
+    refreshes the hot tickers whose cached quote is missing or expires before
+    the next cycle, hottest first. At most `budget_per_minute` tickers are
+    refreshed in any 60 seconds; the rest wait for a later cycle. Batches of a
+    cycle are spread over the cycle, and every pause is jittered, so several
+    workers do not hit the upstream in lockstep. A ticker whose refresh failed
+    is not due again for `interval` seconds, doubled after every further
+    failure up to `max_backoff`.
+    """
+
+    def __init__(
+        self,
+        stock_service: "StockService",
+        watchlist: Sequence[str] = (),
+        hot_set_size: int = 200,
+        batch_size: int = 50,
+        budget_per_minute: int = 600,
+        interval: float = 5.0,
+        jitter: float = 0.2,
+        max_backoff: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+        rng: Callable[[], float] = random.random
+    ):
+        """
+        Initialize the prefetcher.
+
+        Args:
+            stock_service: Service whose quote cache is kept fresh
+            watchlist: Tickers always in the hot set and warmed up at startup
+            hot_set_size: Maximum number of tickers kept fresh
+            batch_size: Maximum tickers per upstream batch
+            budget_per_minute: Maximum tickers refreshed in any 60 seconds
+            interval: Seconds between two refresh cycles
+            jitter: Relative random variation (0-1) of every pause
+            max_backoff: Longest pause (seconds) of a ticker whose refresh keeps failing
+            clock: Monotonic clock function (injectable for tests)
+            sleep: Sleep coroutine function (injectable for tests)
+            rng: Random number generator in [0, 1) (injectable for tests)
+        """
+        self.stock_service = stock_service
+        self.watchlist = list(dict.fromkeys(ticker.strip().upper() for ticker in watchlist))
+        self.hot_set_size = hot_set_size
+        self.batch_size = batch_size
+        self.budget_per_minute = budget_per_minute
+        self.interval = interval
+        self.jitter = jitter
+        self.max_backoff = max_backoff
+        self._clock = clock
+        self._sleep = sleep
+        self._rng = rng
+        # (time, tickers) of recent refreshes within the budget window
+        self._spent: deque[tuple[float, int]] = deque()
+        # Ticker -> (consecutive failed refreshes, time before which it is skipped)
+        self._failures: dict[str, tuple[int, float]] = {}
+        self._warmed_up = False
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def ready(self) -> bool:
+        """
+        Whether the startup warm-up has finished (always true without a watchlist).
+        """
+        return self._warmed_up or not self.watchlist
+
+    def hot_set(self) -> list[str]:
+        """
+        Tickers currently kept fresh: the watchlist, then the most requested others.
+
+        Returns:
+            list[str]: Up to hot_set_size tickers, hottest first after the watchlist
+        """
+        hot = self.watchlist[:self.hot_set_size]
+        watched = set(hot)
+        for ticker in self.stock_service.demand.top(self.hot_set_size):
+            if len(hot) >= self.hot_set_size:
+                break
+            if ticker not in watched:
+                hot.append(ticker)
+        return hot
+
+    def due(self) -> list[str]:
+        """
+        Hot tickers whose quote is missing or expires before the next cycle.
+
+        Tickers backing off after failed refreshes are left out.
+
+        Returns:
+            list[str]: Tickers to refresh, in hot-set order
+        """
+        cache = self.stock_service.quote_cache
+        now = self._clock()
+        due = []
+        for ticker in self.hot_set():
+            failure = self._failures.get(ticker)
+            if cache.is_loading(ticker) or (failure is not None and failure[1] > now):
+                continue
+            remaining = cache.ttl_remaining(ticker)
+            if remaining is None or remaining <= self.interval:
+                due.append(ticker)
+        return due
+
+    def budget_left(self) -> int:
+        """
+        Tickers that may still be refreshed within the current 60-second window.
+        """
+        horizon = self._clock() - 60.0
+        while self._spent and self._spent[0][0] <= horizon:
+            self._spent.popleft()
+        return max(self.budget_per_minute - sum(count for _, count in self._spent), 0)
+
+    async def warm_up(self) -> None:
+        """
+        Load every watchlist quote once, waiting for budget when it runs out.
+
+        Marks the prefetcher ready when done, even if some tickers failed.
+        """
+        pending = list(self.watchlist)
+        logger.info("Warming up %d watchlist quotes", len(pending))
+        try:
+            while pending:
+                allowed = self.budget_left()
+                if allowed == 0:
+                    if not self._spent:
+                        logger.warning("Quote warm-up skipped: no prefetch budget")
+                        break
+                    await self._sleep(self._until_budget())
+                    continue
+                batch, pending = pending[:min(allowed, self.batch_size)], pending[min(allowed, self.batch_size):]
+                await self._refresh(batch)
+                if pending:
+                    await self._sleep(self._jittered(self.interval / 10))
+        finally:
+            self._warmed_up = True
+        logger.info("Quote warm-up finished")
+
+    async def run_once(self) -> int:
+        """
+        Run one refresh cycle.
+
+        Returns:
+            int: Number of tickers sent upstream
+        """
+        due = self.due()[:self.budget_left()]
+        if not due:
+            return 0
+
+        batches = [due[offset:offset + self.batch_size] for offset in range(0, len(due), self.batch_size)]
+        spacing = self.interval / len(batches)
+        for index, batch in enumerate(batches):
+            if index:
+                await self._sleep(self._jittered(spacing))
+            await self._refresh(batch)
+        return len(due)
+
+    def start(self) -> None:
+        """
+        Start the warm-up and the periodic refresh cycles in the background.
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+
+    async def close(self) -> None:
+        """
+        Stop the background refresh.
+        """
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    async def _run(self) -> None:
+        await self.warm_up()
+        while True:
+            started = self._clock()
+            try:
+                await self.run_once()
+            except Exception:
+                # Never let one failed cycle stop the schedule
+                logger.exception("Quote prefetch cycle failed")
+            elapsed = self._clock() - started
+            await self._sleep(self._jittered(max(self.interval - elapsed, 0.0)))
+
+    async def _refresh(self, tickers: list[str]) -> None:
+        self._spent.append((self._clock(), len(tickers)))
+        refreshed = set(await self.stock_service.refresh_prices(tickers))
+        PREFETCHED_QUOTES.labels(outcome="success").inc(len(refreshed))
+        PREFETCHED_QUOTES.labels(outcome="error").inc(len(tickers) - len(refreshed))
+
+        now = self._clock()
+        for ticker in tickers:
+            if ticker in refreshed:
+                self._failures.pop(ticker, None)
+                continue
+            failures = self._failures.get(ticker, (0, 0.0))[0] + 1
+            self._failures[ticker] = (failures, now + min(self.interval * 2 ** (failures - 1), self.max_backoff))
+
+    def _until_budget(self) -> float:
+        if not self._spent:
+            return 0.0
+        return max(self._spent[0][0] + 60.0 - self._clock(), 0.0)
+
+    def _jittered(self, seconds: float) -> float:
+        return seconds * (1.0 + self.jitter * (2.0 * self._rng() - 1.0))
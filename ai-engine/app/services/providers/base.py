@@ -0,0 +1,154 @@
+"""
+Market data provider interface.
+
+StockService talks to upstream market data only through this interface, so the
+data source can be swapped (Yahoo Finance, an offline stand-in, a faster feed)
+via Settings without touching the endpoints.
+"""
+
+import asyncio
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Literal
+
+import pandas as pd
+
+from app.core.errors import AIEngineException, ExternalAPIError
+from app.core.resilience import CircuitBreaker
+
+Interval = Literal["1m", "5m", "15m", "30m", "1h", "1d", "1wk"]
+
+# Bar length of each supported interval
+INTERVAL_DELTAS: dict[str, timedelta] = {
+    "1m": timedelta(minutes=1),
+    "5m": timedelta(minutes=5),
+    "15m": timedelta(minutes=15),
+    "30m": timedelta(minutes=30),
+    "1h": timedelta(hours=1),
+    "1d": timedelta(days=1),
+    "1wk": timedelta(weeks=1),
+}
+
+# Column layout of every history DataFrame returned by a provider
+BAR_COLUMNS = ["open", "high", "low", "close", "volume"]
+
+
+def empty_bars() -> pd.DataFrame:
+    """
+    Create an empty history DataFrame with the standard layout.
+
+    Returns:
+        pd.DataFrame: Empty frame with BAR_COLUMNS and a UTC DatetimeIndex
+    """
+    index = pd.DatetimeIndex([], tz="UTC", name="timestamp")
+    return pd.DataFrame({column: pd.Series(dtype="float64") for column in BAR_COLUMNS}, index=index)
+
+
+@dataclass(frozen=True)
+class Quote:
+    """
+    Latest price of a ticker as reported by a provider.
+    """
+
+    ticker: str
+    price: float
+    currency: str
+
+
+class MarketDataProvider(ABC):
+    """
+    Base class for market data providers.
+
+    Implementations must not block the event loop: synchronous client libraries
+    have to run their calls on the blocking-call executor.
+    """
+
+    name: str = "base"
+    # Breaker guarding this provider's upstream calls, if any (see ResilientProvider)
+    circuit_breaker: CircuitBreaker | None = None
+
+    @abstractmethod
+    async def get_quote(self, ticker: str) -> Quote:
+        """
+        Fetch the latest quote of one ticker.
+
+        Args:
+            ticker: Stock ticker symbol (e.g., "AAPL", "005930.KS")
+
+        Returns:
+            Quote: Latest price and currency
+
+        Raises:
+            ExternalAPIError: If the quote cannot be fetched
+        """
+
+    async def get_quotes(
+        self,
+        tickers: list[str],
+        max_concurrency: int | None = None
+    ) -> dict[str, Quote | AIEngineException]:
+        """
+        Fetch the latest quotes of several tickers.
+
+        The default implementation calls get_quote concurrently, with at most
+        `max_concurrency` calls in flight. Providers with a native batch API
+        should override it (and may ignore `max_concurrency`).
+
+        Args:
+            tickers: Stock ticker symbols
+            max_concurrency: Maximum concurrent get_quote calls (unbounded if None)
+
+        Returns:
+            dict[str, Quote | AIEngineException]: Quote or error for every requested ticker
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or max(len(tickers), 1))
+
+        async def fetch(ticker: str) -> Quote:
+            async with semaphore:
+                return await self.get_quote(ticker)
+
+        results = await asyncio.gather(*(fetch(ticker) for ticker in tickers), return_exceptions=True)
+
+        quotes: dict[str, Quote | AIEngineException] = {}
+        for ticker, result in zip(tickers, results, strict=True):
+            if isinstance(result, AIEngineException | Quote):
+                quotes[ticker] = result
+            elif isinstance(result, Exception):
+                quotes[ticker] = ExternalAPIError(
+                    message=f"External API error while fetching stock data for {ticker}",
+                    details={"ticker": ticker, "error": str(result), "cause": "upstream_error"}
+                )
+            else:
+                raise result
+        return quotes
+
+    @abstractmethod
+    async def get_history(
+        self,
+        ticker: str,
+        interval: Interval,
+        start: datetime,
+        end: datetime
+    ) -> pd.DataFrame:
+        """
+        Fetch OHLCV bars of one ticker.
+
+        Args:
+            ticker: Stock ticker symbol
+            interval: Bar interval (e.g., "1d")
+            start: Inclusive start time (timezone-aware)
+            end: Exclusive end time (timezone-aware)
+
+        Returns:
+            pd.DataFrame: Bars indexed by UTC bar start time with BAR_COLUMNS columns
+
+        Raises:
+            ExternalAPIError: If the history cannot be fetched
+        """
+
+    async def close(self) -> None:
+        """
+        Release provider resources. No-op by default.
+        """
+        return None
@@ -0,0 +1,67 @@
+"""
+Market data provider factory.
+
+Selects the provider implementation configured in Settings.
+"""
+
+from app.config.settings import Settings
+from app.core.executor import BlockingExecutor
+from app.services.providers.base import MarketDataProvider
+
+
+def create_market_data_provider(
+    settings: Settings,
+    executor: BlockingExecutor | None = None
+) -> MarketDataProvider:
+    """
+    Create the market data provider selected by `settings.market_data_provider`.
+
+    The provider is wrapped with a circuit breaker and, if enabled, hedged
+    quote requests; when metrics are enabled the outermost wrapper records
+    upstream latency and errors (including calls rejected by the breaker).
+
+    Args:
+        settings: Application settings
+        executor: Executor for blocking provider calls (defaults to the current shared executor)
+
+    Returns:
+        MarketDataProvider: Configured provider instance
+    """
+    provider: MarketDataProvider
+    if settings.market_data_provider == "local":
+        from app.services.providers.local import LocalMarketDataProvider
+
+        provider = LocalMarketDataProvider(
+            data_path=settings.local_provider_data_path,
+            latency_ms=settings.local_provider_latency_ms
+        )
+    else:
+        from app.services.providers.yahoo import YahooFinanceProvider
+
+        provider = YahooFinanceProvider(executor=executor)
+
+    if settings.circuit_breaker_enabled or settings.provider_hedge_enabled:
+        from app.core.resilience import CircuitBreaker, LatencyTracker
+        from app.services.providers.resilient import ResilientProvider
+
+        breaker = None
+        if settings.circuit_breaker_enabled:
+            breaker = CircuitBreaker(
+                name=provider.name,
+                failure_rate=settings.circuit_breaker_failure_rate,
+                min_calls=settings.circuit_breaker_min_calls,
+                window=settings.circuit_breaker_window,
+                open_seconds=settings.circuit_breaker_open_seconds
+            )
+        provider = ResilientProvider(
+            provider,
+            circuit_breaker=breaker,
+            hedge_percentile=settings.provider_hedge_percentile if settings.provider_hedge_enabled else None,
+            latency_tracker=LatencyTracker(min_samples=settings.provider_hedge_min_samples)
+        )
+
+    if settings.metrics_enabled:
+        from app.services.providers.instrumented import InstrumentedProvider
+
+        provider = InstrumentedProvider(provider)
+    return provider
@@ -0,0 +1,58 @@
+"""
+Metrics decorator for market data providers.
+
+Wraps any provider and records the latency of every upstream call per
+provider, operation and ticker market, plus ExternalAPIError causes.
+"""
+
+from datetime import datetime
+
+import pandas as pd
+
+from app.core.errors import AIEngineException
+from app.core.metrics import market_of, observe_upstream
+from app.services.providers.base import Interval, MarketDataProvider, Quote
+
+
+class InstrumentedProvider(MarketDataProvider):
+    """
+    Provider wrapper that records Prometheus metrics around every call.
+    """
+
+    def __init__(self, inner: MarketDataProvider):
+        """
+        Initialize the wrapper.
+
+        Args:
+            inner: Provider doing the actual work
+        """
+        self.inner = inner
+        self.name = inner.name
+        self.circuit_breaker = inner.circuit_breaker
+
+    async def get_quote(self, ticker: str) -> Quote:
+        with observe_upstream(self.name, "quote", market_of(ticker)):
+            return await self.inner.get_quote(ticker)
+
+    async def get_quotes(
+        self,
+        tickers: list[str],
+        max_concurrency: int | None = None
+    ) -> dict[str, Quote | AIEngineException]:
+        markets = {market_of(ticker) for ticker in tickers}
+        market = markets.pop() if len(markets) == 1 else "mixed"
+        with observe_upstream(self.name, "quotes", market):
+            return await self.inner.get_quotes(tickers, max_concurrency=max_concurrency)
+
+    async def get_history(
+        self,
+        ticker: str,
+        interval: Interval,
+        start: datetime,
+        end: datetime
+    ) -> pd.DataFrame:
+        with observe_upstream(self.name, "history", market_of(ticker)):
+            return await self.inner.get_history(ticker, interval, start, end)
+
+    async def close(self) -> None:
+        await self.inner.close()
@@ -0,0 +1,253 @@
+"""
+Deterministic offline market data provider.
+
+Used for tests, load tests and throughput benchmarks: it never touches the
+network, returns the same data for the same inputs and can simulate upstream
+latency. Quotes can be pinned through a JSON file; every other well-formed
+ticker gets a synthetic but stable price series derived from its symbol.
+
+Data file format:
+    {
+        "quotes": {
+            "AAPL": {"price": 182.52, "currency": "USD"},
+            "005930.KS": {"price": 71500.0, "currency": "KRW"}
+        }
+    }
+"""
+
+import asyncio
+import json
+import re
+import time
+import zlib
+from collections.abc import Callable
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from app.core.errors import AIEngineException, ExternalAPIError
+from app.services.providers.base import (
+    BAR_COLUMNS,
+    INTERVAL_DELTAS,
+    Interval,
+    MarketDataProvider,
+    Quote,
+    empty_bars,
+)
+
+_TICKER_PATTERN = re.compile(r"^[A-Z0-9][A-Z0-9.\-^=]{0,14}$")
+
+# Currency implied by the exchange suffix of a ticker
+_SUFFIX_CURRENCIES = {
+    ".KS": "KRW",
+    ".KQ": "KRW",
+    ".T": "JPY",
+    ".HK": "HKD",
+    ".L": "GBP",
+    ".DE": "EUR",
+    ".PA": "EUR",
+}
+
+# Price level (USD per unit) of currencies for synthetic FX tickers such as "KRW=X"
+_USD_RATES = {
+    "USD": 1.0,
+    "KRW": 1350.0,
+    "JPY": 150.0,
+    "EUR": 0.92,
+    "GBP": 0.79,
+    "CNY": 7.2,
+    "HKD": 7.8,
+}
+
+_SECONDS_PER_DAY = 86_400.0
+
+
+class LocalMarketDataProvider(MarketDataProvider):
+    """
+    Memory/file-backed provider with configurable latency.
+    """
+
+    name = "local"
+
+    def __init__(
+        self,
+        data_path: str | None = None,
+        latency_ms: float = 0.0,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Initialize the provider.
+
+        Args:
+            data_path: Optional JSON file with pinned quotes; when given, only its tickers exist
+            latency_ms: Simulated upstream latency per call in milliseconds
+            clock: Wall-clock function in epoch seconds (injectable for tests)
+        """
+        self.latency = latency_ms / 1000.0
+        self._clock = clock
+        self._quotes: dict[str, Quote] | None = None
+
+        if data_path:
+            raw = json.loads(Path(data_path).read_text(encoding="utf-8"))
+            self._quotes = {
+                ticker.upper(): Quote(ticker=ticker.upper(), price=float(item["price"]), currency=item["currency"])
+                for ticker, item in raw.get("quotes", {}).items()
+            }
+
+    async def get_quote(self, ticker: str) -> Quote:
+        """
+        Get the quote of one ticker after the simulated latency.
+
+        Raises:
+            ExternalAPIError: If the ticker is unknown
+        """
+        await self._simulate_latency()
+        return self._quote(ticker)
+
+    async def get_quotes(
+        self,
+        tickers: list[str],
+        max_concurrency: int | None = None
+    ) -> dict[str, Quote | AIEngineException]:
+        """
+        Get quotes of several tickers with a single simulated round trip.
+
+        `max_concurrency` is ignored: the whole batch is one call.
+        """
+        await self._simulate_latency()
+
+        quotes: dict[str, Quote | AIEngineException] = {}
+        for ticker in tickers:
+            try:
+                quotes[ticker] = self._quote(ticker)
+            except ExternalAPIError as e:
+                quotes[ticker] = e
+        return quotes
+
+    async def get_history(
+        self,
+        ticker: str,
+        interval: Interval,
+        start: datetime,
+        end: datetime
+    ) -> pd.DataFrame:
+        """
+        Generate weekday OHLCV bars in [start, end) after the simulated latency.
+
+        Bar values depend only on the ticker and the bar timestamp, so any two
+        overlapping ranges agree on their common bars.
+
+        Raises:
+            ExternalAPIError: If the ticker is unknown
+        """
+        await self._simulate_latency()
+
+        symbol = self._validate(ticker)
+        step = int(INTERVAL_DELTAS[interval].total_seconds())
+        first = -(-int(start.timestamp()) // step) * step
+        timestamps = np.arange(first, int(end.timestamp()), step, dtype=np.int64)
+
+        # Synthetic markets trade Monday to Friday (1970-01-01 was a Thursday)
+        if interval != "1wk":
+            weekday = (timestamps // int(_SECONDS_PER_DAY) + 3) % 7
+            timestamps = timestamps[weekday < 5]
+        if timestamps.size == 0:
+            return empty_bars()
+
+        open_ = self._price_series(symbol, timestamps)
+        close = self._price_series(symbol, timestamps + step)
+        wiggle = 1.0 + 0.004 * np.abs(_noise(symbol, timestamps, salt=7))
+        volume = np.floor(1e5 * (1.5 + _noise(symbol, timestamps, salt=11)))
+
+        frame = pd.DataFrame(
+            {
+                "open": open_,
+                "high": np.maximum(open_, close) * wiggle,
+                "low": np.minimum(open_, close) / wiggle,
+                "close": close,
+                "volume": volume,
+            },
+            index=pd.DatetimeIndex(pd.to_datetime(timestamps, unit="s", utc=True), name="timestamp")
+        )
+        return frame[BAR_COLUMNS]
+
+    async def _simulate_latency(self) -> None:
+        if self.latency > 0:
+            await asyncio.sleep(self.latency)
+
+    def _quote(self, ticker: str) -> Quote:
+        symbol = self._validate(ticker)
+        if self._quotes is not None:
+            return self._quotes[symbol]
+
+        # Synthetic quotes move once per minute so repeated calls are reproducible
+        now = np.array([int(self._clock()) // 60 * 60], dtype=np.int64)
+        price = float(self._price_series(symbol, now)[0])
+        return Quote(ticker=symbol, price=price, currency=_currency_of(symbol))
+
+    def _validate(self, ticker: str) -> str:
+        symbol = ticker.strip().upper()
+        known = self._quotes is None or symbol in self._quotes
+        if not known or not _TICKER_PATTERN.match(symbol):
+            raise ExternalAPIError(
+                message=f"Unable to fetch stock data for ticker: {ticker}",
+                details={"ticker": ticker, "error": "Invalid ticker or data not available", "cause": "invalid_ticker"}
+            )
+        return symbol
+
+    def _price_series(self, symbol: str, timestamps: np.ndarray) -> np.ndarray:
+        """
+        Smooth, bounded price path: base level times slow cycles plus per-bar noise.
+        """
+        if self._quotes is not None:
+            base = self._quotes[symbol].price
+        else:
+            base = _base_price(symbol)
+
+        seed = zlib.crc32(symbol.encode())
+        days = timestamps / _SECONDS_PER_DAY
+        phase = (seed % 997) / 997 * 2 * np.pi
+        log_level = (
+            0.15 * np.sin(2 * np.pi * days / 180 + phase)
+            + 0.05 * np.sin(2 * np.pi * days / 23 + 2 * phase)
+            + 0.01 * _noise(symbol, timestamps, salt=3)
+        )
+        return base * np.exp(log_level)
+
+
+def _currency_of(symbol: str) -> str:
+    if symbol.endswith("=X"):
+        pair = symbol[:-2]
+        return pair[-3:] if len(pair) >= 3 else "USD"
+    for suffix, currency in _SUFFIX_CURRENCIES.items():
+        if symbol.endswith(suffix):
+            return currency
+    return "USD"
+
+
+def _base_price(symbol: str) -> float:
+    if symbol.endswith("=X"):
+        pair = symbol[:-2]
+        quote_ccy = pair[-3:]
+        base_ccy = pair[:-3] or "USD"
+        return _USD_RATES.get(quote_ccy, 1.0) / _USD_RATES.get(base_ccy, 1.0)
+
+    fraction = (zlib.crc32(symbol.encode()) % 10_000) / 10_000
+    level = 20.0 + 480.0 * fraction
+    return level * _USD_RATES.get(_currency_of(symbol), 1.0)
+
+
+def _noise(symbol: str, timestamps: np.ndarray, salt: int) -> np.ndarray:
+    """
+    Stateless hash noise in [-1, 1) keyed by symbol and timestamp.
+    """
+    key = np.uint64((zlib.crc32(symbol.encode()) << 8) | salt)
+    with np.errstate(over="ignore"):
+        x = timestamps.astype(np.uint64) ^ (key * np.uint64(0x9E3779B97F4A7C15))
+        # splitmix64 finalizer (wrap-around multiplication is intended)
+        x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        x = x ^ (x >> np.uint64(31))
+    return (x >> np.uint64(11)).astype(np.float64) / float(1 << 53) * 2.0 - 1.0
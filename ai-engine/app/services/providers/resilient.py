@@ -0,0 +1,126 @@
+"""
+Resilience decorator for market data providers.
+
+Wraps any provider with a circuit breaker (fail fast while the upstream is
+degraded) and, optionally, hedged quote requests (send a duplicate when a
+quote takes longer than a recent latency percentile).
+"""
+
+import time
+from collections.abc import Awaitable, Callable
+from datetime import datetime
+from typing import TypeVar
+
+import pandas as pd
+
+from app.core.errors import AIEngineException, ExternalAPIError
+from app.core.metrics import HEDGED_REQUESTS, error_cause
+from app.core.resilience import UPSTREAM_FAILURE_CAUSES, CircuitBreaker, LatencyTracker, hedged
+from app.services.providers.base import Interval, MarketDataProvider, Quote
+
+R = TypeVar("R")
+
+
+class _BatchFailed(ExternalAPIError):
+    """
+    Raised through the breaker when every ticker of a native batch failed upstream.
+    """
+
+    def __init__(self, results: dict[str, Quote | AIEngineException]):
+        super().__init__(message="Every ticker of the batch failed", details={"cause": "upstream_error"})
+        self.results = results
+
+
+class ResilientProvider(MarketDataProvider):
+    """
+    Provider wrapper adding a circuit breaker and hedged quote requests.
+
+    Every upstream call (each hedge attempt separately) goes through the
+    breaker. Only single-quote lookups are hedged: they are cheap and
+    idempotent, while duplicating batch or history calls would double the
+    heaviest upstream work exactly when the upstream is slow.
+
+    A native batch call returns per-ticker errors instead of raising, so a
+    batch in which every ticker failed upstream is recorded as one failure.
+    """
+
+    def __init__(
+        self,
+        inner: MarketDataProvider,
+        circuit_breaker: CircuitBreaker | None = None,
+        hedge_percentile: float | None = None,
+        latency_tracker: LatencyTracker | None = None
+    ):
+        """
+        Initialize the wrapper.
+
+        Args:
+            inner: Provider doing the actual work
+            circuit_breaker: Breaker for upstream calls (None disables it)
+            hedge_percentile: Quote latency percentile (0-100) after which a duplicate
+                request is sent (None disables hedging)
+            latency_tracker: Recent quote latencies (defaults to a new tracker)
+        """
+        self.inner = inner
+        self.name = inner.name
+        self.circuit_breaker = circuit_breaker
+        self.hedge_percentile = hedge_percentile
+        self.latency = latency_tracker or LatencyTracker()
+        # Providers with a native batch API keep their single round trip
+        self._native_batch = type(inner).get_quotes is not MarketDataProvider.get_quotes
+
+    async def get_quote(self, ticker: str) -> Quote:
+        delay = None
+        if self.hedge_percentile is not None:
+            delay = self.latency.percentile(self.hedge_percentile)
+
+        quote, winner = await hedged(lambda: self._timed_quote(ticker), delay)
+        if winner is not None:
+            HEDGED_REQUESTS.labels(provider=self.name, winner=winner).inc()
+        return quote
+
+    async def get_quotes(
+        self,
+        tickers: list[str],
+        max_concurrency: int | None = None
+    ) -> dict[str, Quote | AIEngineException]:
+        if not self._native_batch:
+            # Per-ticker lookups through get_quote (breaker and hedging per ticker)
+            return await super().get_quotes(tickers, max_concurrency=max_concurrency)
+
+        async def batch() -> dict[str, Quote | AIEngineException]:
+            results = await self.inner.get_quotes(tickers, max_concurrency=max_concurrency)
+            if results and all(
+                isinstance(result, ExternalAPIError) and error_cause(result) in UPSTREAM_FAILURE_CAUSES
+                for result in results.values()
+            ):
+                raise _BatchFailed(results)
+            return results
+
+        try:
+            return await self._guarded(batch)
+        except _BatchFailed as e:
+            return e.results
+
+    async def get_history(
+        self,
+        ticker: str,
+        interval: Interval,
+        start: datetime,
+        end: datetime
+    ) -> pd.DataFrame:
+        return await self._guarded(lambda: self.inner.get_history(ticker, interval, start, end))
+
+    async def close(self) -> None:
+        await self.inner.close()
+
+    async def _timed_quote(self, ticker: str) -> Quote:
+        started = time.perf_counter()
+        quote = await self._guarded(lambda: self.inner.get_quote(ticker))
+        self.latency.record(time.perf_counter() - started)
+        return quote
+
+    async def _guarded(self, call: Callable[[], Awaitable[R]]) -> R:
+        if self.circuit_breaker is None:
+            return await call()
+        return await self.circuit_breaker.call(call)
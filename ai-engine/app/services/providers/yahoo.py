@@ -0,0 +1,161 @@
+"""
+Yahoo Finance market data provider.
+
+yfinance is a synchronous library, so every call runs on the bounded
+blocking-call executor instead of the event loop.
+"""
+
+import math
+from datetime import datetime
+
+import pandas as pd
+import yfinance as yf
+
+from app.core.errors import ExternalAPIError
+from app.core.executor import BlockingExecutor, get_blocking_executor
+from app.core.logging import get_logger
+from app.services.providers.base import (
+    BAR_COLUMNS,
+    Interval,
+    MarketDataProvider,
+    Quote,
+    empty_bars,
+)
+
+logger = get_logger(__name__)
+
+
+class YahooFinanceProvider(MarketDataProvider):
+    """
+    Market data provider backed by yfinance.
+    """
+
+    name = "yahoo"
+
+    def __init__(self, executor: BlockingExecutor | None = None):
+        """
+        Initialize the provider.
+
+        Args:
+            executor: Executor for blocking yfinance calls (defaults to the shared
+                executor, looked up on every call)
+        """
+        self._executor = executor
+
+    @property
+    def executor(self) -> BlockingExecutor:
+        """
+        Executor for blocking calls.
+
+        The shared executor is resolved per call rather than captured, because
+        the application lifespan shuts it down and replaces it; a provider that
+        outlives one lifespan (it is cached by the API dependencies) must not
+        keep submitting to a shut-down pool.
+        """
+        return self._executor or get_blocking_executor()
+
+    async def get_quote(self, ticker: str) -> Quote:
+        """
+        Fetch the latest quote from Yahoo Finance.
+
+        Args:
+            ticker: Stock ticker symbol (e.g., "AAPL", "005930.KS")
+
+        Returns:
+            Quote: Latest price and currency
+
+        Raises:
+            ExternalAPIError: If the API call fails, times out or ticker is invalid
+            ServiceOverloadedError: If the executor queue is full
+        """
+        return await self.executor.run(self._fetch_quote_sync, ticker)
+
+    async def get_history(
+        self,
+        ticker: str,
+        interval: Interval,
+        start: datetime,
+        end: datetime
+    ) -> pd.DataFrame:
+        """
+        Fetch OHLCV bars from Yahoo Finance.
+
+        Args:
+            ticker: Stock ticker symbol
+            interval: Bar interval (e.g., "1d")
+            start: Inclusive start time (timezone-aware)
+            end: Exclusive end time (timezone-aware)
+
+        Returns:
+            pd.DataFrame: Bars indexed by UTC bar start time with BAR_COLUMNS columns
+
+        Raises:
+            ExternalAPIError: If the API call fails, times out or ticker is invalid
+            ServiceOverloadedError: If the executor queue is full
+        """
+        return await self.executor.run(self._fetch_history_sync, ticker, interval, start, end)
+
+    def _fetch_quote_sync(self, ticker: str) -> Quote:
+        """
+        Blocking quote lookup. Runs on the executor thread pool.
+        """
+        try:
+            # Fetch stock data using yfinance
+            price_info = yf.Ticker(ticker).fast_info
+
+            # Extract price data
+            price = price_info.last_price
+            currency = price_info.currency
+
+        except AttributeError as e:
+            # This occurs when ticker is invalid or data is not available
+            logger.error("Invalid ticker or data not available for %s: %s", ticker, e)
+            raise ExternalAPIError(
+                message=f"Unable to fetch stock data for ticker: {ticker}",
+                details={"ticker": ticker, "error": "Invalid ticker or data not available", "cause": "invalid_ticker"}
+            ) from e
+        except Exception as e:
+            # Catch all other exceptions
+            logger.error("Failed to fetch stock price for %s: %s", ticker, e)
+            raise ExternalAPIError(
+                message=f"External API error while fetching stock data for {ticker}",
+                details={"ticker": ticker, "error": str(e), "cause": "upstream_error"}
+            ) from e
+
+        # fast_info reports None (or NaN) fields for symbols without recent trades
+        if not isinstance(price, int | float) or not math.isfinite(price) or not isinstance(currency, str) or not currency:
+            logger.error("Incomplete quote for %s: price=%r currency=%r", ticker, price, currency)
+            raise ExternalAPIError(
+                message=f"Incomplete quote data for ticker: {ticker}",
+                details={"ticker": ticker, "error": "Missing price or currency", "cause": "invalid_quote"}
+            )
+
+        return Quote(ticker=ticker.upper(), price=float(price), currency=currency)
+
+    def _fetch_history_sync(self, ticker: str, interval: str, start: datetime, end: datetime) -> pd.DataFrame:
+        """
+        Blocking history download. Runs on the executor thread pool.
+        """
+        try:
+            frame = yf.Ticker(ticker).history(
+                start=start,
+                end=end,
+                interval=interval,
+                auto_adjust=False,
+                raise_errors=True
+            )
+        except Exception as e:
+            logger.error("Failed to fetch history for %s: %s", ticker, e)
+            raise ExternalAPIError(
+                message=f"External API error while fetching history for {ticker}",
+                details={"ticker": ticker, "interval": interval, "error": str(e), "cause": "upstream_error"}
+            ) from e
+
+        if frame.empty:
+            return empty_bars()
+
+        frame = frame.rename(columns=str.lower)[BAR_COLUMNS].astype("float64")
+        index = pd.DatetimeIndex(frame.index)
+        frame.index = index.tz_localize("UTC") if index.tz is None else index.tz_convert("UTC")
+        frame.index.name = "timestamp"
+        return frame
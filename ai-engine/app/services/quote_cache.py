@@ -0,0 +1,314 @@
+"""
+In-process quote cache.
+
+This module provides a TTL + LRU cache with single-flight request coalescing
+and optional stale-while-revalidate, used by the service layer to avoid
+hitting upstream providers for hot tickers.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+V = TypeVar("V")
+
+
+@dataclass
+class CacheStats:
+    """
+    Snapshot of cache counters.
+
+    `misses` counts every lookup not served from the cache, `loads` only the
+    upstream loads actually started; the difference is `coalesced`.
+    `stale_hits` counts expired values served while they were being refreshed.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    loads: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    coalesced: int = 0
+    stale_hits: int = 0
+    size: int = 0
+    max_size: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """
+        Fraction of lookups served from the cache (0.0 when there were no lookups).
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class QuoteCache(Generic[V]):
+    """
+    TTL cache with LRU eviction and single-flight loading.
+
+    - Each entry gets its own time-to-live computed from the cached value, so
+      quotes of a closed market can live longer than quotes of an open one,
+      unless the caller passes one explicitly (e.g., the remaining lifetime
+      of a copy read from a shared cache).
+    - When `max_size` is exceeded the least recently used entry is evicted.
+    - Concurrent misses for the same key share one in-flight load, so N
+      simultaneous requests for one ticker cause exactly one upstream call.
+    - With `stale_ttl` > 0 an expired entry is kept that much longer; a
+      lookup in that window returns it at once (passed through `mark_stale`)
+      and refreshes it in the background instead of waiting for upstream.
+
+    The cache is meant to be used from a single event loop and is not thread-safe.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl_for: Callable[[V], float],
+        clock: Callable[[], float] = time.monotonic,
+        stale_ttl: float = 0.0,
+        mark_stale: Callable[[V], V] | None = None
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_size: Maximum number of entries kept
+            ttl_for: Function returning the time-to-live in seconds for a value
+            clock: Monotonic clock function (injectable for tests)
+            stale_ttl: Seconds past its TTL an entry may still be served stale (0 disables)
+            mark_stale: Function returning the copy of a value served stale (defaults to the value)
+        """
+        self.max_size = max_size
+        self.stale_ttl = stale_ttl
+        self._ttl_for = ttl_for
+        self._mark_stale = mark_stale
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[V, float]] = OrderedDict()
+        # Key -> load of (value, explicit TTL or None)
+        self._in_flight: dict[str, asyncio.Task[tuple[V, float | None]]] = {}
+        self._stats = CacheStats(max_size=max_size)
+
+    def get(self, key: str) -> V | None:
+        """
+        Get a fresh cached value without loading it.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The cached value, or None if it is missing or expired
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self._stats.misses += 1
+            return None
+
+        value, expires_at = entry
+        now = self._clock()
+        if expires_at <= now:
+            if expires_at + self.stale_ttl <= now:
+                del self._entries[key]
+                self._stats.expirations += 1
+            self._stats.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self._stats.hits += 1
+        return value
+
+    def get_stale(self, key: str) -> V | None:
+        """
+        Get an expired value that is still within its stale window.
+
+        Does not count as a hit or miss; call it after get() missed.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The value passed through `mark_stale`, or None if there is no stale value
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        value, expires_at = entry
+        now = self._clock()
+        if expires_at > now or expires_at + self.stale_ttl <= now:
+            return None
+
+        self._stats.stale_hits += 1
+        return self._mark_stale(value) if self._mark_stale is not None else value
+
+    def set(self, key: str, value: V, ttl: float | None = None) -> None:
+        """
+        Store a value, evicting least recently used entries if the cache is full.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+            ttl: Time-to-live in seconds (defaults to ttl_for(value); values with TTL <= 0 are not stored)
+        """
+        if ttl is None:
+            ttl = self._ttl_for(value)
+        if ttl <= 0:
+            return
+
+        self._entries[key] = (value, self._clock() + ttl)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self._stats.evictions += 1
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[V]]) -> V:
+        """
+        Get a cached value, loading it once on a miss.
+
+        If another caller is already loading the same key, this call waits for
+        that load instead of starting a new one. Failed loads are not cached.
+        A value within its stale window is returned at once while the load
+        runs in the background.
+
+        Args:
+            key: Cache key
+            loader: Coroutine function that fetches the value upstream
+
+        Returns:
+            The cached or freshly loaded value
+        """
+        async def load() -> tuple[V, float | None]:
+            return await loader(), None
+
+        return await self.get_or_load_with_ttl(key, load)
+
+    async def get_or_load_with_ttl(self, key: str, loader: Callable[[], Awaitable[tuple[V, float | None]]]) -> V:
+        """
+        Like get_or_load, but the loader also returns the time-to-live of its value.
+
+        Args:
+            key: Cache key
+            loader: Coroutine function returning the value and its TTL in seconds
+                (None uses ttl_for)
+
+        Returns:
+            The cached or freshly loaded value
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        task = self._start_load(key, loader)
+
+        stale = self.get_stale(key)
+        if stale is not None:
+            return stale
+
+        # Shield so that one cancelled caller does not cancel the shared load
+        loaded, _ = await asyncio.shield(task)
+        return loaded
+
+    def refresh(self, key: str, loader: Callable[[], Awaitable[V]]) -> None:
+        """
+        Load a value in the background, unless a load of the key is already running.
+
+        Failures are not cached and leave the current entry in place.
+
+        Args:
+            key: Cache key
+            loader: Coroutine function that fetches the value upstream
+        """
+        async def load() -> tuple[V, float | None]:
+            return await loader(), None
+
+        self._start_load(key, load)
+
+    def ttl_remaining(self, key: str) -> float | None:
+        """
+        Seconds until an entry expires, without counting a lookup.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            float | None: Remaining time-to-live (negative within the stale window),
+                or None if the key is not cached
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        return entry[1] - self._clock()
+
+    def is_loading(self, key: str) -> bool:
+        """
+        Whether a load of the key is in flight.
+
+        Args:
+            key: Cache key
+        """
+        return key in self._in_flight
+
+    def _start_load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[tuple[V, float | None]]]
+    ) -> asyncio.Task[tuple[V, float | None]]:
+        task = self._in_flight.get(key)
+        if task is not None:
+            self._stats.coalesced += 1
+            return task
+
+        self._stats.loads += 1
+        new_task: asyncio.Task[tuple[V, float | None]] = asyncio.ensure_future(loader())
+        self._in_flight[key] = new_task
+        new_task.add_done_callback(lambda done: self._on_loaded(key, done))
+        return new_task
+
+    def invalidate(self, key: str) -> None:
+        """
+        Drop a cached entry.
+
+        Args:
+            key: Cache key
+        """
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """
+        Drop all cached entries. Counters are kept.
+        """
+        self._entries.clear()
+
+    def stats(self) -> CacheStats:
+        """
+        Get a snapshot of the cache counters.
+
+        Returns:
+            CacheStats: Current counters and size
+        """
+        return CacheStats(
+            hits=self._stats.hits,
+            misses=self._stats.misses,
+            loads=self._stats.loads,
+            evictions=self._stats.evictions,
+            expirations=self._stats.expirations,
+            coalesced=self._stats.coalesced,
+            stale_hits=self._stats.stale_hits,
+            size=len(self._entries),
+            max_size=self.max_size
+        )
+
+    def _on_loaded(self, key: str, task: asyncio.Task[tuple[V, float | None]]) -> None:
+        self._in_flight.pop(key, None)
+        if task.cancelled():
+            return
+        if task.exception() is None:
+            value, ttl = task.result()
+            self.set(key, value, ttl)
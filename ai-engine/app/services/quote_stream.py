@@ -0,0 +1,199 @@
+"""
+Server-side quote fan-out for streaming endpoints.
+
+One background poller per distinct ticker feeds every subscriber of that
+ticker, so upstream load depends on the number of tickers, not clients.
+Updates are published only when the price changes, and each subscriber keeps
+only the latest update per ticker, so a slow consumer receives coalesced
+updates instead of an ever-growing backlog. While a ticker's market is closed
+its poller sleeps until the next session opens.
+"""
+
+import asyncio
+
+from app.core.errors import AIEngineException, ValidationError
+from app.core.logging import get_logger
+from app.schemas.stock import StockPriceSchema
+from app.services.stock_service import StockService
+
+logger = get_logger(__name__)
+
+
+class Subscription:
+    """
+    One client's view of the quote stream.
+
+    Pending updates are keyed by ticker: a newer quote replaces an unsent older
+    one, which bounds memory by the number of subscribed tickers.
+    """
+
+    def __init__(self) -> None:
+        self.tickers: set[str] = set()
+        self.coalesced = 0
+        self._pending: dict[str, StockPriceSchema] = {}
+        self._ready = asyncio.Event()
+
+    def offer(self, quote: StockPriceSchema) -> None:
+        """
+        Queue a quote for delivery, replacing an undelivered quote of the same ticker.
+
+        Args:
+            quote: Latest quote of a subscribed ticker
+        """
+        if quote.ticker in self._pending:
+            self.coalesced += 1
+        self._pending[quote.ticker] = quote
+        self._ready.set()
+
+    async def next_batch(self) -> list[StockPriceSchema]:
+        """
+        Wait for and take all pending updates.
+
+        Returns:
+            list[StockPriceSchema]: Latest quote of every ticker updated since the last batch
+        """
+        await self._ready.wait()
+        batch = list(self._pending.values())
+        self._pending.clear()
+        self._ready.clear()
+        return batch
+
+
+class QuoteStreamHub:
+    """
+    Registry of subscriptions and per-ticker pollers.
+
+    Pollers start with the first subscriber of a ticker and stop with the last,
+    so idle tickers cost nothing. Quotes are read through StockService, which
+    also shares its cache and single-flight loading with regular requests.
+    """
+
+    def __init__(self, stock_service: StockService, poll_interval: float, max_tickers: int):
+        """
+        Initialize the hub.
+
+        Args:
+            stock_service: Source of quotes
+            poll_interval: Seconds between two polls of one ticker
+            max_tickers: Maximum number of tickers per subscription
+        """
+        self.stock_service = stock_service
+        self.poll_interval = poll_interval
+        self.max_tickers = max_tickers
+        self._subscribers: dict[str, set[Subscription]] = {}
+        self._pollers: dict[str, asyncio.Task[None]] = {}
+        self._last_quotes: dict[str, StockPriceSchema] = {}
+
+    @property
+    def active_tickers(self) -> list[str]:
+        """
+        Tickers that currently have a running poller.
+        """
+        return list(self._pollers)
+
+    def subscribe(self, subscription: Subscription, tickers: list[str]) -> list[str]:
+        """
+        Add tickers to a subscription and start pollers for new tickers.
+
+        The last known quote of an already polled ticker is delivered right away.
+
+        Args:
+            subscription: Client subscription
+            tickers: Ticker symbols to add
+
+        Returns:
+            list[str]: Normalized tickers that were added
+
+        Raises:
+            ValidationError: If the subscription would exceed max_tickers
+        """
+        symbols = [s for s in dict.fromkeys(t.strip().upper() for t in tickers) if s not in subscription.tickers]
+        if len(subscription.tickers) + len(symbols) > self.max_tickers:
+            raise ValidationError(
+                message=f"Too many tickers in one subscription (max {self.max_tickers})",
+                details={"requested": len(subscription.tickers) + len(symbols), "max": self.max_tickers}
+            )
+
+        for symbol in symbols:
+            subscription.tickers.add(symbol)
+            self._subscribers.setdefault(symbol, set()).add(subscription)
+            if symbol in self._last_quotes:
+                subscription.offer(self._last_quotes[symbol])
+            if symbol not in self._pollers:
+                self._pollers[symbol] = asyncio.create_task(self._poll(symbol), name=f"quote-poller-{symbol}")
+        return symbols
+
+    def unsubscribe(self, subscription: Subscription, tickers: list[str] | None = None) -> None:
+        """
+        Remove tickers (all by default) from a subscription and stop idle pollers.
+
+        Args:
+            subscription: Client subscription
+            tickers: Ticker symbols to remove (None removes every ticker)
+        """
+        symbols = subscription.tickers.copy() if tickers is None else {t.strip().upper() for t in tickers}
+
+        for symbol in symbols & subscription.tickers:
+            subscription.tickers.discard(symbol)
+            subscribers = self._subscribers.get(symbol, set())
+            subscribers.discard(subscription)
+            if not subscribers:
+                self._subscribers.pop(symbol, None)
+                self._last_quotes.pop(symbol, None)
+                poller = self._pollers.pop(symbol, None)
+                if poller is not None:
+                    poller.cancel()
+
+    def publish(self, quote: StockPriceSchema) -> bool:
+        """
+        Deliver a quote to all subscribers of its ticker if the price changed.
+
+        Args:
+            quote: Latest quote
+
+        Returns:
+            bool: True if the quote was published, False if the price was unchanged
+        """
+        last = self._last_quotes.get(quote.ticker)
+        if last is not None and last.current_price == quote.current_price:
+            return False
+
+        self._last_quotes[quote.ticker] = quote
+        for subscription in self._subscribers.get(quote.ticker, ()):
+            subscription.offer(quote)
+        return True
+
+    async def close(self) -> None:
+        """
+        Stop every poller and drop all subscriptions (application shutdown).
+        """
+        pollers = list(self._pollers.values())
+        for poller in pollers:
+            poller.cancel()
+        await asyncio.gather(*pollers, return_exceptions=True)
+
+        self._pollers.clear()
+        self._subscribers.clear()
+        self._last_quotes.clear()
+
+    async def _poll(self, ticker: str) -> None:
+        # A poller must survive any error: if it ended, its ticker would stay
+        # registered in _pollers and subscribers would silently stop receiving quotes
+        while True:
+            try:
+                self.publish(await self.stock_service.get_current_price(ticker))
+            except AIEngineException as e:
+                logger.warning("Quote poll failed for %s: %s", ticker, e.message)
+            except Exception:
+                logger.exception("Unexpected error while polling quotes for %s", ticker)
+            await asyncio.sleep(self._next_poll_delay(ticker))
+
+    def _next_poll_delay(self, ticker: str) -> float:
+        # Prices do not move while the market is closed: skip polls until it reopens
+        calendar = self.stock_service.calendar
+        if calendar is None:
+            return self.poll_interval
+        until_open = calendar.seconds_until_open(ticker)
+        if until_open > self.poll_interval:
+            logger.debug("Market of %s is closed, next poll in %.0fs", ticker, until_open)
+        return max(self.poll_interval, until_open)
@@ -0,0 +1,278 @@
+"""
+News/filing retrieval service.
+
+Documents are split into overlapping chunks of whole sentences, embedded
+with the configured embedder and stored in the local memory-mapped vector
+index in RETRIEVAL_INDEX_PATH, which is mapped again (not loaded) when the
+service starts. Searches return the chunks most similar to a query,
+optionally filtered by ticker and publication time, e.g. as context for
+LLM prompts.
+
+Embedding and index work is CPU- and disk-bound, so it runs on a dedicated
+retrieval thread pool, never on the event loop.
+"""
+
+import hashlib
+import json
+import re
+from datetime import UTC, datetime
+from typing import Any
+
+import numpy as np
+
+from app.config.settings import Settings, get_settings
+from app.core.errors import ValidationError
+from app.core.executor import BlockingExecutor
+from app.core.logging import get_logger
+from app.schemas.retrieval import (
+    DocumentSchema,
+    IngestResultSchema,
+    RetrievalStatsSchema,
+    SearchHitSchema,
+    SearchRequest,
+    SearchResultSchema,
+)
+from app.services.embeddings import Embedder, create_embedder
+from app.services.vector_index import META_DTYPE, VectorIndex
+
+logger = get_logger(__name__)
+
+_SENTENCE_END = re.compile(r"(?<=[.!?。])\s+")
+
+
+def chunk_text(text: str, size: int = 800, overlap: int = 100) -> list[str]:
+    """
+    Split text into chunks of whole sentences.
+
+    Sentences are packed into chunks of at most `size` characters; each chunk
+    starts with the last sentences (up to `overlap` characters) of the previous
+    one, so a passage cut at a chunk boundary is still found whole. Sentences
+    longer than `size` are cut into pieces.
+
+    Args:
+        text: Text to split
+        size: Maximum characters per chunk
+        overlap: Maximum characters repeated from the previous chunk
+
+    Returns:
+        list[str]: Chunks in text order (empty for blank text)
+
+    Example:
+        >>> chunk_text("First sentence. Second one.", size=20, overlap=0)
+        ['First sentence.', 'Second one.']
+    """
+    sentences: list[str] = []
+    for sentence in _SENTENCE_END.split(" ".join(text.split())):
+        sentences.extend(sentence[i:i + size] for i in range(0, len(sentence), size))
+
+    chunks: list[str] = []
+    current: list[str] = []
+    for sentence in sentences:
+        if current and len(" ".join([*current, sentence])) > size:
+            chunks.append(" ".join(current))
+            # Carry the last sentences over, within the overlap and leaving room for the next one
+            carried: list[str] = []
+            for previous in reversed(current):
+                candidate = [previous, *carried]
+                if len(" ".join(candidate)) > overlap or len(" ".join([*candidate, sentence])) > size:
+                    break
+                carried = candidate
+            current = carried
+        current.append(sentence)
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+def document_key(document_id: str) -> int:
+    """
+    Get the 63-bit index key of a document ID.
+    """
+    return int.from_bytes(hashlib.blake2b(document_id.encode("utf-8"), digest_size=8).digest(), "little") >> 1
+
+
+def _epoch(value: datetime) -> int:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return int(value.timestamp())
+
+
+class RetrievalService:
+    """
+    Service for indexing and searching news and filings.
+    """
+
+    def __init__(
+        self,
+        settings: Settings | None = None,
+        embedder: Embedder | None = None,
+        index: VectorIndex | None = None,
+        executor: BlockingExecutor | None = None
+    ):
+        """
+        Initialize the service and open (or create) the index.
+
+        Args:
+            settings: Application settings (defaults to the cached settings singleton)
+            embedder: Embedding model (defaults to the one selected by RETRIEVAL_EMBEDDER)
+            index: Vector index (defaults to the one in RETRIEVAL_INDEX_PATH)
+            executor: Executor for embedding and index work (defaults to a dedicated retrieval pool)
+        """
+        self.settings = settings or get_settings()
+        self.embedder = embedder or create_embedder(self.settings)
+        self.index = index or VectorIndex(
+            self.settings.retrieval_index_path,
+            dims=self.embedder.dims,
+            embedder=self.embedder.name,
+            nlist=self.settings.retrieval_nlist,
+            nprobe=self.settings.retrieval_nprobe,
+            exact_threshold=self.settings.retrieval_exact_threshold
+        )
+        self.executor = executor or BlockingExecutor(
+            max_workers=self.settings.retrieval_threads,
+            queue_depth=self.settings.retrieval_threads * 8,
+            name="retrieval"
+        )
+        logger.info("Opened retrieval index %s: %s", self.index.root, self.index.stats())
+
+    async def ingest(self, documents: list[DocumentSchema]) -> IngestResultSchema:
+        """
+        Chunk, embed and index documents, replacing indexed versions with the same ID.
+
+        Args:
+            documents: Documents to index
+
+        Returns:
+            IngestResultSchema: Documents, chunks and replaced documents
+
+        Raises:
+            ValidationError: If more than RETRIEVAL_MAX_DOCUMENTS documents are given
+            ServiceOverloadedError: If the retrieval pool is saturated
+        """
+        if len(documents) > self.settings.retrieval_max_documents:
+            raise ValidationError(
+                message=f"Too many documents (max {self.settings.retrieval_max_documents} per request)",
+                details={"requested": len(documents), "max": self.settings.retrieval_max_documents}
+            )
+        # A later version of a document in the same request wins
+        latest = list({document.id: document for document in documents}.values())
+        return await self.executor.run(self._ingest, latest)
+
+    async def delete(self, document_id: str) -> int:
+        """
+        Remove a document from the index.
+
+        Args:
+            document_id: Document ID
+
+        Returns:
+            int: Chunks removed
+
+        Raises:
+            ValidationError: If the document is not indexed
+        """
+        key = document_key(document_id)
+        chunks = (await self.executor.run(self.index.delete, [key])).get(key, 0)
+        if not chunks:
+            raise ValidationError(message=f"Document not indexed: {document_id}", details={"document_id": document_id})
+        return chunks
+
+    async def search(self, request: SearchRequest) -> SearchResultSchema:
+        """
+        Find the indexed chunks most similar to a query.
+
+        Args:
+            request: Query text, result count and filters
+
+        Returns:
+            SearchResultSchema: Matching chunks by descending similarity
+
+        Raises:
+            ValidationError: If more than RETRIEVAL_MAX_RESULTS results are requested
+            ServiceOverloadedError: If the retrieval pool is saturated
+        """
+        if request.top_k > self.settings.retrieval_max_results:
+            raise ValidationError(
+                message=f"Too many results requested (max {self.settings.retrieval_max_results})",
+                details={"requested": request.top_k, "max": self.settings.retrieval_max_results}
+            )
+        hits = await self.executor.run(self._search, request)
+        return SearchResultSchema(query=request.query, hits=hits)
+
+    def stats(self) -> RetrievalStatsSchema:
+        """
+        Get the size and layout of the index.
+        """
+        stats = self.index.stats()
+        return RetrievalStatsSchema(
+            embedder=self.embedder.name,
+            dims=self.embedder.dims,
+            chunks=stats.live_rows,
+            deleted_chunks=stats.deleted_rows,
+            unsorted_chunks=stats.tail_rows,
+            lists=stats.lists,
+            trained=stats.trained
+        )
+
+    def close(self) -> None:
+        """
+        Release the retrieval threads.
+        """
+        self.executor.shutdown()
+
+    def _ingest(self, documents: list[DocumentSchema]) -> IngestResultSchema:
+        texts: list[str] = []
+        payloads: list[bytes] = []
+        records: list[tuple[int, int, int, int, bytes, int, int]] = []
+        for document in documents:
+            key = document_key(document.id)
+            published = _epoch(document.published_at)
+            ticker = document.ticker.strip().upper().encode("ascii", "replace")
+            for number, chunk in enumerate(chunk_text(
+                document.text, self.settings.retrieval_chunk_size, self.settings.retrieval_chunk_overlap
+            )):
+                # The title is embedded with every chunk, so chunks match queries about the headline
+                texts.append(f"{document.title}\n{chunk}" if document.title else chunk)
+                payloads.append(json.dumps({
+                    "id": document.id,
+                    "title": document.title,
+                    "source": document.source,
+                    "url": document.url,
+                    "text": chunk,
+                }, ensure_ascii=False).encode("utf-8"))
+                records.append((key, number, 0, published, ticker, 0, 0))
+
+        vectors = self.embedder.embed(texts) if texts else None
+        # Writes of other workers cannot land between the delete and the add
+        with self.index.writing():
+            replaced = len(self.index.delete([document_key(document.id) for document in documents]))
+            if vectors is not None:
+                self.index.add(vectors, np.array(records, dtype=META_DTYPE), payloads)
+        logger.info("Indexed %d documents as %d chunks (%d replaced)", len(documents), len(texts), replaced)
+        return IngestResultSchema(documents=len(documents), chunks=len(texts), replaced=replaced)
+
+    def _search(self, request: SearchRequest) -> list[SearchHitSchema]:
+        query = self.embedder.embed([request.query])[0]
+        hits = self.index.search(
+            query,
+            k=request.top_k,
+            tickers=[ticker.strip() for ticker in request.tickers] or None,
+            start=_epoch(request.start) if request.start else None,
+            end=_epoch(request.end) if request.end else None
+        )
+        results = []
+        for hit in hits:
+            record = hit.record
+            payload: dict[str, Any] = json.loads(hit.payload)
+            results.append(SearchHitSchema(
+                document_id=payload["id"],
+                chunk=int(record["chunk"]),
+                ticker=bytes(record["ticker"]).decode("ascii"),
+                published_at=datetime.fromtimestamp(int(record["published"]), tz=UTC),
+                title=payload["title"],
+                source=payload["source"],
+                url=payload["url"],
+                text=payload["text"],
+                score=hit.score
+            ))
+        return results
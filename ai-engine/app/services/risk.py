@@ -0,0 +1,103 @@
+"""
+Vectorized portfolio risk kernels.
+
+All functions take a (T x N) matrix of aligned per-period returns (rows =
+periods, columns = positions) and a length-N vector of position exposures
+in the base currency, and work on whole arrays at once.
+
+The covariance matrix is never materialized: the portfolio P&L series is
+R @ v, its variance equals v' * cov(R) * v, and the covariance of each
+position with the portfolio is a single (N x T) @ (T) product. This keeps
+risk for thousands of positions at O(T * N) instead of O(T * N^2).
+"""
+
+import math
+from dataclasses import dataclass
+from statistics import NormalDist
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class PortfolioRisk:
+    """
+    Risk figures of a portfolio, in base currency over the requested horizon.
+
+    `contributions` is the Euler decomposition of the volatility: entry i is
+    position i's share of it, and the entries sum to `volatility`.
+    """
+
+    volatility: float
+    var_historical: float
+    var_parametric: float
+    contributions: np.ndarray
+    observations: int
+
+
+def returns_from_prices(prices: np.ndarray) -> np.ndarray:
+    """
+    Simple per-period returns of aligned price columns.
+
+    Periods where either price is missing (before a position's first bar)
+    get a zero return, so short histories do not shrink the whole sample.
+
+    Args:
+        prices: (T x N) prices, NaN where unknown
+
+    Returns:
+        np.ndarray: (T-1 x N) returns
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = prices[1:] / prices[:-1] - 1.0
+    cleaned: np.ndarray = np.nan_to_num(returns, nan=0.0, posinf=0.0, neginf=0.0)
+    return cleaned
+
+
+def portfolio_risk(
+    returns: np.ndarray,
+    exposures: np.ndarray,
+    confidence: float = 0.95,
+    horizon_days: int = 1
+) -> PortfolioRisk:
+    """
+    Volatility, historical/parametric VaR and risk contributions of a portfolio.
+
+    Multi-day figures are scaled from daily ones with the square root of the
+    horizon. Parametric VaR assumes normally distributed, zero-mean P&L.
+
+    Args:
+        returns: (T x N) daily returns of the positions
+        exposures: (N) market values of the positions in base currency
+        confidence: VaR confidence level (e.g., 0.95)
+        horizon_days: VaR and volatility horizon in trading days
+
+    Returns:
+        PortfolioRisk: Risk figures as positive amounts in base currency
+    """
+    observations = returns.shape[0]
+    if observations < 2:
+        return PortfolioRisk(0.0, 0.0, 0.0, np.zeros(returns.shape[1]), observations)
+
+    scale = math.sqrt(horizon_days)
+    pnl = returns @ exposures
+    centered = pnl - pnl.mean()
+    variance = float(centered @ centered) / (observations - 1)
+    volatility = math.sqrt(variance)
+
+    if volatility > 0:
+        # cov(R_i, pnl) for every position at once: (N x T) @ (T)
+        covariance = returns.T @ centered / (observations - 1)
+        contributions = exposures * covariance / volatility
+    else:
+        contributions = np.zeros(returns.shape[1])
+
+    var_historical = max(-float(np.quantile(pnl, 1.0 - confidence)), 0.0)
+    var_parametric = NormalDist().inv_cdf(confidence) * volatility
+
+    return PortfolioRisk(
+        volatility=volatility * scale,
+        var_historical=var_historical * scale,
+        var_parametric=var_parametric * scale,
+        contributions=contributions * scale,
+        observations=observations
+    )
@@ -4,11 +4,20 @@ Stock data processing service.
 This module contains business logic for fetching and processing stock data.
 """
 
-import yfinance as yf
+import asyncio
+import time
 
-from app.core.errors import ExternalAPIError
+from app.config.settings import Settings, get_settings
+from app.core.errors import AIEngineException, ExternalAPIError, ValidationError
 from app.core.logging import get_logger
-from app.schemas.stock import StockPriceSchema
+from app.core.shared_cache import SharedCache
+from app.schemas.stock import StockPriceErrorSchema, StockPriceSchema, StockPricesSchema
+from app.services.cache_codec import decode_quote, encode_quote
+from app.services.market_calendar import MarketCalendar
+from app.services.prefetch import TickerDemand
+from app.services.providers.base import MarketDataProvider, Quote
+from app.services.providers.factory import create_market_data_provider
+from app.services.quote_cache import CacheStats, QuoteCache
 
 logger = get_logger(__name__)
 
@@ -21,13 +30,53 @@ class StockService:
     It serves as a reference implementation for the service layer pattern.
     """
 
+    def __init__(
+        self,
+        settings: Settings | None = None,
+        provider: MarketDataProvider | None = None,
+        quote_cache: QuoteCache[StockPriceSchema] | None = None,
+        calendar: MarketCalendar | None = None,
+        shared: SharedCache | None = None
+    ):
+        """
+        Initialize the service.
+
+        Args:
+            settings: Application settings (defaults to the cached settings singleton)
+            provider: Market data provider (defaults to the provider selected in settings)
+            quote_cache: Quote cache (defaults to a new cache configured from settings)
+            calendar: Market calendar (defaults to a new calendar unless MARKET_CALENDAR_ENABLED
+                is false, in which case every market is treated as open)
+            shared: Shared cache tier behind the quote cache (None keeps quotes per worker)
+        """
+        self.settings = settings or get_settings()
+        self.provider = provider or create_market_data_provider(self.settings)
+        self.calendar = calendar
+        if calendar is None and self.settings.market_calendar_enabled:
+            self.calendar = MarketCalendar(extra_holidays=self.settings.market_extra_holidays)
+        self.quote_cache = quote_cache or QuoteCache(
+            max_size=self.settings.quote_cache_max_size,
+            ttl_for=self._quote_ttl,
+            stale_ttl=self.settings.quote_cache_stale_ttl,
+            mark_stale=_mark_stale
+        )
+        self.shared = shared
+        if shared is not None:
+            shared.subscribe(self._on_shared_invalidation)
+        # Recent request frequency per ticker (ranks the prefetcher's hot set)
+        self.demand = TickerDemand(half_life=self.settings.prefetch_demand_half_life)
+        # Background batch refreshes of stale quotes, and the tickers they cover
+        self._refreshes: set[asyncio.Task[None]] = set()
+        self._refreshing: set[str] = set()
+
     async def get_current_price(self, ticker: str) -> StockPriceSchema:
         """
-        Fetch current stock price from Yahoo Finance.
+        Get current stock price, served from the quote cache when fresh.
 
-        This is an async method to maintain consistency with the async-first architecture,
-        even though yfinance is a synchronous library. For truly async external API calls,
-        use httpx or aiohttp.
+        On a cache miss the price is fetched from the market data provider. Concurrent misses
+        for the same ticker share one upstream call. With QUOTE_CACHE_STALE_TTL set, a
+        recently expired quote is returned at once (with `stale=True`) while it is
+        refreshed in the background.
 
         Args:
             ticker: Stock ticker symbol (e.g., "AAPL", "GOOGL")
@@ -36,41 +85,379 @@ class StockService:
             StockPriceSchema: Current stock price and related information
 
         Raises:
-            ExternalAPIError: If the API call fails or ticker is invalid
+            ExternalAPIError: If the API call fails, times out or ticker is invalid
+            ServiceOverloadedError: If the executor queue is full
         """
-        logger.info(f"Fetching stock price for ticker: {ticker}")
+        self.demand.record([ticker.upper()])
+        return await self.quote_cache.get_or_load_with_ttl(
+            ticker.upper(),
+            lambda: self._fetch_current_price(ticker)
+        )
 
-        try:
-            # Fetch stock data using yfinance
-            stock = yf.Ticker(ticker)
-            price_info = stock.fast_info
-
-            # Extract price data
-            current_price = price_info.last_price
-            currency = price_info.currency
-
-            # Create response schema
-            result = StockPriceSchema(
-                ticker=ticker.upper(),
-                current_price=round(current_price, 2),
-                currency=currency,
-                market_status="open"  # Simplified - can be enhanced with market hours check
+    def get_cache_stats(self) -> CacheStats:
+        """
+        Get quote cache counters.
+
+        Returns:
+            CacheStats: Hit/miss/eviction counters of the quote cache
+        """
+        return self.quote_cache.stats()
+
+    async def _fetch_current_price(self, ticker: str) -> tuple[StockPriceSchema, float | None]:
+        """
+        Fetch current stock price from the shared cache or, on a miss, from the provider.
+
+        With a shared cache only one worker fetches a missing ticker upstream;
+        the others wait for its result.
+
+        Args:
+            ticker: Stock ticker symbol (e.g., "AAPL", "GOOGL")
+
+        Returns:
+            tuple[StockPriceSchema, float | None]: Current stock price and, when read through
+                the shared cache, the remaining lifetime of its shared entry
+
+        Raises:
+            ExternalAPIError: If the API call fails, times out or ticker is invalid
+            ServiceOverloadedError: If the executor queue is full
+        """
+        if self.shared is None:
+            return await self._fetch_upstream_price(ticker), None
+
+        key = _quote_key(ticker.upper())
+
+        async def load(keys: list[str]) -> dict[str, tuple[StockPriceSchema, float]]:
+            return {key: self._shared_entry(await self._fetch_upstream_price(ticker))}
+
+        entries = await self.shared.get_or_load_many([key], load, _encode_shared, _decode_shared, _shared_ttl)
+        price, expires_at = entries[key]
+        return price, expires_at - time.time()
+
+    async def _fetch_upstream_price(self, ticker: str) -> StockPriceSchema:
+        """
+        Fetch current stock price from the configured market data provider.
+
+        Args:
+            ticker: Stock ticker symbol (e.g., "AAPL", "GOOGL")
+
+        Returns:
+            StockPriceSchema: Current stock price and related information
+
+        Raises:
+            ExternalAPIError: If the API call fails, times out or ticker is invalid
+            ServiceOverloadedError: If the executor queue is full
+        """
+        logger.info("Fetching stock price for ticker: %s from %s", ticker, self.provider.name)
+
+        quote = await self.provider.get_quote(ticker)
+        result = self._to_price_schema(quote)
+
+        logger.info("Successfully fetched price for %s: %s %s", ticker, quote.price, quote.currency)
+        return result
+
+    def _to_price_schema(self, quote: Quote) -> StockPriceSchema:
+        """
+        Build the response schema of a provider quote.
+        """
+        ticker = quote.ticker.upper()
+        return StockPriceSchema(
+            ticker=ticker,
+            current_price=round(quote.price, 2),
+            currency=quote.currency,
+            market_status=self.calendar.status(ticker) if self.calendar is not None else "open"
+        )
+
+    def _quote_ttl(self, quote: StockPriceSchema) -> float:
+        """
+        Cache time-to-live for a quote.
+
+        Short while its market is open. Once the market has closed, the quote
+        keeps QUOTE_CACHE_TTL_CLOSED for closing prices to settle and is then
+        cached until the next session opens, so a closed market costs no
+        upstream calls at all. (A quote read from the shared cache is cached
+        for what remains of its shared entry's lifetime instead.)
+        """
+        if quote.market_status == "open":
+            return self.settings.quote_cache_ttl_open
+        if self.calendar is None:
+            return self.settings.quote_cache_ttl_closed
+
+        now = self.calendar.now()
+        state = self.calendar.state(quote.ticker, now)
+        if state.next_open is None:
+            return self.settings.quote_cache_ttl_closed
+        if state.last_close is not None and (now - state.last_close).total_seconds() < self.settings.quote_cache_ttl_closed:
+            return self.settings.quote_cache_ttl_closed
+        return max((state.next_open - now).total_seconds(), self.settings.quote_cache_ttl_open)
+
+    async def get_current_prices(self, tickers: list[str]) -> StockPricesSchema:
+        """
+        Fetch current stock prices for several tickers.
+
+        Tickers are normalized (stripped, upper-cased) and de-duplicated while
+        keeping their original order. Fresh quotes are served from the quote
+        cache; all misses go to the provider in one `get_quotes` call (a single
+        round trip for providers with a batch API, otherwise at most
+        `stock_batch_max_concurrency` concurrent lookups) and are cached.
+        Misses with a quote in its stale window are answered with that quote
+        (`stale=True`) and refreshed together in the background. A failing
+        ticker is reported in the `errors` list instead of failing the whole batch.
+
+        Args:
+            tickers: Stock ticker symbols (e.g., ["AAPL", "005930.KS"])
+
+        Returns:
+            StockPricesSchema: Prices of successful tickers and per-ticker errors
+
+        Raises:
+            ValidationError: If more than `stock_batch_max_tickers` distinct tickers are requested
+        """
+        unique_tickers = list(dict.fromkeys(ticker.strip().upper() for ticker in tickers))
+
+        if len(unique_tickers) > self.settings.stock_batch_max_tickers:
+            raise ValidationError(
+                message=f"Too many tickers in one batch (max {self.settings.stock_batch_max_tickers})",
+                details={"requested": len(unique_tickers), "max": self.settings.stock_batch_max_tickers}
             )
 
-            logger.info(f"Successfully fetched price for {ticker}: {current_price} {currency}")
-            return result
+        self.demand.record(unique_tickers)
+
+        results: dict[str, StockPriceSchema | StockPriceErrorSchema] = {}
+        misses: list[str] = []
+        stale: list[str] = []
+        for ticker in unique_tickers:
+            cached = self.quote_cache.get(ticker) or self.quote_cache.get_stale(ticker)
+            if cached is None:
+                misses.append(ticker)
+                continue
+            results[ticker] = cached
+            if cached.stale:
+                stale.append(ticker)
+
+        if stale:
+            self._refresh_in_background(stale)
+
+        if misses:
+            logger.info("Fetching stock prices for %d of %d tickers from %s", len(misses), len(unique_tickers), self.provider.name)
+            results.update(await self._load_prices(misses))
+
+        ordered = [results[ticker] for ticker in unique_tickers]
+        return StockPricesSchema(
+            prices=[result for result in ordered if isinstance(result, StockPriceSchema)],
+            errors=[result for result in ordered if isinstance(result, StockPriceErrorSchema)]
+        )
+
+    async def refresh_prices(self, tickers: list[str]) -> list[str]:
+        """
+        Reload quotes upstream with one batch call and cache them, regardless of freshness.
 
-        except AttributeError as e:
-            # This occurs when ticker is invalid or data is not available
-            logger.error(f"Invalid ticker or data not available for {ticker}: {str(e)}")
-            raise ExternalAPIError(
-                message=f"Unable to fetch stock data for ticker: {ticker}",
-                details={"ticker": ticker, "error": "Invalid ticker or data not available"}
+        Used by the background prefetcher; does not count as demand. The
+        shared cache, if any, is not read (its copies expire just as soon)
+        but updated, and other workers drop their local copies.
+
+        Args:
+            tickers: Normalized stock ticker symbols
+
+        Returns:
+            list[str]: Tickers refreshed successfully
+        """
+        results = await self._fetch_prices(tickers)
+        prices = {ticker: result for ticker, result in results.items() if isinstance(result, StockPriceSchema)}
+        entries = {ticker: self._shared_entry(price) for ticker, price in prices.items()}
+        now = time.time()
+        for ticker, (price, expires_at) in entries.items():
+            self.quote_cache.set(ticker, price, expires_at - now)
+        if self.shared is not None:
+            await self.shared.set_many({
+                _quote_key(ticker): (_encode_shared(entry), entry[1] - now)
+                for ticker, entry in entries.items()
+            })
+        return list(prices)
+
+    def _refresh_in_background(self, tickers: list[str]) -> None:
+        """
+        Reload stale quotes with one batch call, skipping tickers already being refreshed.
+        """
+        pending = [
+            ticker for ticker in tickers
+            if ticker not in self._refreshing and not self.quote_cache.is_loading(ticker)
+        ]
+        if not pending:
+            return
+
+        async def refresh() -> None:
+            try:
+                await self._load_prices(pending)
+            finally:
+                self._refreshing.difference_update(pending)
+
+        self._refreshing.update(pending)
+        task = asyncio.ensure_future(refresh())
+        self._refreshes.add(task)
+        task.add_done_callback(self._refreshes.discard)
+
+    async def _load_prices(self, tickers: list[str]) -> dict[str, StockPriceSchema | StockPriceErrorSchema]:
+        """
+        Load quotes of cache misses and cache the successes.
+
+        Without a shared cache all tickers go to the provider in one batch
+        call. With one, tickers are read from it first and only the rest are
+        fetched upstream, each by one worker at a time.
+
+        Every ticker gets a result: provider errors and unexpected failures
+        (including a failure of the whole batch call) become error entries.
+        """
+        expiries: dict[str, float] = {}
+        if self.shared is None:
+            results = await self._fetch_prices(tickers)
+        else:
+            results, expiries = await self._load_shared_prices(self.shared, tickers)
+
+        now = time.time()
+        for ticker, result in results.items():
+            if isinstance(result, StockPriceSchema):
+                expires_at = expiries.get(ticker)
+                self.quote_cache.set(ticker, result, None if expires_at is None else expires_at - now)
+        return results
+
+    async def _load_shared_prices(
+        self,
+        shared: SharedCache,
+        tickers: list[str]
+    ) -> tuple[dict[str, StockPriceSchema | StockPriceErrorSchema], dict[str, float]]:
+        """
+        Load quotes through the shared cache, fetching missing ones upstream in one batch call.
+
+        Returns the result per ticker and the expiry (epoch seconds) of every shared entry.
+        """
+        errors: dict[str, StockPriceSchema | StockPriceErrorSchema] = {}
+
+        async def load(keys: list[str]) -> dict[str, tuple[StockPriceSchema, float]]:
+            fetched = await self._fetch_prices([key.removeprefix(_QUOTE_PREFIX) for key in keys])
+            entries = {}
+            for ticker, result in fetched.items():
+                if isinstance(result, StockPriceSchema):
+                    entries[_quote_key(ticker)] = self._shared_entry(result)
+                else:
+                    errors[ticker] = result
+            return entries
+
+        entries = await shared.get_or_load_many(
+            [_quote_key(ticker) for ticker in tickers],
+            load,
+            _encode_shared,
+            _decode_shared,
+            _shared_ttl
+        )
+        results = errors
+        expiries: dict[str, float] = {}
+        for ticker in tickers:
+            entry = entries.get(_quote_key(ticker))
+            if entry is not None:
+                results[ticker], expiries[ticker] = entry
+            elif ticker not in results:
+                results[ticker] = _error_schema(ticker, ExternalAPIError(
+                    message=f"No quote returned for ticker: {ticker}",
+                    details={"ticker": ticker, "cause": "upstream_error"}
+                ))
+        return results, expiries
+
+    async def _fetch_prices(self, tickers: list[str]) -> dict[str, StockPriceSchema | StockPriceErrorSchema]:
+        """
+        Fetch quotes with one provider batch call, mapping every failure to an error entry.
+        """
+        try:
+            quotes = await self.provider.get_quotes(
+                tickers,
+                max_concurrency=self.settings.stock_batch_max_concurrency
             )
         except Exception as e:
-            # Catch all other exceptions
-            logger.error(f"Failed to fetch stock price for {ticker}: {str(e)}")
-            raise ExternalAPIError(
-                message=f"External API error while fetching stock data for {ticker}",
-                details={"ticker": ticker, "error": str(e)}
-            )
+            logger.exception("Batch quote lookup failed for %d tickers", len(tickers))
+            return {ticker: _error_schema(ticker, e) for ticker in tickers}
+
+        results: dict[str, StockPriceSchema | StockPriceErrorSchema] = {}
+        for ticker in tickers:
+            quote = quotes.get(ticker)
+            try:
+                if isinstance(quote, Exception):
+                    raise quote
+                if quote is None:
+                    raise ExternalAPIError(
+                        message=f"No quote returned for ticker: {ticker}",
+                        details={"ticker": ticker, "cause": "upstream_error"}
+                    )
+                price = self._to_price_schema(quote)
+            except Exception as e:
+                if not isinstance(e, AIEngineException):
+                    # Never let one bad symbol fail the whole batch
+                    logger.exception("Unexpected error while building stock price for %s", ticker)
+                results[ticker] = _error_schema(ticker, e)
+                continue
+
+            results[ticker] = price
+        return results
+
+    def _shared_entry(self, price: StockPriceSchema) -> tuple[StockPriceSchema, float]:
+        """
+        Shared cache entry of a fresh quote: the quote and its expiry in epoch seconds.
+        """
+        return price, time.time() + self._quote_ttl(price)
+
+    def _on_shared_invalidation(self, keys: list[str]) -> None:
+        """
+        Drop local quotes another worker has refreshed, so the next lookup reads its fresh copy.
+        """
+        for key in keys:
+            if key.startswith(_QUOTE_PREFIX):
+                self.quote_cache.invalidate(key.removeprefix(_QUOTE_PREFIX))
+
+
+_QUOTE_PREFIX = "quote:"
+
+
+def _quote_key(ticker: str) -> str:
+    """
+    Shared cache key of a ticker's quote.
+    """
+    return f"{_QUOTE_PREFIX}{ticker}"
+
+
+def _encode_shared(entry: tuple[StockPriceSchema, float]) -> bytes:
+    """
+    Shared cache payload of a quote and its expiry.
+    """
+    return encode_quote(*entry)
+
+
+def _decode_shared(payload: bytes) -> tuple[StockPriceSchema, float]:
+    """
+    Quote and expiry (epoch seconds) of a shared cache payload.
+    """
+    return decode_quote(payload)
+
+
+def _shared_ttl(entry: tuple[StockPriceSchema, float]) -> float:
+    """
+    Seconds a shared cache entry has left to live.
+    """
+    return entry[1] - time.time()
+
+
+def _mark_stale(price: StockPriceSchema) -> StockPriceSchema:
+    """
+    Copy of a cached quote flagged as stale.
+    """
+    return price.model_copy(update={"stale": True})
+
+
+def _error_schema(ticker: str, error: Exception) -> StockPriceErrorSchema:
+    """
+    Per-ticker error entry of a batch response.
+    """
+    if isinstance(error, AIEngineException):
+        return StockPriceErrorSchema(ticker=ticker, message=error.message, details=error.details)
+    return StockPriceErrorSchema(
+        ticker=ticker,
+        message=f"Unexpected error while fetching stock data for {ticker}",
+        details={"ticker": ticker, "error": str(error), "cause": "internal_error"}
+    )
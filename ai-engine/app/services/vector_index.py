@@ -0,0 +1,679 @@
+"""
+Local memory-mapped IVF vector index.
+
+Vectors are L2-normalized float32 rows kept in flat files that are read
+through NumPy memory maps, so opening an index of millions of vectors maps
+its files instead of loading them, and the page cache is shared by all
+worker processes.
+
+The index has two segments:
+    - sorted rows, grouped by inverted list (the nearest k-means centroid),
+      so a query scores only the `nprobe` lists closest to it, each one a
+      contiguous slice of the vector file;
+    - a tail of rows appended since the last compaction, scanned exactly.
+Deleted rows are tombstoned; compact() rewrites the files as a new
+generation (dropping deleted rows and sorting the tail into its lists) and
+trains the centroids once enough vectors exist. Until then the whole index
+is one list, i.e. exact search.
+
+Every row carries metadata (document, chunk, ticker, publish time) that
+searches filter on. A ticker filter selecting few rows is answered exactly
+from per-ticker postings instead of probing lists.
+
+Several processes can share an index: writes hold an exclusive lock on
+index.lock and first catch up with the files, and searches reopen the files
+when index.json or the appended files changed since they were last read.
+
+Layout (<gen> increases with every compaction):
+    <root>/index.json            {"version", "dims", "embedder", "generation", "nlist", "sorted_rows"}
+    <root>/index.lock            flock() target serializing writers across processes
+    <root>/vectors.<gen>.f32     float32 rows
+    <root>/meta.<gen>.bin        META_DTYPE records, one per row
+    <root>/payloads.<gen>.bin    opaque payload bytes referenced by the records
+    <root>/deleted.<gen>.i8      tombstoned row numbers
+    <root>/centroids.<gen>.npy   (nlist, dims) list centroids, once trained
+    <root>/lists.<gen>.npy       (lists + 1,) offsets of each list in the sorted rows
+    <root>/tickers.<gen>.npz     sorted ticker keys and their offsets into the postings
+    <root>/postings.<gen>.i8     sorted rows ordered by ticker
+"""
+
+import fcntl
+import json
+import os
+import threading
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import IO
+
+import numpy as np
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+INDEX_VERSION = 1
+
+# One record per vector; offset/length locate its payload in the payload file
+META_DTYPE = np.dtype([
+    ("doc", "<i8"),
+    ("chunk", "<i4"),
+    ("list", "<i4"),
+    ("published", "<i8"),
+    ("ticker", "S16"),
+    ("offset", "<i8"),
+    ("length", "<i4"),
+])
+
+# k-means needs enough points per centroid; below this the index stays exact
+_TRAIN_POINTS_PER_LIST = 39
+
+# Sample size of k-means training; more points per list barely move the centroids
+_TRAIN_SAMPLE_PER_LIST = 64
+
+# Rows gathered per step when scanning or rewriting large files
+_BLOCK_ROWS = 65_536
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    """
+    One search result: a row of the index, its cosine similarity to the query,
+    and the row's record and payload as of the search (row numbers change when
+    the index is compacted).
+    """
+
+    row: int
+    score: float
+    record: np.void = field(compare=False, repr=False)
+    payload: bytes = field(compare=False, repr=False)
+
+
+@dataclass(frozen=True)
+class IndexStats:
+    """
+    Size and layout of the index.
+    """
+
+    rows: int
+    live_rows: int
+    sorted_rows: int
+    tail_rows: int
+    deleted_rows: int
+    lists: int
+    trained: bool
+    generation: int
+
+
+@dataclass
+class _Snapshot:
+    """
+    Immutable view of one state of the index; searches use one snapshot throughout.
+    """
+
+    generation: int
+    rows: int
+    sorted_rows: int
+    vectors: np.ndarray
+    meta: np.ndarray
+    payloads: np.ndarray
+    deleted: np.ndarray
+    centroids: np.ndarray | None
+    offsets: np.ndarray
+    ticker_keys: np.ndarray
+    ticker_starts: np.ndarray
+    postings: np.ndarray
+
+
+class VectorIndex:
+    """
+    Incremental IVF index over memory-mapped files with metadata filtering.
+
+    Writes (add, delete, compact) are serialized with a lock, across processes
+    too; searches see the snapshot that was current when they started.
+
+    Example:
+        >>> index = VectorIndex("data/retrieval", dims=256, embedder="hashing-256")
+        >>> index.add(vectors, meta, payloads)
+        >>> hits = index.search(query, k=5, tickers=["AAPL"])
+    """
+
+    def __init__(
+        self,
+        root: str | Path,
+        dims: int,
+        embedder: str,
+        nlist: int = 1024,
+        nprobe: int = 16,
+        exact_threshold: int = 20_000,
+        compact_ratio: float = 0.1,
+        compact_min_rows: int = 10_000,
+        auto_compact: bool = True,
+        seed: int = 0
+    ):
+        """
+        Open the index in `root`, creating it if it does not exist.
+
+        Args:
+            root: Index directory
+            dims: Vector dimensions
+            embedder: Name of the embedder the vectors come from
+            nlist: Inverted lists (k-means centroids) once trained
+            nprobe: Lists scored per query by default
+            exact_threshold: Ticker-filtered searches over at most this many rows are exact
+            compact_ratio: Compact once the tail or the tombstones exceed this share of the sorted rows ...
+            compact_min_rows: ... and this many rows
+            auto_compact: Compact automatically after add/delete (disable for bulk loads)
+            seed: Seed of the k-means initialization
+
+        Raises:
+            ValueError: If the index on disk was built with other dimensions or another embedder
+        """
+        self.root = Path(root)
+        self.dims = dims
+        self.embedder = embedder
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.exact_threshold = exact_threshold
+        self.compact_ratio = compact_ratio
+        self.compact_min_rows = compact_min_rows
+        self.auto_compact = auto_compact
+        self.seed = seed
+        self._lock = threading.RLock()
+        self._lock_path = self.root / "index.lock"
+        self._lock_file: IO[bytes] | None = None
+        self._writer: int | None = None
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        with _locked(self._lock_path, fcntl.LOCK_EX):
+            header = self._read_header()
+            if header is None:
+                header = {"generation": 0, "sorted_rows": 0}
+                self._write_header(0, 0, 1)
+            elif header["dims"] != dims or header["embedder"] != embedder:
+                raise ValueError(
+                    f"Index at {self.root} holds {header['dims']}-dim {header['embedder']} vectors, "
+                    f"not {dims}-dim {embedder}"
+                )
+            self._snapshot = self._open(int(header["generation"]), int(header["sorted_rows"]))
+            self._disk = self._disk_state(self._snapshot.generation)
+
+    @property
+    def rows(self) -> int:
+        """
+        Rows in the index, deleted rows included.
+        """
+        return self._current().rows
+
+    def stats(self) -> IndexStats:
+        """
+        Get the size and layout of the index.
+        """
+        snapshot = self._current()
+        deleted = int(np.count_nonzero(snapshot.deleted))
+        return IndexStats(
+            rows=snapshot.rows,
+            live_rows=snapshot.rows - deleted,
+            sorted_rows=snapshot.sorted_rows,
+            tail_rows=snapshot.rows - snapshot.sorted_rows,
+            deleted_rows=deleted,
+            lists=len(snapshot.offsets) - 1,
+            trained=snapshot.centroids is not None,
+            generation=snapshot.generation
+        )
+
+    def add(self, vectors: np.ndarray, meta: np.ndarray, payloads: Sequence[bytes]) -> None:
+        """
+        Append vectors with their metadata and payloads (blocking).
+
+        Args:
+            vectors: (n, dims) L2-normalized vectors
+            meta: META_DTYPE records with doc, chunk, ticker and published set
+                (list, offset and length are filled in)
+            payloads: One payload per vector (e.g., the chunk text as JSON)
+        """
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        if vectors.ndim != 2 or vectors.shape[1] != self.dims or not len(vectors) == len(meta) == len(payloads):
+            raise ValueError(f"Expected (n, {self.dims}) vectors with one record and payload each")
+        if len(vectors) == 0:
+            return
+
+        with self.writing():
+            snapshot = self._snapshot
+            records = np.array(meta, dtype=META_DTYPE)
+            lengths = np.fromiter((len(payload) for payload in payloads), dtype=np.int64, count=len(payloads))
+            records["offset"] = snapshot.payloads.size + np.concatenate([[0], np.cumsum(lengths)[:-1]])
+            records["length"] = lengths
+            records["list"] = self._assign(vectors, snapshot.centroids)
+
+            # Payloads first, then vectors, then records: a row exists once its record does
+            gen = snapshot.generation
+            with open(self._path("payloads", gen), "ab") as f:
+                f.write(b"".join(payloads))
+            with open(self._path("vectors", gen), "ab") as f:
+                f.write(vectors.tobytes())
+            with open(self._path("meta", gen), "ab") as f:
+                f.write(records.tobytes())
+
+            self._snapshot = self._open(gen, snapshot.sorted_rows, snapshot)
+            self._disk = self._disk_state(gen)
+            if self.auto_compact and self._needs_compaction():
+                self._compact()
+
+    def delete(self, docs: Sequence[int]) -> dict[int, int]:
+        """
+        Tombstone every row of some documents (blocking).
+
+        Args:
+            docs: Document keys (META_DTYPE "doc")
+
+        Returns:
+            dict[int, int]: Rows deleted per document that had rows
+        """
+        with self.writing():
+            snapshot = self._snapshot
+            rows = self._doc_rows(snapshot, docs)
+            if rows.size == 0:
+                return {}
+            with open(self._path("deleted", snapshot.generation), "ab") as f:
+                f.write(rows.astype("<i8").tobytes())
+            deleted = snapshot.deleted.copy()
+            deleted[rows] = True
+            self._snapshot = replace(snapshot, deleted=deleted)
+            self._disk = self._disk_state(snapshot.generation)
+            keys, counts = np.unique(snapshot.meta["doc"][rows], return_counts=True)
+            if self.auto_compact and self._needs_compaction():
+                self._compact()
+            return dict(zip(keys.tolist(), counts.tolist(), strict=True))
+
+    def compact(self) -> None:
+        """
+        Rewrite the index as a new generation: drop deleted rows, sort the tail into
+        its lists, and train the centroids if there are enough vectors (blocking).
+        """
+        with self.writing():
+            self._compact()
+
+    @contextmanager
+    def writing(self) -> Iterator[None]:
+        """
+        Hold the write lock, so that several writes are applied together (blocking).
+
+        Writers in this and other processes wait until the block exits. The
+        snapshot is brought up to date with the files first; add, delete and
+        compact take the lock themselves and may be called inside the block.
+        """
+        with self._lock:
+            if self._lock_file is None:
+                self._lock_file = open(self._lock_path, "ab")
+                try:
+                    fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+                    if self._disk != self._disk_state(self._snapshot.generation):
+                        self._reload()
+                except BaseException:
+                    self._lock_file.close()
+                    self._lock_file = None
+                    raise
+                self._writer = threading.get_ident()
+                try:
+                    yield
+                finally:
+                    self._writer = None
+                    fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+                    self._lock_file.close()
+                    self._lock_file = None
+            else:
+                yield
+
+    def search(
+        self,
+        query: np.ndarray,
+        k: int,
+        tickers: Sequence[str] | None = None,
+        start: int | None = None,
+        end: int | None = None,
+        nprobe: int | None = None
+    ) -> list[SearchHit]:
+        """
+        Find the rows most similar to a query vector (blocking).
+
+        Args:
+            query: (dims,) L2-normalized query vector
+            k: Maximum hits
+            tickers: Only rows of these tickers
+            start: Only rows published at or after this epoch second
+            end: Only rows published before this epoch second
+            nprobe: Lists to score (defaults to the index's nprobe)
+
+        Returns:
+            list[SearchHit]: Hits by descending similarity
+        """
+        snapshot = self._current()
+        query = np.ascontiguousarray(query, dtype=np.float32)
+        keys = np.array([ticker.upper() for ticker in tickers], dtype="S16") if tickers else None
+        row_blocks: list[np.ndarray] = []
+        score_blocks: list[np.ndarray] = []
+
+        def collect(rows: np.ndarray, scores: np.ndarray) -> None:
+            keep = ~snapshot.deleted[rows]
+            if keys is not None or start is not None or end is not None:
+                records = snapshot.meta[rows]
+                if keys is not None:
+                    keep &= np.isin(records["ticker"], keys)
+                if start is not None:
+                    keep &= records["published"] >= start
+                if end is not None:
+                    keep &= records["published"] < end
+            row_blocks.append(rows[keep])
+            score_blocks.append(scores[keep])
+
+        if snapshot.sorted_rows:
+            candidates = self._ticker_rows(snapshot, keys) if keys is not None else None
+            if candidates is not None and candidates.size <= self.exact_threshold:
+                candidates.sort()
+                collect(candidates, snapshot.vectors[candidates] @ query)
+            else:
+                for lo, hi in self._probe(snapshot, query, nprobe or self.nprobe):
+                    collect(np.arange(lo, hi), snapshot.vectors[lo:hi] @ query)
+
+        for lo in range(snapshot.sorted_rows, snapshot.rows, _BLOCK_ROWS):
+            hi = min(lo + _BLOCK_ROWS, snapshot.rows)
+            collect(np.arange(lo, hi), snapshot.vectors[lo:hi] @ query)
+
+        if not row_blocks:
+            return []
+        rows = np.concatenate(row_blocks)
+        scores = np.concatenate(score_blocks)
+        if rows.size > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+            rows, scores = rows[top], scores[top]
+        order = np.argsort(-scores, kind="stable")
+        return [
+            SearchHit(
+                row=int(rows[i]),
+                score=float(scores[i]),
+                record=snapshot.meta[rows[i]],
+                payload=self._payload(snapshot, int(rows[i]))
+            )
+            for i in order
+        ]
+
+    def record(self, row: int) -> np.void:
+        """
+        Get the META_DTYPE record of a row of the current snapshot.
+        """
+        record: np.void = self._current().meta[row]
+        return record
+
+    def payload(self, row: int) -> bytes:
+        """
+        Get the payload of a row of the current snapshot.
+        """
+        return self._payload(self._current(), row)
+
+    @staticmethod
+    def _payload(snapshot: _Snapshot, row: int) -> bytes:
+        record = snapshot.meta[row]
+        offset, length = int(record["offset"]), int(record["length"])
+        return snapshot.payloads[offset:offset + length].tobytes()
+
+    # ------------------------------------------------------------------ search helpers
+
+    def _probe(self, snapshot: _Snapshot, query: np.ndarray, nprobe: int) -> list[tuple[int, int]]:
+        offsets = snapshot.offsets
+        if snapshot.centroids is None:
+            return [(int(offsets[0]), int(offsets[-1]))]
+        similarity = snapshot.centroids @ query
+        nprobe = min(nprobe, len(similarity))
+        lists = np.argpartition(-similarity, nprobe - 1)[:nprobe]
+        return [(int(offsets[i]), int(offsets[i + 1])) for i in np.sort(lists) if offsets[i + 1] > offsets[i]]
+
+    @staticmethod
+    def _ticker_rows(snapshot: _Snapshot, keys: np.ndarray) -> np.ndarray:
+        positions = np.searchsorted(snapshot.ticker_keys, keys)
+        blocks = [
+            snapshot.postings[snapshot.ticker_starts[i]:snapshot.ticker_starts[i + 1]]
+            for i, key in zip(positions, keys, strict=True)
+            if i < len(snapshot.ticker_keys) and snapshot.ticker_keys[i] == key
+        ]
+        return np.concatenate(blocks) if blocks else np.empty(0, dtype=np.int64)
+
+    @staticmethod
+    def _doc_rows(snapshot: _Snapshot, docs: Sequence[int]) -> np.ndarray:
+        keys = np.array(docs, dtype=np.int64)
+        blocks = [np.empty(0, dtype=np.int64)]
+        for lo in range(0, snapshot.rows, _BLOCK_ROWS * 16):
+            hi = min(lo + _BLOCK_ROWS * 16, snapshot.rows)
+            blocks.append(np.flatnonzero(np.isin(snapshot.meta["doc"][lo:hi], keys)) + lo)
+        rows = np.concatenate(blocks)
+        live: np.ndarray = rows[~snapshot.deleted[rows]]
+        return live
+
+    # ------------------------------------------------------------------ maintenance
+
+    def _needs_compaction(self) -> bool:
+        snapshot = self._snapshot
+        threshold = max(self.compact_min_rows, self.compact_ratio * snapshot.sorted_rows)
+        if snapshot.centroids is None and snapshot.rows >= self.nlist * _TRAIN_POINTS_PER_LIST:
+            return True
+        deleted = int(np.count_nonzero(snapshot.deleted))
+        return snapshot.rows - snapshot.sorted_rows >= threshold or deleted >= threshold
+
+    def _compact(self) -> None:
+        snapshot = self._snapshot
+        live = np.flatnonzero(~snapshot.deleted)
+        centroids = snapshot.centroids
+        lists = np.asarray(snapshot.meta["list"])
+        if centroids is None and live.size >= self.nlist * _TRAIN_POINTS_PER_LIST:
+            centroids = self._train(snapshot.vectors, live)
+            lists = np.empty(snapshot.rows, dtype=np.int32)
+            for lo in range(0, live.size, _BLOCK_ROWS):
+                rows = live[lo:lo + _BLOCK_ROWS]
+                lists[rows] = self._assign(snapshot.vectors[rows], centroids)
+
+        order = live[np.argsort(lists[live], kind="stable")]
+        gen = snapshot.generation + 1
+        records = np.array(snapshot.meta[order])
+        records["list"] = lists[order]
+
+        with open(self._path("vectors", gen), "wb") as f:
+            for lo in range(0, order.size, _BLOCK_ROWS):
+                f.write(np.ascontiguousarray(snapshot.vectors[order[lo:lo + _BLOCK_ROWS]]).tobytes())
+        with open(self._path("payloads", gen), "wb") as f:
+            for start, length in zip(records["offset"].tolist(), records["length"].tolist(), strict=True):
+                f.write(snapshot.payloads[start:start + length].tobytes())
+        lengths = records["length"].astype(np.int64)
+        records["offset"] = np.cumsum(lengths) - lengths
+        self._path("meta", gen).write_bytes(records.tobytes())
+        self._path("deleted", gen).write_bytes(b"")
+
+        list_count = len(centroids) if centroids is not None else 1
+        offsets = np.searchsorted(records["list"], np.arange(list_count + 1)).astype(np.int64)
+        np.save(self._path("lists", gen), offsets)
+        if centroids is not None:
+            np.save(self._path("centroids", gen), centroids)
+        by_ticker = np.argsort(records["ticker"], kind="stable")
+        keys, starts = np.unique(records["ticker"][by_ticker], return_index=True)
+        np.savez(self._path("tickers", gen), keys=keys, starts=np.append(starts, order.size).astype(np.int64))
+        self._path("postings", gen).write_bytes(by_ticker.astype("<i8").tobytes())
+
+        # The header switches generations atomically; files of older generations are then unused
+        self._write_header(gen, int(order.size), list_count)
+        self._snapshot = self._open(gen, int(order.size))
+        self._disk = self._disk_state(gen)
+        for name in ("vectors", "meta", "payloads", "deleted", "lists", "centroids", "tickers", "postings"):
+            self._path(name, snapshot.generation).unlink(missing_ok=True)
+        logger.info(
+            "Compacted vector index %s to generation %d: %d rows in %d lists (%d deleted rows dropped)",
+            self.root, gen, order.size, list_count, snapshot.rows - live.size
+        )
+
+    def _train(self, vectors: np.ndarray, live: np.ndarray, iterations: int = 10) -> np.ndarray:
+        """
+        Spherical k-means on a sample of the live rows.
+        """
+        rng = np.random.default_rng(self.seed)
+        sample_size = min(live.size, self.nlist * _TRAIN_SAMPLE_PER_LIST)
+        sample = np.ascontiguousarray(vectors[np.sort(rng.choice(live, size=sample_size, replace=False))])
+        centroids = sample[rng.choice(sample_size, size=self.nlist, replace=False)].copy()
+        for _ in range(iterations):
+            assignment = self._assign(sample, centroids)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, sample)
+            counts = np.bincount(assignment, minlength=self.nlist)
+            empty = counts == 0
+            # Re-seed empty lists with random sample points
+            sums[empty] = sample[rng.choice(sample_size, size=int(empty.sum()), replace=False)]
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            centroids = (sums / np.maximum(norms, 1e-12)).astype(np.float32)
+        return centroids
+
+    @staticmethod
+    def _assign(vectors: np.ndarray, centroids: np.ndarray | None) -> np.ndarray:
+        if centroids is None:
+            return np.zeros(len(vectors), dtype=np.int32)
+        assignment = np.empty(len(vectors), dtype=np.int32)
+        for lo in range(0, len(vectors), _BLOCK_ROWS // 8):
+            block = vectors[lo:lo + _BLOCK_ROWS // 8]
+            assignment[lo:lo + len(block)] = np.argmax(block @ centroids.T, axis=1)
+        return assignment
+
+    # ------------------------------------------------------------------ files
+
+    def _current(self) -> _Snapshot:
+        """
+        The snapshot, reopened first if another process changed the files.
+        """
+        snapshot = self._snapshot
+        if self._writer == threading.get_ident() or self._disk == self._disk_state(snapshot.generation):
+            return snapshot
+        with _locked(self._lock_path, fcntl.LOCK_SH):
+            if self._disk != self._disk_state(self._snapshot.generation):
+                self._reload()
+            return self._snapshot
+
+    def _reload(self) -> None:
+        # Callers hold the file lock, so the header and the files are consistent
+        header = self._read_header()
+        if header is None:
+            raise ValueError(f"Vector index at {self.root} was removed")
+        gen, sorted_rows = int(header["generation"]), int(header["sorted_rows"])
+        snapshot = self._snapshot
+        same_layout = snapshot.generation == gen and snapshot.sorted_rows == sorted_rows
+        self._snapshot = self._open(gen, sorted_rows, snapshot if same_layout else None)
+        self._disk = self._disk_state(gen)
+
+    def _disk_state(self, gen: int) -> tuple[int, ...]:
+        """
+        Identity and size of the files a write changes: index.json is replaced by
+        compactions, records and tombstones are appended to.
+        """
+        state: list[int] = []
+        for path in (self.root / "index.json", self._path("meta", gen), self._path("deleted", gen)):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                state += [-1, -1, -1]
+            else:
+                state += [stat.st_ino, stat.st_size, stat.st_mtime_ns]
+        return tuple(state)
+
+    def _open(self, gen: int, sorted_rows: int, previous: _Snapshot | None = None) -> _Snapshot:
+        meta = self._map("meta", gen, META_DTYPE)
+        vectors = self._map("vectors", gen, np.dtype(np.float32), self.dims)
+        # Ignore rows whose record or vector was cut short by an interrupted append
+        rows = min(len(meta), len(vectors))
+        meta, vectors = meta[:rows], vectors[:rows]
+
+        if previous is not None and previous.generation == gen:
+            deleted = np.concatenate([previous.deleted, np.zeros(rows - previous.rows, dtype=bool)])
+            # Pick up rows tombstoned by other processes
+            tombstones = self._map("deleted", gen, np.dtype("<i8"))
+            deleted[tombstones[tombstones < rows]] = True
+            return replace(
+                previous, rows=rows, vectors=vectors, meta=meta, deleted=deleted,
+                payloads=self._map("payloads", gen, np.dtype(np.uint8))
+            )
+
+        deleted = np.zeros(rows, dtype=bool)
+        tombstones = self._map("deleted", gen, np.dtype("<i8"))
+        deleted[tombstones[tombstones < rows]] = True
+
+        centroids_path = self._path("centroids", gen)
+        centroids = np.load(centroids_path) if centroids_path.exists() else None
+        lists_path = self._path("lists", gen)
+        offsets = np.load(lists_path) if lists_path.exists() else np.zeros(2, dtype=np.int64)
+        tickers_path = self._path("tickers", gen)
+        if tickers_path.exists():
+            with np.load(tickers_path) as tickers:
+                ticker_keys, ticker_starts = tickers["keys"], tickers["starts"]
+        else:
+            ticker_keys, ticker_starts = np.empty(0, dtype="S16"), np.zeros(1, dtype=np.int64)
+
+        return _Snapshot(
+            generation=gen,
+            rows=rows,
+            sorted_rows=min(sorted_rows, rows),
+            vectors=vectors,
+            meta=meta,
+            payloads=self._map("payloads", gen, np.dtype(np.uint8)),
+            deleted=deleted,
+            centroids=centroids,
+            offsets=offsets,
+            ticker_keys=ticker_keys,
+            ticker_starts=ticker_starts,
+            postings=self._map("postings", gen, np.dtype("<i8"))
+        )
+
+    def _map(self, name: str, gen: int, dtype: np.dtype, width: int | None = None) -> np.ndarray:
+        path = self._path(name, gen)
+        row_size = dtype.itemsize * (width or 1)
+        try:
+            count = path.stat().st_size // row_size
+        except FileNotFoundError:
+            count = 0
+        shape = (count, width) if width else (count,)
+        if count == 0:
+            return np.empty(shape, dtype=dtype)
+        return np.memmap(path, dtype=dtype, mode="r", shape=shape)
+
+    def _path(self, name: str, gen: int) -> Path:
+        suffix = {
+            "vectors": "f32", "meta": "bin", "payloads": "bin", "deleted": "i8",
+            "centroids": "npy", "lists": "npy", "tickers": "npz", "postings": "i8",
+        }[name]
+        return self.root / f"{name}.{gen}.{suffix}"
+
+    def _read_header(self) -> dict[str, int | str] | None:
+        path = self.root / "index.json"
+        if not path.exists():
+            return None
+        header: dict[str, int | str] = json.loads(path.read_text(encoding="utf-8"))
+        if header.get("version") != INDEX_VERSION:
+            raise ValueError(f"Unsupported vector index version at {self.root}: {header.get('version')}")
+        return header
+
+    def _write_header(self, gen: int, sorted_rows: int, lists: int) -> None:
+        header = {
+            "version": INDEX_VERSION,
+            "dims": self.dims,
+            "embedder": self.embedder,
+            "generation": gen,
+            "nlist": lists,
+            "sorted_rows": sorted_rows,
+        }
+        path = self.root / "index.json"
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_text(json.dumps(header), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+
+@contextmanager
+def _locked(path: Path, operation: int) -> Iterator[None]:
+    with open(path, "ab") as file:
+        fcntl.flock(file, operation)
+        try:
+            yield
+        finally:
+            fcntl.flock(file, fcntl.LOCK_UN)
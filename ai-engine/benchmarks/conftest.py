@@ -0,0 +1,45 @@
+"""
+Pytest configuration for the micro-benchmark suite.
+
+Benchmarks run against the deterministic offline provider, never the network.
+
+Running the benchmarks:
+    $ pytest benchmarks --no-cov --benchmark-only
+    $ pytest benchmarks --no-cov --benchmark-only \
+        --benchmark-storage=benchmarks/baselines --benchmark-compare --benchmark-compare-fail=mean:25%
+"""
+
+import asyncio
+import os
+import tempfile
+from collections.abc import Awaitable, Callable, Iterator
+from typing import Any
+
+import pytest
+
+os.environ.setdefault("MARKET_DATA_PROVIDER", "local")
+os.environ.setdefault("BAR_STORE_PATH", tempfile.mkdtemp(prefix="calix-bench-bars-"))
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+os.environ.setdefault("METRICS_ENABLED", "false")
+
+
+@pytest.fixture
+def event_loop_runner() -> Iterator[Callable[[Callable[[], Awaitable[Any]]], Any]]:
+    """
+    Provide a function that runs a coroutine factory on one reusable event loop.
+
+    pytest-benchmark times synchronous callables, so async code under test is
+    driven through run_until_complete on a loop created once per benchmark
+    (loop creation is not part of the measurement).
+
+    Example:
+        >>> def test_bench(benchmark, event_loop_runner):
+        ...     benchmark(event_loop_runner, lambda: service.get_current_price("AAPL"))
+    """
+    loop = asyncio.new_event_loop()
+
+    def run(factory: Callable[[], Awaitable[Any]]) -> Any:
+        return loop.run_until_complete(factory())
+
+    yield run
+    loop.close()
@@ -0,0 +1,171 @@
+"""
+Local fake of an OpenAI-compatible chat completions server.
+
+Answers POST /v1/chat/completions with a fixed-length reply, streamed as SSE
+chunks when requested, after a configurable time to first token and per-token
+delay. It counts calls and tokens so tests and benchmarks can measure the cost
+and latency of LLM features offline (point LLM_BASE_URL at it).
+
+Usage:
+    $ python -m benchmarks.fake_llm --port 9100 --first-token-ms 300 --token-ms 20
+    $ LLM_BASE_URL=http://127.0.0.1:9100/v1 OPENAI_API_KEY=fake python -m app
+"""
+
+import argparse
+import asyncio
+import json
+import socket
+import threading
+import time
+import uuid
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from typing import Any
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+_WORDS = (
+    "Shares traded in a narrow range as investors weighed recent earnings against rate expectations, "
+    "with volume close to its monthly average and no single catalyst dominating the session."
+).split()
+
+
+@dataclass
+class FakeLLMStats:
+    """
+    Calls and tokens served by the fake server.
+    """
+
+    calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+
+
+def create_fake_llm_app(
+    reply_tokens: int = 40,
+    first_token_latency: float = 0.0,
+    token_latency: float = 0.0
+) -> tuple[FastAPI, FakeLLMStats]:
+    """
+    Create the fake chat completions app.
+
+    Args:
+        reply_tokens: Tokens per reply (one word each); capped by the request's max_tokens
+        first_token_latency: Seconds before the first token
+        token_latency: Seconds between tokens
+
+    Returns:
+        tuple: App and its live statistics
+    """
+    app = FastAPI()
+    stats = FakeLLMStats()
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request) -> Any:
+        body = await request.json()
+        prompt_tokens = sum(len(str(message.get("content", "")).split()) for message in body["messages"])
+        count = min(reply_tokens, int(body.get("max_tokens") or reply_tokens))
+        tokens = [(" " if i else "") + _WORDS[i % len(_WORDS)] for i in range(count)]
+        stats.calls += 1
+        stats.prompt_tokens += prompt_tokens
+        stats.completion_tokens += count
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        usage = {"prompt_tokens": prompt_tokens, "completion_tokens": count, "total_tokens": prompt_tokens + count}
+
+        if not body.get("stream"):
+            await asyncio.sleep(first_token_latency + token_latency * count)
+            return JSONResponse({
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": body["model"],
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": "".join(tokens)},
+                    "finish_reason": "stop",
+                }],
+                "usage": usage,
+            })
+
+        include_usage = bool((body.get("stream_options") or {}).get("include_usage"))
+
+        def chunk(delta: dict[str, Any], finish_reason: str | None = None, **extra: Any) -> str:
+            choices = [{"index": 0, "delta": delta, "finish_reason": finish_reason}] if delta or finish_reason else []
+            payload = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": body["model"],
+                "choices": choices,
+                **extra,
+            }
+            return f"data: {json.dumps(payload)}\n\n"
+
+        async def events() -> AsyncIterator[str]:
+            await asyncio.sleep(first_token_latency)
+            yield chunk({"role": "assistant", "content": ""})
+            for i, token in enumerate(tokens):
+                if i and token_latency:
+                    await asyncio.sleep(token_latency)
+                yield chunk({"content": token})
+            yield chunk({}, finish_reason="stop")
+            if include_usage:
+                yield chunk({}, usage=usage)
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return app, stats
+
+
+class FakeLLMServer:
+    """
+    Fake LLM server running on a local port in a background thread.
+
+    Example:
+        >>> with FakeLLMServer(token_latency=0.01) as server:
+        ...     settings = Settings(llm_base_url=server.base_url, openai_api_key="fake")
+    """
+
+    def __init__(self, reply_tokens: int = 40, first_token_latency: float = 0.0, token_latency: float = 0.0):
+        self.app, self.stats = create_fake_llm_app(reply_tokens, first_token_latency, token_latency)
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            self.port: int = sock.getsockname()[1]
+        self.base_url = f"http://127.0.0.1:{self.port}/v1"
+        self._server = uvicorn.Server(uvicorn.Config(
+            self.app, host="127.0.0.1", port=self.port, log_level="warning", lifespan="off"
+        ))
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+
+    def __enter__(self) -> "FakeLLMServer":
+        self._thread.start()
+        deadline = time.monotonic() + 10.0
+        while not self._server.started:
+            if time.monotonic() > deadline or not self._thread.is_alive():
+                raise RuntimeError("fake LLM server did not start")
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._server.should_exit = True
+        self._thread.join(timeout=10.0)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local fake OpenAI-compatible chat completions server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--reply-tokens", type=int, default=40)
+    parser.add_argument("--first-token-ms", type=float, default=300.0, help="Time to first token")
+    parser.add_argument("--token-ms", type=float, default=20.0, help="Delay between tokens")
+    args = parser.parse_args()
+
+    app, _ = create_fake_llm_app(args.reply_tokens, args.first_token_ms / 1000, args.token_ms / 1000)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="info")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+"""
+Local load generator for the AI Engine API.
+
+Drives the ASGI app in-process (httpx ASGITransport, no sockets) against the
+offline local provider and reports throughput and p50/p95/p99 latency for
+each scenario at each concurrency level. Results can be saved as a baseline
+and later compared against it; a regression beyond the tolerance makes the
+run exit with status 1.
+
+Usage:
+    $ python -m benchmarks.loadgen
+    $ python -m benchmarks.loadgen --scenarios price,prices --concurrency 1,16,64 --requests 2000
+    $ python -m benchmarks.loadgen --save benchmarks/baselines/loadgen.json
+    $ python -m benchmarks.loadgen --compare benchmarks/baselines/loadgen.json --tolerance 0.25
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+# Offline, quiet configuration; must be set before the app (and its settings) is imported
+os.environ.setdefault("MARKET_DATA_PROVIDER", "local")
+os.environ.setdefault("BAR_STORE_PATH", tempfile.mkdtemp(prefix="calix-loadgen-bars-"))
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+import httpx  # noqa: E402
+
+# Request factory: (request index) -> (method, path, keyword arguments for httpx)
+RequestFactory = Callable[[int], tuple[str, str, dict[str, Any]]]
+
+TICKER_POOL = [f"T{i:03d}" for i in range(500)]
+
+
+def _price(i: int) -> tuple[str, str, dict[str, Any]]:
+    return "POST", "/api/v1/stocks/price", {"json": {"ticker": TICKER_POOL[i % len(TICKER_POOL)]}}
+
+
+def _prices(i: int) -> tuple[str, str, dict[str, Any]]:
+    start = (i * 20) % len(TICKER_POOL)
+    return "POST", "/api/v1/stocks/prices", {"json": {"tickers": TICKER_POOL[start:start + 20]}}
+
+
+def _history(i: int) -> tuple[str, str, dict[str, Any]]:
+    ticker = TICKER_POOL[i % 20]
+    return "GET", "/api/v1/stocks/history", {"params": {"ticker": ticker, "start": "2023-01-01", "end": "2024-01-01"}}
+
+
+def _indicators(i: int) -> tuple[str, str, dict[str, Any]]:
+    tickers = [TICKER_POOL[(i + k) % 20] for k in range(5)]
+    return "POST", "/api/v1/indicators", {
+        "json": {"tickers": tickers, "start": "2023-01-01", "end": "2024-01-01", "indicators": ["sma", "rsi", "macd"]}
+    }
+
+
+def _health(i: int) -> tuple[str, str, dict[str, Any]]:
+    return "GET", "/api/v1/health", {}
+
+
+SCENARIOS: dict[str, RequestFactory] = {
+    "health": _health,
+    "price": _price,
+    "prices": _prices,
+    "history": _history,
+    "indicators": _indicators,
+}
+
+
+@dataclass
+class LoadResult:
+    """
+    Outcome of one scenario at one concurrency level.
+
+    Latencies are in milliseconds; throughput is in requests per second.
+    """
+
+    scenario: str
+    concurrency: int
+    requests: int
+    errors: int
+    throughput: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+
+    @property
+    def key(self) -> str:
+        return f"{self.scenario}@{self.concurrency}"
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: str,
+    concurrency: int,
+    total_requests: int,
+    warmup: int = 50,
+) -> LoadResult:
+    """
+    Send total_requests requests from `concurrency` concurrent workers.
+
+    Args:
+        client: HTTP client bound to the app (or a live server)
+        scenario: Scenario name (key of SCENARIOS)
+        concurrency: Number of concurrent workers
+        total_requests: Requests to send after warm-up
+        warmup: Requests sent before measuring (fills caches and the bar store)
+
+    Returns:
+        LoadResult: Throughput, error count and latency percentiles
+    """
+    factory = SCENARIOS[scenario]
+
+    for i in range(warmup):
+        method, path, kwargs = factory(i)
+        await client.request(method, path, **kwargs)
+
+    latencies = np.empty(total_requests, dtype=np.float64)
+    errors = 0
+    next_index = 0
+
+    async def worker() -> None:
+        nonlocal errors, next_index
+        while next_index < total_requests:
+            i = next_index
+            next_index += 1
+            method, path, kwargs = factory(i)
+            started = time.perf_counter()
+            response = await client.request(method, path, **kwargs)
+            latencies[i] = time.perf_counter() - started
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1000.0
+    return LoadResult(
+        scenario=scenario,
+        concurrency=concurrency,
+        requests=total_requests,
+        errors=errors,
+        throughput=round(total_requests / elapsed, 1),
+        p50_ms=round(float(p50), 3),
+        p95_ms=round(float(p95), 3),
+        p99_ms=round(float(p99), 3),
+    )
+
+
+async def run_load(
+    scenarios: list[str],
+    concurrency_levels: list[int],
+    total_requests: int,
+    base_url: str | None = None,
+) -> list[LoadResult]:
+    """
+    Run every scenario at every concurrency level.
+
+    Args:
+        scenarios: Scenario names to run
+        concurrency_levels: Concurrency levels to run each scenario at
+        total_requests: Measured requests per scenario and level
+        base_url: Live server URL; when None the app is driven in-process
+
+    Returns:
+        list[LoadResult]: One result per scenario and concurrency level
+    """
+    if base_url is None:
+        from app.main import app
+
+        transport: httpx.AsyncBaseTransport = httpx.ASGITransport(app=app)
+        base_url = "http://loadgen"
+    else:
+        transport = httpx.AsyncHTTPTransport(limits=httpx.Limits(max_connections=max(concurrency_levels)))
+
+    results = []
+    async with httpx.AsyncClient(transport=transport, base_url=base_url, timeout=30.0) as client:
+        for scenario in scenarios:
+            for concurrency in concurrency_levels:
+                results.append(await run_scenario(client, scenario, concurrency, total_requests))
+    return results
+
+
+def compare(results: list[LoadResult], baseline: dict[str, Any], tolerance: float) -> list[str]:
+    """
+    Compare results against a saved baseline.
+
+    A result regresses when its p95 latency is more than `tolerance` above the
+    baseline's, its throughput is more than `tolerance` below it, or it has
+    errors the baseline did not have. Results without a baseline entry are skipped.
+
+    Args:
+        results: Results of the current run
+        baseline: Baseline file content (see save_baseline)
+        tolerance: Allowed relative regression (e.g., 0.25 for 25%)
+
+    Returns:
+        list[str]: One message per regression (empty if none)
+    """
+    expected = {f"{r['scenario']}@{r['concurrency']}": r for r in baseline["results"]}
+    regressions = []
+    for result in results:
+        base = expected.get(result.key)
+        if base is None:
+            continue
+        if result.p95_ms > base["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{result.key}: p95 {result.p95_ms:.3f} ms > baseline {base['p95_ms']:.3f} ms")
+        if result.throughput < base["throughput"] * (1 - tolerance):
+            regressions.append(
+                f"{result.key}: throughput {result.throughput:.1f} req/s < baseline {base['throughput']:.1f} req/s"
+            )
+        if result.errors > base["errors"]:
+            regressions.append(f"{result.key}: {result.errors} errors (baseline {base['errors']})")
+    return regressions
+
+
+def save_baseline(results: list[LoadResult], path: Path) -> None:
+    """
+    Write results as a baseline file, with the machine they were measured on.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    content = {
+        "machine": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "results": [asdict(r) for r in results],
+    }
+    path.write_text(json.dumps(content, indent=2) + "\n")
+
+
+def format_table(results: list[LoadResult]) -> str:
+    """
+    Render results as a fixed-width text table.
+    """
+    header = f"{'scenario':<12}{'conc':>6}{'reqs':>8}{'errors':>8}{'req/s':>11}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+    rows = [
+        f"{r.scenario:<12}{r.concurrency:>6}{r.requests:>8}{r.errors:>8}{r.throughput:>11.1f}"
+        f"{r.p50_ms:>10.3f}{r.p95_ms:>10.3f}{r.p99_ms:>10.3f}"
+        for r in results
+    ]
+    return "\n".join([header, "-" * len(header), *rows])
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Load-test the AI Engine API against the offline provider")
+    parser.add_argument("--scenarios", default="price,prices,history,indicators",
+                        help=f"Comma-separated scenarios ({', '.join(SCENARIOS)})")
+    parser.add_argument("--concurrency", default="1,8,32", help="Comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=1000, help="Measured requests per scenario and level")
+    parser.add_argument("--url", default=None, help="Load-test a running server instead of the in-process app")
+    parser.add_argument("--save", type=Path, default=None, help="Write results as a baseline JSON file")
+    parser.add_argument("--compare", type=Path, default=None, help="Baseline JSON file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative regression")
+    args = parser.parse_args(argv)
+
+    scenarios = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    unknown = [s for s in scenarios if s not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)}")
+    concurrency_levels = [int(c) for c in args.concurrency.split(",")]
+
+    results = asyncio.run(run_load(scenarios, concurrency_levels, args.requests, args.url))
+    print(format_table(results))
+
+    if args.save is not None:
+        save_baseline(results, args.save)
+        print(f"\nBaseline written to {args.save}")
+
+    if args.compare is not None:
+        regressions = compare(results, json.loads(args.compare.read_text()), args.tolerance)
+        if regressions:
+            print(f"\nRegressions against {args.compare} (tolerance {args.tolerance:.0%}):")
+            for message in regressions:
+                print(f"  - {message}")
+            return 1
+        print(f"\nNo regressions against {args.compare} (tolerance {args.tolerance:.0%})")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+"""
+Micro-benchmarks for response schema validation and serialization.
+
+These cover the per-request Pydantic work of POST /api/v1/stocks/price:
+building DataResponse[StockPriceSchema], validating it from a dict (what
+FastAPI does for response_model) and dumping it to JSON. The envelope
+benchmarks compare FastAPI's response_model path with data_response for a
+single price and a 200-ticker batch.
+"""
+
+import time
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+from app.api.responses import data_response
+from app.core.metrics import observe_serialization
+from app.schemas.base import DataResponse
+from app.schemas.stock import StockPriceSchema, StockPricesSchema
+
+PRICE = {"ticker": "AAPL", "current_price": 189.43, "currency": "USD", "market_status": "open"}
+RESPONSE = {"success": True, "message": "Stock price retrieved successfully", "data": PRICE}
+BATCH = {
+    "success": True,
+    "message": "Stock prices retrieved successfully",
+    "data": {"prices": [{**PRICE, "ticker": f"T{i:03d}"} for i in range(200)], "errors": []},
+}
+
+
+def test_build_price_response(benchmark):
+    """Construct the endpoint's response object from a service result."""
+    price = StockPriceSchema(**PRICE)
+
+    result = benchmark(
+        lambda: DataResponse[StockPriceSchema](data=price, message="Stock price retrieved successfully")
+    )
+
+    assert result.data.ticker == "AAPL"
+
+
+def test_validate_price_response(benchmark):
+    """Validate a price response from plain Python data (response_model validation)."""
+    model = DataResponse[StockPriceSchema]
+
+    result = benchmark(model.model_validate, RESPONSE)
+
+    assert result.data.current_price == 189.43
+
+
+def test_serialize_price_response(benchmark):
+    """Dump a validated price response to JSON bytes."""
+    response = DataResponse[StockPriceSchema].model_validate(RESPONSE)
+
+    payload = benchmark(response.model_dump_json)
+
+    assert payload.startswith('{"success":true')
+
+
+def test_validate_and_serialize_batch_response(benchmark):
+    """Round-trip a 200-ticker batch response (validation + JSON dump)."""
+    model = DataResponse[StockPricesSchema]
+
+    payload = benchmark(lambda: model.model_validate(BATCH).model_dump_json())
+
+    assert payload.count('"ticker"') == 200
+
+
+_ADAPTERS: dict[type, TypeAdapter] = {}  # type: ignore[type-arg]
+
+
+def _response_model_path(model: type[DataResponse], data: object, message: str) -> Response:  # type: ignore[type-arg]
+    """
+    What FastAPI does for an endpoint returning a DataResponse: build it, validate it
+    again against response_model, dump it and wrap it in a Response.
+    """
+    started = time.perf_counter()
+    adapter = _ADAPTERS.setdefault(model, TypeAdapter(model))
+    body = adapter.dump_json(adapter.validate_python(model(data=data, message=message)), by_alias=True)
+    observe_serialization(time.perf_counter() - started)
+    return Response(content=body, media_type="application/json")
+
+
+def test_envelope_response_model_single(benchmark):
+    """Single price through FastAPI's response_model path."""
+    price = StockPriceSchema(**PRICE)
+
+    response = benchmark(
+        lambda: _response_model_path(DataResponse[StockPriceSchema], price, "Stock price retrieved successfully")
+    )
+
+    assert response.body == data_response(price, message="Stock price retrieved successfully").body
+
+
+def test_envelope_fast_path_single(benchmark):
+    """Single price through data_response (cached model, no re-validation)."""
+    price = StockPriceSchema(**PRICE)
+
+    response = benchmark(data_response, price, "Stock price retrieved successfully")
+
+    assert response.body.startswith(b'{"success":true')
+
+
+def test_envelope_response_model_batch(benchmark):
+    """200-ticker batch through FastAPI's response_model path."""
+    prices = StockPricesSchema.model_validate(BATCH["data"])
+
+    response = benchmark(
+        lambda: _response_model_path(DataResponse[StockPricesSchema], prices, "Stock prices retrieved successfully")
+    )
+
+    assert response.body == data_response(prices, message="Stock prices retrieved successfully").body
+
+
+def test_envelope_fast_path_batch(benchmark):
+    """200-ticker batch through data_response (cached model, no re-validation)."""
+    prices = StockPricesSchema.model_validate(BATCH["data"])
+
+    response = benchmark(data_response, prices, "Stock prices retrieved successfully")
+
+    assert bytes(response.body).count(b'"ticker"') == 200
@@ -0,0 +1,227 @@
+"""
+Micro-benchmarks for the stock service cache and batch paths, the risk kernels,
+micro-batched model inference, LLM commentary (against the local fake LLM
+server in benchmarks.fake_llm, so no tokens are spent), retrieval index
+searches (see benchmarks.vector_index for the 1M-vector benchmark),
+backtest parameter sweeps and price alert evaluation.
+
+The provider is the offline local provider with no simulated latency, so
+these measure the service layer itself: cache lookups, single-flight
+bookkeeping and batch fan-out.
+"""
+
+import asyncio
+from collections.abc import Iterator
+from pathlib import Path
+
+import httpx
+import numpy as np
+import pytest
+
+from app.config.settings import Settings
+from app.core.http_client import create_openai_client
+from app.models.runtime import save_linear_model
+from app.schemas.commentary import CommentaryRequest
+from app.schemas.stock import StockPriceSchema
+from app.services.alert_engine import AlertEngine, AlertRule
+from app.services.backtest import run_grid
+from app.services.commentary_service import CommentaryService
+from app.services.prediction_service import PredictionService
+from app.services.providers.local import LocalMarketDataProvider
+from app.services.quote_cache import QuoteCache
+from app.services.risk import portfolio_risk
+from app.services.stock_service import StockService
+from app.services.vector_index import VectorIndex
+from benchmarks.fake_llm import FakeLLMServer
+from benchmarks.vector_index import synthetic_rows
+
+TICKERS = [f"T{i:03d}" for i in range(200)]
+
+
+@pytest.fixture
+def stock_service() -> StockService:
+    """
+    Provide a stock service backed by the local provider and a fresh cache.
+    """
+    settings = Settings(market_data_provider="local", metrics_enabled=False)
+    return StockService(settings=settings, provider=LocalMarketDataProvider())
+
+
+def test_quote_cache_hit(benchmark):
+    """Synchronous cache lookup of a fresh entry."""
+    cache: QuoteCache[StockPriceSchema] = QuoteCache(max_size=2048, ttl_for=lambda _: 60.0)
+    quote = StockPriceSchema(ticker="AAPL", current_price=189.43, currency="USD", market_status="open")
+    cache.set("AAPL", quote)
+
+    result = benchmark(cache.get, "AAPL")
+
+    assert result is quote
+
+
+def test_get_current_price_cached(benchmark, event_loop_runner, stock_service: StockService):
+    """Service price lookup served from the quote cache."""
+    event_loop_runner(lambda: stock_service.get_current_price("AAPL"))
+
+    result = benchmark(event_loop_runner, lambda: stock_service.get_current_price("AAPL"))
+
+    assert result.ticker == "AAPL"
+
+
+def test_get_current_price_uncached(benchmark, event_loop_runner, stock_service: StockService):
+    """Service price lookup that misses the cache and loads from the provider."""
+
+    def cold_lookup():
+        stock_service.quote_cache.clear()
+        return stock_service.get_current_price("AAPL")
+
+    result = benchmark(event_loop_runner, cold_lookup)
+
+    assert result.ticker == "AAPL"
+
+
+def test_get_current_prices_batch_cached(benchmark, event_loop_runner, stock_service: StockService):
+    """200-ticker batch lookup with every ticker already cached."""
+    event_loop_runner(lambda: stock_service.get_current_prices(TICKERS))
+
+    result = benchmark(event_loop_runner, lambda: stock_service.get_current_prices(TICKERS))
+
+    assert len(result.prices) == 200
+
+
+def test_get_current_prices_batch_uncached(benchmark, event_loop_runner, stock_service: StockService):
+    """200-ticker batch lookup with a cold cache (provider fan-out)."""
+
+    def cold_batch():
+        stock_service.quote_cache.clear()
+        return stock_service.get_current_prices(TICKERS)
+
+    result = benchmark(event_loop_runner, cold_batch)
+
+    assert len(result.prices) == 200
+
+
+def test_portfolio_risk_5000_positions(benchmark):
+    """Volatility, VaR and risk contributions of 5000 positions over 250 daily returns."""
+    rng = np.random.default_rng(0)
+    returns = rng.normal(0, 0.02, size=(250, 5000))
+    exposures = rng.uniform(-1e4, 1e5, size=5000)
+
+    risk = benchmark(portfolio_risk, returns, exposures, 0.99)
+
+    assert risk.contributions.sum() == pytest.approx(risk.volatility)
+
+
+@pytest.mark.parametrize("max_batch_size", [1, 64])
+def test_predict_256_concurrent_requests(benchmark, event_loop_runner, tmp_path: Path, max_batch_size: int):
+    """256 concurrent single-row predictions; forward passes are shared up to max_batch_size rows."""
+    rng = np.random.default_rng(0)
+    save_linear_model(tmp_path / "direction.npz", [f"f{i}" for i in range(32)], rng.normal(size=32), 0.0, "1")
+    settings = Settings(
+        inference_model_path=str(tmp_path),
+        inference_batch_max_size=max_batch_size,
+        inference_batch_max_wait_ms=1.0,
+        metrics_enabled=False
+    )
+    service = PredictionService(settings=settings)
+    event_loop_runner(service.load)
+    instances = rng.normal(size=(256, 1, 32)).tolist()
+
+    async def burst() -> list:
+        return await asyncio.gather(*(service.predict("direction", rows) for rows in instances))
+
+    try:
+        result = benchmark(event_loop_runner, burst)
+    finally:
+        event_loop_runner(service.close)
+
+    assert len(result) == 256
+
+
+@pytest.fixture(scope="module")
+def llm_server() -> Iterator[FakeLLMServer]:
+    """
+    Run a fake LLM server with a 40-token reply and no simulated latency.
+    """
+    with FakeLLMServer(reply_tokens=40) as server:
+        yield server
+
+
+@pytest.mark.parametrize("cached", [False, True], ids=["uncached", "cached"])
+def test_commentary(benchmark, event_loop_runner, llm_server: FakeLLMServer, cached: bool):
+    """Streamed commentary for one ticker: a full LLM round trip, or a commentary cache hit."""
+    settings = Settings(
+        market_data_provider="local",
+        openai_api_key="fake",
+        llm_base_url=llm_server.base_url,
+        commentary_token_budget=10**12,
+        metrics_enabled=False
+    )
+    service = CommentaryService(StockService(settings=settings, provider=LocalMarketDataProvider()), settings=settings)
+    http_client = httpx.AsyncClient()
+    llm = create_openai_client(settings, http_client)
+    request = CommentaryRequest(tickers=["AAPL"], language="en")
+
+    async def commentary():
+        if not cached:
+            service.cache.clear()
+        return await service.generate(await service.prepare(request, "bench"), llm)
+
+    try:
+        if cached:
+            event_loop_runner(commentary)
+        result = benchmark(event_loop_runner, commentary)
+    finally:
+        event_loop_runner(http_client.aclose)
+
+    assert result.cached is cached
+    assert result.usage.completion_tokens == 40
+
+
+@pytest.mark.parametrize("tickers", [None, ["T7"]], ids=["unfiltered", "ticker"])
+def test_vector_search_100k(benchmark, tmp_path: Path, tickers: list[str] | None):
+    """Top-10 search of a trained 100k x 256 index (nprobe 16 of 256 lists), with and without a ticker filter."""
+    dims = 256
+    centers = np.random.default_rng(0).standard_normal((400, dims)) / np.sqrt(dims)
+    index = VectorIndex(tmp_path, dims=dims, embedder="bench", nlist=256, auto_compact=False)
+    index.add(*synthetic_rows(0, 100_000, dims, centers, tickers=500, seed=0))
+    index.compact()
+    query = synthetic_rows(100_000, 1, dims, centers, tickers=500, seed=1)[0][0]
+
+    hits = benchmark(index.search, query, 10, tickers=tickers)
+
+    assert len(hits) == 10
+
+
+@pytest.mark.parametrize("strategy", ["ma_crossover", "rebalance"])
+def test_backtest_grid_10y_50_tickers(benchmark, strategy: str):
+    """Simulate a 100-combination grid over 10 years of daily closes of 50 tickers in one chunk."""
+    rng = np.random.default_rng(0)
+    prices = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.015, (2520, 50)), axis=0))
+    if strategy == "ma_crossover":
+        grid: list[tuple[int, ...]] = [(fast, slow) for fast in range(5, 55, 5) for slow in range(60, 260, 20)]
+    else:
+        grid = [(period,) for period in range(1, 101)]
+
+    stats = benchmark(run_grid, prices, strategy, grid, cost_rate=0.0006, periods_per_year=252)
+
+    assert stats.shape == (100, 8)
+
+
+def test_alert_ticks_10k_rules(benchmark):
+    """Evaluate 1000 random-walk ticks of a ticker with 10k repeating threshold rules within +-20% of the price."""
+    rng = np.random.default_rng(0)
+    engine = AlertEngine()
+    levels = 100 * (1 + rng.uniform(-0.2, 0.2, 10_000))
+    engine.upsert(
+        AlertRule(id=f"r{i}", ticker="AAPL", kind="threshold", direction="above" if i % 2 else "below",
+                  level=float(level), repeat=True)
+        for i, level in enumerate(levels)
+    )
+    prices = (100 * np.exp(np.cumsum(rng.normal(0, 0.0005, 1000)))).tolist()
+
+    def ticks() -> int:
+        return sum(len(engine.on_price("AAPL", price, 0.0)) for price in prices)
+
+    fired = benchmark(ticks)
+
+    assert fired > 0
@@ -0,0 +1,131 @@
+"""
+Large-scale benchmark of the retrieval vector index.
+
+Builds an index of clustered synthetic unit vectors (real embeddings are
+clustered too; uniform random vectors would make any IVF index look bad)
+spread over tickers and publication days, then reports build, compaction
+and reopen times, and p50/p95/p99 query latency with recall@k against an
+exact scan for unfiltered, ticker-filtered, date-filtered and tail-heavy
+searches.
+
+Usage:
+    $ python -m benchmarks.vector_index                        # 1M vectors, 256 dims
+    $ python -m benchmarks.vector_index --vectors 200000 --dims 128 --nprobe 8,16,32
+    $ python -m benchmarks.vector_index --path /data/bench-index --keep
+"""
+
+import argparse
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from app.services.vector_index import META_DTYPE, VectorIndex
+
+_BATCH = 100_000
+_DAY = 86_400
+
+
+def synthetic_rows(
+    start: int, count: int, dims: int, centers: np.ndarray, tickers: int, seed: int
+) -> tuple[np.ndarray, np.ndarray, list[bytes]]:
+    """
+    Make unit vectors scattered around random centers, one ticker and day per row.
+    """
+    rng = np.random.default_rng(seed + start)
+    vectors = centers[rng.integers(len(centers), size=count)] + rng.normal(0, 1 / np.sqrt(dims), (count, dims))
+    vectors = (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+    rows = np.arange(start, start + count)
+    meta = np.zeros(count, dtype=META_DTYPE)
+    meta["doc"] = rows // 4
+    meta["chunk"] = rows % 4
+    meta["ticker"] = np.char.add(b"T", (rows % tickers).astype("S5"))
+    meta["published"] = 1_700_000_000 + (rows % 730) * _DAY
+    payloads = [b'{"id":"d%d"}' % row for row in rows.tolist()]
+    return vectors, meta, payloads
+
+
+def measure(index: VectorIndex, queries: np.ndarray, k: int, **filters: object) -> tuple[np.ndarray, list[set[int]]]:
+    """
+    Run the queries, returning their latencies in milliseconds and hit rows.
+    """
+    latencies = []
+    results = []
+    for query in queries:
+        started = time.perf_counter()
+        hits = index.search(query, k, **filters)  # type: ignore[arg-type]
+        latencies.append((time.perf_counter() - started) * 1000)
+        results.append({hit.row for hit in hits})
+    return np.array(latencies), results
+
+
+def report(name: str, latencies: np.ndarray, results: list[set[int]], exact: list[set[int]], k: int) -> None:
+    recall = np.mean([len(found & truth) / max(min(k, len(truth)), 1) for found, truth in zip(results, exact, strict=True)])
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    print(f"  {name:<34} p50 {p50:7.2f} ms  p95 {p95:7.2f} ms  p99 {p99:7.2f} ms  recall@{k} {recall:.3f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the retrieval vector index at scale")
+    parser.add_argument("--vectors", type=int, default=1_000_000)
+    parser.add_argument("--dims", type=int, default=256)
+    parser.add_argument("--nlist", type=int, default=1024)
+    parser.add_argument("--nprobe", default="8,16,32", help="Comma-separated nprobe values")
+    parser.add_argument("--tickers", type=int, default=500)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--tail", type=int, default=50_000, help="Rows appended after compaction")
+    parser.add_argument("--path", help="Index directory (default: a temporary directory)")
+    parser.add_argument("--keep", action="store_true", help="Keep the index directory")
+    args = parser.parse_args()
+
+    root = Path(args.path or tempfile.mkdtemp(prefix="calix-vector-bench-"))
+    rng = np.random.default_rng(0)
+    centers = rng.standard_normal((args.vectors // 250, args.dims)) / np.sqrt(args.dims)
+    k = args.top_k
+
+    try:
+        index = VectorIndex(root, dims=args.dims, embedder="bench", nlist=args.nlist, auto_compact=False)
+        started = time.perf_counter()
+        for lo in range(0, args.vectors, _BATCH):
+            index.add(*synthetic_rows(lo, min(_BATCH, args.vectors - lo), args.dims, centers, args.tickers, 0))
+        appended = time.perf_counter() - started
+        started = time.perf_counter()
+        index.compact()
+        compacted = time.perf_counter() - started
+
+        started = time.perf_counter()
+        index = VectorIndex(root, dims=args.dims, embedder="bench", nlist=args.nlist, auto_compact=False)
+        reopened = time.perf_counter() - started
+        size = sum(path.stat().st_size for path in root.iterdir()) / 2**30
+        print(f"{args.vectors:,} vectors x {args.dims} dims, {args.nlist} lists, {size:.2f} GiB on disk")
+        print(f"  append {appended:.1f} s, train + compact {compacted:.1f} s, reopen {reopened * 1000:.1f} ms")
+
+        queries, _, _ = synthetic_rows(args.vectors, args.queries, args.dims, centers, args.tickers, 1)
+        exact_nprobe = args.nlist
+        filters = {
+            "unfiltered": {},
+            f"ticker (1 of {args.tickers})": {"tickers": ["T7"]},
+            "date (last 30 of 730 days)": {"start": 1_700_000_000 + 700 * _DAY},
+        }
+        for name, options in filters.items():
+            _, exact = measure(index, queries[:50], k, nprobe=exact_nprobe, **options)
+            print(f" {name}")
+            for nprobe in (int(value) for value in args.nprobe.split(",")):
+                latencies, results = measure(index, queries, k, nprobe=nprobe, **options)
+                report(f"nprobe={nprobe}", latencies, results[:50], exact, k)
+
+        index.add(*synthetic_rows(args.vectors, args.tail, args.dims, centers, args.tickers, 2))
+        print(f" unfiltered with {args.tail:,} uncompacted rows")
+        _, exact = measure(index, queries[:50], k, nprobe=exact_nprobe)
+        latencies, results = measure(index, queries, k, nprobe=16)
+        report("nprobe=16", latencies, results[:50], exact, k)
+    finally:
+        if not args.keep:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
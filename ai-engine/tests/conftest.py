@@ -4,10 +4,20 @@ Pytest configuration and shared fixtures.
 This module provides test fixtures that can be used across all test files.
 """
 
+import os
+import tempfile
+
 import pytest
 from fastapi.testclient import TestClient
 
-from app.main import app
+# Run the test suite against the deterministic offline provider (no network).
+# Must be set before the settings singleton is first created.
+os.environ.setdefault("MARKET_DATA_PROVIDER", "local")
+os.environ.setdefault("BAR_STORE_PATH", tempfile.mkdtemp(prefix="calix-bars-"))
+os.environ.setdefault("RETRIEVAL_INDEX_PATH", tempfile.mkdtemp(prefix="calix-retrieval-"))
+os.environ.setdefault("ALERT_STORE_PATH", tempfile.mkdtemp(prefix="calix-alerts-"))
+
+from app.main import app  # noqa: E402
 
 
 @pytest.fixture
@@ -48,4 +58,4 @@ def invalid_stock_ticker() -> str:
     Returns:
         str: Invalid stock ticker symbol
     """
-    return "INVALID_TICKER_123"
+    return "INVALID_1"  # within the 10-character ticker limit
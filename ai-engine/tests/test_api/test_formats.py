@@ -0,0 +1,163 @@
+"""
+Tests for Accept negotiation and the columnar wire formats.
+"""
+
+import json
+import math
+
+import msgpack
+import numpy as np
+import pytest
+
+from app.api.formats import (
+    ARROW,
+    COLUMNAR_JSON,
+    JSON,
+    MSGPACK,
+    history_response,
+    negotiate,
+    prices_response,
+)
+from app.core.errors import NotAcceptableError
+from app.schemas.stock import StockPriceErrorSchema, StockPriceSchema, StockPricesSchema
+from app.services.bar_store import BAR_DTYPE
+
+PRICES = StockPricesSchema(
+    prices=[
+        StockPriceSchema(ticker="AAPL", current_price=189.43, currency="USD", market_status="open"),
+        StockPriceSchema(
+            ticker="005930.KS", current_price=71200.0, currency="KRW", market_status="closed",
+            stale=True, base_currency="USD", base_price=52.74
+        ),
+    ],
+    errors=[StockPriceErrorSchema(ticker="NOPE", message="Unable to fetch stock data for ticker: NOPE")]
+)
+
+
+def make_records(count: int) -> np.ndarray:
+    records = np.zeros(count, dtype=BAR_DTYPE)
+    records["ts"] = 1_704_067_200 + np.arange(count) * 86_400
+    records["open"] = np.linspace(100.0, 200.0, count)
+    records["high"] = records["open"] + 1.5
+    records["low"] = records["open"] - 1.25
+    records["close"] = records["open"] + 0.5
+    records["volume"] = np.arange(count) * 1_000.0
+    if count:
+        records["volume"][0] = np.nan
+    return records
+
+
+async def read_stream(response) -> list[bytes]:
+    return [chunk async for chunk in response.body_iterator]
+
+
+@pytest.mark.parametrize(
+    ("accept", "expected"),
+    [
+        (None, JSON),
+        ("*/*", JSON),
+        ("application/json", JSON),
+        ("application/x-msgpack", MSGPACK),
+        ("application/json;q=0.5, application/vnd.calix.columnar+json", COLUMNAR_JSON),
+        ("application/vnd.msgpack, application/vnd.calix.columnar+json", MSGPACK),
+        ("text/csv, application/vnd.apache.arrow.stream;q=0.9", ARROW),
+        ("application/vnd.msgpack;q=0, */*;q=0.1", JSON),
+    ]
+)
+def test_negotiate_picks_the_preferred_supported_format(accept: str | None, expected: str):
+    """
+    Test that the highest-quality supported media type is chosen, in header order on ties.
+    """
+    assert negotiate(accept) == expected
+
+
+def test_negotiate_rejects_unsupported_types():
+    """
+    Test that a header without any servable media type raises a 406 error.
+    """
+    with pytest.raises(NotAcceptableError) as exc_info:
+        negotiate("text/csv, application/xml")
+
+    assert exc_info.value.status_code == 406
+    assert MSGPACK in exc_info.value.details["available"]
+
+
+def test_prices_columnar_json_and_msgpack_share_one_layout():
+    """
+    Test that batch prices become column arrays, identical in JSON and MessagePack.
+    """
+    as_json = json.loads(prices_response(PRICES, "ok", COLUMNAR_JSON).body)
+    as_msgpack = msgpack.unpackb(prices_response(PRICES, "ok", MSGPACK).body)
+
+    assert as_json == as_msgpack
+    assert as_json["success"] is True
+    assert as_json["data"]["prices"]["ticker"] == ["AAPL", "005930.KS"]
+    assert as_json["data"]["prices"]["base_price"] == [None, 52.74]
+    assert as_json["data"]["errors"][0]["ticker"] == "NOPE"
+
+
+def test_prices_arrow_carries_envelope_in_metadata():
+    """
+    Test that Arrow prices hold one row per price and the envelope in the schema metadata.
+    """
+    pa = pytest.importorskip("pyarrow")
+
+    table = pa.ipc.open_stream(prices_response(PRICES, "ok", ARROW).body).read_all()
+
+    assert table.column("ticker").to_pylist() == ["AAPL", "005930.KS"]
+    assert table.schema.field("base_price").type == pa.float64()
+    assert table.schema.metadata[b"message"] == b"ok"
+    assert json.loads(table.schema.metadata[b"errors"])[0]["ticker"] == "NOPE"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("count", [0, 1, 7, 25])
+async def test_history_formats_decode_to_the_same_columns(count: int):
+    """
+    Test that streamed columnar JSON, MessagePack and Arrow history hold the same values.
+    """
+    pa = pytest.importorskip("pyarrow")
+    records = make_records(count)
+
+    as_json = json.loads(b"".join(
+        await read_stream(history_response("AAPL", "1d", records, "ok", COLUMNAR_JSON, chunk_size=10))
+    ))
+    as_msgpack = msgpack.unpackb(b"".join(
+        await read_stream(history_response("AAPL", "1d", records, "ok", MSGPACK, chunk_size=10))
+    ))
+    table = pa.ipc.open_stream(b"".join(
+        await read_stream(history_response("AAPL", "1d", records, "ok", ARROW, chunk_size=10))
+    )).read_all()
+
+    expected = {
+        "timestamp": records["ts"].tolist(),
+        "open": records["open"].tolist(),
+        "high": records["high"].tolist(),
+        "low": records["low"].tolist(),
+        "close": records["close"].tolist(),
+        "volume": [0 if math.isnan(value) else int(value) for value in records["volume"]],
+    }
+    assert as_json == as_msgpack == {
+        "success": True,
+        "message": "ok",
+        "data": {"ticker": "AAPL", "interval": "1d", "bars": expected},
+    }
+    assert table.num_rows == count
+    assert table.column("timestamp").cast(pa.int64()).to_pylist() == expected["timestamp"]
+    assert table.column("volume").to_pylist() == expected["volume"]
+    assert table.column("close").to_pylist() == expected["close"]
+    assert table.schema.metadata[b"ticker"] == b"AAPL"
+
+
+@pytest.mark.asyncio
+async def test_history_is_encoded_one_chunk_at_a_time():
+    """
+    Test that no streamed chunk holds more than chunk_size bars of a column.
+    """
+    records = make_records(1_000)
+
+    chunks = await read_stream(history_response("AAPL", "1d", records, "ok", MSGPACK, chunk_size=100))
+
+    # Every value is a 9-byte fixed-width MessagePack number
+    assert max(len(chunk) for chunk in chunks) <= 100 * 9
+    assert len(chunks) >= 6 * 10
@@ -0,0 +1,85 @@
+"""
+Tests for the fast response envelope path.
+"""
+
+import math
+from datetime import UTC, datetime
+
+import pytest
+from fastapi import FastAPI, Response
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from app.api.responses import data_response, data_response_model
+from app.schemas.base import DataResponse
+from app.schemas.fx import FxRatesSchema
+from app.schemas.stock import StockPriceErrorSchema, StockPriceSchema, StockPricesSchema
+
+PAYLOADS: list[BaseModel] = [
+    StockPriceSchema(ticker="AAPL", current_price=189.43, currency="USD", market_status="open"),
+    StockPriceSchema(
+        ticker="005930.KS", current_price=71200.0, currency="KRW", market_status="closed",
+        stale=True, base_currency="USD", base_price=52.7407
+    ),
+    StockPricesSchema(
+        prices=[StockPriceSchema(ticker=f"T{i:03d}", current_price=i + 0.5, currency="USD", market_status="open")
+                for i in range(50)],
+        errors=[StockPriceErrorSchema(ticker="BAD", message="알 수 없는 종목: BAD", details={"cause": "not_found"})]
+    ),
+    FxRatesSchema(
+        currencies=["USD", "KRW"],
+        matrix=[[1.0, 1350.0], [1 / 1350.0, math.nan]],
+        as_of=datetime(2024, 3, 1, 9, 30, tzinfo=UTC)
+    ),
+]
+
+
+def make_client(payload: BaseModel) -> TestClient:
+    """
+    App serving one payload through FastAPI's response_model path and through data_response.
+    """
+    app = FastAPI()
+    model = data_response_model(type(payload))
+
+    @app.get("/model", response_model=model)
+    async def via_model() -> DataResponse[BaseModel]:
+        return model(data=payload, message="Retrieved ✓")
+
+    @app.get("/fast", response_model=model)
+    async def via_fast_path() -> Response:
+        return data_response(data=payload, message="Retrieved ✓")
+
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("payload", PAYLOADS, ids=lambda payload: type(payload).__name__)
+def test_fast_path_is_byte_identical_to_response_model(payload: BaseModel):
+    """
+    Test that data_response produces exactly the body and content type FastAPI would.
+    """
+    client = make_client(payload)
+
+    expected = client.get("/model")
+    actual = client.get("/fast")
+
+    assert actual.status_code == expected.status_code == 200
+    assert actual.headers["content-type"] == expected.headers["content-type"]
+    assert actual.content == expected.content
+
+
+def test_response_models_are_created_once():
+    """
+    Test that every payload type maps to one cached DataResponse model.
+    """
+    assert data_response_model(StockPriceSchema) is data_response_model(StockPriceSchema)
+    assert data_response_model(StockPriceSchema) is DataResponse[StockPriceSchema]
+
+
+def test_fast_path_keeps_status_and_failure_flag():
+    """
+    Test that an unsuccessful envelope carries its status code and success=false.
+    """
+    response = data_response(PAYLOADS[0], message="Warming up", success=False, status_code=503)
+
+    assert response.status_code == 503
+    assert response.body.startswith(b'{"success":false,"message":"Warming up","data":{"ticker":"AAPL"')
@@ -0,0 +1,49 @@
+"""
+Tests for price alert endpoints.
+"""
+
+from fastapi.testclient import TestClient
+
+
+def test_alert_rules_lifecycle(client: TestClient):
+    """
+    Test creating, listing and deleting alert rules.
+
+    Args:
+        client: FastAPI test client fixture
+    """
+    response = client.put(
+        "/api/v1/alerts/rules",
+        json={"rules": [
+            {"id": "api-1", "ticker": "AAPL", "kind": "threshold", "direction": "above", "level": 500.0},
+            {"id": "api-2", "ticker": "MSFT", "kind": "percent_move", "direction": "below", "percent": 0.1, "reference": 300.0},
+        ]}
+    )
+
+    assert response.status_code == 200
+    rules = response.json()["data"]["rules"]
+    assert [rule["id"] for rule in rules] == ["api-1", "api-2"]
+    assert rules[0]["armed_levels"] == {"above": 500.0}
+
+    listed = client.get("/api/v1/alerts/rules", params={"ticker": "msft"}).json()["data"]["rules"]
+    assert [rule["id"] for rule in listed] == ["api-2"]
+
+    for rule_id in ("api-1", "api-2"):
+        assert client.delete(f"/api/v1/alerts/rules/{rule_id}").status_code == 200
+    assert client.delete("/api/v1/alerts/rules/api-1").status_code == 400
+    assert client.get("/api/v1/alerts/stats").json()["data"]["rules"] == 0
+
+
+def test_alert_rule_missing_parameters(client: TestClient):
+    """
+    Test that a rule without the parameters of its kind is rejected.
+
+    Args:
+        client: FastAPI test client fixture
+    """
+    response = client.put(
+        "/api/v1/alerts/rules",
+        json={"rules": [{"id": "api-3", "ticker": "AAPL", "kind": "indicator_cross", "indicator": "sma"}]}
+    )
+
+    assert response.status_code == 422  # Pydantic validation error
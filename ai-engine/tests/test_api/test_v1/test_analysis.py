@@ -0,0 +1,132 @@
+"""
+Tests for the LLM analysis endpoints, against a local fake LLM server.
+"""
+
+import json
+from collections.abc import Iterator
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.dependencies import get_app_settings, get_commentary_service
+from app.config.settings import Settings
+from app.main import app
+from app.services.commentary_service import CommentaryService
+from app.services.providers.local import LocalMarketDataProvider
+from app.services.stock_service import StockService
+from benchmarks.fake_llm import FakeLLMServer
+
+
+@pytest.fixture(scope="module")
+def llm_server() -> Iterator[FakeLLMServer]:
+    """
+    Run one fake LLM server for the module.
+    """
+    with FakeLLMServer(reply_tokens=8) as server:
+        yield server
+
+
+@pytest.fixture
+def analysis_client(llm_server: FakeLLMServer) -> Iterator[tuple[TestClient, CommentaryService]]:
+    """
+    Provide a client whose lifespan-owned OpenAI client targets the fake server.
+
+    Yields:
+        tuple: Test client (lifespan running) and the commentary service it uses
+    """
+    settings = Settings(
+        market_data_provider="local",
+        market_calendar_enabled=False,
+        openai_api_key="fake",
+        llm_base_url=llm_server.base_url,
+        commentary_max_concurrency=1,
+        commentary_token_budget=2000
+    )
+    service = CommentaryService(StockService(settings=settings, provider=LocalMarketDataProvider()), settings=settings)
+    app.dependency_overrides[get_app_settings] = lambda: settings
+    app.dependency_overrides[get_commentary_service] = lambda: service
+    try:
+        with TestClient(app) as client:
+            yield client, service
+    finally:
+        app.dependency_overrides.clear()
+
+
+def parse_events(body: str) -> list[tuple[str, dict]]:
+    """
+    Parse an SSE body into (event, data) pairs.
+    """
+    events = []
+    for frame in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in frame.splitlines())
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def test_commentary_streams_tokens(analysis_client: tuple[TestClient, CommentaryService]):
+    """
+    Test that commentary is streamed as token events ended by a done event.
+    """
+    client, _ = analysis_client
+
+    response = client.post("/api/v1/analysis/commentary", json={"tickers": ["AAPL"]}, headers={"X-Caller-ID": "u1"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = parse_events(response.text)
+    assert [name for name, _ in events] == ["token"] * 8 + ["done"]
+    done = events[-1][1]
+    assert done["commentary"] == "".join(data["text"] for _, data in events[:-1])
+    assert done["tickers"] == ["AAPL"]
+    assert done["cached"] is False
+
+
+def test_commentary_json_and_cache(analysis_client: tuple[TestClient, CommentaryService], llm_server: FakeLLMServer):
+    """
+    Test the non-streaming response and that repeating it is served from the cache.
+    """
+    client, _ = analysis_client
+    calls = llm_server.stats.calls
+    body = {"positions": [{"ticker": "AAPL", "quantity": 10}], "question": "How is it doing?"}
+
+    first = client.post("/api/v1/analysis/commentary?stream=false", json=body)
+    second = client.post("/api/v1/analysis/commentary?stream=false", json=body)
+
+    assert first.status_code == 200
+    assert first.json()["data"]["cached"] is False
+    assert second.json()["data"]["cached"] is True
+    assert second.json()["data"]["commentary"] == first.json()["data"]["commentary"]
+    assert llm_server.stats.calls == calls + 1
+
+
+def test_commentary_token_budget(analysis_client: tuple[TestClient, CommentaryService]):
+    """
+    Test that a caller over its token budget gets 429 while other callers are served.
+    """
+    client, service = analysis_client
+    lease = service.budgets.acquire("u2", reserve=1)
+    lease.settle(2000)
+    lease.release()
+
+    limited = client.post("/api/v1/analysis/commentary", json={"tickers": ["MSFT"]}, headers={"X-Caller-ID": "u2"})
+    other = client.post("/api/v1/analysis/commentary", json={"tickers": ["MSFT"]}, headers={"X-Caller-ID": "u3"})
+
+    assert limited.status_code == 429
+    assert limited.json()["details"]["cause"] == "budget"
+    assert other.status_code == 200
+
+
+def test_commentary_requires_one_subject(analysis_client: tuple[TestClient, CommentaryService]):
+    """
+    Test that requests need exactly one of tickers and positions.
+    """
+    client, _ = analysis_client
+
+    neither = client.post("/api/v1/analysis/commentary", json={})
+    both = client.post(
+        "/api/v1/analysis/commentary",
+        json={"tickers": ["AAPL"], "positions": [{"ticker": "AAPL", "quantity": 1}]}
+    )
+
+    assert neither.status_code == 422
+    assert both.status_code == 422
@@ -0,0 +1,58 @@
+"""
+Tests for backtest endpoints.
+"""
+
+from fastapi.testclient import TestClient
+
+
+def test_run_backtest(client: TestClient):
+    """
+    Test a moving-average crossover sweep over stored history.
+
+    Args:
+        client: FastAPI test client fixture
+    """
+    response = client.post(
+        "/api/v1/backtest",
+        json={"tickers": ["AAPL", "MSFT"], "strategy": "ma_crossover", "fast_windows": [5, 10], "slow_windows": [20, 50]}
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["success"] is True
+    data = body["data"]
+    assert data["tickers"] == ["AAPL", "MSFT"]
+    assert len(data["runs"]) == 4
+    assert data["best"]["parameters"] == data["runs"][0]["parameters"]
+    assert len(data["best"]["equity"]) == data["bars"]
+
+
+def test_run_backtest_without_valid_combination(client: TestClient):
+    """
+    Test that a grid without a fast window shorter than a slow one is rejected.
+
+    Args:
+        client: FastAPI test client fixture
+    """
+    response = client.post(
+        "/api/v1/backtest",
+        json={"tickers": ["AAPL"], "strategy": "ma_crossover", "fast_windows": [100], "slow_windows": [50]}
+    )
+
+    assert response.status_code == 400
+    assert response.json()["success"] is False
+
+
+def test_run_backtest_invalid_window(client: TestClient):
+    """
+    Test that non-positive windows are rejected.
+
+    Args:
+        client: FastAPI test client fixture
+    """
+    response = client.post(
+        "/api/v1/backtest",
+        json={"tickers": ["AAPL"], "strategy": "ma_crossover", "fast_windows": [0]}
+    )
+
+    assert response.status_code == 422  # Pydantic validation error
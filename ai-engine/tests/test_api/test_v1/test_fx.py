@@ -0,0 +1,72 @@
+"""
+Tests for FX rate endpoints.
+"""
+
+from fastapi.testclient import TestClient
+
+
+def test_get_fx_rates(client: TestClient):
+    """
+    Test the cross-rate matrix of the configured currencies.
+
+    Args:
+        client: FastAPI test client fixture
+    """
+    response = client.get("/api/v1/fx/rates")
+
+    assert response.status_code == 200
+    data = response.json()["data"]
+    currencies, matrix = data["currencies"], data["matrix"]
+    assert currencies[0] == "USD"
+    assert "KRW" in currencies
+    assert len(matrix) == len(currencies)
+    assert all(matrix[i][i] == 1.0 for i in range(len(currencies)))
+
+
+def test_convert_amounts(client: TestClient):
+    """
+    Test conversion of amounts in mixed currencies to one currency.
+
+    Args:
+        client: FastAPI test client fixture
+    """
+    response = client.post(
+        "/api/v1/fx/convert",
+        json={"amounts": [100, 5000], "currencies": ["KRW", "KRW"], "target": "KRW"}
+    )
+
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["amounts"] == [100.0, 5000.0]
+    assert data["total"] == 5100.0
+
+
+def test_convert_unsupported_currency(client: TestClient):
+    """
+    Test conversion from a currency without a rate.
+
+    Args:
+        client: FastAPI test client fixture
+    """
+    response = client.post(
+        "/api/v1/fx/convert",
+        json={"amounts": [1], "currencies": ["XYZ"], "target": "USD"}
+    )
+
+    assert response.status_code == 400
+    assert response.json()["details"]["cause"] == "unsupported_currency"
+
+
+def test_convert_length_mismatch(client: TestClient):
+    """
+    Test that amounts and currencies must line up.
+
+    Args:
+        client: FastAPI test client fixture
+    """
+    response = client.post(
+        "/api/v1/fx/convert",
+        json={"amounts": [1, 2], "currencies": ["USD"], "target": "USD"}
+    )
+
+    assert response.status_code == 422  # Pydantic validation error
@@ -2,8 +2,27 @@
 Tests for health check endpoints.
 """
 
+import asyncio
+from pathlib import Path
+
+import pytest
 from fastapi.testclient import TestClient
 
+from app.api.dependencies import (
+    get_market_data_provider,
+    get_prediction_service,
+    get_quote_prefetcher,
+    get_stock_service,
+)
+from app.config.settings import Settings
+from app.core.errors import ExternalAPIError
+from app.core.resilience import CircuitBreaker
+from app.main import app
+from app.models.runtime import save_linear_model
+from app.services.prediction_service import PredictionService
+from app.services.prefetch import QuotePrefetcher
+from app.services.providers.local import LocalMarketDataProvider
+
 
 def test_health_check(client: TestClient):
     """
@@ -39,6 +58,37 @@ def test_readiness_check(client: TestClient):
     assert data["success"] is True
     assert "message" in data
     assert "ready" in data["message"].lower()
+    assert data["data"]["status"] == "ready"
+    assert [circuit["state"] for circuit in data["data"]["circuits"]] == ["closed"]
+
+
+def test_readiness_reports_open_circuit(client: TestClient):
+    """
+    Test that an open provider circuit is reported as degraded readiness.
+
+    Args:
+        client: FastAPI test client fixture
+    """
+    provider = LocalMarketDataProvider()
+    provider.circuit_breaker = CircuitBreaker("local", min_calls=1, open_seconds=30.0)
+
+    async def failing() -> None:
+        raise ExternalAPIError(message="down", details={"cause": "timeout"})
+
+    with pytest.raises(ExternalAPIError):
+        asyncio.run(provider.circuit_breaker.call(failing))
+
+    app.dependency_overrides[get_market_data_provider] = lambda: provider
+    try:
+        response = client.get("/api/v1/health/ready")
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["status"] == "degraded"
+    assert data["circuits"][0]["state"] == "open"
+    assert data["circuits"][0]["retry_after"] > 0
 
 
 def test_root_endpoint(client: TestClient):
@@ -57,3 +107,57 @@ def test_root_endpoint(client: TestClient):
     assert data["status"] == "running"
     assert "service" in data
     assert "version" in data
+
+
+def test_readiness_waits_for_warm_up(client: TestClient):
+    """
+    Test that readiness is 503 until the watchlist warm-up has finished.
+
+    Args:
+        client: FastAPI test client fixture
+    """
+    prefetcher = QuotePrefetcher(get_stock_service(), watchlist=["AAPL"])
+    app.dependency_overrides[get_quote_prefetcher] = lambda: prefetcher
+    try:
+        warming = client.get("/api/v1/health/ready")
+        asyncio.run(prefetcher.warm_up())
+        ready = client.get("/api/v1/health/ready")
+    finally:
+        app.dependency_overrides.clear()
+
+    assert warming.status_code == 503
+    assert warming.json()["data"]["status"] == "warming_up"
+    assert ready.status_code == 200
+    assert ready.json()["data"]["warmed_up"] is True
+
+
+def test_readiness_waits_for_models(client: TestClient, tmp_path: Path):
+    """
+    Test that readiness is 503 while models load and reports a failed model as degraded.
+
+    Args:
+        client: FastAPI test client fixture
+        tmp_path: Model directory
+    """
+    save_linear_model(tmp_path / "price_direction.npz", ["return_1d"], [1.0], bias=0.0, version="1")
+    (tmp_path / "broken.npz").write_bytes(b"not a model")
+    service = PredictionService(settings=Settings(inference_model_path=str(tmp_path)))
+    app.dependency_overrides[get_prediction_service] = lambda: service
+    try:
+        loading = client.get("/api/v1/health/ready")
+        asyncio.run(service.load())
+        loaded = client.get("/api/v1/health/ready")
+    finally:
+        app.dependency_overrides.clear()
+        asyncio.run(service.close())
+
+    assert loading.status_code == 503
+    assert loading.json()["data"]["status"] == "warming_up"
+    assert {model["state"] for model in loading.json()["data"]["models"]} == {"loading"}
+    assert loaded.status_code == 200
+    data = loaded.json()["data"]
+    assert data["status"] == "degraded"
+    assert {model["name"]: model["state"] for model in data["models"]} == {
+        "broken": "failed",
+        "price_direction": "ready"
+    }
@@ -0,0 +1,50 @@
+"""
+Tests for technical indicator endpoints.
+"""
+
+from fastapi.testclient import TestClient
+
+
+def test_get_indicators(client: TestClient):
+    """
+    Test indicator computation for several tickers.
+
+    Args:
+        client: FastAPI test client fixture
+    """
+    response = client.post(
+        "/api/v1/indicators",
+        json={
+            "tickers": ["AAPL", "005930.KS"],
+            "interval": "1d",
+            "start": "2024-01-01",
+            "end": "2024-06-01",
+            "indicators": ["sma", "macd"],
+            "limit": 5
+        }
+    )
+
+    assert response.status_code == 200
+    data = response.json()["data"]
+
+    assert len(data["timestamps"]) == 5
+    assert [series["ticker"] for series in data["series"]] == ["AAPL", "005930.KS"]
+    values = data["series"][0]["values"]
+    assert set(values) == {"sma", "macd", "macd_signal", "macd_hist"}
+    assert all(len(points) == 5 for points in values.values())
+    assert all(point is not None for point in values["sma"])
+
+
+def test_get_indicators_unknown_indicator(client: TestClient):
+    """
+    Test indicator computation with an unsupported indicator name.
+
+    Args:
+        client: FastAPI test client fixture
+    """
+    response = client.post(
+        "/api/v1/indicators",
+        json={"tickers": ["AAPL"], "indicators": ["ichimoku"]}
+    )
+
+    assert response.status_code == 422  # Pydantic validation error
@@ -0,0 +1,43 @@
+"""
+Tests for portfolio endpoints.
+"""
+
+from fastapi.testclient import TestClient
+
+
+def test_get_portfolio_risk(client: TestClient):
+    """
+    Test portfolio valuation and risk in a base currency.
+
+    Args:
+        client: FastAPI test client fixture
+    """
+    response = client.post(
+        "/api/v1/portfolio/risk",
+        json={
+            "positions": [{"ticker": "AAPL", "quantity": 10}, {"ticker": "005930.KS", "quantity": 50}],
+            "base_currency": "USD",
+            "confidence": 0.99
+        }
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["success"] is True
+    data = body["data"]
+    assert data["base_currency"] == "USD"
+    assert [position["ticker"] for position in data["positions"]] == ["AAPL", "005930.KS"]
+    assert data["market_value"] > 0
+    assert data["var_parametric"] > 0
+
+
+def test_get_portfolio_risk_empty_positions(client: TestClient):
+    """
+    Test that a portfolio without positions is rejected.
+
+    Args:
+        client: FastAPI test client fixture
+    """
+    response = client.post("/api/v1/portfolio/risk", json={"positions": []})
+
+    assert response.status_code == 422  # Pydantic validation error
@@ -0,0 +1,109 @@
+"""
+Tests for the model prediction endpoints.
+"""
+
+import asyncio
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.dependencies import get_prediction_service
+from app.config.settings import Settings
+from app.main import app
+from app.models.runtime import save_linear_model
+from app.services.prediction_service import PredictionService
+
+
+@pytest.fixture
+def prediction_service(tmp_path: Path) -> Iterator[PredictionService]:
+    """
+    Serve one loaded logistic regression through the prediction endpoints.
+    """
+    save_linear_model(
+        tmp_path / "price_direction.npz", ["return_1d", "return_5d"], [3.0, 1.0], bias=0.0, version="2024-06-01"
+    )
+    service = PredictionService(settings=Settings(inference_model_path=str(tmp_path)))
+    asyncio.run(service.load())
+    app.dependency_overrides[get_prediction_service] = lambda: service
+    try:
+        yield service
+    finally:
+        app.dependency_overrides.clear()
+        asyncio.run(service.close())
+
+
+def test_list_models(client: TestClient, prediction_service: PredictionService):
+    """
+    Test that the model list reports the loaded model with its features.
+    """
+    response = client.get("/api/v1/predictions/models")
+
+    assert response.status_code == 200
+    models = response.json()["data"]["models"]
+    assert [(model["name"], model["state"], model["version"]) for model in models] == [
+        ("price_direction", "ready", "2024-06-01")
+    ]
+    assert models[0]["features"] == ["return_1d", "return_5d"]
+
+
+def test_predict(client: TestClient, prediction_service: PredictionService):
+    """
+    Test a prediction for several instances.
+    """
+    response = client.post(
+        "/api/v1/predictions/price_direction", json={"instances": [[0.5, 0.0], [-0.5, 0.1], [0.0, 0.0]]}
+    )
+
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["model"] == "price_direction"
+    assert data["directions"] == ["up", "down", "up"]
+    assert data["probabilities"][2] == pytest.approx(0.5)
+
+
+def test_predict_unknown_model(client: TestClient, prediction_service: PredictionService):
+    """
+    Test that an unknown model name is a validation error.
+    """
+    response = client.post("/api/v1/predictions/unknown", json={"instances": [[0.0, 0.0]]})
+
+    assert response.status_code == 400
+    assert response.json()["success"] is False
+
+
+def test_predict_wrong_feature_count(client: TestClient, prediction_service: PredictionService):
+    """
+    Test that instances with the wrong width are rejected with the expected features.
+    """
+    response = client.post("/api/v1/predictions/price_direction", json={"instances": [[0.0, 0.0, 0.0]]})
+
+    assert response.status_code == 400
+    assert response.json()["details"]["features"] == ["return_1d", "return_5d"]
+
+
+def test_predict_requires_instances(client: TestClient, prediction_service: PredictionService):
+    """
+    Test that an empty instance list fails request validation.
+    """
+    response = client.post("/api/v1/predictions/price_direction", json={"instances": []})
+
+    assert response.status_code == 422
+
+
+def test_predict_while_model_loading(client: TestClient, tmp_path: Path):
+    """
+    Test that predicting with a model that is still loading is rejected as unavailable.
+    """
+    save_linear_model(tmp_path / "price_direction.npz", ["return_1d"], [1.0], bias=0.0, version="1")
+    service = PredictionService(settings=Settings(inference_model_path=str(tmp_path)))
+    app.dependency_overrides[get_prediction_service] = lambda: service
+    try:
+        response = client.post("/api/v1/predictions/price_direction", json={"instances": [[0.0]]})
+    finally:
+        app.dependency_overrides.clear()
+        asyncio.run(service.close())
+
+    assert response.status_code == 503
+    assert response.json()["details"]["state"] == "loading"
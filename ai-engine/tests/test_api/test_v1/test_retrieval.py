@@ -0,0 +1,101 @@
+"""
+Tests for the news/filing retrieval endpoints.
+"""
+
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.dependencies import get_retrieval_service
+from app.config.settings import Settings
+from app.main import app
+from app.services.retrieval_service import RetrievalService
+
+DOCUMENTS = [
+    {
+        "id": "news-aapl-1",
+        "ticker": "AAPL",
+        "published_at": "2024-06-01T13:30:00Z",
+        "title": "Apple unveils on-device AI features",
+        "text": "Apple announced on-device AI features at its developer conference. Developers get new APIs.",
+        "source": "Reuters",
+        "url": "https://example.com/aapl-ai",
+    },
+    {
+        "id": "10-Q-msft-2024q1",
+        "ticker": "MSFT",
+        "published_at": "2024-04-25T20:00:00Z",
+        "text": "Intelligent Cloud revenue increased driven by Azure consumption growth.",
+        "source": "10-Q",
+    },
+]
+
+
+@pytest.fixture
+def retrieval_service(tmp_path: Path) -> Iterator[RetrievalService]:
+    """
+    Serve an empty index in a temporary directory through the retrieval endpoints.
+    """
+    service = RetrievalService(settings=Settings(retrieval_index_path=str(tmp_path), retrieval_max_results=10))
+    app.dependency_overrides[get_retrieval_service] = lambda: service
+    try:
+        yield service
+    finally:
+        app.dependency_overrides.clear()
+        service.close()
+
+
+def test_ingest_search_and_delete(client: TestClient, retrieval_service: RetrievalService):
+    """
+    Test indexing documents, finding them by similarity and removing them.
+    """
+    response = client.post("/api/v1/retrieval/documents", json={"documents": DOCUMENTS})
+
+    assert response.status_code == 200
+    assert response.json()["data"] == {"documents": 2, "chunks": 2, "replaced": 0}
+
+    response = client.post("/api/v1/retrieval/search", json={"query": "Azure cloud revenue", "top_k": 1})
+
+    assert response.status_code == 200
+    hits = response.json()["data"]["hits"]
+    assert [(hit["document_id"], hit["ticker"], hit["source"]) for hit in hits] == [
+        ("10-Q-msft-2024q1", "MSFT", "10-Q")
+    ]
+    assert hits[0]["published_at"].startswith("2024-04-25T20:00:00")
+
+    response = client.delete("/api/v1/retrieval/documents/10-Q-msft-2024q1")
+
+    assert response.status_code == 200
+    assert response.json()["data"] == {"document_id": "10-Q-msft-2024q1", "chunks": 1}
+    stats = client.get("/api/v1/retrieval/stats").json()["data"]
+    assert (stats["chunks"], stats["deleted_chunks"], stats["embedder"]) == (1, 1, "hashing-256")
+
+
+def test_search_with_filters(client: TestClient, retrieval_service: RetrievalService):
+    """
+    Test that ticker and date filters restrict the results.
+    """
+    client.post("/api/v1/retrieval/documents", json={"documents": DOCUMENTS})
+
+    by_ticker = client.post("/api/v1/retrieval/search", json={"query": "revenue", "tickers": ["AAPL"]})
+    by_date = client.post("/api/v1/retrieval/search", json={"query": "revenue", "end": "2024-05-01T00:00:00Z"})
+
+    assert [hit["document_id"] for hit in by_ticker.json()["data"]["hits"]] == ["news-aapl-1"]
+    assert [hit["document_id"] for hit in by_date.json()["data"]["hits"]] == ["10-Q-msft-2024q1"]
+
+
+def test_errors(client: TestClient, retrieval_service: RetrievalService):
+    """
+    Test the error responses for unknown documents, invalid requests and result limits.
+    """
+    unknown = client.delete("/api/v1/retrieval/documents/missing")
+    too_many = client.post("/api/v1/retrieval/search", json={"query": "revenue", "top_k": 11})
+    invalid = client.post("/api/v1/retrieval/documents", json={"documents": [{"id": "x", "ticker": "AAPL"}]})
+
+    assert unknown.status_code == 400
+    assert unknown.json()["success"] is False
+    assert too_many.status_code == 400
+    assert too_many.json()["details"]["max"] == 10
+    assert invalid.status_code == 422
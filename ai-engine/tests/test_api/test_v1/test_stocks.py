@@ -2,9 +2,15 @@
 Tests for stock endpoints.
 """
 
+from datetime import datetime
+
+import msgpack
 import pytest
 from fastapi.testclient import TestClient
 
+from app.api.dependencies import get_stock_service
+from app.core.errors import ExternalAPIError
+
 
 def test_get_stock_price_success(client: TestClient, valid_stock_ticker: str):
     """
@@ -96,3 +102,207 @@ def test_get_stock_price_empty_ticker(client: TestClient):
     )
 
     assert response.status_code == 422  # Pydantic validation error
+
+
+def test_get_stock_prices_partial_failure(client: TestClient, monkeypatch: pytest.MonkeyPatch):
+    """
+    Test batch stock price retrieval with one failing ticker.
+
+    The failing ticker should be reported in errors while the others succeed.
+
+    Args:
+        client: FastAPI test client fixture
+        monkeypatch: Pytest monkeypatch fixture
+    """
+    provider = get_stock_service().provider
+    original_get_quotes = provider.get_quotes
+
+    async def fake_get_quotes(tickers: list[str], max_concurrency: int | None = None):
+        quotes = await original_get_quotes([t for t in tickers if t != "NOPE"], max_concurrency)
+        if "NOPE" in tickers:
+            quotes["NOPE"] = ExternalAPIError(message="Unable to fetch stock data for ticker: NOPE")
+        return quotes
+
+    get_stock_service().quote_cache.clear()
+    monkeypatch.setattr(provider, "get_quotes", fake_get_quotes)
+
+    response = client.post(
+        "/api/v1/stocks/prices",
+        json={"tickers": ["AAPL", "nope", "AAPL"]}
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+
+    assert data["success"] is True
+    assert [price["ticker"] for price in data["data"]["prices"]] == ["AAPL"]
+    assert [error["ticker"] for error in data["data"]["errors"]] == ["NOPE"]
+
+
+def test_get_stock_prices_empty_tickers(client: TestClient):
+    """
+    Test batch stock price retrieval with an empty ticker list.
+
+    This should return a validation error due to min_length constraint.
+
+    Args:
+        client: FastAPI test client fixture
+    """
+    response = client.post(
+        "/api/v1/stocks/prices",
+        json={"tickers": []}
+    )
+
+    assert response.status_code == 422  # Pydantic validation error
+
+
+def test_get_quote_cache_stats(client: TestClient):
+    """
+    Test quote cache stats endpoint.
+
+    Args:
+        client: FastAPI test client fixture
+    """
+    response = client.get("/api/v1/stocks/cache/stats")
+
+    assert response.status_code == 200
+    data = response.json()
+
+    assert data["success"] is True
+    for field in ("hits", "misses", "loads", "coalesced", "evictions", "size", "max_size", "hit_ratio"):
+        assert field in data["data"]
+
+
+def test_get_stock_history(client: TestClient, valid_stock_ticker: str):
+    """
+    Test historical bars retrieval with query parameters.
+
+    Args:
+        client: FastAPI test client fixture
+        valid_stock_ticker: Valid stock ticker fixture
+    """
+    response = client.get(
+        "/api/v1/stocks/history",
+        params={"ticker": valid_stock_ticker, "interval": "1d", "start": "2024-01-01", "end": "2024-02-01"}
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+
+    assert data["success"] is True
+    history = data["data"]
+    assert history["ticker"] == valid_stock_ticker.upper()
+    assert history["interval"] == "1d"
+    assert len(history["bars"]) > 0
+    for field in ("timestamp", "open", "high", "low", "close", "volume"):
+        assert field in history["bars"][0]
+
+
+def test_post_stock_history(client: TestClient, valid_stock_ticker: str):
+    """
+    Test historical bars retrieval with a JSON body.
+
+    Args:
+        client: FastAPI test client fixture
+        valid_stock_ticker: Valid stock ticker fixture
+    """
+    response = client.post(
+        "/api/v1/stocks/history",
+        json={"ticker": valid_stock_ticker, "interval": "1wk", "start": "2024-01-01T00:00:00Z", "end": "2024-03-01T00:00:00Z"}
+    )
+
+    assert response.status_code == 200
+    assert len(response.json()["data"]["bars"]) > 0
+
+
+def test_get_stock_history_invalid_interval(client: TestClient, valid_stock_ticker: str):
+    """
+    Test historical bars retrieval with an unsupported interval.
+
+    Args:
+        client: FastAPI test client fixture
+        valid_stock_ticker: Valid stock ticker fixture
+    """
+    response = client.get(
+        "/api/v1/stocks/history",
+        params={"ticker": valid_stock_ticker, "interval": "3d"}
+    )
+
+    assert response.status_code == 422  # Pydantic validation error
+
+
+def test_get_stock_prices_in_base_currency(client: TestClient):
+    """
+    Test batch prices converted to a base currency with the cached FX rates.
+
+    Args:
+        client: FastAPI test client fixture
+    """
+    response = client.post(
+        "/api/v1/stocks/prices",
+        json={"tickers": ["AAPL", "005930.KS"], "base_currency": "KRW"}
+    )
+
+    assert response.status_code == 200
+    aapl, samsung = response.json()["data"]["prices"]
+    assert aapl["base_currency"] == "KRW"
+    assert aapl["base_price"] > aapl["current_price"] * 500
+    assert samsung["base_price"] == samsung["current_price"]
+
+
+def test_get_stock_history_as_msgpack_columns(client: TestClient, valid_stock_ticker: str):
+    """
+    Test that Accept: application/vnd.msgpack returns the same bars as column arrays.
+
+    Args:
+        client: FastAPI test client fixture
+        valid_stock_ticker: Valid stock ticker fixture
+    """
+    params = {"ticker": valid_stock_ticker, "interval": "1d", "start": "2024-01-01", "end": "2024-02-01"}
+    bars = client.get("/api/v1/stocks/history", params=params).json()["data"]["bars"]
+
+    response = client.get("/api/v1/stocks/history", params=params, headers={"Accept": "application/vnd.msgpack"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/vnd.msgpack"
+    assert "Accept" in response.headers["vary"]
+    columns = msgpack.unpackb(response.content)["data"]["bars"]
+    assert columns["close"] == [bar["close"] for bar in bars]
+    assert columns["timestamp"][0] == int(datetime.fromisoformat(bars[0]["timestamp"]).timestamp())
+
+
+def test_get_stock_prices_as_columnar_json(client: TestClient):
+    """
+    Test that batch prices are returned as column arrays for the columnar JSON media type.
+
+    Args:
+        client: FastAPI test client fixture
+    """
+    response = client.post(
+        "/api/v1/stocks/prices",
+        json={"tickers": ["AAPL", "MSFT"]},
+        headers={"Accept": "application/vnd.calix.columnar+json"}
+    )
+
+    assert response.status_code == 200
+    prices = response.json()["data"]["prices"]
+    assert prices["ticker"] == ["AAPL", "MSFT"]
+    assert len(prices["current_price"]) == 2
+
+
+def test_get_stock_history_not_acceptable(client: TestClient, valid_stock_ticker: str):
+    """
+    Test that an Accept header without a supported media type is rejected with 406.
+
+    Args:
+        client: FastAPI test client fixture
+        valid_stock_ticker: Valid stock ticker fixture
+    """
+    response = client.get(
+        "/api/v1/stocks/history",
+        params={"ticker": valid_stock_ticker},
+        headers={"Accept": "text/csv"}
+    )
+
+    assert response.status_code == 406
+    assert response.json()["success"] is False
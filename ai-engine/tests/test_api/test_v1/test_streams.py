@@ -0,0 +1,84 @@
+"""
+Tests for quote streaming endpoints.
+"""
+
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.v1.endpoints.streams import sse_events
+from app.schemas.stock import StockPriceSchema
+from app.services.quote_stream import QuoteStreamHub, Subscription
+from app.services.stock_service import StockService
+
+
+def test_stream_quotes_websocket(client: TestClient, valid_stock_ticker: str):
+    """
+    Test subscribing to quotes over a WebSocket.
+
+    Args:
+        client: FastAPI test client fixture
+        valid_stock_ticker: Valid stock ticker fixture
+    """
+    with client.websocket_connect("/api/v1/stream/quotes") as websocket:
+        websocket.send_json({"action": "subscribe", "tickers": [valid_stock_ticker]})
+
+        messages = [websocket.receive_json(), websocket.receive_json()]
+
+    status = next(message for message in messages if message["type"] == "subscribed")
+    update = next(message for message in messages if message["type"] == "quotes")
+    assert status["tickers"] == [valid_stock_ticker]
+    assert update["data"][0]["ticker"] == valid_stock_ticker
+    assert update["data"][0]["current_price"] > 0
+
+
+def test_stream_quotes_websocket_invalid_command(client: TestClient):
+    """
+    Test that an invalid command returns an error message and keeps the socket open.
+
+    Args:
+        client: FastAPI test client fixture
+    """
+    with client.websocket_connect("/api/v1/stream/quotes") as websocket:
+        websocket.send_json({"action": "explode", "tickers": ["AAPL"]})
+        error = websocket.receive_json()
+
+        websocket.send_json({"action": "unsubscribe", "tickers": ["AAPL"]})
+        status = websocket.receive_json()
+
+    assert error["type"] == "error"
+    assert status["type"] == "unsubscribed"
+
+
+def test_stream_quotes_sse_rejects_invalid_tickers(client: TestClient):
+    """
+    Test that the SSE endpoint validates its ticker list before streaming.
+
+    Args:
+        client: FastAPI test client fixture
+    """
+    response = client.get("/api/v1/stream/quotes/sse", params={"tickers": ",,"})
+
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_sse_events_frames_and_heartbeat():
+    """
+    Test SSE framing of quote updates and keep-alive comments.
+    """
+    class DisconnectAfterHeartbeat:
+        async def is_disconnected(self) -> bool:
+            return True
+
+    hub = QuoteStreamHub(StockService(), poll_interval=10.0, max_tickers=10)
+    subscription = Subscription()
+    subscription.offer(StockPriceSchema(ticker="AAPL", current_price=1.5, currency="USD", market_status="open"))
+
+    frames = [frame async for frame in sse_events(DisconnectAfterHeartbeat(), hub, subscription, 0.01)]
+
+    assert frames[0].startswith("event: quotes\ndata: ")
+    assert frames[0].endswith("\n\n")
+    assert json.loads(frames[0].split("data: ", 1)[1])["data"][0]["ticker"] == "AAPL"
+    assert len(frames) == 1
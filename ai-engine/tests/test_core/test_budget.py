@@ -0,0 +1,80 @@
+"""
+Tests for per-caller concurrency and usage budgets.
+"""
+
+import pytest
+
+from app.core.budget import CallerBudgets
+from app.core.errors import RateLimitError
+
+
+class FakeClock:
+    """
+    Manually advanced monotonic clock.
+    """
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_concurrency_limit_per_caller():
+    """
+    Test that a caller at its concurrency limit is rejected while other callers are not.
+    """
+    budgets = CallerBudgets(max_concurrency=2, budget=10_000, window=60.0)
+    first = budgets.acquire("alice", reserve=10)
+    budgets.acquire("alice", reserve=10)
+
+    with pytest.raises(RateLimitError) as exc_info:
+        budgets.acquire("alice", reserve=10)
+    assert exc_info.value.details["cause"] == "concurrency"
+    assert exc_info.value.status_code == 429
+
+    budgets.acquire("bob", reserve=10)
+    first.release()
+    budgets.acquire("alice", reserve=10)
+
+
+def test_token_budget_slides_with_the_window():
+    """
+    Test that settled spending counts against the budget until it leaves the window.
+    """
+    clock = FakeClock()
+    budgets = CallerBudgets(max_concurrency=5, budget=1000, window=60.0, clock=clock)
+
+    lease = budgets.acquire("alice", reserve=600)
+    lease.settle(700)
+    lease.release()
+    lease.release()  # idempotent
+    assert budgets.used("alice") == 700
+
+    clock.now += 20.0
+    with pytest.raises(RateLimitError) as exc_info:
+        budgets.acquire("alice", reserve=400)
+    assert exc_info.value.details["cause"] == "budget"
+    assert exc_info.value.details["retry_after"] == 40
+
+    budgets.acquire("alice", reserve=300).release()
+
+    clock.now += 40.0
+    assert budgets.used("alice") == 0
+    budgets.acquire("alice", reserve=1000)
+
+
+def test_reservations_count_until_settled():
+    """
+    Test that in-flight reservations keep concurrent calls from overrunning the budget.
+    """
+    budgets = CallerBudgets(max_concurrency=5, budget=1000, window=60.0)
+    lease = budgets.acquire("alice", reserve=600)
+
+    with pytest.raises(RateLimitError):
+        budgets.acquire("alice", reserve=600)
+
+    lease.settle(100)
+    lease.release()
+    budgets.acquire("alice", reserve=600)
+    assert budgets.used("alice") == 100
@@ -0,0 +1,84 @@
+"""
+Tests for the blocking-call executor.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.core.errors import ExternalAPIError, ServiceOverloadedError
+from app.core.executor import BlockingExecutor
+
+
+@pytest.fixture
+def executor():
+    """
+    Provide a small executor and shut it down after the test.
+    """
+    executor = BlockingExecutor(max_workers=2, queue_depth=1, timeout=1.0, name="test")
+    yield executor
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_run_does_not_block_event_loop(executor: BlockingExecutor):
+    """
+    Test that a blocking call leaves the event loop free for other coroutines.
+    """
+    ticks = 0
+
+    async def ticker() -> None:
+        nonlocal ticks
+        for _ in range(5):
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    result, _ = await asyncio.gather(executor.run(time.sleep, 0.1), ticker())
+
+    assert result is None
+    assert ticks == 5
+    assert executor.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_run_timeout_raises_external_api_error(executor: BlockingExecutor):
+    """
+    Test that a call exceeding its timeout raises ExternalAPIError.
+    """
+    with pytest.raises(ExternalAPIError) as exc_info:
+        await executor.run(time.sleep, 0.3, timeout=0.05)
+
+    assert exc_info.value.details["error"] == "timeout"
+
+
+@pytest.mark.asyncio
+async def test_run_rejects_work_when_queue_is_full(executor: BlockingExecutor):
+    """
+    Test that calls beyond max_workers + queue_depth are rejected.
+    """
+    release = threading.Event()
+    calls = [asyncio.ensure_future(executor.run(release.wait, 1.0)) for _ in range(3)]
+    await asyncio.sleep(0.05)
+
+    with pytest.raises(ServiceOverloadedError):
+        await executor.run(release.wait, 1.0)
+
+    release.set()
+    await asyncio.gather(*calls)
+    assert executor.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_run_propagates_exceptions(executor: BlockingExecutor):
+    """
+    Test that exceptions raised by the blocking call reach the caller.
+    """
+    def fail() -> None:
+        raise ExternalAPIError(message="boom")
+
+    with pytest.raises(ExternalAPIError, match="boom"):
+        await executor.run(fail)
+
+    assert executor.pending == 0
@@ -0,0 +1,108 @@
+"""
+Tests for the shared outbound HTTP client.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config.settings import Settings
+from app.core.errors import ExternalAPIError
+from app.core.http_client import HostLimitedTransport, create_http_client, create_openai_client
+from app.core.metrics import REGISTRY
+from app.main import app
+
+
+def make_transport(max_per_host: int, delay: float = 0.01):
+    """
+    Build a limited transport over a mock upstream that records peak concurrency per host.
+    """
+    active: dict[str, int] = {}
+    peak: dict[str, int] = {}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        active[host] = active.get(host, 0) + 1
+        peak[host] = max(peak.get(host, 0), active[host])
+        await asyncio.sleep(delay)
+        active[host] -= 1
+        return httpx.Response(200, content=body())
+
+    async def body():
+        # Streamed like a real network response (content is read after the transport returns)
+        yield b"{}"
+
+    return HostLimitedTransport(httpx.MockTransport(handler), max_per_host=max_per_host), peak
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_limited_per_host():
+    """
+    Test that each host gets its own cap on concurrent requests.
+    """
+    transport, peak = make_transport(max_per_host=2)
+
+    async with httpx.AsyncClient(transport=transport) as client:
+        urls = ["https://a.example/q"] * 6 + ["https://b.example/q"] * 2
+        responses = await asyncio.gather(*(client.get(url) for url in urls))
+
+    assert all(r.status_code == 200 for r in responses)
+    assert peak == {"a.example": 2, "b.example": 2}
+
+
+@pytest.mark.asyncio
+async def test_host_slot_is_held_until_streamed_response_is_closed():
+    """
+    Test that a streamed response keeps its host slot until it is closed.
+    """
+    transport, _ = make_transport(max_per_host=1, delay=0)
+
+    async with httpx.AsyncClient(transport=transport) as client:
+        async with client.stream("GET", "https://a.example/q"):
+            blocked = asyncio.ensure_future(client.get("https://a.example/q"))
+            await asyncio.sleep(0.01)
+            assert not blocked.done()
+
+        response = await asyncio.wait_for(blocked, timeout=1.0)
+
+    assert response.status_code == 200
+
+
+def test_lifespan_creates_and_closes_shared_client():
+    """
+    Test that the application lifespan owns the shared HTTP client.
+    """
+    with TestClient(app):
+        http_client = app.state.http_client
+        assert isinstance(http_client, httpx.AsyncClient)
+        assert not http_client.is_closed
+
+    assert http_client.is_closed
+
+
+def test_pool_usage_is_exported():
+    """
+    Test that connection pool gauges are published for a new client.
+    """
+    create_http_client(Settings())
+
+    assert REGISTRY.get_sample_value("calix_http_client_pool_connections", {"state": "active"}) == 0.0
+    assert REGISTRY.get_sample_value("calix_http_client_pool_connections", {"state": "idle"}) == 0.0
+
+
+@pytest.mark.asyncio
+async def test_openai_client_uses_shared_pool():
+    """
+    Test that the OpenAI client sends requests through the shared client.
+    """
+    http_client = httpx.AsyncClient()
+    openai_client = create_openai_client(Settings(openai_api_key="sk-test"), http_client)
+
+    assert openai_client._client is http_client
+
+    with pytest.raises(ExternalAPIError):
+        create_openai_client(Settings(openai_api_key=None), http_client)
+
+    await http_client.aclose()
@@ -0,0 +1,141 @@
+"""
+Tests for the logging pipeline and request correlation IDs.
+"""
+
+import json
+import logging
+import queue
+
+from fastapi.testclient import TestClient
+
+from app.core.logging import (
+    JsonFormatter,
+    NonBlockingQueueHandler,
+    RequestIdFilter,
+    SamplingFilter,
+    request_id_var,
+)
+
+
+def make_record(name: str = "api", level: int = logging.INFO, msg: str = "hello %s", args: tuple = ("world",)):
+    return logging.LogRecord(name, level, __file__, 1, msg, args, None)
+
+
+def test_json_formatter_includes_request_id():
+    """
+    Test that records are formatted as one JSON object carrying the request ID.
+    """
+    record = make_record()
+    token = request_id_var.set("req-123")
+    try:
+        RequestIdFilter().filter(record)
+    finally:
+        request_id_var.reset(token)
+
+    entry = json.loads(JsonFormatter().format(record))
+
+    assert entry["message"] == "hello world"
+    assert entry["logger"] == "api"
+    assert entry["level"] == "INFO"
+    assert entry["request_id"] == "req-123"
+    assert entry["timestamp"].endswith("Z")
+
+
+def test_queue_handler_drops_records_when_full():
+    """
+    Test that a full log queue drops records instead of blocking the caller.
+    """
+    handler = NonBlockingQueueHandler(queue.Queue(maxsize=1))
+
+    handler.emit(make_record(msg="first", args=()))
+    handler.emit(make_record(msg="second", args=()))
+
+    assert handler.queue.qsize() == 1
+    assert handler.queue.get_nowait().getMessage() == "first"
+
+
+def test_queue_handler_merges_arguments_on_caller_thread():
+    """
+    Test that message arguments are rendered before the record is queued.
+    """
+    handler = NonBlockingQueueHandler(queue.Queue())
+    tickers = ["AAPL"]
+
+    handler.emit(make_record(msg="tickers %s", args=(tickers,)))
+    tickers.append("MSFT")
+
+    assert handler.queue.get_nowait().getMessage() == "tickers ['AAPL']"
+
+
+def test_sampling_filter_keeps_configured_fraction():
+    """
+    Test that sampling applies by logger prefix and never to warnings.
+    """
+    draws = iter([0.05, 0.5, 0.5])
+    sampler = SamplingFilter(sample_rates={"api": 0.1}, rng=lambda: next(draws))
+
+    assert sampler.filter(make_record("api")) is True
+    assert sampler.filter(make_record("api.stocks")) is False
+    assert sampler.filter(make_record("api", level=logging.WARNING)) is True
+    assert sampler.filter(make_record("app.services")) is True
+
+
+def test_rate_limit_filter_refills_over_time():
+    """
+    Test that a rate-limited logger keeps at most N records per second.
+    """
+    now = [0.0]
+    sampler = SamplingFilter(rate_limits={"app.services": 2}, clock=lambda: now[0])
+    record = make_record("app.services.stock_service")
+
+    assert [sampler.filter(record) for _ in range(3)] == [True, True, False]
+    assert sampler.filter(make_record("app.services", level=logging.ERROR)) is True
+
+    now[0] = 0.5
+    assert sampler.filter(record) is True
+    assert sampler.filter(record) is False
+
+
+def test_fractional_rate_limit_keeps_one_record_per_interval():
+    """
+    Test that a rate below one record per second still lets records through.
+    """
+    now = [0.0]
+    sampler = SamplingFilter(rate_limits={"app.services": 0.5}, clock=lambda: now[0])
+    record = make_record("app.services.stock_service")
+
+    assert [sampler.filter(record) for _ in range(2)] == [True, False]
+
+    now[0] = 1.0
+    assert sampler.filter(record) is False
+
+    now[0] = 2.0
+    assert sampler.filter(record) is True
+    assert sampler.filter(record) is False
+
+
+def test_request_id_is_propagated_from_caller(client: TestClient):
+    """
+    Test that a caller-supplied correlation ID is echoed back.
+
+    Args:
+        client: FastAPI test client fixture
+    """
+    response = client.get("/api/v1/health", headers={"X-Request-ID": "spring-7f3a9c"})
+
+    assert response.headers["X-Request-ID"] == "spring-7f3a9c"
+
+
+def test_request_id_is_generated_when_missing_or_malformed(client: TestClient):
+    """
+    Test that a new correlation ID replaces a missing or unsafe one.
+
+    Args:
+        client: FastAPI test client fixture
+    """
+    generated = client.get("/api/v1/health").headers["X-Request-ID"]
+    replaced = client.get("/api/v1/health", headers={"X-Request-ID": "bad id\n"}).headers["X-Request-ID"]
+
+    assert len(generated) == 32
+    assert len(replaced) == 32
+    assert generated != replaced
@@ -0,0 +1,170 @@
+"""
+Tests for Prometheus metrics and the metrics middleware.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.errors import ExternalAPIError
+from app.core.executor import BlockingExecutor
+from app.core.metrics import REGISTRY, market_of, observe_upstream, route_of
+
+
+def sample(name: str, labels: dict[str, str]) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_metrics_endpoint_exposes_request_latency(client: TestClient):
+    """
+    Test that requests are recorded per route template and exposed at /metrics.
+
+    Args:
+        client: FastAPI test client fixture
+    """
+    labels = {"method": "GET", "route": "/api/v1/health", "status": "200"}
+    before = sample("calix_http_request_duration_seconds_count", labels)
+
+    client.get("/api/v1/health")
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "calix_http_request_duration_seconds" in response.text
+    assert "calix_http_requests_in_flight" in response.text
+    assert sample("calix_http_request_duration_seconds_count", labels) == before + 1
+
+
+def test_serialization_time_is_recorded_per_route(client: TestClient, valid_stock_ticker: str):
+    """
+    Test that response model serialization is timed for routes with a response model.
+
+    Args:
+        client: FastAPI test client fixture
+        valid_stock_ticker: Valid stock ticker fixture
+    """
+    labels = {"route": "/api/v1/stocks/price"}
+    before = sample("calix_response_serialization_seconds_count", labels)
+
+    client.post("/api/v1/stocks/price", json={"ticker": valid_stock_ticker})
+
+    assert sample("calix_response_serialization_seconds_count", labels) == before + 1
+
+
+def test_upstream_errors_are_counted_by_cause(client: TestClient, invalid_stock_ticker: str):
+    """
+    Test that failed provider calls are recorded with latency and error cause.
+
+    Args:
+        client: FastAPI test client fixture
+        invalid_stock_ticker: Invalid stock ticker fixture
+    """
+    errors = {"provider": "local", "cause": "invalid_ticker"}
+    before = sample("calix_external_api_errors_total", errors)
+
+    client.post("/api/v1/stocks/price", json={"ticker": invalid_stock_ticker})
+
+    assert sample("calix_external_api_errors_total", errors) == before + 1
+    assert sample(
+        "calix_upstream_request_duration_seconds_count",
+        {"provider": "local", "operation": "quote", "market": "US", "outcome": "error"}
+    ) >= 1
+
+
+def test_observe_upstream_records_timeout_cause():
+    """
+    Test that the cause label comes from the error details.
+    """
+    labels = {"provider": "test", "cause": "timeout"}
+    before = sample("calix_external_api_errors_total", labels)
+
+    with pytest.raises(ExternalAPIError):
+        with observe_upstream("test", "quote", "US"):
+            raise ExternalAPIError(message="timed out", details={"cause": "timeout"})
+
+    assert sample("calix_external_api_errors_total", labels) == before + 1
+
+
+@pytest.mark.asyncio
+async def test_executor_wait_time_is_recorded():
+    """
+    Test that every executor call records its queue wait time.
+    """
+    executor = BlockingExecutor(max_workers=1, queue_depth=4, name="metrics-test")
+    try:
+        for _ in range(3):
+            await executor.run(lambda: None)
+    finally:
+        executor.shutdown()
+
+    assert sample("calix_executor_queue_wait_seconds_count", {"executor": "metrics-test"}) == 3
+
+
+@pytest.mark.parametrize(
+    ("ticker", "market"),
+    [("AAPL", "US"), ("005930.KS", "KRX"), ("035720.KQ", "KRX"), ("KRW=X", "FX"), ("7203.T", "T"),
+     ("X.ANYTHING", "other"), ("AB.ZZ9", "other")]
+)
+def test_market_of(ticker: str, market: str):
+    """
+    Test market labels derived from ticker suffixes.
+    """
+    assert market_of(ticker) == market
+
+
+@pytest.mark.parametrize(
+    ("route_path", "path", "template"),
+    [
+        ("/alerts/rules/{rule_id}", "/api/v1/alerts/rules/a", "/api/v1/alerts/rules/{rule_id}"),
+        ("/api/v1/alerts/rules/{rule_id}", "/api/v1/alerts/rules/a", "/api/v1/alerts/rules/{rule_id}"),
+        ("/health", "/api/v1/health", "/api/v1/health"),
+        ("/", "/", "/"),
+    ]
+)
+def test_route_of_uses_route_template(route_path: str, path: str, template: str):
+    """
+    Test that the label is the route template (nested or flattened routers), never a raw value.
+    """
+    scope = {"route": SimpleNamespace(path=route_path), "path": path, "path_params": {"rule_id": "a"}}
+
+    assert route_of(scope) == template
+    assert route_of({"path": path}) == "unmatched"
+
+
+def test_multiprocess_metrics_aggregate_workers(tmp_path: Path):
+    """
+    Test that with PROMETHEUS_MULTIPROC_DIR a scrape reports the counters and live gauges of every worker.
+    """
+    script = (
+        "import os, sys\n"
+        "from app.core.metrics import PREFETCHED_QUOTES, REQUESTS_IN_FLIGHT, render_metrics\n"
+        "from prometheus_client import multiprocess\n"
+        "pids = []\n"
+        "for _ in range(2):\n"
+        "    pid = os.fork()\n"
+        "    if pid == 0:\n"
+        "        PREFETCHED_QUOTES.labels(outcome='success').inc()\n"
+        "        REQUESTS_IN_FLIGHT.inc()\n"
+        "        os._exit(0)\n"
+        "    os.waitpid(pid, 0)\n"
+        "    pids.append(pid)\n"
+        "multiprocess.mark_process_dead(pids[0])\n"
+        "sys.stdout.write(render_metrics()[0].decode())\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=Path(__file__).resolve().parents[2],
+        env={**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)},
+        capture_output=True,
+        check=True,
+        text=True
+    ).stdout
+
+    assert 'calix_prefetched_quotes_total{outcome="success"} 2.0' in output
+    # The gauge of the worker marked dead is gone
+    assert "calix_http_requests_in_flight 1.0" in output
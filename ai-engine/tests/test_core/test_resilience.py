@@ -0,0 +1,198 @@
+"""
+Tests for the circuit breaker and hedged calls.
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.errors import CircuitOpenError, ExternalAPIError, ServiceOverloadedError
+from app.core.resilience import CircuitBreaker, LatencyTracker, hedged
+
+
+class FakeClock:
+    """
+    Manually advanced clock.
+    """
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def ok() -> str:
+    return "ok"
+
+
+async def upstream_error() -> str:
+    raise ExternalAPIError(message="boom", details={"cause": "upstream_error"})
+
+
+async def invalid_ticker() -> str:
+    raise ExternalAPIError(message="no such ticker", details={"cause": "invalid_ticker"})
+
+
+async def call_ignoring_errors(breaker: CircuitBreaker, func) -> None:
+    try:
+        await breaker.call(func)
+    except ExternalAPIError:
+        pass
+
+
+@pytest.mark.asyncio
+async def test_circuit_opens_at_failure_rate_and_fails_fast():
+    """
+    Test that the circuit opens once enough calls failed and then rejects calls.
+    """
+    clock = FakeClock()
+    breaker = CircuitBreaker("test", failure_rate=0.5, min_calls=4, open_seconds=10.0, clock=clock)
+
+    for func in (ok, upstream_error, ok):
+        await call_ignoring_errors(breaker, func)
+    assert breaker.state == "closed"
+
+    await call_ignoring_errors(breaker, upstream_error)
+    assert breaker.state == "open"
+
+    calls = 0
+
+    async def counted() -> str:
+        nonlocal calls
+        calls += 1
+        return "ok"
+
+    with pytest.raises(CircuitOpenError) as exc_info:
+        await breaker.call(counted)
+
+    assert calls == 0
+    assert exc_info.value.details["cause"] == "circuit_open"
+    assert exc_info.value.details["retry_after"] == 10.0
+
+
+@pytest.mark.asyncio
+async def test_half_open_probe_closes_or_reopens_circuit():
+    """
+    Test that after the cool-down one probe decides whether the circuit closes.
+    """
+    clock = FakeClock()
+    breaker = CircuitBreaker("test", failure_rate=0.5, min_calls=1, open_seconds=10.0, clock=clock)
+    await call_ignoring_errors(breaker, upstream_error)
+
+    clock.now = 10.0
+    assert breaker.state == "half_open"
+    await call_ignoring_errors(breaker, upstream_error)
+    assert breaker.state == "open"
+
+    clock.now = 20.0
+    assert await breaker.call(ok) == "ok"
+    assert breaker.snapshot().state == "closed"
+    assert breaker.snapshot().calls == 0
+
+
+@pytest.mark.asyncio
+async def test_only_upstream_failures_count():
+    """
+    Test that invalid tickers and local overload do not open the circuit.
+    """
+    breaker = CircuitBreaker("test", failure_rate=0.5, min_calls=2)
+
+    async def overloaded() -> str:
+        raise ServiceOverloadedError(message="busy")
+
+    for _ in range(3):
+        await call_ignoring_errors(breaker, invalid_ticker)
+        with pytest.raises(ServiceOverloadedError):
+            await breaker.call(overloaded)
+
+    snapshot = breaker.snapshot()
+    assert snapshot.state == "closed"
+    assert snapshot.calls == 3
+    assert snapshot.failure_rate == 0.0
+
+
+@pytest.mark.asyncio
+async def test_outcomes_leave_the_window():
+    """
+    Test that only failures within the window count towards the failure rate.
+    """
+    clock = FakeClock()
+    breaker = CircuitBreaker("test", failure_rate=0.5, min_calls=2, window=60.0, clock=clock)
+    await call_ignoring_errors(breaker, upstream_error)
+
+    clock.now = 61.0
+    await call_ignoring_errors(breaker, upstream_error)
+
+    assert breaker.state == "closed"
+
+
+def test_latency_tracker_percentile():
+    """
+    Test nearest-rank percentiles once enough samples are known.
+    """
+    tracker = LatencyTracker(min_samples=4)
+    for seconds in (0.4, 0.1, 0.3):
+        tracker.record(seconds)
+    assert tracker.percentile(95) is None
+
+    tracker.record(0.2)
+    assert tracker.percentile(50) == 0.2
+    assert tracker.percentile(95) == 0.4
+
+
+@pytest.mark.asyncio
+async def test_hedged_call_uses_faster_duplicate():
+    """
+    Test that a slow first attempt is overtaken by the hedge, which is then used.
+    """
+    delays = iter([1.0, 0.0])
+    cancelled = []
+
+    async def attempt() -> float:
+        delay = next(delays)
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            cancelled.append(delay)
+            raise
+        return delay
+
+    result, winner = await asyncio.wait_for(hedged(attempt, delay=0.01), timeout=0.5)
+    await asyncio.sleep(0)
+
+    assert (result, winner) == (0.0, "hedge")
+    assert cancelled == [1.0]
+
+
+@pytest.mark.asyncio
+async def test_hedged_call_without_delay_runs_once():
+    """
+    Test that no duplicate is sent when hedging is disabled or the first attempt is fast.
+    """
+    calls = 0
+
+    async def attempt() -> str:
+        nonlocal calls
+        calls += 1
+        return "ok"
+
+    assert await hedged(attempt, delay=None) == ("ok", None)
+    assert await hedged(attempt, delay=1.0) == ("ok", None)
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_hedged_call_raises_first_error_when_all_attempts_fail():
+    """
+    Test that the first attempt's error is raised when the hedge fails too.
+    """
+    attempts = iter(["first", "second"])
+
+    async def attempt() -> str:
+        name = next(attempts)
+        await asyncio.sleep(0.02 if name == "first" else 0.0)
+        raise ExternalAPIError(message=name)
+
+    with pytest.raises(ExternalAPIError, match="first"):
+        await hedged(attempt, delay=0.01)
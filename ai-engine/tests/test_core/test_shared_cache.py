@@ -0,0 +1,169 @@
+"""
+Tests for the shared (Redis-protocol) cache tier, against an in-process fake server.
+"""
+
+import asyncio
+
+import fakeredis
+import pytest
+
+from app.config.settings import Settings
+from app.core.shared_cache import SharedCache, create_shared_cache
+
+
+def make_workers(count: int = 2, **kwargs: float) -> list[SharedCache]:
+    server = fakeredis.FakeServer()
+    return [SharedCache(fakeredis.FakeAsyncRedis(server=server), **kwargs) for _ in range(count)]
+
+
+def counting_loader(calls: list[list[str]], delay: float = 0.05):
+    async def load(keys: list[str]) -> dict[str, int]:
+        calls.append(list(keys))
+        await asyncio.sleep(delay)
+        return {key: len(key) for key in keys}
+    return load
+
+
+def encode(value: int) -> bytes:
+    return str(value).encode()
+
+
+def ttl(value: int) -> float:
+    return 60.0
+
+
+@pytest.mark.asyncio
+async def test_only_one_worker_loads_a_missing_key():
+    """
+    Test that concurrent misses on two workers cause one load, and the other worker reads its result.
+    """
+    first, second = make_workers(lock_poll=0.01)
+    calls: list[list[str]] = []
+    load = counting_loader(calls)
+
+    results = await asyncio.gather(
+        first.get_or_load_many(["quote:AAPL", "quote:MSFT"], load, encode, int, ttl),
+        second.get_or_load_many(["quote:AAPL", "quote:MSFT"], load, encode, int, ttl)
+    )
+
+    assert calls == [["quote:AAPL", "quote:MSFT"]]
+    assert results[0] == results[1] == {"quote:AAPL": 10, "quote:MSFT": 10}
+    # Locks are released once the values are stored
+    assert await first.client.keys("calix:lock:*") == []
+
+
+@pytest.mark.asyncio
+async def test_stored_values_are_served_without_loading():
+    """
+    Test that values already in the store are decoded instead of loaded.
+    """
+    (worker,) = make_workers(count=1)
+    calls: list[list[str]] = []
+    await worker.set_many({"quote:AAPL": (b"7", 60.0)})
+
+    result = await worker.get_or_load_many(["quote:AAPL", "quote:MSFT"], counting_loader(calls, 0), encode, int, ttl)
+
+    assert calls == [["quote:MSFT"]]
+    assert result == {"quote:AAPL": 7, "quote:MSFT": 10}
+    assert 0 < await worker.client.pttl("calix:quote:MSFT") <= 60_000
+
+
+@pytest.mark.asyncio
+async def test_abandoned_lock_falls_back_to_loading_after_lock_wait():
+    """
+    Test that a key locked by a worker that never stores it is loaded after lock_wait.
+    """
+    first, second = make_workers(lock_wait=0.1, lock_poll=0.02)
+    assert await first.acquire(["quote:AAPL"])
+    calls: list[list[str]] = []
+
+    result = await second.get_or_load_many(["quote:AAPL"], counting_loader(calls, 0), encode, int, ttl)
+
+    assert calls == [["quote:AAPL"]]
+    assert result == {"quote:AAPL": 10}
+
+
+@pytest.mark.asyncio
+async def test_release_keeps_a_lock_taken_over_by_another_worker():
+    """
+    Test that releasing an expired lock never deletes the lock another worker holds now.
+    """
+    first, second = make_workers()
+    tokens = await first.acquire(["bars:1d:AAPL"])
+    await first.client.delete("calix:lock:bars:1d:AAPL")
+    assert await second.acquire(["bars:1d:AAPL"])
+
+    await first.release(tokens)
+
+    assert await first.client.exists("calix:lock:bars:1d:AAPL") == 1
+
+
+@pytest.mark.asyncio
+async def test_lock_waits_for_the_current_holder():
+    """
+    Test that lock() waits until the other holder releases the key.
+    """
+    first, second = make_workers(lock_poll=0.01)
+    order: list[str] = []
+
+    async def hold(worker: SharedCache, name: str) -> None:
+        async with worker.lock("bars:1d:AAPL") as held:
+            assert held
+            order.append(f"{name} in")
+            await asyncio.sleep(0.05)
+            order.append(f"{name} out")
+
+    await asyncio.gather(hold(first, "first"), hold(second, "second"))
+
+    assert order == ["first in", "first out", "second in", "second out"]
+
+
+@pytest.mark.asyncio
+async def test_writes_are_announced_to_other_workers_only():
+    """
+    Test that set_many and invalidate notify the other workers' handlers, not the writer's own.
+    """
+    first, second = make_workers()
+    seen: dict[str, list[list[str]]] = {"first": [], "second": []}
+    first.subscribe(seen["first"].append)
+    second.subscribe(seen["second"].append)
+    first.start()
+    second.start()
+    try:
+        # Let both listeners subscribe before publishing
+        await asyncio.sleep(0.05)
+        await first.set_many({"quote:AAPL": (b"1", 60.0)})
+        await second.invalidate(["quote:MSFT"])
+        for _ in range(50):
+            if seen["first"] and seen["second"]:
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        await first.close()
+        await second.close()
+
+    assert seen == {"first": [["quote:MSFT"]], "second": [["quote:AAPL"]]}
+
+
+@pytest.mark.asyncio
+async def test_unreachable_store_degrades_to_loading():
+    """
+    Test that a store that cannot be reached only costs the loads it would have saved.
+    """
+    worker = create_shared_cache(Settings(shared_cache_enabled=True, shared_cache_url="redis://127.0.0.1:1/0"))
+    assert worker is not None
+    calls: list[list[str]] = []
+
+    result = await worker.get_or_load_many(["quote:AAPL"], counting_loader(calls, 0), encode, int, ttl)
+
+    assert calls == [["quote:AAPL"]]
+    assert result == {"quote:AAPL": 10}
+    await worker.close()
+
+
+def test_shared_cache_is_off_by_default():
+    """
+    Test that no shared cache (and no redis client) is created unless enabled.
+    """
+    assert create_shared_cache(Settings()) is None
+    assert isinstance(create_shared_cache(Settings(shared_cache_enabled=True)), SharedCache)
@@ -0,0 +1,176 @@
+"""
+Tests for the production server entry point (python -m app).
+"""
+
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+import httpx
+import pytest
+
+from app.config.settings import Settings
+from app.server import available_cpus, resolve_http, resolve_loop, worker_count
+
+# Seconds from launching `python -m app` until every worker answers health checks
+COLD_START_BUDGET = 5.0
+
+# Seconds `import app.main` may take in a fresh interpreter
+IMPORT_BUDGET = 3.0
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port: int = sock.getsockname()[1]
+        return port
+
+
+def server_env(**overrides: str) -> dict[str, str]:
+    return {
+        **os.environ,
+        "MARKET_DATA_PROVIDER": "local",
+        "BAR_STORE_PATH": tempfile.mkdtemp(prefix="calix-bars-"),
+        "MARKET_CALENDAR_ENABLED": "false",
+        "SERVER_GRACEFUL_TIMEOUT": "10",
+        **overrides,
+    }
+
+
+@pytest.fixture
+def server() -> Iterator[tuple[subprocess.Popen[bytes], str, float]]:
+    """
+    Launch `python -m app` with two workers and wait until it answers health checks.
+
+    Yields:
+        tuple: Master process, base URL and seconds from launch to the first healthy answer
+    """
+    port = free_port()
+    url = f"http://127.0.0.1:{port}"
+    launched = time.monotonic()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "app", "--host", "127.0.0.1", "--port", str(port), "--workers", "2"],
+        cwd=PROJECT_ROOT,
+        env=server_env(LOCAL_PROVIDER_LATENCY_MS="1000"),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    cold_start = None
+    try:
+        while time.monotonic() - launched < COLD_START_BUDGET * 4:
+            try:
+                if httpx.get(f"{url}/api/v1/health", timeout=1.0).status_code == 200:
+                    cold_start = time.monotonic() - launched
+                    break
+            except httpx.TransportError:
+                time.sleep(0.05)
+        assert cold_start is not None, "server did not start"
+        yield process, url, cold_start
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+
+
+def request_in_background(url: str) -> tuple[threading.Thread, list[int]]:
+    """
+    Start a quote request that takes about one second (LOCAL_PROVIDER_LATENCY_MS) in a thread.
+    """
+    statuses: list[int] = []
+
+    def run() -> None:
+        response = httpx.post(f"{url}/api/v1/stocks/price", json={"ticker": "AAPL"}, timeout=15.0)
+        statuses.append(response.status_code)
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    # Let the request reach a worker before signalling the master
+    time.sleep(0.3)
+    return thread, statuses
+
+
+def test_import_defers_heavy_dependencies():
+    """
+    Test that importing the app neither loads the provider/LLM SDKs nor exceeds the import budget.
+    """
+    script = (
+        "import json, sys, time\n"
+        "started = time.perf_counter()\n"
+        "import app.main\n"
+        "print(json.dumps({'seconds': time.perf_counter() - started, 'modules': sorted(sys.modules)}))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script], cwd=PROJECT_ROOT, env=server_env(), capture_output=True, check=True
+    ).stdout
+    result = json.loads(output.splitlines()[-1])
+
+    assert {"yfinance", "openai", "langchain", "redis"}.isdisjoint(result["modules"])
+    assert result["seconds"] < IMPORT_BUDGET
+
+
+@pytest.mark.slow
+@pytest.mark.integration
+def test_cold_start_and_graceful_drain(server: tuple[subprocess.Popen[bytes], str, float]):
+    """
+    Test that the server starts within budget and SIGTERM lets an in-flight request finish.
+    """
+    process, url, cold_start = server
+    assert cold_start < COLD_START_BUDGET
+
+    thread, statuses = request_in_background(url)
+    process.send_signal(signal.SIGTERM)
+    thread.join(timeout=15.0)
+
+    assert statuses == [200]
+    assert process.wait(timeout=15.0) == 0
+
+
+@pytest.mark.slow
+@pytest.mark.integration
+def test_reload_replaces_workers_without_refusing_requests(server: tuple[subprocess.Popen[bytes], str, float]):
+    """
+    Test that SIGHUP keeps serving while the old workers drain their in-flight requests.
+    """
+    process, url, _ = server
+
+    thread, statuses = request_in_background(url)
+    process.send_signal(signal.SIGHUP)
+    health = [httpx.get(f"{url}/api/v1/health", timeout=5.0).status_code for _ in range(20)]
+    thread.join(timeout=15.0)
+
+    assert statuses == [200]
+    assert set(health) == {200}
+    assert process.poll() is None
+    process.send_signal(signal.SIGTERM)
+    assert process.wait(timeout=15.0) == 0
+
+
+def test_worker_count_defaults_to_available_cpus():
+    """
+    Test that SERVER_WORKERS overrides the CPU-derived worker count.
+    """
+    assert available_cpus() >= 1
+    assert worker_count(Settings(server_workers=0)) == available_cpus()
+    assert worker_count(Settings(server_workers=3)) == 3
+
+
+def test_auto_selects_uvloop_and_httptools_when_installed():
+    """
+    Test that "auto" resolves to the fast implementations when they are importable.
+    """
+    pytest.importorskip("uvloop")
+    pytest.importorskip("httptools")
+
+    assert resolve_loop("auto") == "uvloop"
+    assert resolve_http("auto") == "httptools"
+    assert resolve_loop("asyncio") == "asyncio"
@@ -0,0 +1,143 @@
+"""
+Tests for the price alert rule engine.
+"""
+
+import pytest
+
+from app.services.alert_engine import AlertEngine, AlertRule, SortedLevels
+
+
+def threshold(rule_id: str, level: float, direction: str = "above", **options: object) -> AlertRule:
+    return AlertRule(id=rule_id, ticker="AAPL", kind="threshold", direction=direction, level=level, **options)  # type: ignore[arg-type]
+
+
+def test_sorted_levels_range_queries():
+    """
+    Test the half-open crossing ranges of rising and falling moves, with equal levels.
+    """
+    levels = SortedLevels()
+    for level, rule_id in [(3.0, "c"), (1.0, "a"), (2.0, "b"), (2.0, "b2")]:
+        levels.add(level, rule_id)
+
+    assert levels.rising(1.0, 2.0) == [(2.0, "b"), (2.0, "b2")]
+    assert levels.falling(3.0, 1.0) == [(2.0, "b2"), (2.0, "b"), (1.0, "a")]
+    levels.remove(2.0, "b")
+    assert levels.rising(0.0, 10.0) == [(1.0, "a"), (2.0, "b2"), (3.0, "c")]
+
+
+def test_threshold_fires_once_on_crossing():
+    """
+    Test that a one-shot threshold fires on the crossing only and is then removed.
+    """
+    engine = AlertEngine()
+    engine.upsert([threshold("up", 100.0, metadata={"user_id": "7"}), threshold("down", 90.0, "below")])
+
+    assert engine.on_price("AAPL", 95.0, 1.0) == []
+    assert engine.on_price("AAPL", 99.0, 2.0) == []
+    [event] = engine.on_price("AAPL", 101.0, 3.0)
+
+    assert (event.rule_id, event.direction, event.level, event.price, event.previous_price) == ("up", "above", 100.0, 101.0, 99.0)
+    assert event.metadata == {"user_id": "7"}
+    assert engine.get("up") is None
+    assert engine.on_price("AAPL", 99.0, 4.0) == []
+    assert engine.on_price("AAPL", 101.0, 5.0) == []
+    fired, rebased = engine.take_changes()
+    assert [rule.id for rule in fired] == ["up"]
+    assert rebased == []
+    assert [event.rule_id for event in engine.on_price("AAPL", 89.0, 6.0)] == ["down"]
+
+
+def test_repeating_threshold_fires_again_after_crossing_back():
+    """
+    Test that a repeating threshold stays armed but needs the price to cross back first.
+    """
+    engine = AlertEngine()
+    engine.upsert([threshold("up", 100.0, repeat=True)])
+
+    prices = [99.0, 101.0, 102.0, 100.0, 98.0, 100.0]
+    fired = [bool(engine.on_price("AAPL", price, float(i))) for i, price in enumerate(prices)]
+
+    assert fired == [False, True, False, False, False, True]
+    assert engine.fired == 2
+
+
+def test_only_crossed_rules_fire():
+    """
+    Test that a move only touches the rules between the previous and the new price, in crossing order.
+    """
+    engine = AlertEngine()
+    engine.upsert(threshold(f"up-{i}", float(i)) for i in range(1, 1001))
+    engine.upsert(threshold(f"down-{i}", float(i), "below") for i in range(1, 1001))
+
+    engine.on_price("AAPL", 100.5, 1.0)
+    rising = engine.on_price("AAPL", 105.5, 2.0)
+    falling = engine.on_price("AAPL", 97.5, 3.0)
+
+    assert [event.rule_id for event in rising] == ["up-101", "up-102", "up-103", "up-104", "up-105"]
+    assert [event.rule_id for event in falling] == ["down-105", "down-104", "down-103", "down-102", "down-101", "down-100", "down-99", "down-98"]
+    assert len(engine) == 2000 - 13
+
+
+def test_percent_move_from_first_price_and_rebase():
+    """
+    Test percent moves measured from the first price, and repeating rules re-armed around the firing price.
+    """
+    engine = AlertEngine()
+    engine.upsert([
+        AlertRule(id="any", ticker="AAPL", kind="percent_move", direction="any", percent=0.1, repeat=True),
+        AlertRule(id="drop", ticker="AAPL", kind="percent_move", direction="below", percent=0.05, reference=200.0),
+    ])
+
+    assert engine.armed_levels("any") == {}
+    assert engine.armed_levels("drop") == pytest.approx({"below": 190.0})
+    engine.on_price("AAPL", 100.0, 1.0)
+    assert engine.armed_levels("any") == pytest.approx({"above": 110.0, "below": 90.0})
+    assert engine.on_price("AAPL", 109.0, 2.0) == []
+    [event] = engine.on_price("AAPL", 111.0, 3.0)
+
+    assert (event.rule_id, event.direction) == ("any", "above")
+    rule = engine.get("any")
+    assert rule is not None and rule.reference == 111.0
+    _, rebased = engine.take_changes()
+    assert {rule.id: rule.reference for rule in rebased} == {"any": 111.0}
+    assert [event.rule_id for event in engine.on_price("AAPL", 99.0, 4.0)] == ["any"]
+
+
+def test_indicator_cross_follows_the_line():
+    """
+    Test that indicator rules arm with the moving average and fire when either the price or the line crosses.
+    """
+    engine = AlertEngine()
+    rule = AlertRule(id="sma", ticker="AAPL", kind="indicator_cross", direction="above", indicator="sma", period=20, repeat=True)
+    engine.upsert([rule])
+    engine.on_price("AAPL", 95.0, 1.0)
+    assert engine.on_price("AAPL", 120.0, 2.0) == []  # not armed yet
+
+    assert engine.set_indicator("AAPL", "sma", 20, 125.0, 3.0) == []
+    assert engine.armed_levels("sma") == {"above": 125.0}
+    [crossed] = engine.on_price("AAPL", 126.0, 4.0)
+    assert crossed.level == 125.0
+    engine.on_price("AAPL", 118.0, 5.0)
+    [moved] = engine.set_indicator("AAPL", "sma", 20, 117.0, 6.0)
+
+    assert (moved.level, moved.price) == (117.0, 118.0)
+    assert engine.indicator_keys() == {("AAPL", "sma", 20)}
+
+
+def test_upsert_and_replace_keep_unchanged_rules_armed():
+    """
+    Test that identical rules keep their state, changed rules are re-armed and replace() drops missing rules.
+    """
+    engine = AlertEngine()
+    percent = AlertRule(id="p", ticker="MSFT", kind="percent_move", direction="any", percent=0.1)
+    engine.upsert([percent, threshold("t", 100.0)])
+    engine.on_price("MSFT", 50.0, 1.0)
+    armed = engine.get("p")
+
+    engine.replace([armed, threshold("t", 100.0)])  # type: ignore[list-item]
+    assert engine.armed_levels("p") == pytest.approx({"above": 55.0, "below": 45.0})
+    engine.replace([threshold("t", 110.0)])
+
+    assert engine.get("p") is None
+    assert engine.armed_levels("t") == {"above": 110.0}
+    assert engine.tickers == ["AAPL"]
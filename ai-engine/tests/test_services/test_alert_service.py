@@ -0,0 +1,270 @@
+"""
+Tests for the price alert service, rule store and webhook delivery.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import json
+from datetime import UTC, datetime, timedelta
+
+import httpx
+import pytest
+
+from app.config.settings import Settings
+from app.core.errors import ValidationError
+from app.core.executor import BlockingExecutor
+from app.schemas.alert import AlertRuleSchema
+from app.services.alert_engine import AlertEvent, AlertRule
+from app.services.alert_service import AlertService
+from app.services.alert_store import AlertRuleStore, EvaluatorLock
+from app.services.alert_webhook import SIGNATURE_HEADER, AlertWebhook
+from app.services.bar_store import BarStore
+from app.services.history_service import HistoryService
+from app.services.indicators import sma
+from app.services.providers.local import LocalMarketDataProvider
+from app.services.stock_service import StockService
+
+NOW = datetime(2024, 6, 5, 15, 0, tzinfo=UTC).timestamp()
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = NOW
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def no_sleep(seconds: float) -> None:
+    return None
+
+
+def make_service(tmp_path, clock: Clock, webhook: AlertWebhook | None = None, **overrides: object) -> AlertService:
+    settings = Settings(
+        market_calendar_enabled=False, metrics_enabled=False, quote_cache_ttl_open=0.0, **overrides  # type: ignore[arg-type]
+    )
+    provider = LocalMarketDataProvider(clock=clock)
+    return AlertService(
+        StockService(settings=settings, provider=provider),
+        HistoryService(settings=settings, provider=provider, store=BarStore(str(tmp_path / "bars")), clock=clock),
+        settings=settings,
+        store=AlertRuleStore(tmp_path / "alerts"),
+        lock=EvaluatorLock(tmp_path / "alerts"),
+        webhook=webhook or AlertWebhook(None),
+        executor=BlockingExecutor(max_workers=1, queue_depth=8, name="alerts-test"),
+        clock=clock,
+        sleep=no_sleep
+    )
+
+
+def recording_client(statuses: list[int] | None = None) -> tuple[httpx.AsyncClient, list[httpx.Request]]:
+    """
+    Client over a mock backend that records requests and answers with `statuses` (then 200).
+    """
+    requests: list[httpx.Request] = []
+    pending = list(statuses or [])
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(pending.pop(0) if pending else 200)
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler)), requests
+
+
+def event(rule_id: str) -> AlertEvent:
+    return AlertEvent(
+        id=f"event-{rule_id}", rule_id=rule_id, ticker="AAPL", kind="threshold", direction="above",
+        level=100.0, price=101.0, previous_price=99.0, timestamp=NOW, metadata={"user_id": "7"}
+    )
+
+
+def test_store_is_shared_and_compare_and_set(tmp_path):
+    """
+    Test that a second store instance sees writes, and evaluation changes do not overwrite newer rules.
+    """
+    writer, reader = AlertRuleStore(tmp_path), AlertRuleStore(tmp_path)
+    rule = AlertRule(id="p", ticker="AAPL", kind="percent_move", direction="any", percent=0.1)
+    writer.update(upsert=[rule])
+
+    assert reader.changed()
+    assert reader.load() == [rule]
+    assert not reader.changed()
+
+    edited = AlertRule(id="p", ticker="AAPL", kind="percent_move", direction="any", percent=0.2)
+    reader.update(upsert=[edited])
+    rules = writer.update(rebased=[AlertRule(id="p", ticker="AAPL", kind="percent_move", direction="any", percent=0.1, reference=50.0)])
+    assert rules == [edited]
+    assert writer.update(fired=[rule]) == [edited]
+    assert writer.update(fired=[edited]) == []
+
+
+def test_evaluator_lock_is_exclusive(tmp_path):
+    """
+    Test that only one holder at a time evaluates, and the role passes on when released.
+    """
+    first, second = EvaluatorLock(tmp_path), EvaluatorLock(tmp_path)
+
+    assert first.try_acquire()
+    assert not second.try_acquire()
+    first.release()
+    assert second.try_acquire()
+    assert second.held and not first.held
+    second.release()
+
+
+@pytest.mark.asyncio
+async def test_rules_are_shared_between_workers(tmp_path):
+    """
+    Test rule creation, listing through another service instance, limits and deletion.
+    """
+    clock = Clock()
+    first = make_service(tmp_path, clock, alert_max_rules=2)
+    second = make_service(tmp_path, clock, alert_max_rules=2)
+    rules = [
+        AlertRuleSchema(id="a", ticker="aapl", kind="threshold", level=200.0, metadata={"user_id": "7"}),
+        AlertRuleSchema(id="b", ticker="MSFT", kind="percent_move", direction="any", percent=0.05, reference=400.0),
+    ]
+
+    stored = await first.put_rules(rules)
+
+    assert [(rule.id, rule.ticker) for rule in stored] == [("a", "AAPL"), ("b", "MSFT")]
+    assert stored[1].armed_levels == pytest.approx({"above": 420.0, "below": 380.0})
+    assert [rule.id for rule in await second.list_rules("aapl")] == ["a"]
+    with pytest.raises(ValidationError, match="Too many alert rules"):
+        await second.put_rules([AlertRuleSchema(id="c", ticker="AAPL", kind="threshold", level=1.0)])
+
+    deleted = await second.delete_rule("a")
+    assert deleted.metadata == {"user_id": "7"}
+    assert [rule.id for rule in await first.list_rules()] == ["b"]
+    with pytest.raises(ValidationError, match="not found"):
+        await first.delete_rule("a")
+
+
+@pytest.mark.asyncio
+async def test_evaluation_fires_crossed_rules_and_persists(tmp_path):
+    """
+    Test that a quote crossing a rule's level fires it once, queues the event and removes the rule from the store.
+    """
+    clock = Clock()
+    webhook = AlertWebhook("https://backend.example/alerts", sleep=no_sleep)
+    service = make_service(tmp_path, clock, webhook=webhook)
+    provider = LocalMarketDataProvider(clock=clock)
+    before = (await provider.get_quote("AAPL")).price
+    clock.now += 3600
+    after = (await provider.get_quote("AAPL")).price
+    clock.now = NOW
+    direction = "above" if after > before else "below"
+    await service.put_rules([
+        AlertRuleSchema(id="cross", ticker="AAPL", kind="threshold", direction=direction, level=(before + after) / 2),
+        AlertRuleSchema(id="far", ticker="AAPL", kind="threshold", direction="above", level=before * 10),
+    ])
+
+    assert await service.evaluate_once() == []
+    clock.now += 3600
+    [fired] = await service.evaluate_once()
+
+    assert (fired.rule_id, fired.direction) == ("cross", direction)
+    assert fired.price == pytest.approx(after, abs=0.01)
+    assert webhook.queued == 1
+    assert [rule.id for rule in AlertRuleStore(tmp_path / "alerts").load()] == ["far"]
+    stats = await service.get_stats()
+    assert (stats.rules, stats.evaluations, stats.fired) == (1, 2, 1)
+
+
+@pytest.mark.asyncio
+async def test_indicator_rules_arm_with_moving_average(tmp_path):
+    """
+    Test that indicator_cross rules watch the moving average of daily closes.
+    """
+    clock = Clock()
+    service = make_service(tmp_path, clock)
+    await service.put_rules([
+        AlertRuleSchema(id="sma", ticker="AAPL", kind="indicator_cross", direction="below", indicator="sma", period=5)
+    ])
+
+    await service.evaluate_once()
+
+    end = datetime.fromtimestamp(NOW, tz=UTC)
+    bars = await service.history_service.get_bars("AAPL", "1d", end - timedelta(days=45), end)
+    expected = sma(bars[["close"]], 5).iloc[-1, 0]
+    [rule] = await service.list_rules()
+    assert rule.armed_levels == pytest.approx({"below": expected})
+
+
+@pytest.mark.asyncio
+async def test_webhook_sends_signed_batches():
+    """
+    Test that queued events go out in batches of at most batch_size, with an HMAC signature.
+    """
+    client, requests = recording_client()
+    webhook = AlertWebhook("https://backend.example/alerts", batch_size=2, secret="s3cret", sleep=no_sleep)
+    webhook.start(client)
+    webhook.offer([event("a"), event("b"), event("c")])
+
+    await webhook.close()
+    await client.aclose()
+
+    assert [len(json.loads(request.content)["events"]) for request in requests] == [2, 1]
+    first = requests[0]
+    assert json.loads(first.content)["events"][0]["metadata"] == {"user_id": "7"}
+    expected = hmac.new(b"s3cret", first.content, hashlib.sha256).hexdigest()
+    assert first.headers[SIGNATURE_HEADER] == f"sha256={expected}"
+    assert (webhook.delivered, webhook.calls, webhook.queued) == (3, 2, 0)
+
+
+@pytest.mark.asyncio
+async def test_webhook_retries_server_errors_only():
+    """
+    Test retries on 5xx responses and no retry of a rejected (4xx) batch.
+    """
+    client, requests = recording_client([503, 503, 400])
+    webhook = AlertWebhook("https://backend.example/alerts", batch_size=1, max_retries=3, sleep=no_sleep)
+    webhook.start(client)
+    webhook.offer([event("a"), event("b")])
+
+    await webhook.flush()
+    await webhook.close()
+    await client.aclose()
+
+    assert len(requests) == 4
+    assert (webhook.failed, webhook.delivered) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_webhook_close_resends_batch_in_flight():
+    """
+    Test that a batch whose call is cut off by close() is sent again by the last flush.
+    """
+    requests: list[httpx.Request] = []
+    sending = asyncio.Event()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if len(requests) == 1:
+            sending.set()
+            await asyncio.Event().wait()
+        return httpx.Response(200)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    webhook = AlertWebhook("https://backend.example/alerts", batch_size=2, sleep=no_sleep)
+    webhook.start(client)
+    webhook.offer([event("a"), event("b")])
+    await sending.wait()
+
+    await webhook.close()
+    await client.aclose()
+
+    assert [event["id"] for event in json.loads(requests[-1].content)["events"]] == ["event-a", "event-b"]
+    assert (len(requests), webhook.delivered, webhook.queued) == (2, 2, 0)
+
+
+def test_webhook_queue_drops_oldest_events():
+    """
+    Test that a full queue keeps the newest events.
+    """
+    webhook = AlertWebhook("https://backend.example/alerts", queue_size=2)
+
+    webhook.offer([event("a"), event("b"), event("c")])
+
+    assert (webhook.queued, webhook.dropped) == (2, 1)
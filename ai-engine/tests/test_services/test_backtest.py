@@ -0,0 +1,268 @@
+"""
+Tests for the vectorized backtest kernels and the backtest service.
+"""
+
+import asyncio
+import os
+import time
+from datetime import UTC, datetime
+
+import numpy as np
+import pytest
+
+from app.config.settings import Settings
+from app.core.errors import ServiceOverloadedError, ValidationError, WorkerCrashedError
+from app.schemas.backtest import BacktestRequest
+from app.server import available_cpus
+from app.services.backtest import (
+    STAT_NAMES,
+    ma_crossover_weights,
+    rebalance_weights,
+    rolling_means,
+    run_grid,
+    simulate,
+    summarize,
+)
+from app.services.backtest_service import BacktestService
+from app.services.bar_store import BarStore
+from app.services.history_service import HistoryService
+from app.services.providers.local import LocalMarketDataProvider
+
+NOW = datetime(2024, 6, 5, 15, 0, tzinfo=UTC).timestamp()
+
+
+def make_service(tmp_path, **overrides: object) -> BacktestService:
+    settings = Settings(market_calendar_enabled=False, metrics_enabled=False, **overrides)  # type: ignore[arg-type]
+    provider = LocalMarketDataProvider(clock=lambda: NOW)
+    history = HistoryService(settings=settings, provider=provider, store=BarStore(str(tmp_path)), clock=lambda: NOW)
+    return BacktestService(history, settings=settings, clock=lambda: NOW)
+
+
+@pytest.fixture
+def service(tmp_path):
+    """
+    Provide a backtest service on the local provider at a fixed time, running on a thread.
+    """
+    service = make_service(tmp_path, backtest_processes=1, backtest_max_tickers=3, backtest_max_combinations=10)
+    yield service
+    service.close()
+
+
+def crash(chunk: list[tuple[int, ...]]) -> np.ndarray:
+    """
+    Kill the worker process running a chunk.
+    """
+    os._exit(1)
+
+
+def echo(chunk: list[tuple[int, ...]]) -> np.ndarray:
+    """
+    Return a chunk's parameters as its stats.
+    """
+    return np.array(chunk, dtype=np.float64)
+
+
+def slow_echo(chunk: list[tuple[int, ...]]) -> np.ndarray:
+    """
+    Return a chunk's parameters as its stats after a while.
+    """
+    time.sleep(0.5)
+    return echo(chunk)
+
+
+def stat(stats: np.ndarray, name: str) -> np.ndarray:
+    return stats[:, STAT_NAMES.index(name)]
+
+
+def test_rolling_means_wait_for_full_windows():
+    """
+    Test that moving averages are NaN until a window is full of prices.
+    """
+    prices = np.array([[np.nan, 1.0], [2.0, 2.0], [4.0, 3.0], [6.0, 4.0]])
+
+    means = rolling_means(prices, [2, 3])
+
+    np.testing.assert_allclose(means[2][:, 0], [np.nan, np.nan, 3.0, 5.0])
+    np.testing.assert_allclose(means[3][:, 1], [np.nan, np.nan, 2.0, 3.0])
+
+
+def test_buy_and_hold_follows_prices_after_entry_cost():
+    """
+    Test that a fully invested single-ticker run tracks the price path, paying costs only on entry.
+    """
+    prices = np.array([[100.0], [110.0], [99.0], [121.0]])
+    weights = np.ones((1, 4, 1))
+
+    simulation = simulate(prices, weights, cost_rate=0.001, initial_capital=1000.0)
+
+    np.testing.assert_allclose(simulation.turnover[0], [1.0, 0.0, 0.0])
+    np.testing.assert_allclose(simulation.equity[0], [1000.0, 1099.0, 989.1, 1208.9])
+    stats = summarize(simulation, periods_per_year=252)
+    assert stat(stats, "max_drawdown")[0] == pytest.approx(0.1)
+    assert stat(stats, "total_return")[0] == pytest.approx(0.2089)
+    assert stat(stats, "exposure")[0] == pytest.approx(1.0)
+
+
+def test_rebalancing_trades_the_drift_back():
+    """
+    Test that turnover between rebalances is zero and a rebalance trades the drifted weights back.
+    """
+    prices = np.array([[10.0, 10.0], [20.0, 10.0], [20.0, 10.0], [20.0, 10.0]])
+
+    weights = rebalance_weights(prices, [2], np.ones(2))
+    simulation = simulate(prices, weights, cost_rate=0.0)
+
+    np.testing.assert_allclose(weights[0, 1], [2 / 3, 1 / 3])
+    np.testing.assert_allclose(weights[0, 2], [0.5, 0.5])
+    np.testing.assert_allclose(simulation.turnover[0], [1.0, 0.0, 1 / 3])
+    np.testing.assert_allclose(simulation.equity[0], [1.0, 1.5, 1.5, 1.5])
+
+
+def test_ma_crossover_invests_sleeves_above_the_slow_average():
+    """
+    Test crossover weights, with and without shorting.
+    """
+    prices = np.array([[1.0, 4.0], [2.0, 3.0], [3.0, 2.0], [4.0, 1.0]])
+
+    long_only = ma_crossover_weights(prices, [(1, 2)])
+    long_short = ma_crossover_weights(prices, [(1, 2)], allow_short=True)
+
+    np.testing.assert_allclose(long_only[0], [[0, 0], [0.5, 0], [0.5, 0], [0.5, 0]])
+    np.testing.assert_allclose(long_short[0], [[0, 0], [0.5, -0.5], [0.5, -0.5], [0.5, -0.5]])
+
+
+def test_run_grid_matches_single_runs():
+    """
+    Test that simulating a grid at once gives the same stats as each combination alone.
+    """
+    rng = np.random.default_rng(0)
+    prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (300, 4)), axis=0))
+    grid = [(5, 20), (10, 50), (20, 100)]
+
+    stats = run_grid(prices, "ma_crossover", grid, cost_rate=0.0006, periods_per_year=252)
+
+    assert stats.shape == (3, len(STAT_NAMES))
+    for i, combination in enumerate(grid):
+        single = run_grid(prices, "ma_crossover", [combination], cost_rate=0.0006, periods_per_year=252)
+        np.testing.assert_allclose(stats[i], single[0])
+    assert (stat(stats, "turnover") > 0).all()
+
+
+@pytest.mark.asyncio
+async def test_backtests_a_parameter_grid(service: BacktestService):
+    """
+    Test a crossover sweep over stored history: runs by Sharpe and the best equity curve.
+    """
+    result = await service.run(BacktestRequest(
+        tickers=["AAPL", "msft"], strategy="ma_crossover", fast_windows=[5, 10, 50], slow_windows=[20, 50]
+    ))
+
+    assert result.tickers == ["AAPL", "MSFT"]
+    assert [run.parameters for run in result.runs if run.parameters == {"fast": 50, "slow": 50}] == []
+    assert len(result.runs) == 4
+    sharpes = [run.sharpe for run in result.runs]
+    assert sharpes == sorted(sharpes, reverse=True)
+    assert result.best.parameters == result.runs[0].parameters
+    assert len(result.best.equity) == len(result.timestamps) == result.bars
+    assert result.best.equity[0] == 10_000.0
+    assert result.best.equity[-1] == pytest.approx(result.runs[0].final_equity)
+    assert max(result.best.drawdown) == pytest.approx(result.runs[0].max_drawdown)
+
+
+@pytest.mark.asyncio
+async def test_rebalance_uses_target_weights(service: BacktestService):
+    """
+    Test that rebalancing runs one combination per period and ignores zero-weight tickers.
+    """
+    result = await service.run(BacktestRequest(
+        tickers=["AAPL", "MSFT"], strategy="rebalance", rebalance_periods=[5, 21], weights={"aapl": 1.0}
+    ))
+
+    assert sorted(run.parameters["period"] for run in result.runs) == [5, 21]
+    for run in result.runs:
+        assert run.exposure == pytest.approx(1.0, abs=0.01)
+        assert run.turnover < 1.0
+
+
+@pytest.mark.asyncio
+async def test_rejects_oversized_or_empty_grids(service: BacktestService):
+    """
+    Test the ticker and combination limits and grids without a fast < slow pair.
+    """
+    with pytest.raises(ValidationError, match="Too many tickers"):
+        await service.run(BacktestRequest(tickers=["A", "B", "C", "D"], strategy="rebalance"))
+    with pytest.raises(ValidationError, match="Too many parameter combinations"):
+        await service.run(BacktestRequest(
+            tickers=["AAPL"], strategy="ma_crossover", fast_windows=list(range(1, 5)), slow_windows=list(range(10, 15))
+        ))
+    with pytest.raises(ValidationError, match="fast window shorter"):
+        await service.run(BacktestRequest(tickers=["AAPL"], strategy="ma_crossover", fast_windows=[50], slow_windows=[20]))
+
+
+@pytest.mark.asyncio
+async def test_process_pool_matches_thread(tmp_path):
+    """
+    Test that chunks simulated on worker processes give the same runs as one thread.
+    """
+    request = BacktestRequest(
+        tickers=["AAPL", "MSFT"], strategy="ma_crossover", fast_windows=[5, 10, 20], slow_windows=[30, 60]
+    )
+    threaded = make_service(tmp_path / "thread", backtest_processes=1)
+    pooled = make_service(tmp_path / "pool", backtest_processes=2, backtest_chunk_elements=1)
+    try:
+        expected = await threaded.run(request)
+        result = await pooled.run(request)
+    finally:
+        threaded.close()
+        pooled.close()
+
+    assert result.runs == expected.runs
+    assert result.best == expected.best
+
+
+@pytest.mark.asyncio
+async def test_dead_worker_restarts_the_pool(tmp_path):
+    """
+    Test that a worker process dying fails the run with a 503 and the next run gets a new pool.
+    """
+    service = make_service(tmp_path, backtest_processes=2)
+    grid = [(period,) for period in range(4)]
+    try:
+        with pytest.raises(WorkerCrashedError) as excinfo:
+            await service._run_chunks(crash, grid, 1)
+        assert excinfo.value.status_code == 503
+        assert service._pool is None
+
+        stats = await service._run_chunks(echo, grid, 1)
+    finally:
+        service.close()
+
+    assert stats[:, 0].tolist() == [0.0, 1.0, 2.0, 3.0]
+
+
+def test_processes_default_to_the_workers_share_of_cpus(tmp_path):
+    """
+    Test that the server workers' default pools together have one process per CPU.
+    """
+    assert make_service(tmp_path, server_workers=1).processes == available_cpus()
+    assert make_service(tmp_path, server_workers=available_cpus() * 2).processes == 1
+    assert make_service(tmp_path, server_workers=1, backtest_processes=3).processes == 3
+
+
+@pytest.mark.asyncio
+async def test_rejects_grids_beyond_max_pending(tmp_path):
+    """
+    Test that grids arriving while BACKTEST_MAX_PENDING grids run on the processes are rejected with a 503.
+    """
+    service = make_service(tmp_path, backtest_processes=2, backtest_max_pending=1)
+    grid = [(period,) for period in range(4)]
+    try:
+        running = asyncio.create_task(service._run_chunks(slow_echo, grid, 1))
+        await asyncio.sleep(0)
+        with pytest.raises(ServiceOverloadedError):
+            await service._run_chunks(echo, grid, 1)
+        assert len(await running) == 4
+
+        assert len(await service._run_chunks(echo, grid, 1)) == 4
+    finally:
+        service.close()
@@ -0,0 +1,78 @@
+"""
+Tests for the local bar store.
+"""
+
+from pathlib import Path
+
+import numpy as np
+
+from app.services.bar_store import BAR_DTYPE, BarStore
+
+
+def make_records(timestamps: list[int]) -> np.ndarray:
+    records = np.zeros(len(timestamps), dtype=BAR_DTYPE)
+    records["ts"] = timestamps
+    records["close"] = [float(ts) for ts in timestamps]
+    return records
+
+
+def test_write_and_read_range(tmp_path: Path):
+    """
+    Test that stored bars are read back by time range.
+    """
+    store = BarStore(tmp_path)
+    store.write("AAPL", "1d", make_records([10, 20, 30, 40]), start=0, end=50)
+
+    records = store.read("AAPL", "1d", 20, 40)
+
+    assert records["ts"].tolist() == [20, 30]
+    assert store.coverage("AAPL", "1d").start == 0
+    assert store.coverage("AAPL", "1d").end == 50
+
+
+def test_tail_is_appended_in_place(tmp_path: Path):
+    """
+    Test that newer bars are appended and duplicates are ignored.
+    """
+    store = BarStore(tmp_path)
+    store.write("AAPL", "1d", make_records([10, 20]), start=0, end=25)
+    store.write("AAPL", "1d", make_records([20, 30]), start=15, end=35)
+
+    assert store.read("AAPL", "1d", 0, 100)["ts"].tolist() == [10, 20, 30]
+    assert store.coverage("AAPL", "1d").end == 35
+
+
+def test_head_backfill_rewrites_partition(tmp_path: Path):
+    """
+    Test that bars older than the stored range are merged in front.
+    """
+    store = BarStore(tmp_path)
+    store.write("AAPL", "1d", make_records([30, 40]), start=25, end=45)
+    store.write("AAPL", "1d", make_records([10, 20]), start=5, end=25)
+
+    assert store.read("AAPL", "1d", 0, 100)["ts"].tolist() == [10, 20, 30, 40]
+    assert store.coverage("AAPL", "1d").start == 5
+
+
+def test_partial_trailing_record_is_ignored(tmp_path: Path):
+    """
+    Test that an interrupted append does not corrupt reads.
+    """
+    store = BarStore(tmp_path)
+    store.write("005930.KS", "1d", make_records([10, 20]), start=0, end=25)
+
+    data_file = next((tmp_path / "1d").glob("*.bars"))
+    with open(data_file, "ab") as f:
+        f.write(b"\x00" * 5)
+
+    assert store.read("005930.KS", "1d", 0, 100)["ts"].tolist() == [10, 20]
+
+
+def test_missing_partition(tmp_path: Path):
+    """
+    Test reads of a ticker that was never stored.
+    """
+    store = BarStore(tmp_path)
+
+    assert store.coverage("MSFT", "1d") is None
+    assert store.read("MSFT", "1d", 0, 100).size == 0
@@ -0,0 +1,54 @@
+"""
+Tests for the binary encodings of shared cache values.
+"""
+
+import numpy as np
+import pytest
+
+from app.schemas.stock import StockPriceSchema
+from app.services.bar_store import BAR_DTYPE, Coverage
+from app.services.cache_codec import decode_bars, decode_quote, encode_bars, encode_quote
+
+
+def test_quote_round_trip_is_compact():
+    """
+    Test that a quote and its expiry survive encoding in far fewer bytes than JSON.
+    """
+    price = StockPriceSchema(ticker="005930.KS", current_price=71200.0, currency="KRW", market_status="closed")
+
+    payload = encode_quote(price, 1_700_000_000.5)
+
+    assert decode_quote(payload) == (price, 1_700_000_000.5)
+    assert len(payload) < len(price.model_dump_json()) / 2
+
+
+def test_bars_round_trip_without_copying():
+    """
+    Test that bars decode as a read-only view with their coverage.
+    """
+    records = np.zeros(3, dtype=BAR_DTYPE)
+    records["ts"] = [0, 86_400, 172_800]
+    records["close"] = [1.0, 2.0, 3.0]
+
+    decoded, coverage = decode_bars(encode_bars(records, Coverage(start=0, end=259_200)))
+
+    np.testing.assert_array_equal(decoded, records)
+    assert coverage == Coverage(start=0, end=259_200)
+    assert not decoded.flags.writeable
+
+
+@pytest.mark.parametrize("payload", [b"", b"\x02" + bytes(16), bytes(17) + b"\x00"])
+def test_unknown_bar_layouts_are_rejected(payload: bytes):
+    """
+    Test that truncated payloads and other layout versions raise ValueError.
+    """
+    with pytest.raises(ValueError):
+        decode_bars(payload)
+
+
+def test_unknown_quote_layouts_are_rejected():
+    """
+    Test that a quote of another layout version raises ValueError.
+    """
+    with pytest.raises(ValueError):
+        decode_quote(b"\x90")
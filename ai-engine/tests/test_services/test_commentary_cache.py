@@ -0,0 +1,104 @@
+"""
+Tests for the LLM commentary cache.
+"""
+
+import numpy as np
+import pytest
+
+from app.services.commentary_cache import CommentaryCache, content_words, embed, normalize_question
+
+
+class FakeClock:
+    """
+    Manually advanced monotonic clock.
+    """
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_cache(clock: FakeClock | None = None, max_size: int = 100) -> CommentaryCache:
+    return CommentaryCache(max_size=max_size, ttl=60.0, similarity_threshold=0.9, clock=clock or FakeClock())
+
+
+def test_embedding_matches_rephrasings_only():
+    """
+    Test that rephrased questions are similar and different questions are not.
+    """
+    rephrased = embed(normalize_question("What's driving AAPL today?")) @ embed(
+        normalize_question("what is driving aapl today")
+    )
+    different = embed(normalize_question("Is it a good time to buy?")) @ embed(
+        normalize_question("Is it a good time to sell?")
+    )
+
+    assert rephrased >= 0.9
+    assert different < 0.9
+    assert np.linalg.norm(embed("")) == 0.0
+
+
+def test_exact_and_near_duplicate_hits_within_context():
+    """
+    Test that a question hits its own answer and a near-duplicate's, but only in the same context.
+    """
+    cache = make_cache()
+    question = normalize_question("What's driving AAPL today?")
+    cache.set("ctx", question, "answer", prompt_tokens=10, completion_tokens=20)
+
+    exact = cache.get("ctx", question)
+    near = cache.get("ctx", normalize_question("What is driving AAPL today"))
+
+    assert exact is not None and exact.text == "answer"
+    assert near is not None and near.text == "answer"
+    assert cache.get("other", question) is None
+    assert cache.get("ctx", normalize_question("Summarize the risks")) is None
+    assert cache.get("ctx", "") is None
+
+
+@pytest.mark.parametrize(("cached", "asked"), [
+    ("Is it a good time to increase my position in AAPL?", "Is it a good time to decrease my position in AAPL?"),
+    ("What is the outlook for AAPL over the next month?", "What is the outlook for AAPL over the next year?"),
+    ("Why did AAPL drop?", "Why did AAPL not drop?"),
+])
+def test_questions_differing_in_one_word_do_not_share_answers(cached: str, asked: str):
+    """
+    Test that questions whose trigram embeddings are close but whose content words differ miss.
+    """
+    cache = make_cache()
+    cache.set("ctx", normalize_question(cached), "answer", prompt_tokens=1, completion_tokens=1)
+
+    assert cache.get("ctx", normalize_question(asked)) is None
+    assert content_words(normalize_question("What's driving AAPL today?")) == {"driving", "aapl", "today"}
+
+
+def test_entries_expire_after_ttl():
+    """
+    Test that answers are not served after their TTL.
+    """
+    clock = FakeClock()
+    cache = make_cache(clock)
+    cache.set("ctx", "", "answer", prompt_tokens=1, completion_tokens=1)
+
+    clock.now += 59.0
+    assert cache.get("ctx", "") is not None
+    clock.now += 2.0
+    assert cache.get("ctx", "") is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_context_is_evicted():
+    """
+    Test that exceeding max_size evicts the least recently used context.
+    """
+    cache = make_cache(max_size=2)
+    cache.set("a", "", "answer a", prompt_tokens=1, completion_tokens=1)
+    cache.set("b", "", "answer b", prompt_tokens=1, completion_tokens=1)
+    cache.get("a", "")
+    cache.set("c", "", "answer c", prompt_tokens=1, completion_tokens=1)
+
+    assert len(cache) == 2
+    assert cache.get("b", "") is None
+    assert cache.get("a", "") is not None
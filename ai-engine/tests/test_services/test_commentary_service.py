@@ -0,0 +1,203 @@
+"""
+Tests for the LLM commentary service against a local fake LLM server.
+"""
+
+import time
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+import httpx
+import pytest
+
+from app.config.settings import Settings
+from app.core.errors import ExternalAPIError, RateLimitError, ValidationError
+from app.core.http_client import create_openai_client
+from app.schemas.commentary import CommentaryRequest
+from app.schemas.portfolio import PositionSchema
+from app.services.commentary_service import CommentaryService
+from app.services.providers.local import LocalMarketDataProvider
+from app.services.stock_service import StockService
+from benchmarks.fake_llm import FakeLLMServer
+
+
+@pytest.fixture(scope="module")
+def llm_server() -> Iterator[FakeLLMServer]:
+    """
+    Run one fake LLM server for the module.
+    """
+    with FakeLLMServer(reply_tokens=12) as server:
+        yield server
+
+
+@pytest.fixture
+def settings(llm_server: FakeLLMServer) -> Settings:
+    """
+    Settings pointing the LLM client at the fake server.
+    """
+    return Settings(
+        market_data_provider="local",
+        market_calendar_enabled=False,
+        openai_api_key="fake",
+        llm_base_url=llm_server.base_url,
+        llm_max_tokens=100,
+        commentary_max_tickers=3
+    )
+
+
+@pytest.fixture
+def service(settings: Settings) -> CommentaryService:
+    """
+    Commentary service over the local provider with a fresh cache and budgets.
+    """
+    stock_service = StockService(settings=settings, provider=LocalMarketDataProvider())
+    return CommentaryService(stock_service, settings=settings)
+
+
+@asynccontextmanager
+async def llm_client(settings: Settings) -> AsyncIterator[Any]:
+    """
+    OpenAI client talking to the LLM_BASE_URL server over a dedicated HTTP client.
+    """
+    async with httpx.AsyncClient() as http_client:
+        yield create_openai_client(settings, http_client).with_options(max_retries=0)
+
+
+@pytest.mark.asyncio
+async def test_stream_yields_tokens_and_charges_budget(
+    service: CommentaryService, settings: Settings, llm_server: FakeLLMServer
+):
+    """
+    Test that commentary is streamed in pieces and its reported usage is charged to the caller.
+    """
+    calls = llm_server.stats.calls
+    job = await service.prepare(CommentaryRequest(tickers=["aapl"], language="en"), "alice")
+
+    async with llm_client(settings) as llm:
+        pieces = [piece async for piece in service.stream(job, llm)]
+
+    assert len(pieces) == 12
+    assert job.result is not None
+    assert job.result.commentary == "".join(pieces)
+    assert job.result.tickers == ["AAPL"]
+    assert job.result.cached is False
+    assert job.result.usage.completion_tokens == 12
+    assert llm_server.stats.calls == calls + 1
+    assert service.budgets.used("alice") == job.result.usage.prompt_tokens + 12
+
+
+@pytest.mark.asyncio
+async def test_repeated_and_rephrased_questions_are_served_from_cache(
+    service: CommentaryService, settings: Settings, llm_server: FakeLLMServer
+):
+    """
+    Test that the same inputs, and a near-duplicate question, cost no further LLM calls or tokens.
+    """
+    calls = llm_server.stats.calls
+    async with llm_client(settings) as llm:
+        first = await service.generate(
+            await service.prepare(CommentaryRequest(tickers=["AAPL"], question="What's driving AAPL today?"), "alice"),
+            llm
+        )
+        used = service.budgets.used("alice")
+
+        again = await service.generate(
+            await service.prepare(CommentaryRequest(tickers=["AAPL"], question="what is driving aapl today"), "bob"),
+            llm
+        )
+        other_language = await service.generate(
+            await service.prepare(
+                CommentaryRequest(tickers=["AAPL"], question="What's driving AAPL today?", language="en"), "alice"
+            ),
+            llm
+        )
+
+    assert again.cached is True
+    assert again.commentary == first.commentary
+    assert again.usage == first.usage
+    assert other_language.cached is False
+    assert llm_server.stats.calls == calls + 2
+    assert service.budgets.used("bob") == 0
+    assert service.budgets.used("alice") > used
+
+
+@pytest.mark.asyncio
+async def test_portfolio_prompt_includes_positions(service: CommentaryService):
+    """
+    Test that portfolio positions of one ticker are summed into the prompt.
+    """
+    request = CommentaryRequest(positions=[
+        PositionSchema(ticker="AAPL", quantity=4),
+        PositionSchema(ticker="aapl", quantity=6),
+        PositionSchema(ticker="005930.KS", quantity=50),
+    ])
+
+    job = await service.prepare(request, "alice")
+    job.release()
+
+    prompt = job.messages[1]["content"]
+    assert "AAPL: 10 shares at" in prompt
+    assert "005930.KS: 50 shares at" in prompt
+    assert "Korean" in job.messages[0]["content"]
+
+
+@pytest.mark.asyncio
+async def test_budget_rejects_before_calling_llm(settings: Settings, llm_server: FakeLLMServer):
+    """
+    Test that a caller over its token budget is rejected without an LLM call.
+    """
+    settings = settings.model_copy(update={"commentary_token_budget": 50})
+    service = CommentaryService(StockService(settings=settings, provider=LocalMarketDataProvider()), settings=settings)
+    calls = llm_server.stats.calls
+
+    with pytest.raises(RateLimitError):
+        await service.prepare(CommentaryRequest(tickers=["AAPL"]), "alice")
+
+    assert llm_server.stats.calls == calls
+
+
+@pytest.mark.asyncio
+async def test_prepare_validates_tickers(service: CommentaryService):
+    """
+    Test the ticker limit and that a request without any priced ticker fails.
+    """
+    with pytest.raises(ValidationError):
+        await service.prepare(CommentaryRequest(tickers=["A", "B", "C", "D"]), "alice")
+    with pytest.raises(ExternalAPIError):
+        await service.prepare(CommentaryRequest(tickers=["INVALID_1"]), "alice")
+
+
+@pytest.mark.asyncio
+async def test_llm_failure_releases_budget(service: CommentaryService, settings: Settings):
+    """
+    Test that an unreachable LLM raises ExternalAPIError and frees the caller's slot.
+    """
+    unreachable = settings.model_copy(update={"llm_base_url": "http://127.0.0.1:9/v1"})
+    async with llm_client(unreachable) as llm:
+        job = await service.prepare(CommentaryRequest(tickers=["AAPL"]), "alice")
+
+        with pytest.raises(ExternalAPIError) as exc_info:
+            await service.generate(job, llm)
+
+    assert exc_info.value.details["cause"] == "llm"
+    for _ in range(service.budgets.max_concurrency):
+        (await service.prepare(CommentaryRequest(tickers=["AAPL"]), "alice")).release()
+
+
+@pytest.mark.asyncio
+async def test_first_token_arrives_before_generation_ends(settings: Settings):
+    """
+    Test that streaming hands out the first token long before the last one is generated.
+    """
+    with FakeLLMServer(reply_tokens=10, token_latency=0.05) as slow_server:
+        slow = settings.model_copy(update={"llm_base_url": slow_server.base_url})
+        service = CommentaryService(StockService(settings=slow, provider=LocalMarketDataProvider()), settings=slow)
+        job = await service.prepare(CommentaryRequest(tickers=["AAPL"]), "alice")
+        arrivals = []
+        started = time.perf_counter()
+        async with llm_client(slow) as llm:
+            async for _ in service.stream(job, llm):
+                arrivals.append(time.perf_counter() - started)
+
+    assert len(arrivals) == 10
+    assert arrivals[0] < arrivals[-1] / 3
@@ -0,0 +1,183 @@
+"""
+Tests for the FX rate service and cross-rate matrix.
+"""
+
+import asyncio
+from datetime import UTC, datetime
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.dependencies import get_fx_service
+from app.core.errors import AIEngineException, ExternalAPIError, ValidationError
+from app.main import app
+from app.schemas.stock import StockPriceSchema
+from app.services.fx_service import FxRates, FxService
+from app.services.providers.base import MarketDataProvider, Quote
+
+AS_OF = datetime(2024, 3, 1, tzinfo=UTC)
+
+
+class PairProvider(MarketDataProvider):
+    """
+    Provider serving fixed pivot pair quotes and counting batch calls.
+    """
+
+    name = "pairs"
+
+    def __init__(self, rates: dict[str, float]):
+        self.rates = rates
+        self.batches = 0
+
+    async def get_quote(self, ticker: str) -> Quote:
+        if ticker not in self.rates:
+            raise ExternalAPIError(message=f"Unknown pair {ticker}", details={"cause": "invalid_ticker"})
+        return Quote(ticker=ticker, price=self.rates[ticker], currency=ticker[3:6])
+
+    async def get_quotes(self, tickers: list[str], max_concurrency: int | None = None) -> dict[str, Quote | AIEngineException]:
+        self.batches += 1
+        await asyncio.sleep(0.01)
+        return await super().get_quotes(tickers, max_concurrency)
+
+    async def get_history(self, ticker, interval, start, end):  # type: ignore[no-untyped-def]
+        raise NotImplementedError
+
+
+def test_cross_rates_from_pivot_rates():
+    """
+    Test that every cross rate is derived from the pivot rates.
+    """
+    rates = FxRates.from_pivot_rates({"USD": 1.0, "KRW": 1350.0, "JPY": 150.0}, AS_OF)
+
+    assert rates.rate("USD", "KRW") == pytest.approx(1350.0)
+    assert rates.rate("KRW", "USD") == pytest.approx(1 / 1350)
+    assert rates.rate("JPY", "KRW") == pytest.approx(9.0)
+    np.testing.assert_allclose(np.diag(rates.matrix), 1.0)
+    np.testing.assert_allclose(rates.matrix * rates.matrix.T, 1.0)
+
+
+def test_convert_mixed_currencies_in_one_call():
+    """
+    Test vectorized conversion of amounts in several currencies.
+    """
+    rates = FxRates.from_pivot_rates({"USD": 1.0, "KRW": 1350.0, "JPY": 150.0}, AS_OF)
+
+    converted = rates.convert([10.0, 13500.0, 300.0, 1.0], ["USD", "KRW", "jpy", "USD"], "KRW")
+
+    np.testing.assert_allclose(converted, [13500.0, 13500.0, 2700.0, 1350.0])
+
+
+def test_convert_rejects_unsupported_currency():
+    """
+    Test that an unknown currency raises a validation error.
+    """
+    rates = FxRates.from_pivot_rates({"USD": 1.0, "KRW": 1350.0}, AS_OF)
+
+    with pytest.raises(ValidationError) as exc_info:
+        rates.convert([1.0], ["CHF"], "USD")
+
+    assert exc_info.value.details["cause"] == "unsupported_currency"
+
+
+@pytest.mark.asyncio
+async def test_rates_are_cached_until_the_refresh_interval():
+    """
+    Test that concurrent callers share one load and reuse it until it is due.
+    """
+    now = [1000.0]
+    provider = PairProvider({"USDKRW=X": 1350.0, "USDEUR=X": 0.9})
+    service = FxService(provider, ["KRW", "EUR"], refresh_interval=60.0, clock=lambda: now[0])
+
+    first, second = await asyncio.gather(service.get_rates(), service.get_rates())
+    await service.get_rates()
+
+    assert first is second
+    assert provider.batches == 1
+    assert first.currencies == ("USD", "KRW", "EUR")
+
+    now[0] += 61
+    provider.rates["USDKRW=X"] = 1400.0
+    refreshed = await service.get_rates()
+
+    assert provider.batches == 2
+    assert refreshed.rate("USD", "KRW") == pytest.approx(1400.0)
+
+
+@pytest.mark.asyncio
+async def test_failed_pair_keeps_last_known_rate():
+    """
+    Test that a pair missing from a refresh keeps its previous rate.
+    """
+    provider = PairProvider({"USDKRW=X": 1350.0, "USDEUR=X": 0.9})
+    service = FxService(provider, ["KRW", "EUR"])
+    await service.refresh()
+
+    del provider.rates["USDEUR=X"]
+    provider.rates["USDKRW=X"] = 1300.0
+    rates = await service.refresh()
+
+    assert rates.rate("USD", "EUR") == pytest.approx(0.9)
+    assert rates.rate("USD", "KRW") == pytest.approx(1300.0)
+
+
+@pytest.mark.asyncio
+async def test_no_rates_at_all_raises():
+    """
+    Test that the service fails when no pair could ever be loaded.
+    """
+    service = FxService(PairProvider({}), ["KRW"])
+
+    with pytest.raises(ExternalAPIError):
+        await service.get_rates()
+
+
+@pytest.mark.asyncio
+async def test_scheduler_refreshes_in_background():
+    """
+    Test that start() refreshes the matrix periodically and close() stops it.
+    """
+    provider = PairProvider({"USDKRW=X": 1350.0})
+    service = FxService(provider, ["KRW"], refresh_interval=0.02)
+
+    service.start()
+    await asyncio.sleep(0.1)
+    await service.close()
+    batches = provider.batches
+    await asyncio.sleep(0.05)
+
+    assert batches >= 2
+    assert provider.batches == batches
+
+
+@pytest.mark.asyncio
+async def test_to_base_converts_quotes():
+    """
+    Test that quotes gain base-currency prices without touching the originals.
+    """
+    service = FxService(PairProvider({"USDKRW=X": 1350.0}), ["KRW"])
+    prices = [
+        StockPriceSchema(ticker="005930.KS", current_price=71500.0, currency="KRW", market_status="open"),
+        StockPriceSchema(ticker="7203.T", current_price=2500.0, currency="JPY", market_status="open"),
+    ]
+
+    samsung, toyota = await service.to_base(prices, "usd")
+
+    assert samsung.base_currency == "USD"
+    assert samsung.base_price == pytest.approx(71500 / 1350, abs=1e-4)
+    assert toyota.base_price is None
+    assert prices[0].base_price is None
+
+
+def test_lifespan_replaces_closed_service():
+    """
+    Test that a new application lifespan gets a new FX service instead of the closed one.
+    """
+    with TestClient(app):
+        first = get_fx_service()
+        assert first._scheduler is not None
+
+    with TestClient(app):
+        second = get_fx_service()
+        assert second is not first
+        assert second._scheduler is not None
@@ -0,0 +1,164 @@
+"""
+Tests for the history service.
+"""
+
+import math
+from datetime import UTC, datetime
+from pathlib import Path
+
+import fakeredis
+import pandas as pd
+import pytest
+
+from app.config.settings import Settings
+from app.core.errors import ValidationError
+from app.core.shared_cache import SharedCache
+from app.services.bar_store import BarStore
+from app.services.history_service import HistoryService
+from app.services.providers.local import LocalMarketDataProvider
+
+
+class RecordingProvider(LocalMarketDataProvider):
+    """
+    Local provider that records every history range requested upstream.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.history_calls: list[tuple[datetime, datetime]] = []
+
+    async def get_history(self, ticker, interval, start, end) -> pd.DataFrame:
+        self.history_calls.append((start, end))
+        return await super().get_history(ticker, interval, start, end)
+
+
+class GappyProvider(LocalMarketDataProvider):
+    """
+    Local provider whose history contains an all-NaN gap row and a NaN volume.
+    """
+
+    async def get_history(self, ticker, interval, start, end) -> pd.DataFrame:
+        frame = await super().get_history(ticker, interval, start, end)
+        frame.iloc[1] = math.nan
+        frame.iloc[2, frame.columns.get_loc("volume")] = math.nan
+        return frame
+
+
+class FakeClock:
+    def __init__(self, now: datetime) -> None:
+        self.now = now.timestamp()
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_service(tmp_path: Path, clock: FakeClock) -> tuple[HistoryService, RecordingProvider]:
+    provider = RecordingProvider()
+    service = HistoryService(Settings(), provider=provider, store=BarStore(tmp_path), clock=clock)
+    return service, provider
+
+
+@pytest.mark.asyncio
+async def test_only_missing_tail_is_fetched(tmp_path: Path):
+    """
+    Test that a second request only fetches the range after the stored bars.
+    """
+    clock = FakeClock(datetime(2024, 3, 1, 12, tzinfo=UTC))
+    service, provider = make_service(tmp_path, clock)
+    start = datetime(2024, 1, 1, tzinfo=UTC)
+
+    first = await service.get_bars("AAPL", "1d", start, datetime(2024, 2, 1, tzinfo=UTC))
+    second = await service.get_bars("AAPL", "1d", start, datetime(2024, 2, 15, tzinfo=UTC))
+
+    assert provider.history_calls == [
+        (start, datetime(2024, 2, 1, tzinfo=UTC)),
+        (datetime(2024, 2, 1, tzinfo=UTC), datetime(2024, 2, 15, tzinfo=UTC)),
+    ]
+    assert second.loc[first.index].equals(first)
+
+    expected = await LocalMarketDataProvider().get_history("AAPL", "1d", start, datetime(2024, 2, 15, tzinfo=UTC))
+    pd.testing.assert_frame_equal(second, expected, check_freq=False)
+
+    await service.get_bars("AAPL", "1d", datetime(2024, 1, 10, tzinfo=UTC), datetime(2024, 2, 10, tzinfo=UTC))
+    assert len(provider.history_calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_forming_bar_is_served_but_not_stored(tmp_path: Path):
+    """
+    Test that the bar of the current, unfinished interval is never persisted.
+    """
+    clock = FakeClock(datetime(2024, 3, 5, 12, tzinfo=UTC))
+    service, provider = make_service(tmp_path, clock)
+
+    bars = await service.get_bars("AAPL", "1d", datetime(2024, 3, 1, tzinfo=UTC))
+
+    assert bars.index[-1] == pd.Timestamp("2024-03-05", tz="UTC")
+    stored = service.store.read("AAPL", "1d", 0, 2**62)
+    assert pd.to_datetime(stored["ts"][-1], unit="s", utc=True) == pd.Timestamp("2024-03-04", tz="UTC")
+
+    clock.now = datetime(2024, 3, 6, 12, tzinfo=UTC).timestamp()
+    await service.get_bars("AAPL", "1d", datetime(2024, 3, 1, tzinfo=UTC))
+    # The next fetch resumes where the previously completed range ended
+    assert provider.history_calls[-1][0] == datetime(2024, 3, 4, 12, 0, 1, tzinfo=UTC)
+
+
+@pytest.mark.asyncio
+async def test_start_must_be_before_end(tmp_path: Path):
+    """
+    Test that an empty range is rejected.
+    """
+    service, _ = make_service(tmp_path, FakeClock(datetime(2024, 3, 1, tzinfo=UTC)))
+
+    with pytest.raises(ValidationError):
+        await service.get_bars("AAPL", "1d", datetime(2024, 2, 1, tzinfo=UTC), datetime(2024, 1, 1, tzinfo=UTC))
+
+
+@pytest.mark.asyncio
+async def test_nan_bars_are_not_stored_and_nan_volume_is_served(tmp_path: Path):
+    """
+    Test that upstream gap rows are dropped and a missing volume does not break the response.
+    """
+    clock = FakeClock(datetime(2024, 3, 1, 12, tzinfo=UTC))
+    store = BarStore(tmp_path)
+    service = HistoryService(Settings(), provider=GappyProvider(), store=store, clock=clock)
+    start, end = datetime(2024, 1, 1, tzinfo=UTC), datetime(2024, 2, 1, tzinfo=UTC)
+    expected = await LocalMarketDataProvider().get_history("AAPL", "1d", start, end)
+
+    first = await service.get_history("AAPL", "1d", start, end)
+    second = await service.get_history("AAPL", "1d", start, end)
+
+    assert len(first.bars) == len(expected) - 1
+    assert second == first
+    assert first.bars[1].volume == 0
+    assert not any(math.isnan(bar.close) for bar in first.bars)
+
+
+@pytest.mark.asyncio
+async def test_workers_share_completed_bars_through_the_shared_cache(tmp_path: Path):
+    """
+    Test that bars fetched by one worker are imported by another from the shared cache,
+    so it only fetches the forming bar upstream.
+    """
+    server = fakeredis.FakeServer()
+    clock = FakeClock(datetime(2024, 3, 1, 12, tzinfo=UTC))
+    first_provider, second_provider = RecordingProvider(), RecordingProvider()
+    first = HistoryService(
+        Settings(), provider=first_provider, store=BarStore(tmp_path / "first"), clock=clock,
+        shared=SharedCache(fakeredis.FakeAsyncRedis(server=server))
+    )
+    second = HistoryService(
+        Settings(), provider=second_provider, store=BarStore(tmp_path / "second"), clock=clock,
+        shared=SharedCache(fakeredis.FakeAsyncRedis(server=server))
+    )
+    start = datetime(2024, 1, 1, tzinfo=UTC)
+
+    expected = await first.get_bars("AAPL", "1d", start)
+    served = await second.get_bars("AAPL", "1d", start)
+
+    pd.testing.assert_frame_equal(served, expected)
+    assert second.store.coverage("AAPL", "1d") == first.store.coverage("AAPL", "1d")
+    # Only the range after the shared bars (the forming bar) went upstream
+    assert second_provider.history_calls == [
+        (datetime(2024, 2, 29, 12, 0, 1, tzinfo=UTC), datetime(2024, 3, 1, 12, tzinfo=UTC))
+    ]
@@ -0,0 +1,69 @@
+"""
+Tests for the technical indicator service.
+"""
+
+import asyncio
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from app.config.settings import Settings
+from app.core.errors import ValidationError
+from app.services.indicator_service import IndicatorService
+from app.services.providers.base import Interval
+from app.services.providers.local import LocalMarketDataProvider
+
+
+class FakeHistoryService:
+    """
+    History source serving local-provider bars while recording concurrency.
+    """
+
+    def __init__(self) -> None:
+        self.provider = LocalMarketDataProvider()
+        self.calls: list[str] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def get_bars(self, ticker: str, interval: Interval, start: datetime | None, end: datetime | None) -> pd.DataFrame:
+        self.calls.append(ticker)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            return await self.provider.get_history(ticker, interval, start, end)
+        finally:
+            self.in_flight -= 1
+
+
+START, END = datetime.fromisoformat("2024-01-01T00:00:00+00:00"), datetime.fromisoformat("2024-03-01T00:00:00+00:00")
+
+
+@pytest.mark.asyncio
+async def test_load_prices_limits_concurrency():
+    """
+    Test that no more than indicator_max_concurrency tickers load at once.
+    """
+    history = FakeHistoryService()
+    service = IndicatorService(history, Settings(indicator_max_concurrency=3))  # type: ignore[arg-type]
+
+    prices = await service.load_prices([f"T{i}" for i in range(10)], "1d", START, END)
+
+    assert len(history.calls) == 10
+    assert history.max_in_flight == 3
+    assert list(prices["close"].columns) == [f"T{i}" for i in range(10)]
+
+
+@pytest.mark.asyncio
+async def test_load_prices_rejects_too_many_tickers():
+    """
+    Test that requests above indicator_max_tickers are rejected before any load.
+    """
+    history = FakeHistoryService()
+    service = IndicatorService(history, Settings(indicator_max_tickers=2))  # type: ignore[arg-type]
+
+    with pytest.raises(ValidationError):
+        await service.load_prices(["AAPL", "MSFT", "GOOGL"], "1d", START, END)
+
+    assert history.calls == []
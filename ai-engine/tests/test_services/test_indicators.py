@@ -0,0 +1,122 @@
+"""
+Tests for vectorized and incremental technical indicators.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.indicators import (
+    INDICATOR_NAMES,
+    IncrementalIndicators,
+    IndicatorParams,
+    align_prices,
+    compute_indicators,
+    rsi,
+    sma,
+)
+
+PARAMS = IndicatorParams(macd_fast=3, macd_slow=6, macd_signal=4, rsi_period=5, sma_window=4,
+                         ema_span=4, bollinger_window=5, atr_period=5, volatility_window=5)
+
+
+@pytest.fixture
+def prices() -> dict[str, pd.DataFrame]:
+    """
+    Provide aligned random-walk prices for three tickers; one starts late.
+    """
+    rng = np.random.default_rng(42)
+    index = pd.date_range("2024-01-01", periods=60, freq="D", tz="UTC")
+    close = pd.DataFrame(
+        100 * np.exp(np.cumsum(rng.normal(0, 0.02, size=(60, 3)), axis=0)),
+        index=index,
+        columns=["AAPL", "MSFT", "NEW"]
+    )
+    close.iloc[:25, 2] = np.nan
+    spread = pd.DataFrame(rng.uniform(0.001, 0.02, size=(60, 3)), index=index, columns=close.columns)
+    return {"close": close, "high": close * (1 + spread), "low": close * (1 - spread)}
+
+
+def test_sma_matches_manual_mean():
+    """
+    Test SMA against a hand-computed window mean.
+    """
+    close = pd.DataFrame({"A": [1.0, 2.0, 3.0, 4.0, 5.0]})
+
+    result = sma(close, 3)
+
+    assert result["A"].isna().tolist()[:2] == [True, True]
+    assert result["A"].tolist()[2:] == [2.0, 3.0, 4.0]
+
+
+def test_rsi_is_100_without_losses():
+    """
+    Test that a strictly rising series has RSI 100.
+    """
+    close = pd.DataFrame({"A": np.arange(1.0, 30.0)})
+
+    assert rsi(close, 14)["A"].iloc[-1] == 100.0
+
+
+def test_batch_is_vectorized_per_ticker(prices: dict[str, pd.DataFrame]):
+    """
+    Test that computing all tickers at once equals computing each one alone.
+    """
+    together = compute_indicators(prices["high"], prices["low"], prices["close"], list(INDICATOR_NAMES), PARAMS)
+
+    for ticker in prices["close"].columns:
+        alone = compute_indicators(
+            prices["high"][[ticker]], prices["low"][[ticker]], prices["close"][[ticker]], list(INDICATOR_NAMES), PARAMS
+        )
+        for name, frame in alone.items():
+            pd.testing.assert_series_equal(together[name][ticker], frame[ticker])
+
+
+@pytest.mark.parametrize("new_bars", [1, 10, 40])
+def test_incremental_update_matches_batch(prices: dict[str, pd.DataFrame], new_bars: int):
+    """
+    Test that seeding from history and appending bars one at a time gives
+    the same values as a full batch recomputation.
+    """
+    high, low, close = prices["high"], prices["low"], prices["close"]
+    batch = compute_indicators(high, low, close, list(INDICATOR_NAMES), PARAMS)
+
+    state = IncrementalIndicators(high.iloc[:-new_bars], low.iloc[:-new_bars], close.iloc[:-new_bars], PARAMS)
+    for row in range(len(close) - new_bars, len(close)):
+        latest = state.update(high.iloc[row].to_numpy(), low.iloc[row].to_numpy(), close.iloc[row].to_numpy())
+        for name, values in latest.items():
+            np.testing.assert_allclose(values, batch[name].iloc[row].to_numpy(), rtol=1e-9, equal_nan=True)
+
+
+def test_align_prices_forward_fills_gaps():
+    """
+    Test that gaps after a ticker's first bar are forward-filled.
+    """
+    index = pd.date_range("2024-01-01", periods=4, freq="D", tz="UTC")
+    aligned = align_prices({
+        "US": pd.Series([1.0, 2.0, 3.0, 4.0], index=index),
+        "KR": pd.Series([10.0, 30.0], index=index[[1, 3]]),
+    })
+
+    assert np.isnan(aligned["KR"].iloc[0])
+    assert aligned["KR"].tolist()[1:] == [10.0, 10.0, 30.0]
+
+
+def test_incremental_update_forward_fills_missing_bars(prices: dict[str, pd.DataFrame]):
+    """
+    Test that NaN inputs (no new bar for a ticker) match the forward-filled batch result.
+    """
+    raw = {field: frame.copy() for field, frame in prices.items()}
+    gaps = [45, 46, 52]
+    for frame in raw.values():
+        frame.iloc[gaps, 1] = np.nan
+    aligned = {field: frame.ffill() for field, frame in raw.items()}
+    batch = compute_indicators(aligned["high"], aligned["low"], aligned["close"], list(INDICATOR_NAMES), PARAMS)
+
+    state = IncrementalIndicators(aligned["high"].iloc[:40], aligned["low"].iloc[:40], aligned["close"].iloc[:40], PARAMS)
+    for row in range(40, 60):
+        latest = state.update(*(raw[field].iloc[row].to_numpy() for field in ("high", "low", "close")))
+        for name, values in latest.items():
+            np.testing.assert_allclose(values, batch[name].iloc[row].to_numpy(), rtol=1e-9, equal_nan=True)
+
+    assert not np.isnan(latest["sma"][1])
@@ -0,0 +1,112 @@
+"""
+Tests for the exchange trading calendar.
+"""
+
+from datetime import UTC, date, datetime
+
+import pytest
+
+from app.services.market_calendar import MarketCalendar, exchange_of
+
+
+def utc(*args: int) -> datetime:
+    return datetime(*args, tzinfo=UTC)
+
+
+@pytest.fixture(scope="module")
+def calendar() -> MarketCalendar:
+    """
+    Provide a calendar built around 2026.
+    """
+    return MarketCalendar(clock=lambda: utc(2026, 6, 1, 12))
+
+
+@pytest.mark.parametrize(
+    ("ticker", "exchange"),
+    [("AAPL", "US"), ("brk-b", "US"), ("005930.KS", "KRX"), ("035720.kq", "KRX"), ("KRW=X", "FX"), ("7203.T", None)]
+)
+def test_exchange_of(ticker: str, exchange: str | None):
+    """
+    Test that the exchange is resolved from the ticker suffix.
+    """
+    assert exchange_of(ticker) == exchange
+
+
+@pytest.mark.parametrize(
+    ("now", "status"),
+    [
+        (utc(2026, 10, 19, 13, 29), "closed"),  # Monday 09:29 New York
+        (utc(2026, 10, 19, 13, 30), "open"),
+        (utc(2026, 10, 19, 20, 0), "closed"),   # 16:00 close
+        (utc(2026, 10, 17, 15, 0), "closed"),   # Saturday
+        (utc(2026, 4, 3, 15, 0), "closed"),     # Good Friday
+        (utc(2026, 7, 3, 15, 0), "closed"),     # Independence Day observed on Friday
+        (utc(2026, 11, 26, 15, 0), "closed"),   # Thanksgiving
+        (utc(2026, 3, 9, 13, 30), "open"),      # first Monday of daylight saving time
+    ]
+)
+def test_us_sessions(calendar: MarketCalendar, now: datetime, status: str):
+    """
+    Test NYSE/NASDAQ hours, weekends and holidays.
+    """
+    assert calendar.status("AAPL", now) == status
+
+
+def test_us_half_day_closes_early(calendar: MarketCalendar):
+    """
+    Test that the day after Thanksgiving closes at 13:00 New York time.
+    """
+    open_state = calendar.state("AAPL", utc(2026, 11, 27, 17, 59))
+    closed_state = calendar.state("AAPL", utc(2026, 11, 27, 18, 0))
+
+    assert open_state.is_open
+    assert open_state.next_close == utc(2026, 11, 27, 18, 0)
+    assert not closed_state.is_open
+    assert closed_state.next_open == utc(2026, 11, 30, 14, 30)
+
+
+def test_krx_sessions(calendar: MarketCalendar):
+    """
+    Test KRX hours, the late first session of the year and lunar holidays.
+    """
+    assert calendar.status("005930.KS", utc(2026, 10, 16, 6, 29)) == "open"    # 15:29 Seoul
+    assert calendar.status("005930.KS", utc(2026, 10, 16, 6, 30)) == "closed"  # 15:30 close
+    assert calendar.status("005930.KS", utc(2026, 1, 2, 0, 30)) == "closed"    # 09:30, opens at 10:00
+    assert calendar.status("005930.KS", utc(2026, 1, 2, 1, 0)) == "open"
+    assert calendar.status("005930.KS", utc(2026, 2, 17, 2, 0)) == "closed"    # Seollal
+    assert calendar.status("005930.KS", utc(2026, 12, 31, 2, 0)) == "closed"   # year-end closing day
+
+
+def test_fx_trades_around_the_clock_on_weekdays(calendar: MarketCalendar):
+    """
+    Test that FX is open from Sunday 17:00 to Friday 17:00 New York time.
+    """
+    sunday_evening = calendar.state("KRW=X", utc(2026, 10, 18, 21, 30))
+
+    assert sunday_evening.is_open
+    assert sunday_evening.next_close == utc(2026, 10, 23, 21, 0)
+    assert calendar.status("KRW=X", utc(2026, 10, 17, 12, 0)) == "closed"
+    assert calendar.seconds_until_open("KRW=X", utc(2026, 10, 18, 20, 0)) == 3600.0
+
+
+def test_unknown_exchange_is_always_open(calendar: MarketCalendar):
+    """
+    Test that tickers without a calendar are treated as open.
+    """
+    state = calendar.state("7203.T", utc(2026, 10, 17, 12, 0))
+
+    assert state.is_open
+    assert state.exchange is None
+    assert calendar.seconds_until_open("7203.T") == 0.0
+
+
+def test_extra_holidays_and_later_years():
+    """
+    Test configured closures and lookups beyond the prebuilt years.
+    """
+    calendar = MarketCalendar(extra_holidays={"krx": [date(2027, 2, 8)]}, clock=lambda: utc(2026, 6, 1))
+
+    assert calendar.status("005930.KS", utc(2027, 2, 8, 2, 0)) == "closed"
+    assert calendar.status("005930.KS", utc(2027, 2, 10, 2, 0)) == "open"
+    assert calendar.status("AAPL", utc(2031, 7, 4, 15, 0)) == "closed"
+    assert calendar.status("AAPL", utc(2031, 7, 7, 15, 0)) == "open"
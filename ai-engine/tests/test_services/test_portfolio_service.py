@@ -0,0 +1,115 @@
+"""
+Tests for the portfolio valuation and risk service.
+"""
+
+from datetime import UTC, datetime
+
+import pytest
+
+from app.config.settings import Settings
+from app.core.errors import ValidationError
+from app.schemas.portfolio import PortfolioRiskRequest, PositionSchema
+from app.services.bar_store import BarStore
+from app.services.fx_service import FxService
+from app.services.history_service import HistoryService
+from app.services.portfolio_service import PortfolioService
+from app.services.providers.local import LocalMarketDataProvider
+from app.services.stock_service import StockService
+
+NOW = datetime(2024, 6, 5, 15, 0, tzinfo=UTC).timestamp()
+
+
+@pytest.fixture
+def service(tmp_path) -> PortfolioService:
+    """
+    Provide a portfolio service on the local provider at a fixed time.
+    """
+    settings = Settings(market_calendar_enabled=False, metrics_enabled=False, portfolio_max_positions=3)
+    provider = LocalMarketDataProvider(clock=lambda: NOW)
+    return PortfolioService(
+        StockService(settings=settings, provider=provider),
+        HistoryService(settings=settings, provider=provider, store=BarStore(str(tmp_path)), clock=lambda: NOW),
+        FxService(provider, ["KRW", "EUR"], clock=lambda: NOW),
+        settings=settings,
+        clock=lambda: NOW
+    )
+
+
+def request(*positions: tuple[str, float], **options: object) -> PortfolioRiskRequest:
+    return PortfolioRiskRequest(
+        positions=[PositionSchema(ticker=ticker, quantity=quantity) for ticker, quantity in positions],
+        **options  # type: ignore[arg-type]
+    )
+
+
+@pytest.mark.asyncio
+async def test_values_positions_in_base_currency(service: PortfolioService):
+    """
+    Test FX conversion, duplicate aggregation and portfolio totals.
+    """
+    result = await service.get_risk(request(("AAPL", 10), ("005930.KS", 20), ("aapl", 5), base_currency="USD"))
+
+    aapl, samsung = result.positions
+    assert (aapl.ticker, aapl.quantity, aapl.fx_rate) == ("AAPL", 15, 1.0)
+    assert samsung.currency == "KRW"
+    assert samsung.fx_rate == pytest.approx(1 / 1350, rel=0.5)
+    assert samsung.market_value == pytest.approx(20 * samsung.price * samsung.fx_rate)
+    assert result.market_value == pytest.approx(aapl.market_value + samsung.market_value)
+    assert aapl.weight + samsung.weight == pytest.approx(1.0)
+    assert result.errors == []
+
+
+@pytest.mark.asyncio
+async def test_position_in_unsupported_currency_is_reported(service: PortfolioService):
+    """
+    Test that a position quoted in a currency without an FX rate is left out.
+    """
+    result = await service.get_risk(request(("AAPL", 1), ("7203.T", 100)))
+
+    assert [position.ticker for position in result.positions] == ["AAPL"]
+    assert result.errors[0].ticker == "7203.T"
+    assert result.errors[0].details == {"ticker": "7203.T", "currency": "JPY", "cause": "unsupported_currency"}
+
+
+@pytest.mark.asyncio
+async def test_rejects_unsupported_base_currency(service: PortfolioService):
+    """
+    Test that a base currency outside FX_CURRENCIES is rejected.
+    """
+    with pytest.raises(ValidationError):
+        await service.get_risk(request(("AAPL", 1), base_currency="CHF"))
+
+
+@pytest.mark.asyncio
+async def test_risk_uses_completed_daily_history(service: PortfolioService):
+    """
+    Test that risk figures come from the daily closes and decompose the volatility.
+    """
+    result = await service.get_risk(request(("AAPL", 10), ("MSFT", -4), ("005930.KS", 20), base_currency="KRW"))
+
+    assert result.observations > 200
+    assert result.volatility > 0
+    assert result.var_parametric > 0 and result.var_historical > 0
+    assert sum(position.risk_contribution for position in result.positions) == pytest.approx(result.volatility)
+    assert sum(position.risk_contribution_pct for position in result.positions) == pytest.approx(1.0)
+    assert result.daily_pnl == pytest.approx(sum(position.daily_pnl for position in result.positions))
+
+
+@pytest.mark.asyncio
+async def test_unpriced_positions_are_reported(service: PortfolioService):
+    """
+    Test that a ticker without a quote is listed in errors and left out.
+    """
+    result = await service.get_risk(request(("AAPL", 10), ("INVALID_1", 1)))
+
+    assert [position.ticker for position in result.positions] == ["AAPL"]
+    assert [error.ticker for error in result.errors] == ["INVALID_1"]
+
+
+@pytest.mark.asyncio
+async def test_rejects_too_many_positions(service: PortfolioService):
+    """
+    Test that portfolios above portfolio_max_positions are rejected.
+    """
+    with pytest.raises(ValidationError):
+        await service.get_risk(request(("AAPL", 1), ("MSFT", 1), ("GOOGL", 1), ("NVDA", 1)))
@@ -0,0 +1,230 @@
+"""
+Tests for the model runtime, registry, micro-batcher and prediction service.
+"""
+
+import asyncio
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from app.config.settings import Settings
+from app.core.errors import ModelInferenceError, ValidationError
+from app.core.executor import BlockingExecutor
+from app.models.batcher import MicroBatcher
+from app.models.registry import ModelRegistry
+from app.models.runtime import LinearModel, load_model, save_linear_model
+from app.services.prediction_service import PredictionService
+
+FEATURES = ["return_1d", "return_5d", "rsi_14"]
+
+
+@pytest.fixture
+def model_dir(tmp_path: Path) -> Path:
+    """
+    Provide a model directory holding one logistic regression artifact.
+    """
+    save_linear_model(tmp_path / "price_direction.npz", FEATURES, [2.0, 1.0, 0.0], bias=0.0, version="2024-06-01")
+    return tmp_path
+
+
+@pytest.fixture
+def executor():
+    """
+    Provide an inference executor and shut it down after the test.
+    """
+    executor = BlockingExecutor(max_workers=2, queue_depth=4, name="test-inference")
+    yield executor
+    executor.shutdown()
+
+
+def test_linear_model_round_trip(model_dir: Path):
+    """
+    Test that a saved logistic regression loads with its metadata and predicts sigmoid(x @ w + b).
+    """
+    model = load_model(model_dir / "price_direction.npz")
+
+    assert isinstance(model, LinearModel)
+    assert model.version == "2024-06-01"
+    assert model.features == tuple(FEATURES)
+    probabilities = model.predict(np.array([[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [-1000.0, 0.0, 0.0]]))
+    np.testing.assert_allclose(probabilities, [0.5, 1 / (1 + np.exp(-2.0)), 0.0])
+
+
+def test_registry_loads_and_warms_up_models(model_dir: Path):
+    """
+    Test that models report "loading" until load() and "ready" afterwards.
+    """
+    registry = ModelRegistry(model_dir, warmup_rows=8)
+
+    assert registry.loading
+    assert [status.state for status in registry.statuses()] == ["loading"]
+    with pytest.raises(ModelInferenceError):
+        registry.get("price_direction")
+
+    registry.load()
+
+    assert not registry.loading
+    status = registry.statuses()[0]
+    assert (status.state, status.kind, status.version) == ("ready", "logistic", "2024-06-01")
+    assert status.load_seconds is not None
+    assert registry.get("price_direction").features == tuple(FEATURES)
+
+
+def test_registry_isolates_broken_artifacts(model_dir: Path):
+    """
+    Test that a corrupt artifact fails alone while the other models are served.
+    """
+    (model_dir / "broken.npz").write_bytes(b"not a model")
+    (model_dir / "README.txt").write_text("ignored")
+    registry = ModelRegistry(model_dir)
+
+    registry.load()
+
+    states = {status.name: status.state for status in registry.statuses()}
+    assert states == {"broken": "failed", "price_direction": "ready"}
+    assert registry.statuses()[0].error
+    with pytest.raises(ModelInferenceError):
+        registry.get("broken")
+    with pytest.raises(ValidationError):
+        registry.get("unknown")
+
+
+def test_registry_without_model_directory_is_empty(tmp_path: Path):
+    """
+    Test that a missing model directory serves no models and is not loading.
+    """
+    registry = ModelRegistry(tmp_path / "missing")
+
+    assert registry.statuses() == []
+    assert not registry.loading
+
+
+@pytest.mark.asyncio
+async def test_batcher_merges_concurrent_requests(executor: BlockingExecutor):
+    """
+    Test that concurrent requests share forward passes and get their own rows back.
+    """
+    calls: list[int] = []
+
+    def predict(rows: np.ndarray) -> np.ndarray:
+        calls.append(len(rows))
+        return rows[:, 0] * 2
+
+    batcher = MicroBatcher("test", predict, executor, max_batch_size=64, max_wait=0.05)
+    try:
+        results = await asyncio.gather(*(batcher.submit(np.array([[float(i)], [float(i) + 0.5]])) for i in range(20)))
+    finally:
+        await batcher.close()
+
+    for i, result in enumerate(results):
+        np.testing.assert_allclose(result, [2 * i, 2 * i + 1])
+    assert sum(calls) == 40
+    assert len(calls) < 20
+    assert (batcher.batches, batcher.rows) == (len(calls), 40)
+
+
+@pytest.mark.asyncio
+async def test_batcher_sends_full_batch_without_waiting(executor: BlockingExecutor):
+    """
+    Test that reaching max_batch_size sends the batch long before max_wait.
+    """
+    batcher = MicroBatcher("test", lambda rows: rows[:, 0], executor, max_batch_size=4, max_wait=30.0)
+    try:
+        result = await asyncio.wait_for(
+            asyncio.gather(*(batcher.submit(np.ones((1, 1))) for _ in range(4))),
+            timeout=5.0
+        )
+    finally:
+        await batcher.close()
+
+    assert len(result) == 4
+    assert batcher.batches == 1
+
+
+@pytest.mark.asyncio
+async def test_batcher_sends_oversized_request_alone(executor: BlockingExecutor):
+    """
+    Test that a request larger than max_batch_size is still served, in a pass of its own.
+    """
+    calls: list[int] = []
+
+    def predict(rows: np.ndarray) -> np.ndarray:
+        calls.append(len(rows))
+        return rows[:, 0]
+
+    batcher = MicroBatcher("test", predict, executor, max_batch_size=4, max_wait=0.01)
+    try:
+        large, small = await asyncio.gather(batcher.submit(np.ones((10, 1))), batcher.submit(np.ones((2, 1))))
+    finally:
+        await batcher.close()
+
+    assert (len(large), len(small)) == (10, 2)
+    assert calls == [10, 2]
+
+
+@pytest.mark.asyncio
+async def test_batcher_wraps_model_errors(executor: BlockingExecutor):
+    """
+    Test that a failing forward pass fails every request of the batch with ModelInferenceError.
+    """
+    def predict(rows: np.ndarray) -> np.ndarray:
+        raise RuntimeError("bad weights")
+
+    batcher = MicroBatcher("test", predict, executor, max_batch_size=8, max_wait=0.01)
+    try:
+        results = await asyncio.gather(
+            batcher.submit(np.ones((1, 1))), batcher.submit(np.ones((1, 1))), return_exceptions=True
+        )
+    finally:
+        await batcher.close()
+
+    assert all(isinstance(result, ModelInferenceError) for result in results)
+    assert results[0].details["error"] == "bad weights"
+
+
+@pytest.mark.asyncio
+async def test_service_predicts_directions(model_dir: Path):
+    """
+    Test that the service returns probabilities and directions per instance once loaded.
+    """
+    service = PredictionService(settings=Settings(inference_model_path=str(model_dir)))
+    try:
+        service.start()
+        assert service.loading
+        await service.load()
+        assert not service.loading
+
+        prediction = await service.predict("price_direction", [[1.0, 0.0, 50.0], [-1.0, 0.0, 50.0]])
+    finally:
+        await service.close()
+
+    assert prediction.model == "price_direction"
+    assert prediction.version == "2024-06-01"
+    assert prediction.directions == ["up", "down"]
+    assert prediction.probabilities[0] == pytest.approx(1 / (1 + np.exp(-2.0)))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "instances",
+    [
+        [[1.0, 0.0]],
+        [[1.0, 0.0, 0.0], [1.0, 0.0]],
+        [[float("nan"), 0.0, 0.0]],
+        [[0.0, 0.0, 0.0]] * 3,
+    ],
+    ids=["too-few-features", "ragged", "not-finite", "too-many-instances"]
+)
+async def test_service_rejects_invalid_instances(model_dir: Path, instances: list[list[float]]):
+    """
+    Test that instances not matching the model's input are rejected before batching.
+    """
+    settings = Settings(inference_model_path=str(model_dir), inference_max_instances=2)
+    service = PredictionService(settings=settings)
+    try:
+        await service.load()
+        with pytest.raises(ValidationError):
+            await service.predict("price_direction", instances)
+    finally:
+        await service.close()
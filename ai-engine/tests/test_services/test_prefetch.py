@@ -0,0 +1,203 @@
+"""
+Tests for request-frequency ranking and the background quote prefetcher.
+"""
+
+import asyncio
+
+import pytest
+
+from app.config.settings import Settings
+from app.core.errors import AIEngineException, ExternalAPIError
+from app.services.prefetch import QuotePrefetcher, TickerDemand
+from app.services.providers.base import Quote
+from app.services.providers.local import LocalMarketDataProvider
+from app.services.stock_service import StockService
+
+
+class BatchRecordingProvider(LocalMarketDataProvider):
+    """
+    Local provider recording every batch call.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.batches: list[list[str]] = []
+
+    async def get_quotes(self, tickers: list[str], max_concurrency: int | None = None) -> dict[str, Quote | AIEngineException]:
+        self.batches.append(list(tickers))
+        return await super().get_quotes(tickers, max_concurrency)
+
+
+class FakeTime:
+    """
+    Manual clock whose sleep only advances the time.
+    """
+
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def make_prefetcher(time: FakeTime, **options: object) -> tuple[QuotePrefetcher, BatchRecordingProvider]:
+    provider = BatchRecordingProvider()
+    service = StockService(settings=Settings(market_calendar_enabled=False, quote_cache_ttl_open=30.0), provider=provider)
+    prefetcher = QuotePrefetcher(service, clock=time, sleep=time.sleep, rng=lambda: 0.5, **options)  # type: ignore[arg-type]
+    return prefetcher, provider
+
+
+def test_demand_ranks_recent_requests_higher():
+    """
+    Test that decayed counts favour recent requests and forget old ones.
+    """
+    now = [0.0]
+    demand = TickerDemand(half_life=10.0, clock=lambda: now[0])
+
+    demand.record(["OLD"] * 4)
+    now[0] = 20.0  # two half-lives: OLD counts 1.0
+    demand.record(["NEW", "NEW"])
+    demand.record(["MID"])
+
+    assert demand.top(10) == ["NEW", "OLD", "MID"]
+
+    now[0] = 40.0  # NEW 0.5, MID 0.25, OLD 0.25
+    assert demand.top(10) == ["NEW"]
+
+
+def test_demand_survives_rebasing():
+    """
+    Test that ranking is unchanged after the forward-decay weights are rebased.
+    """
+    now = [0.0]
+    demand = TickerDemand(half_life=1.0, clock=lambda: now[0])
+
+    now[0] = 49.0
+    demand.record(["A", "A", "B"])
+    now[0] = 51.0
+    demand.record(["C"])
+
+    assert demand.top(3) == ["C", "A"]
+
+
+def test_hot_set_is_watchlist_then_most_requested():
+    """
+    Test hot-set ordering and its size limit.
+    """
+    time = FakeTime()
+    prefetcher, _ = make_prefetcher(time, watchlist=["aapl", "MSFT"], hot_set_size=3)
+    prefetcher.stock_service.demand.record(["TSLA", "NVDA", "NVDA", "AAPL"])
+
+    assert prefetcher.hot_set() == ["AAPL", "MSFT", "NVDA"]
+
+
+@pytest.mark.asyncio
+async def test_warm_up_loads_watchlist_in_batches_and_marks_ready():
+    """
+    Test that warm-up fills the cache in batches before reporting ready.
+    """
+    time = FakeTime()
+    prefetcher, provider = make_prefetcher(time, watchlist=[f"T{i}" for i in range(5)], batch_size=2)
+
+    assert not prefetcher.ready
+    await prefetcher.warm_up()
+
+    assert prefetcher.ready
+    assert provider.batches == [["T0", "T1"], ["T2", "T3"], ["T4"]]
+    assert all(prefetcher.stock_service.quote_cache.get(f"T{i}") is not None for i in range(5))
+
+
+@pytest.mark.asyncio
+async def test_warm_up_waits_for_budget():
+    """
+    Test that warm-up beyond the per-minute budget waits for the window to pass.
+    """
+    time = FakeTime()
+    prefetcher, provider = make_prefetcher(time, watchlist=["A", "B", "C"], batch_size=10, budget_per_minute=2)
+
+    await prefetcher.warm_up()
+
+    assert provider.batches == [["A", "B"], ["C"]]
+    assert time.now >= 60.0
+
+
+@pytest.mark.asyncio
+async def test_cycle_refreshes_only_due_tickers_within_budget():
+    """
+    Test that a cycle skips fresh quotes and caps refreshes at the budget.
+    """
+    time = FakeTime()
+    prefetcher, provider = make_prefetcher(time, budget_per_minute=3, batch_size=2, interval=5.0)
+    service = prefetcher.stock_service
+    await service.get_current_prices(["FRESH"])
+    service.demand.record(["A", "B", "C", "D", "FRESH", "FRESH"])
+    provider.batches.clear()
+
+    refreshed = await prefetcher.run_once()
+
+    assert refreshed == 3
+    assert provider.batches == [["A", "B"], ["C"]]
+    # Two batches spread over the 5-second cycle
+    assert time.sleeps == [2.5]
+    assert await prefetcher.run_once() == 0
+
+
+@pytest.mark.asyncio
+async def test_failing_tickers_back_off():
+    """
+    Test that tickers failing upstream are skipped for doubling pauses instead of every cycle.
+    """
+    time = FakeTime()
+    prefetcher, provider = make_prefetcher(time, interval=5.0, max_backoff=12.0)
+    original = provider.get_quotes
+
+    async def failing_quotes(tickers: list[str], max_concurrency: int | None = None):
+        results = await original(tickers, max_concurrency)
+        results["DOWN"] = ExternalAPIError(message="down", details={"cause": "upstream_error"})
+        return results
+
+    provider.get_quotes = failing_quotes  # type: ignore[method-assign]
+    prefetcher.stock_service.demand.record(["AAPL", "DOWN"])
+
+    await prefetcher.run_once()
+    assert provider.batches[-1] == ["AAPL", "DOWN"]
+    assert prefetcher.due() == []
+
+    # Failed once: skipped for one interval, then for two
+    time.now = 5.0
+    assert prefetcher.due() == ["DOWN"]
+    await prefetcher.run_once()
+    time.now = 14.0
+    assert prefetcher.due() == []
+    time.now = 15.0
+    await prefetcher.run_once()
+    # Capped at max_backoff
+    time.now = 26.0
+    assert prefetcher.due() == []
+    time.now = 27.0
+    assert prefetcher.due() == ["DOWN"]
+
+
+@pytest.mark.asyncio
+async def test_start_and_close():
+    """
+    Test that the background task warms up and stops on close.
+    """
+    provider = BatchRecordingProvider()
+    service = StockService(settings=Settings(market_calendar_enabled=False), provider=provider)
+    prefetcher = QuotePrefetcher(service, watchlist=["AAPL"], interval=0.01)
+
+    prefetcher.start()
+    for _ in range(100):
+        if prefetcher.ready:
+            break
+        await asyncio.sleep(0.01)
+    await prefetcher.close()
+
+    assert prefetcher.ready
+    assert provider.batches[0] == ["AAPL"]
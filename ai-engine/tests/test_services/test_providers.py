@@ -0,0 +1,242 @@
+"""
+Tests for market data providers.
+"""
+
+import asyncio
+import json
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from app.config.settings import Settings
+from app.core.errors import CircuitOpenError, ExternalAPIError
+from app.core.executor import get_blocking_executor
+from app.core.resilience import CircuitBreaker, LatencyTracker
+from app.services.providers.base import BAR_COLUMNS
+from app.services.providers.factory import create_market_data_provider
+from app.services.providers.instrumented import InstrumentedProvider
+from app.services.providers.local import LocalMarketDataProvider
+from app.services.providers.resilient import ResilientProvider
+from app.services.providers.yahoo import YahooFinanceProvider
+
+
+def test_factory_selects_provider_from_settings():
+    """
+    Test that the provider is selected by Settings.market_data_provider.
+    """
+    plain = {"metrics_enabled": False, "circuit_breaker_enabled": False}
+    local = create_market_data_provider(Settings(market_data_provider="local", **plain))
+    yahoo = create_market_data_provider(Settings(market_data_provider="yahoo", **plain))
+    wrapped = create_market_data_provider(Settings(market_data_provider="local"))
+
+    assert isinstance(local, LocalMarketDataProvider)
+    assert isinstance(yahoo, YahooFinanceProvider)
+    assert isinstance(wrapped, InstrumentedProvider)
+    assert isinstance(wrapped.inner, ResilientProvider)
+    assert isinstance(wrapped.inner.inner, LocalMarketDataProvider)
+    assert wrapped.circuit_breaker is wrapped.inner.circuit_breaker is not None
+
+
+def test_yahoo_provider_follows_replaced_shared_executor():
+    """
+    Test that a cached Yahoo provider uses the new executor after a lifespan shut the old one down.
+    """
+    provider = YahooFinanceProvider()
+    first = provider.executor
+
+    first.shutdown()
+    get_blocking_executor.cache_clear()
+
+    assert provider.executor is not first
+    assert provider.executor is get_blocking_executor()
+
+
+@pytest.mark.asyncio
+async def test_local_quotes_are_deterministic():
+    """
+    Test that the synthetic provider returns the same quote for the same time.
+    """
+    first = LocalMarketDataProvider(clock=lambda: 1_700_000_000.0)
+    second = LocalMarketDataProvider(clock=lambda: 1_700_000_030.0)
+
+    quote = await first.get_quote("aapl")
+
+    assert quote == await second.get_quote("AAPL")
+    assert quote.price > 0
+    assert quote.currency == "USD"
+    assert (await first.get_quote("005930.KS")).currency == "KRW"
+
+
+@pytest.mark.asyncio
+async def test_local_quotes_from_data_file(tmp_path: Path):
+    """
+    Test that a data file pins quotes and restricts the known tickers.
+    """
+    data_file = tmp_path / "quotes.json"
+    data_file.write_text(json.dumps({"quotes": {"AAPL": {"price": 182.52, "currency": "USD"}}}))
+    provider = LocalMarketDataProvider(data_path=str(data_file))
+
+    quotes = await provider.get_quotes(["AAPL", "MSFT"])
+
+    assert quotes["AAPL"].price == 182.52
+    assert isinstance(quotes["MSFT"], ExternalAPIError)
+
+
+@pytest.mark.asyncio
+async def test_local_provider_simulates_latency():
+    """
+    Test that the configured latency is applied once per call.
+    """
+    provider = LocalMarketDataProvider(latency_ms=50)
+
+    started = time.perf_counter()
+    await provider.get_quotes(["AAPL", "MSFT", "GOOGL"])
+    elapsed = time.perf_counter() - started
+
+    assert 0.05 <= elapsed < 0.5
+
+
+@pytest.mark.asyncio
+async def test_local_history_is_consistent_across_ranges():
+    """
+    Test that overlapping history ranges agree on their common bars.
+    """
+    provider = LocalMarketDataProvider()
+    utc = UTC
+
+    full = await provider.get_history("AAPL", "1d", datetime(2024, 1, 1, tzinfo=utc), datetime(2024, 3, 1, tzinfo=utc))
+    tail = await provider.get_history("AAPL", "1d", datetime(2024, 2, 1, tzinfo=utc), datetime(2024, 3, 1, tzinfo=utc))
+
+    assert list(full.columns) == BAR_COLUMNS
+    assert full.index.tz is not None
+    assert (full.index.dayofweek < 5).all()
+    assert (full["high"] >= full["low"]).all()
+    assert full.loc[tail.index].equals(tail)
+
+
+@pytest.mark.asyncio
+async def test_local_provider_rejects_invalid_ticker():
+    """
+    Test that malformed tickers raise ExternalAPIError.
+    """
+    provider = LocalMarketDataProvider()
+
+    with pytest.raises(ExternalAPIError):
+        await provider.get_quote("NOT A TICKER")
+
+
+@pytest.mark.asyncio
+async def test_yahoo_provider_rejects_incomplete_quote(monkeypatch: pytest.MonkeyPatch):
+    """
+    Test that a quote without a price is reported as an ExternalAPIError, not a TypeError.
+    """
+
+    class FakeTicker:
+        def __init__(self, ticker: str):
+            self.fast_info = SimpleNamespace(last_price=None, currency="USD")
+
+    monkeypatch.setattr("app.services.providers.yahoo.yf.Ticker", FakeTicker)
+
+    with pytest.raises(ExternalAPIError) as exc_info:
+        await YahooFinanceProvider().get_quote("AAPL")
+
+    assert exc_info.value.details["cause"] == "invalid_quote"
+
+
+class FlakyProvider(LocalMarketDataProvider):
+    """
+    Local provider whose quotes fail while `down` is set.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.down = False
+        self.quote_calls = 0
+
+    async def get_quote(self, ticker: str):
+        self.quote_calls += 1
+        if self.down:
+            raise ExternalAPIError(message="down", details={"cause": "upstream_error"})
+        return await super().get_quote(ticker)
+
+
+@pytest.mark.asyncio
+async def test_resilient_provider_fails_fast_when_circuit_is_open():
+    """
+    Test that once the upstream keeps failing, calls are rejected without reaching it.
+    """
+    inner = FlakyProvider()
+    provider = ResilientProvider(inner, circuit_breaker=CircuitBreaker("local", min_calls=2))
+    inner.down = True
+
+    for _ in range(2):
+        with pytest.raises(ExternalAPIError):
+            await provider.get_quote("AAPL")
+
+    with pytest.raises(CircuitOpenError):
+        await provider.get_quote("AAPL")
+    with pytest.raises(CircuitOpenError):
+        await provider.get_quotes(["AAPL"])
+
+    assert inner.quote_calls == 2
+
+
+class FlakyBatchProvider(LocalMarketDataProvider):
+    """
+    Local provider with a native batch API whose tickers all fail while `down` is set.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.down = False
+        self.batch_calls = 0
+
+    async def get_quotes(self, tickers: list[str], max_concurrency: int | None = None):
+        self.batch_calls += 1
+        if self.down:
+            return {ticker: ExternalAPIError(message="down", details={"cause": "upstream_error"}) for ticker in tickers}
+        return {ticker: await self.get_quote(ticker) for ticker in tickers}
+
+
+@pytest.mark.asyncio
+async def test_resilient_provider_counts_failed_native_batches():
+    """
+    Test that native batches in which every ticker failed trip the breaker.
+    """
+    inner = FlakyBatchProvider()
+    provider = ResilientProvider(inner, circuit_breaker=CircuitBreaker("local", min_calls=2))
+    inner.down = True
+
+    for _ in range(2):
+        results = await provider.get_quotes(["AAPL", "MSFT"])
+        assert all(isinstance(result, ExternalAPIError) for result in results.values())
+
+    with pytest.raises(CircuitOpenError):
+        await provider.get_quotes(["AAPL"])
+    assert inner.batch_calls == 2
+
+
+@pytest.mark.asyncio
+async def test_resilient_provider_hedges_slow_quotes():
+    """
+    Test that a quote slower than the tracked percentile gets a duplicate request.
+    """
+    inner = LocalMarketDataProvider()
+    tracker = LatencyTracker(min_samples=1)
+    tracker.record(0.001)
+    provider = ResilientProvider(inner, hedge_percentile=95.0, latency_tracker=tracker)
+    delays = iter([1.0, 0.0])
+    original = inner.get_quote
+
+    async def slow_then_fast(ticker: str):
+        await asyncio.sleep(next(delays))
+        return await original(ticker)
+
+    inner.get_quote = slow_then_fast
+
+    quote = await asyncio.wait_for(provider.get_quote("AAPL"), timeout=0.5)
+
+    assert quote.ticker == "AAPL"
@@ -0,0 +1,227 @@
+"""
+Tests for the in-process quote cache.
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.errors import ExternalAPIError
+from app.services.quote_cache import QuoteCache
+
+
+class FakeClock:
+    """
+    Manually advanced clock for TTL tests.
+    """
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_cache(max_size: int = 10, ttl: float = 5.0, clock: FakeClock | None = None) -> QuoteCache[str]:
+    return QuoteCache(max_size=max_size, ttl_for=lambda value: ttl, clock=clock or FakeClock())
+
+
+def test_get_counts_hits_and_misses():
+    """
+    Test hit/miss counters on plain lookups.
+    """
+    cache = make_cache()
+
+    assert cache.get("AAPL") is None
+    cache.set("AAPL", "quote")
+    assert cache.get("AAPL") == "quote"
+
+    stats = cache.stats()
+    assert stats.hits == 1
+    assert stats.misses == 1
+    assert stats.hit_ratio == 0.5
+
+
+def test_entries_expire_after_ttl():
+    """
+    Test that entries are dropped once their TTL elapses.
+    """
+    clock = FakeClock()
+    cache = make_cache(ttl=5.0, clock=clock)
+    cache.set("AAPL", "quote")
+
+    clock.now = 4.9
+    assert cache.get("AAPL") == "quote"
+
+    clock.now = 5.0
+    assert cache.get("AAPL") is None
+    assert cache.stats().expirations == 1
+
+
+def test_ttl_remaining_does_not_count_lookups():
+    """
+    Test remaining TTL introspection used by the prefetcher.
+    """
+    clock = FakeClock()
+    cache = make_cache(ttl=5.0, clock=clock)
+    cache.set("AAPL", "quote")
+
+    clock.now = 2.0
+    assert cache.ttl_remaining("AAPL") == 3.0
+    assert cache.ttl_remaining("MSFT") is None
+    assert cache.stats().hits == cache.stats().misses == 0
+
+
+def test_ttl_depends_on_value():
+    """
+    Test that each entry gets the TTL computed from its value.
+    """
+    clock = FakeClock()
+    cache: QuoteCache[str] = QuoteCache(
+        max_size=10,
+        ttl_for=lambda value: 5.0 if value == "open" else 300.0,
+        clock=clock
+    )
+    cache.set("AAPL", "open")
+    cache.set("005930.KS", "closed")
+
+    clock.now = 60.0
+    assert cache.get("AAPL") is None
+    assert cache.get("005930.KS") == "closed"
+
+
+@pytest.mark.asyncio
+async def test_explicit_ttl_overrides_ttl_for():
+    """
+    Test that a TTL passed with a value (e.g., of a shared cache copy) replaces the computed one.
+    """
+    clock = FakeClock()
+    cache = make_cache(ttl=300.0, clock=clock)
+    cache.set("AAPL", "quote", ttl=2.0)
+
+    async def load() -> tuple[str, float | None]:
+        return "loaded", 3.0
+
+    assert await cache.get_or_load_with_ttl("MSFT", load) == "loaded"
+    assert cache.ttl_remaining("AAPL") == 2.0
+    assert cache.ttl_remaining("MSFT") == 3.0
+
+
+def test_lru_eviction():
+    """
+    Test that the least recently used entry is evicted when the cache is full.
+    """
+    cache = make_cache(max_size=2)
+    cache.set("A", "a")
+    cache.set("B", "b")
+    cache.get("A")
+    cache.set("C", "c")
+
+    assert cache.get("B") is None
+    assert cache.get("A") == "a"
+    assert cache.get("C") == "c"
+    assert cache.stats().evictions == 1
+    assert cache.stats().size == 2
+
+
+@pytest.mark.asyncio
+async def test_get_or_load_coalesces_concurrent_misses():
+    """
+    Test that N simultaneous misses for one key cause exactly one load.
+    """
+    cache = make_cache()
+    calls = 0
+
+    async def loader() -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "quote"
+
+    results = await asyncio.gather(*(cache.get_or_load("AAPL", loader) for _ in range(20)))
+
+    assert results == ["quote"] * 20
+    assert calls == 1
+    stats = cache.stats()
+    assert stats.loads == 1
+    assert stats.coalesced == 19
+
+    assert await cache.get_or_load("AAPL", loader) == "quote"
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_get_or_load_does_not_cache_failures():
+    """
+    Test that a failed load is propagated to all waiters and not cached.
+    """
+    cache = make_cache()
+    calls = 0
+
+    async def failing_loader() -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        raise ExternalAPIError(message="upstream down")
+
+    results = await asyncio.gather(
+        *(cache.get_or_load("AAPL", failing_loader) for _ in range(3)),
+        return_exceptions=True
+    )
+
+    assert all(isinstance(result, ExternalAPIError) for result in results)
+    assert calls == 1
+
+    with pytest.raises(ExternalAPIError):
+        await cache.get_or_load("AAPL", failing_loader)
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_stale_value_is_served_while_refreshing():
+    """
+    Test that an expired value in its stale window is returned at once and reloaded in the background.
+    """
+    clock = FakeClock()
+    cache: QuoteCache[str] = QuoteCache(
+        max_size=10,
+        ttl_for=lambda value: 5.0,
+        clock=clock,
+        stale_ttl=60.0,
+        mark_stale=lambda value: f"{value} (stale)"
+    )
+    cache.set("AAPL", "old")
+    refreshed = asyncio.Event()
+
+    async def loader() -> str:
+        await refreshed.wait()
+        return "new"
+
+    clock.now = 10.0
+    assert await cache.get_or_load("AAPL", loader) == "old (stale)"
+    assert await cache.get_or_load("AAPL", loader) == "old (stale)"
+    assert cache.stats().loads == 1
+
+    refreshed.set()
+    await asyncio.sleep(0.01)
+    assert cache.get("AAPL") == "new"
+    assert cache.stats().stale_hits == 2
+
+
+@pytest.mark.asyncio
+async def test_stale_window_ends():
+    """
+    Test that values past their stale window are dropped and loaded synchronously.
+    """
+    clock = FakeClock()
+    cache: QuoteCache[str] = QuoteCache(max_size=10, ttl_for=lambda value: 5.0, clock=clock, stale_ttl=60.0)
+    cache.set("AAPL", "old")
+
+    clock.now = 65.0
+    assert cache.get_stale("AAPL") is None
+
+    async def loader() -> str:
+        return "new"
+
+    assert await cache.get_or_load("AAPL", loader) == "new"
+    assert cache.stats().expirations == 1
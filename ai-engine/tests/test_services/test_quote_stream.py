@@ -0,0 +1,190 @@
+"""
+Tests for the quote stream hub.
+"""
+
+import asyncio
+from datetime import UTC, datetime
+
+import pytest
+
+from app.config.settings import Settings
+from app.core.errors import ValidationError
+from app.schemas.stock import StockPriceSchema
+from app.services.market_calendar import MarketCalendar
+from app.services.quote_stream import QuoteStreamHub, Subscription
+from app.services.stock_service import StockService
+
+
+class ScriptedStockService(StockService):
+    """
+    StockService returning scripted prices and counting upstream polls per ticker.
+    """
+
+    def __init__(self, prices: dict[str, list[float]], calendar: MarketCalendar | None = None):
+        # Without a calendar every market is open, so tests do not depend on the wall clock
+        super().__init__(Settings(market_calendar_enabled=False), calendar=calendar)
+        self.prices = prices
+        self.polls: dict[str, int] = {}
+
+    async def get_current_price(self, ticker: str) -> StockPriceSchema:
+        count = self.polls.get(ticker, 0)
+        self.polls[ticker] = count + 1
+        series = self.prices[ticker]
+        price = series[min(count, len(series) - 1)]
+        return StockPriceSchema(ticker=ticker, current_price=price, currency="USD", market_status="open")
+
+
+def quote(ticker: str, price: float) -> StockPriceSchema:
+    return StockPriceSchema(ticker=ticker, current_price=price, currency="USD", market_status="open")
+
+
+@pytest.mark.asyncio
+async def test_one_poller_per_ticker_for_many_subscribers():
+    """
+    Test that upstream polls scale with distinct tickers, not subscribers.
+    """
+    service = ScriptedStockService({"AAPL": [1.0], "MSFT": [2.0]})
+    hub = QuoteStreamHub(service, poll_interval=0.01, max_tickers=10)
+    subscriptions = [Subscription() for _ in range(50)]
+    for subscription in subscriptions:
+        hub.subscribe(subscription, ["AAPL", "msft"])
+
+    await asyncio.sleep(0.05)
+
+    assert sorted(hub.active_tickers) == ["AAPL", "MSFT"]
+    assert service.polls["AAPL"] < 10
+    for subscription in subscriptions:
+        batch = await subscription.next_batch()
+        assert {q.ticker for q in batch} == {"AAPL", "MSFT"}
+
+    for subscription in subscriptions:
+        hub.unsubscribe(subscription)
+    assert hub.active_tickers == []
+
+
+@pytest.mark.asyncio
+async def test_publishes_only_price_changes():
+    """
+    Test that unchanged prices are not published.
+    """
+    hub = QuoteStreamHub(ScriptedStockService({}), poll_interval=1.0, max_tickers=10)
+    subscription = Subscription()
+    subscription.tickers.add("AAPL")
+    hub._subscribers["AAPL"] = {subscription}
+
+    assert hub.publish(quote("AAPL", 1.0)) is True
+    assert hub.publish(quote("AAPL", 1.0)) is False
+    assert hub.publish(quote("AAPL", 1.5)) is True
+
+    batch = await subscription.next_batch()
+    assert [q.current_price for q in batch] == [1.5]
+
+
+@pytest.mark.asyncio
+async def test_slow_consumer_gets_coalesced_updates():
+    """
+    Test that undelivered updates are replaced by the latest quote per ticker.
+    """
+    subscription = Subscription()
+    for price in (1.0, 2.0, 3.0):
+        subscription.offer(quote("AAPL", price))
+    subscription.offer(quote("MSFT", 9.0))
+
+    batch = await subscription.next_batch()
+
+    assert [(q.ticker, q.current_price) for q in batch] == [("AAPL", 3.0), ("MSFT", 9.0)]
+    assert subscription.coalesced == 2
+
+
+@pytest.mark.asyncio
+async def test_new_subscriber_receives_last_quote():
+    """
+    Test that joining an already polled ticker delivers its last quote immediately.
+    """
+    service = ScriptedStockService({"AAPL": [1.0]})
+    hub = QuoteStreamHub(service, poll_interval=10.0, max_tickers=10)
+    first = Subscription()
+    hub.subscribe(first, ["AAPL"])
+    await first.next_batch()
+
+    late = Subscription()
+    hub.subscribe(late, ["AAPL"])
+
+    assert [q.current_price for q in await asyncio.wait_for(late.next_batch(), 0.1)] == [1.0]
+    assert service.polls["AAPL"] == 1
+    hub.unsubscribe(first)
+    hub.unsubscribe(late)
+
+
+def test_subscription_ticker_limit():
+    """
+    Test that a subscription cannot exceed max_tickers.
+    """
+    hub = QuoteStreamHub(ScriptedStockService({}), poll_interval=1.0, max_tickers=2)
+
+    with pytest.raises(ValidationError):
+        hub.subscribe(Subscription(), ["A", "B", "C"])
+
+
+class FlakyStockService(ScriptedStockService):
+    """
+    Scripted service whose first polls fail with a non-AIEngineException error.
+    """
+
+    def __init__(self, prices: dict[str, list[float]], failures: int):
+        super().__init__(prices)
+        self.failures = failures
+
+    async def get_current_price(self, ticker: str) -> StockPriceSchema:
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("cannot schedule new futures after shutdown")
+        return await super().get_current_price(ticker)
+
+
+@pytest.mark.asyncio
+async def test_poller_survives_unexpected_errors():
+    """
+    Test that a poller keeps running after an unexpected error and still delivers quotes.
+    """
+    service = FlakyStockService({"AAPL": [1.0]}, failures=2)
+    hub = QuoteStreamHub(service, poll_interval=0.01, max_tickers=10)
+    subscription = Subscription()
+    hub.subscribe(subscription, ["AAPL"])
+
+    batch = await asyncio.wait_for(subscription.next_batch(), timeout=1.0)
+
+    assert [q.ticker for q in batch] == ["AAPL"]
+    assert not hub._pollers["AAPL"].done()
+    await hub.close()
+
+
+@pytest.mark.asyncio
+async def test_close_stops_all_pollers():
+    """
+    Test that closing the hub cancels every poller.
+    """
+    hub = QuoteStreamHub(ScriptedStockService({"AAPL": [1.0], "MSFT": [2.0]}), poll_interval=0.01, max_tickers=10)
+    hub.subscribe(Subscription(), ["AAPL", "MSFT"])
+    pollers = list(hub._pollers.values())
+
+    await hub.close()
+
+    assert hub.active_tickers == []
+    assert all(poller.cancelled() for poller in pollers)
+
+
+@pytest.mark.asyncio
+async def test_poller_sleeps_while_market_is_closed():
+    """
+    Test that a ticker of a closed market is polled once and then not until the market opens.
+    """
+    saturday = datetime(2026, 10, 17, 15, 0, tzinfo=UTC)
+    service = ScriptedStockService({"AAPL": [1.0, 2.0], "KRW=X": [1.0, 2.0]}, MarketCalendar(clock=lambda: saturday))
+    hub = QuoteStreamHub(service, poll_interval=0.01, max_tickers=10)
+    hub.subscribe(Subscription(), ["AAPL"])
+
+    await asyncio.sleep(0.05)
+
+    assert service.polls == {"AAPL": 1}
+    await hub.close()
@@ -0,0 +1,182 @@
+"""
+Tests for text chunking, embeddings and the retrieval service.
+"""
+
+from collections.abc import Iterator
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from app.config.settings import Settings
+from app.core.errors import ValidationError
+from app.schemas.retrieval import DocumentSchema, SearchRequest
+from app.services.embeddings import HashingEmbedder, create_embedder
+from app.services.retrieval_service import RetrievalService, chunk_text, document_key
+
+
+@pytest.fixture
+def service(tmp_path: Path) -> Iterator[RetrievalService]:
+    """
+    Provide a retrieval service on an empty index with small chunks.
+    """
+    service = RetrievalService(settings=Settings(
+        retrieval_index_path=str(tmp_path / "index"),
+        retrieval_chunk_size=120,
+        retrieval_chunk_overlap=40,
+        retrieval_max_documents=3,
+        retrieval_max_results=10
+    ))
+    yield service
+    service.close()
+
+
+def document(doc_id: str, ticker: str, text: str, published_at: str = "2024-06-01T13:30:00Z") -> DocumentSchema:
+    """
+    Make a document with a title.
+    """
+    return DocumentSchema(
+        id=doc_id, ticker=ticker, published_at=datetime.fromisoformat(published_at),
+        title=f"{ticker} news", text=text, source="Reuters"
+    )
+
+
+def test_chunk_text_packs_sentences_with_overlap():
+    """
+    Test that chunks hold whole sentences within the size and repeat the previous chunk's last sentence.
+    """
+    text = "Alpha one two. Beta three four. Gamma five six. Delta seven eight."
+
+    chunks = chunk_text(text, size=34, overlap=16)
+
+    assert chunks == ["Alpha one two. Beta three four.", "Beta three four. Gamma five six.",
+                      "Gamma five six. Delta seven eight."]
+    assert chunk_text(text, size=200, overlap=16) == [text]
+    assert chunk_text("   ") == []
+
+
+def test_chunk_text_cuts_long_sentences():
+    """
+    Test that a sentence longer than the chunk size is cut into pieces.
+    """
+    chunks = chunk_text("x" * 25, size=10, overlap=0)
+
+    assert chunks == ["x" * 10, "x" * 10, "x" * 5]
+
+
+def test_hashing_embedder_is_normalized_and_deterministic():
+    """
+    Test that hashed embeddings are unit vectors and texts sharing words are closer.
+    """
+    embedder = HashingEmbedder(dims=64)
+
+    vectors = embedder.embed(["Apple beats earnings estimates", "Apple beats estimates", "Oil prices fall", ""])
+
+    assert vectors.shape == (4, 64)
+    assert vectors.dtype == np.float32
+    np.testing.assert_allclose(np.linalg.norm(vectors[:3], axis=1), 1.0, rtol=1e-6)
+    assert not vectors[3].any()
+    assert vectors[0] @ vectors[1] > vectors[0] @ vectors[2]
+    np.testing.assert_array_equal(embedder.embed(["Oil prices fall"])[0], vectors[2])
+    assert create_embedder(Settings(retrieval_embedding_dims=32)).name == "hashing-32"
+
+
+@pytest.mark.asyncio
+async def test_ingest_and_search(service: RetrievalService):
+    """
+    Test that indexed chunks are found by a query with their document fields.
+    """
+    result = await service.ingest([
+        document("a1", "AAPL", "Apple unveiled on-device AI features for the iPhone. Developers get new APIs."),
+        document("m1", "MSFT", "Microsoft reported cloud revenue growth. Azure grew faster than expected."),
+    ])
+
+    assert (result.documents, result.chunks, result.replaced) == (2, 2, 0)
+
+    found = await service.search(SearchRequest(query="Azure cloud revenue growth", top_k=1))
+
+    hit = found.hits[0]
+    assert (hit.document_id, hit.ticker, hit.chunk, hit.source) == ("m1", "MSFT", 0, "Reuters")
+    assert hit.text.startswith("Microsoft reported")
+    assert hit.published_at == datetime.fromisoformat("2024-06-01T13:30:00+00:00")
+    assert 0 < hit.score <= 1
+
+
+@pytest.mark.asyncio
+async def test_search_filters_by_ticker_and_time(service: RetrievalService):
+    """
+    Test that ticker and publication time filters apply to the results.
+    """
+    await service.ingest([
+        document("a1", "AAPL", "Earnings beat estimates on strong services revenue.", "2024-01-10T00:00:00"),
+        document("a2", "AAPL", "Earnings beat estimates again as services revenue grew.", "2024-04-10T00:00:00"),
+        document("m1", "MSFT", "Earnings beat estimates on strong cloud revenue.", "2024-04-11T00:00:00"),
+    ])
+
+    by_ticker = await service.search(SearchRequest(query="earnings beat estimates", tickers=["aapl"]))
+    by_time = await service.search(SearchRequest(
+        query="earnings beat estimates", start=datetime(2024, 4, 1), end=datetime(2024, 4, 11)
+    ))
+
+    assert {hit.document_id for hit in by_ticker.hits} == {"a1", "a2"}
+    assert [hit.document_id for hit in by_time.hits] == ["a2"]
+
+
+@pytest.mark.asyncio
+async def test_reingest_replaces_document(service: RetrievalService):
+    """
+    Test that ingesting a document ID again replaces its chunks.
+    """
+    await service.ingest([document("a1", "AAPL", "Old text about supply chains in Asia.")])
+
+    result = await service.ingest([document("a1", "AAPL", "New text about services revenue.")])
+    found = await service.search(SearchRequest(query="supply chains in Asia"))
+
+    assert result.replaced == 1
+    assert [hit.text for hit in found.hits] == ["New text about services revenue."]
+    assert service.stats().chunks == 1
+
+
+@pytest.mark.asyncio
+async def test_delete_document(service: RetrievalService):
+    """
+    Test that a deleted document is no longer found and deleting it again is rejected.
+    """
+    await service.ingest([document("a1", "AAPL", "Apple unveiled on-device AI features.")])
+
+    assert await service.delete("a1") == 1
+    assert (await service.search(SearchRequest(query="on-device AI"))).hits == []
+    with pytest.raises(ValidationError, match="not indexed"):
+        await service.delete("a1")
+
+
+@pytest.mark.asyncio
+async def test_limits(service: RetrievalService):
+    """
+    Test that too many documents or results are rejected.
+    """
+    with pytest.raises(ValidationError, match="Too many documents"):
+        await service.ingest([document(f"d{i}", "AAPL", "Text.") for i in range(4)])
+    with pytest.raises(ValidationError, match="Too many results"):
+        await service.search(SearchRequest(query="text", top_k=11))
+
+
+@pytest.mark.asyncio
+async def test_index_survives_restart(tmp_path: Path):
+    """
+    Test that a new service on the same index path finds previously ingested documents.
+    """
+    settings = Settings(retrieval_index_path=str(tmp_path))
+    first = RetrievalService(settings=settings)
+    await first.ingest([document("a1", "AAPL", "Apple unveiled on-device AI features.")])
+    first.close()
+
+    second = RetrievalService(settings=settings)
+    try:
+        found = await second.search(SearchRequest(query="on-device AI features"))
+    finally:
+        second.close()
+
+    assert [hit.document_id for hit in found.hits] == ["a1"]
+    assert second.index.record(0)["doc"] == document_key("a1")
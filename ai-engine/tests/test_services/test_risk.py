@@ -0,0 +1,82 @@
+"""
+Tests for the vectorized portfolio risk kernels.
+"""
+
+from statistics import NormalDist
+
+import numpy as np
+import pytest
+
+from app.services.risk import portfolio_risk, returns_from_prices
+
+
+@pytest.fixture
+def returns() -> np.ndarray:
+    """
+    Provide correlated daily returns of five positions over 250 days.
+    """
+    rng = np.random.default_rng(7)
+    market = rng.normal(0, 0.01, size=(250, 1))
+    return market + rng.normal(0, 0.015, size=(250, 5))
+
+
+def test_volatility_matches_covariance_matrix(returns: np.ndarray):
+    """
+    Test that volatility equals sqrt(v' * cov * v) without building the matrix.
+    """
+    exposures = np.array([1000.0, -500.0, 2500.0, 750.0, 100.0])
+
+    risk = portfolio_risk(returns, exposures)
+
+    expected = np.sqrt(exposures @ np.cov(returns, rowvar=False) @ exposures)
+    assert risk.volatility == pytest.approx(expected)
+    assert risk.observations == 250
+
+
+def test_contributions_sum_to_volatility(returns: np.ndarray):
+    """
+    Test the Euler decomposition against the covariance-matrix formula.
+    """
+    exposures = np.array([1000.0, -500.0, 2500.0, 750.0, 100.0])
+
+    risk = portfolio_risk(returns, exposures, horizon_days=10)
+
+    covariance = np.cov(returns, rowvar=False)
+    expected = exposures * (covariance @ exposures) / np.sqrt(exposures @ covariance @ exposures) * np.sqrt(10)
+    np.testing.assert_allclose(risk.contributions, expected)
+    assert risk.contributions.sum() == pytest.approx(risk.volatility)
+
+
+def test_value_at_risk(returns: np.ndarray):
+    """
+    Test historical VaR as the P&L quantile and parametric VaR as z * volatility.
+    """
+    exposures = np.full(5, 1000.0)
+
+    risk = portfolio_risk(returns, exposures, confidence=0.99)
+
+    pnl = returns @ exposures
+    assert risk.var_historical == pytest.approx(-np.quantile(pnl, 0.01))
+    assert risk.var_parametric == pytest.approx(NormalDist().inv_cdf(0.99) * risk.volatility)
+
+
+def test_too_few_observations_give_zero_risk():
+    """
+    Test that fewer than two return observations produce no risk.
+    """
+    risk = portfolio_risk(np.zeros((1, 3)), np.ones(3))
+
+    assert risk.volatility == 0.0
+    assert risk.var_historical == 0.0
+    assert risk.contributions.tolist() == [0.0, 0.0, 0.0]
+
+
+def test_returns_from_prices_zero_fills_gaps():
+    """
+    Test that periods before a position's first price get a zero return.
+    """
+    prices = np.array([[100.0, np.nan], [110.0, 50.0], [99.0, 55.0]])
+
+    returns = returns_from_prices(prices)
+
+    np.testing.assert_allclose(returns, [[0.1, 0.0], [-0.1, 0.1]])
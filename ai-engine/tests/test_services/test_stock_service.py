@@ -0,0 +1,276 @@
+"""
+Tests for stock service.
+"""
+
+import asyncio
+from datetime import UTC, datetime
+
+import fakeredis
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.dependencies import get_history_service, get_stock_service
+from app.config.settings import Settings
+from app.core.errors import AIEngineException, ExternalAPIError, ValidationError
+from app.core.shared_cache import SharedCache
+from app.main import app
+from app.schemas.stock import StockPriceSchema
+from app.services.market_calendar import MarketCalendar
+from app.services.providers.base import Interval, MarketDataProvider, Quote
+from app.services.stock_service import StockService
+
+
+class FakeProvider(MarketDataProvider):
+    """
+    Provider with per-ticker lookups that records calls and concurrency.
+    """
+
+    name = "fake"
+
+    def __init__(self, failing: set[str] | None = None, broken: set[str] | None = None):
+        self.failing = failing or set()
+        self.broken = broken or set()
+        self.calls: list[str] = []
+        self.batch_calls: list[list[str]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def get_quote(self, ticker: str) -> Quote:
+        self.calls.append(ticker)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            if ticker in self.failing:
+                raise ExternalAPIError(
+                    message=f"Unable to fetch stock data for ticker: {ticker}",
+                    details={"ticker": ticker}
+                )
+            if ticker in self.broken:
+                # e.g. yfinance fast_info without a last price
+                return Quote(ticker=ticker, price=None, currency=None)  # type: ignore[arg-type]
+            return Quote(ticker=ticker, price=100.0, currency="USD")
+        finally:
+            self.in_flight -= 1
+
+    async def get_quotes(
+        self,
+        tickers: list[str],
+        max_concurrency: int | None = None
+    ) -> dict[str, Quote | AIEngineException]:
+        self.batch_calls.append(list(tickers))
+        return await super().get_quotes(tickers, max_concurrency=max_concurrency)
+
+    async def get_history(self, ticker: str, interval: Interval, start: datetime, end: datetime) -> pd.DataFrame:
+        raise NotImplementedError
+
+
+def make_service(settings: Settings | None = None, **provider_kwargs: set[str]) -> tuple[StockService, FakeProvider]:
+    provider = FakeProvider(**provider_kwargs)
+    return StockService(settings or Settings(), provider=provider), provider
+
+
+@pytest.mark.asyncio
+async def test_get_current_prices_deduplicates_tickers():
+    """
+    Test that duplicate tickers are fetched once and request order is kept.
+    """
+    service, provider = make_service()
+
+    result = await service.get_current_prices(["msft", "AAPL", "MSFT ", "aapl"])
+
+    assert sorted(provider.calls) == ["AAPL", "MSFT"]
+    assert [price.ticker for price in result.prices] == ["MSFT", "AAPL"]
+    assert result.errors == []
+
+
+@pytest.mark.asyncio
+async def test_get_current_prices_limits_concurrency():
+    """
+    Test that no more than stock_batch_max_concurrency lookups run at once.
+    """
+    service, provider = make_service(Settings(stock_batch_max_concurrency=3))
+
+    await service.get_current_prices([f"T{i}" for i in range(12)])
+
+    assert len(provider.calls) == 12
+    assert provider.max_in_flight == 3
+
+
+@pytest.mark.asyncio
+async def test_get_current_prices_sends_only_cache_misses_in_one_batch():
+    """
+    Test that cached tickers are served locally and the rest go to get_quotes once.
+    """
+    service, provider = make_service()
+    await service.get_current_price("AAPL")
+
+    result = await service.get_current_prices(["AAPL", "MSFT", "GOOGL"])
+    await service.get_current_prices(["MSFT", "GOOGL"])
+
+    assert provider.batch_calls == [["MSFT", "GOOGL"]]
+    assert [price.ticker for price in result.prices] == ["AAPL", "MSFT", "GOOGL"]
+
+
+@pytest.mark.asyncio
+async def test_get_current_prices_reports_errors_per_ticker():
+    """
+    Test that one failing ticker does not fail the whole batch.
+    """
+    service, _ = make_service(failing={"NOPE"})
+
+    result = await service.get_current_prices(["AAPL", "NOPE", "MSFT"])
+
+    assert [price.ticker for price in result.prices] == ["AAPL", "MSFT"]
+    assert len(result.errors) == 1
+    assert result.errors[0].ticker == "NOPE"
+    assert "NOPE" in result.errors[0].message
+
+
+@pytest.mark.asyncio
+async def test_get_current_prices_reports_unexpected_errors_per_ticker():
+    """
+    Test that an unexpected (non-AIEngineException) error is reported for its ticker only.
+    """
+    service, _ = make_service(broken={"BAD"})
+
+    result = await service.get_current_prices(["AAPL", "BAD"])
+
+    assert [price.ticker for price in result.prices] == ["AAPL"]
+    assert [error.ticker for error in result.errors] == ["BAD"]
+    assert result.errors[0].details["cause"] == "internal_error"
+
+
+@pytest.mark.asyncio
+async def test_get_current_prices_rejects_oversized_batch():
+    """
+    Test that batches above stock_batch_max_tickers are rejected.
+    """
+    service, provider = make_service(Settings(stock_batch_max_tickers=2))
+
+    with pytest.raises(ValidationError):
+        await service.get_current_prices(["AAPL", "MSFT", "GOOGL"])
+
+    assert provider.calls == []
+
+
+@pytest.mark.asyncio
+async def test_get_current_price_uses_quote_cache():
+    """
+    Test that repeated and concurrent lookups of one ticker hit upstream once.
+    """
+    service = StockService(Settings())
+    calls: list[str] = []
+
+    async def fake_fetch(ticker: str) -> StockPriceSchema:
+        calls.append(ticker)
+        await asyncio.sleep(0.01)
+        return StockPriceSchema(ticker=ticker.upper(), current_price=1.0, currency="USD", market_status="open")
+
+    service._fetch_upstream_price = fake_fetch
+
+    await asyncio.gather(*(service.get_current_price("aapl") for _ in range(5)))
+    await service.get_current_price("AAPL")
+
+    assert calls == ["aapl"]
+    assert service.get_cache_stats().hits == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_quotes_are_flagged_and_refreshed_in_background():
+    """
+    Test that expired quotes are served with stale=True while one batch refresh runs.
+    """
+    settings = Settings(quote_cache_ttl_open=0.2, quote_cache_stale_ttl=60.0, market_calendar_enabled=False)
+    service, provider = make_service(settings)
+    await service.get_current_prices(["AAPL", "MSFT"])
+    await asyncio.sleep(0.25)
+
+    single = await service.get_current_price("AAPL")
+    batch = await service.get_current_prices(["AAPL", "MSFT"])
+
+    assert single.stale is True
+    assert [price.stale for price in batch.prices] == [True, True]
+
+    await asyncio.sleep(0.05)
+    fresh = await service.get_current_prices(["AAPL", "MSFT"])
+
+    assert [price.stale for price in fresh.prices] == [False, False]
+    assert provider.batch_calls == [["AAPL", "MSFT"], ["MSFT"]]
+    assert provider.calls.count("AAPL") == 2
+
+
+@pytest.mark.asyncio
+async def test_market_status_and_ttl_follow_the_calendar():
+    """
+    Test that quotes carry the exchange's market status and closed quotes are cached until the open.
+    """
+    now = [datetime(2026, 10, 16, 15, 0, tzinfo=UTC)]  # Friday 11:00 New York, 00:00 Seoul (Saturday)
+    calendar = MarketCalendar(clock=lambda: now[0])
+    settings = Settings(quote_cache_ttl_open=5.0, quote_cache_ttl_closed=300.0)
+    service = StockService(settings, provider=FakeProvider(), calendar=calendar)
+
+    us = await service.get_current_price("AAPL")
+    krx = await service.get_current_price("005930.KS")
+
+    assert (us.market_status, krx.market_status) == ("open", "closed")
+    assert service._quote_ttl(us) == 5.0
+    # KRX closed at 15:30 Friday Seoul time and opens Monday 09:00 (00:00 UTC)
+    assert service._quote_ttl(krx) == (datetime(2026, 10, 19, 0, 0, tzinfo=UTC) - now[0]).total_seconds()
+
+    now[0] = datetime(2026, 10, 16, 20, 1, tzinfo=UTC)  # one minute after the US close
+    assert service._quote_ttl(us.model_copy(update={"market_status": "closed"})) == 300.0
+
+
+@pytest.mark.asyncio
+async def test_workers_share_quotes_through_the_shared_cache():
+    """
+    Test that a quote fetched by one worker is served to another from the shared cache,
+    and that a refresh by one worker drops the other's local copy.
+    """
+    server = fakeredis.FakeServer()
+    settings = Settings(market_calendar_enabled=False)
+    first_shared = SharedCache(fakeredis.FakeAsyncRedis(server=server))
+    second_shared = SharedCache(fakeredis.FakeAsyncRedis(server=server))
+    first_provider = FakeProvider()
+    second_provider = FakeProvider()
+    first = StockService(settings, provider=first_provider, shared=first_shared)
+    second = StockService(settings, provider=second_provider, shared=second_shared)
+
+    await first.get_current_prices(["AAPL", "MSFT"])
+    single = await second.get_current_price("AAPL")
+    batch = await second.get_current_prices(["AAPL", "MSFT", "GOOGL"])
+
+    assert first_provider.batch_calls == [["AAPL", "MSFT"]]
+    assert second_provider.batch_calls == [["GOOGL"]]
+    assert single.current_price == 100.0
+    assert [price.ticker for price in batch.prices] == ["AAPL", "MSFT", "GOOGL"]
+    # Local copies read from the shared cache expire with the shared entry
+    assert 0 < second.quote_cache.ttl_remaining("AAPL") <= settings.quote_cache_ttl_open
+
+    second_shared.start()
+    try:
+        await asyncio.sleep(0.05)
+        await first.refresh_prices(["AAPL"])
+        for _ in range(50):
+            if second.quote_cache.ttl_remaining("AAPL") is None:
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        await second_shared.close()
+
+    assert second.quote_cache.ttl_remaining("AAPL") is None
+    assert second.quote_cache.ttl_remaining("MSFT") is not None
+
+
+def test_lifespan_replaces_services_on_the_closed_shared_cache():
+    """
+    Test that a new application lifespan builds new stock and history services.
+    """
+    with TestClient(app):
+        stock, history = get_stock_service(), get_history_service()
+
+    with TestClient(app):
+        assert get_stock_service() is not stock
+        assert get_history_service() is not history
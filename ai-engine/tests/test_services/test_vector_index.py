@@ -0,0 +1,254 @@
+"""
+Tests for the memory-mapped IVF vector index.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from app.services.vector_index import META_DTYPE, VectorIndex
+
+DIMS = 16
+
+
+def make_rows(count: int, seed: int = 0, first_doc: int = 0) -> tuple[np.ndarray, np.ndarray, list[bytes]]:
+    """
+    Make random unit vectors, four chunks per document, alternating AAPL/MSFT, published at their row number.
+    """
+    rng = np.random.default_rng(seed)
+    vectors = rng.standard_normal((count, DIMS)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    meta = np.zeros(count, dtype=META_DTYPE)
+    meta["doc"] = first_doc + np.arange(count) // 4
+    meta["chunk"] = np.arange(count) % 4
+    meta["ticker"] = np.where(np.arange(count) % 2 == 0, b"AAPL", b"MSFT")
+    meta["published"] = np.arange(count)
+    payloads = [f"row-{first_doc * 4 + i}".encode() for i in range(count)]
+    return vectors, meta, payloads
+
+
+def open_index(root: Path, **kwargs: int) -> VectorIndex:
+    """
+    Open a small index that trains after a few hundred vectors.
+    """
+    options: dict[str, int] = {"nlist": 8, "nprobe": 8, "compact_min_rows": 100, **kwargs}
+    return VectorIndex(root, dims=DIMS, embedder="test", **options)
+
+
+def exact_top(vectors: np.ndarray, query: np.ndarray, k: int) -> list[int]:
+    """
+    Brute-force nearest rows.
+    """
+    return list(np.argsort(-(vectors @ query))[:k])
+
+
+def test_empty_index_returns_no_hits(tmp_path: Path):
+    """
+    Test that a new index is created on disk and searches return nothing.
+    """
+    index = open_index(tmp_path / "index")
+
+    assert index.search(np.ones(DIMS, dtype=np.float32) / 4, k=5) == []
+    assert (tmp_path / "index" / "index.json").exists()
+    assert index.stats().rows == 0
+
+
+def test_add_and_search_untrained_is_exact(tmp_path: Path):
+    """
+    Test that a small index (one list) returns the exact nearest rows with their payloads.
+    """
+    index = open_index(tmp_path)
+    vectors, meta, payloads = make_rows(50)
+    index.add(vectors, meta, payloads)
+
+    hits = index.search(vectors[7], k=3)
+
+    assert [hit.row for hit in hits] == exact_top(vectors, vectors[7], 3)
+    assert hits[0].score == pytest.approx(1.0)
+    assert index.payload(hits[0].row) == b"row-7"
+    assert int(index.record(hits[0].row)["doc"]) == 1
+    assert not index.stats().trained
+
+
+def test_incremental_adds_train_and_compact(tmp_path: Path):
+    """
+    Test that the index trains its lists once it holds enough vectors and stays searchable across compactions.
+    """
+    index = open_index(tmp_path)
+    vectors, meta, payloads = make_rows(1000)
+    for lo in range(0, 1000, 50):
+        index.add(vectors[lo:lo + 50], meta[lo:lo + 50], payloads[lo:lo + 50])
+
+    stats = index.stats()
+    assert stats.trained
+    assert stats.lists == 8
+    assert stats.rows == 1000
+    assert stats.tail_rows < 100
+    for row in (0, 333, 999):
+        hit = index.search(vectors[row], k=1)[0]
+        assert index.payload(hit.row) == f"row-{row}".encode()
+        assert hit.score == pytest.approx(1.0)
+
+
+def test_ivf_recall_against_exact_search(tmp_path: Path):
+    """
+    Test that probing a quarter of the lists finds most of the exact top 10.
+    """
+    index = open_index(tmp_path, nprobe=2)
+    vectors, meta, payloads = make_rows(2000)
+    index.add(vectors, meta, payloads)
+    index.compact()
+
+    queries = np.random.default_rng(1).standard_normal((20, DIMS)).astype(np.float32)
+    found = 0
+    for query in queries:
+        query /= np.linalg.norm(query)
+        expected = {index.payload(row) for row in [hit.row for hit in index.search(query, k=10, nprobe=8)]}
+        found += len(expected & {index.payload(hit.row) for hit in index.search(query, k=10)})
+
+    assert found / 200 >= 0.5
+
+
+def test_ticker_and_date_filters(tmp_path: Path):
+    """
+    Test that only rows of the requested tickers and publish range are returned, before and after compaction.
+    """
+    index = open_index(tmp_path)
+    vectors, meta, payloads = make_rows(400)
+    index.add(vectors, meta, payloads)
+
+    for _ in range(2):
+        hits = index.search(vectors[10], k=20, tickers=["msft"], start=100, end=300)
+        assert hits
+        for hit in hits:
+            record = index.record(hit.row)
+            assert record["ticker"] == b"MSFT"
+            assert 100 <= record["published"] < 300
+        # Row 10 is AAPL and outside the range
+        assert b"row-10" not in {index.payload(hit.row) for hit in hits}
+        assert index.search(vectors[10], k=5, tickers=["TSLA"]) == []
+        index.compact()
+
+
+def test_selective_ticker_filter_is_exact(tmp_path: Path):
+    """
+    Test that a ticker filter matching few rows scans them all instead of probing lists.
+    """
+    index = open_index(tmp_path, nprobe=1, exact_threshold=500)
+    vectors, meta, payloads = make_rows(2000)
+    meta["ticker"][:300] = b"RARE"
+    index.add(vectors, meta, payloads)
+    index.compact()
+
+    query = vectors[5]
+    rare = vectors[:300]
+    hits = index.search(query, k=10, tickers=["RARE"])
+
+    assert [index.payload(hit.row) for hit in hits] == [f"row-{row}".encode() for row in exact_top(rare, query, 10)]
+
+
+def test_delete_and_reinsert(tmp_path: Path):
+    """
+    Test that deleted documents disappear from results and can be added again.
+    """
+    index = open_index(tmp_path)
+    vectors, meta, payloads = make_rows(40)
+    index.add(vectors, meta, payloads)
+
+    assert index.delete([2, 99]) == {2: 4}
+    assert index.delete([2]) == {}
+    assert b"row-8" not in {index.payload(hit.row) for hit in index.search(vectors[8], k=40)}
+
+    index.add(vectors[8:12], meta[8:12], payloads[8:12])
+    assert index.payload(index.search(vectors[8], k=1)[0].row) == b"row-8"
+    assert index.stats().live_rows == 40
+
+
+def test_reopen_maps_persisted_index(tmp_path: Path):
+    """
+    Test that a reopened index has the same rows, lists, tombstones and tail as before.
+    """
+    index = open_index(tmp_path)
+    vectors, meta, payloads = make_rows(600)
+    index.add(vectors[:550], meta[:550], payloads[:550])
+    index.add(vectors[550:], meta[550:], payloads[550:])
+    index.delete([0])
+    before = index.stats()
+
+    reopened = open_index(tmp_path)
+
+    assert reopened.stats() == before
+    assert isinstance(reopened._snapshot.vectors, np.memmap)
+    for row in (4, 100, 599):
+        assert reopened.payload(reopened.search(vectors[row], k=1)[0].row) == f"row-{row}".encode()
+    assert b"row-0" not in {reopened.payload(hit.row) for hit in reopened.search(vectors[0], k=10)}
+
+
+def test_reopen_ignores_partial_append(tmp_path: Path):
+    """
+    Test that a record cut short by an interrupted append is ignored on reopen.
+    """
+    index = open_index(tmp_path)
+    vectors, meta, payloads = make_rows(20)
+    index.add(vectors, meta, payloads)
+    with open(tmp_path / "vectors.0.f32", "ab") as f:
+        f.write(vectors[0].tobytes())
+    with open(tmp_path / "meta.0.bin", "ab") as f:
+        f.write(meta[:1].tobytes()[:10])
+
+    assert open_index(tmp_path).stats().rows == 20
+
+
+def test_compaction_drops_deleted_rows_and_old_files(tmp_path: Path):
+    """
+    Test that compaction rewrites a new generation without deleted rows.
+    """
+    index = open_index(tmp_path)
+    vectors, meta, payloads = make_rows(40)
+    index.add(vectors, meta, payloads)
+    index.delete([0, 1])
+
+    index.compact()
+
+    stats = index.stats()
+    assert (stats.rows, stats.deleted_rows, stats.tail_rows, stats.generation) == (32, 0, 0, 1)
+    assert not list(tmp_path.glob("*.0.*"))
+    assert index.payload(index.search(vectors[20], k=1)[0].row) == b"row-20"
+
+
+def test_rejects_other_embedder(tmp_path: Path):
+    """
+    Test that an index built with one embedder is not opened with another.
+    """
+    open_index(tmp_path)
+
+    with pytest.raises(ValueError, match="16-dim test"):
+        VectorIndex(tmp_path, dims=32, embedder="other")
+
+
+def test_instances_sharing_files_see_each_others_writes(tmp_path: Path):
+    """
+    Test that indexes of several workers on the same files pick up each other's adds, deletes and compactions.
+    """
+    first, second = open_index(tmp_path, auto_compact=False), open_index(tmp_path, auto_compact=False)
+    vectors, meta, payloads = make_rows(40)
+
+    first.add(vectors[:20], meta[:20], payloads[:20])
+    assert second.search(vectors[5], k=1)[0].payload == b"row-5"
+
+    # Appended after the other worker's rows, with payload offsets past theirs
+    second.add(vectors[20:], meta[20:], payloads[20:])
+    assert first.search(vectors[30], k=1)[0].payload == b"row-30"
+    assert open_index(tmp_path).search(vectors[30], k=1)[0].payload == b"row-30"
+
+    first.delete([0])
+    assert b"row-0" not in {hit.payload for hit in second.search(vectors[0], k=10)}
+
+    second.compact()
+    first.add(vectors[:4], meta[:4], payloads[:4])
+    assert first.stats() == second.stats()
+    assert second.stats().generation == 1
+    assert not list(tmp_path.glob("*.0.*"))
+    hit = second.search(vectors[2], k=1)[0]
+    assert (hit.payload, int(hit.record["doc"])) == (b"row-2", 0)